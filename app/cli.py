@@ -10,6 +10,9 @@ Usage:
     retro test project/
     retro new my_project
     retro docs script.retro
+    retro lint [path] [--stdin] [--json] [-j N]
+    retro fmt [path] [--check]
+    retro stats
 """
 
 from __future__ import annotations
@@ -70,21 +73,66 @@ def create_parser() -> argparse.ArgumentParser:
 
     # format command
     fmt_parser = subparsers.add_parser("fmt", help="Format code")
-    fmt_parser.add_argument("path", help="File or directory")
+    fmt_parser.add_argument("path", nargs="?", default=".", help="File or directory")
     fmt_parser.add_argument("--check", action="store_true", help="Check only, don't modify")
+    _add_batch_arguments(fmt_parser)
 
     # lint command
     lint_parser = subparsers.add_parser("lint", help="Lint code")
-    lint_parser.add_argument("path", help="File or directory")
+    lint_parser.add_argument("path", nargs="?", default=".", help="File or directory")
+    _add_batch_arguments(lint_parser)
 
     # parse command
     parse_parser = subparsers.add_parser("parse", help="Parse and show AST")
     parse_parser.add_argument("file", help="Script file")
     parse_parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parse_parser.add_argument(
+        "--optimize", action="store_true", help="Show the AST after constant folding"
+    )
+
+    # stats command
+    stats_parser = subparsers.add_parser("stats", help="Show per-action latency percentiles")
+    stats_parser.add_argument("file", nargs="?", help="Stats file (default: last run)")
+    stats_parser.add_argument("--phases", action="store_true", help="Break down by phase")
+    stats_parser.add_argument("--json", action="store_true", help="Output as JSON")
 
     return parser
 
 
+def _add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the project-wide lint and fmt commands."""
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read file paths from stdin (e.g. git diff --name-only REV)",
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes (0 = CPUs)")
+    parser.add_argument("--json", action="store_true", help="One JSON object per file")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the result cache")
+    parser.add_argument("--cache-dir", default=None, help="Cache directory (default .retroauto)")
+
+
+def _batch_files(args: argparse.Namespace) -> list[Path] | None:
+    """Files for lint/fmt from stdin or the path argument, or None if the path is missing."""
+    from app.tools.batch import collect_files
+
+    if args.stdin:
+        return collect_files(listed=sys.stdin.read().splitlines())
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Error: Path not found: {path}", file=sys.stderr)
+        return None
+    return collect_files(path)
+
+
+def _batch_cache(args: argparse.Namespace, task: str):  # type: ignore[no-untyped-def]
+    from app.tools.batch import CACHE_DIR, ResultCache
+
+    if args.no_cache:
+        return None
+    return ResultCache.for_task(task, Path(args.cache_dir) if args.cache_dir else CACHE_DIR)
+
+
 def cmd_run(args: argparse.Namespace) -> int:
     """Run a script."""
     file_path = Path(args.file)
@@ -250,31 +298,36 @@ def cmd_docs(args: argparse.Namespace) -> int:
 
 
 def cmd_fmt(args: argparse.Namespace) -> int:
-    """Format code."""
-    path = Path(args.path)
-    if not path.exists():
-        print(f"Error: Path not found: {path}", file=sys.stderr)
+    """Format code (parallel, cached by content hash)."""
+    files = _batch_files(args)
+    if files is None:
         return 1
 
     try:
-        from app.ide.formatter import Formatter
-
-        formatter = Formatter()
-
-        files = [path] if path.is_file() else list(path.glob("**/*.retro"))
-
-        for file in files:
-            source = file.read_text(encoding="utf-8")
-            formatted = formatter.format(source)
-
-            if args.check:
-                if source != formatted:
-                    print(f"Would format: {file}")
-            else:
-                file.write_text(formatted, encoding="utf-8")
-                print(f"Formatted: {file}")
-
-        return 0
+        import json
+
+        from app.tools.batch import run_batch
+
+        task = "fmt-check" if args.check else "fmt"
+        changed = errors = cached = 0
+
+        for result in run_batch(task, files, args.jobs, _batch_cache(args, "fmt")):
+            cached += result.cached
+            if args.json:
+                print(json.dumps(result.to_dict()), flush=True)
+            if result.error:
+                errors += 1
+                if not args.json:
+                    print(f"Error: {result.path}: {result.error}", file=sys.stderr)
+            elif result.changed:
+                changed += 1
+                if not args.json:
+                    print(f"{'Would format' if args.check else 'Formatted'}: {result.path}")
+
+        print(f"{len(files)} file(s), {cached} cached", file=sys.stderr)
+        if errors:
+            return 1
+        return 1 if args.check and changed else 0
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -282,37 +335,41 @@ def cmd_fmt(args: argparse.Namespace) -> int:
 
 
 def cmd_lint(args: argparse.Namespace) -> int:
-    """Lint code."""
-    path = Path(args.path)
-    if not path.exists():
-        print(f"Error: Path not found: {path}", file=sys.stderr)
+    """Lint code (parallel, cached by content hash)."""
+    files = _batch_files(args)
+    if files is None:
         return 1
 
     try:
-        from app.ide.quick_fixes import LiveValidator
-
-        validator = LiveValidator()
-
-        files = [path] if path.is_file() else list(path.glob("**/*.retro"))
-
-        total_issues = 0
-
-        for file in files:
-            source = file.read_text(encoding="utf-8")
-            errors = validator.validate(source)
-
-            if errors:
-                print(f"\n{file}:")
-                for err in errors:
-                    print(f"  L{err.line}: [{err.severity}] {err.message}")
-                    total_issues += 1
-
-        if total_issues:
-            print(f"\n{total_issues} issue(s) found")
-            return 1
-        else:
-            print("No issues found")
-            return 0
+        import json
+
+        from app.tools.batch import run_batch
+
+        total_issues = errors = cached = 0
+
+        for result in run_batch("lint", files, args.jobs, _batch_cache(args, "lint")):
+            cached += result.cached
+            total_issues += len(result.issues)
+            if args.json:
+                print(json.dumps(result.to_dict()), flush=True)
+                errors += bool(result.error)
+                continue
+            if result.error:
+                errors += 1
+                print(f"Error: {result.path}: {result.error}", file=sys.stderr)
+            elif result.issues:
+                print(f"\n{result.path}:")
+                for issue in result.issues:
+                    print(f"  L{issue['line']}: [{issue['severity']}] {issue['message']}")
+                sys.stdout.flush()
+
+        print(f"{len(files)} file(s), {cached} cached", file=sys.stderr)
+        if not args.json:
+            if total_issues:
+                print(f"\n{total_issues} issue(s) found")
+            else:
+                print("No issues found")
+        return 1 if total_issues or errors else 0
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -344,6 +401,58 @@ def cmd_parse(args: argparse.Namespace) -> int:
         print(f"Imports: {len(program.imports)}")
         print(f"Constants: {len(program.constants)}")
 
+        if args.optimize:
+            from core.dsl.formatter import Formatter
+            from core.dsl.optimizer import Optimizer
+
+            optimizer = Optimizer()
+            optimized = optimizer.optimize(program)
+            print(f"Optimized: {optimizer.stats}")
+            print()
+            print(Formatter().format(optimized), end="")
+
+        return 0
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Show per-action latency percentiles from the last run."""
+    from core.analytics.metrics import ACTION_STATS_PATH, ActionMetrics, MetricsRegistry
+
+    file_path = Path(args.file) if args.file else ACTION_STATS_PATH
+    if not file_path.exists():
+        print(f"Error: No stats found: {file_path}", file=sys.stderr)
+        return 1
+
+    try:
+        registry = MetricsRegistry()
+        registry.load_histograms(file_path)
+        rows = ActionMetrics(registry).summary()
+        if not args.phases:
+            rows = [row for row in rows if not row["phase"]]
+
+        if args.json:
+            import json
+
+            print(json.dumps(rows, indent=2))
+            return 0
+
+        if not rows:
+            print("No actions recorded")
+            return 0
+
+        print(f"{'Action':<28} {'Count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for row in rows:
+            name = row["action"] + (f" [{row['asset']}]" if row["asset"] else "")
+            if row["phase"]:
+                name = f"  {row['phase']}"
+            print(
+                f"{name:<28} {row['count']:>7} "
+                + " ".join(f"{row[key] * 1000:>9.1f}" for key in ("p50", "p95", "p99", "max"))
+            )
         return 0
 
     except Exception as e:
@@ -369,6 +478,7 @@ def main(argv: list[str] | None = None) -> int:
         "fmt": cmd_fmt,
         "lint": cmd_lint,
         "parse": cmd_parse,
+        "stats": cmd_stats,
     }
 
     handler = commands.get(args.command)
@@ -0,0 +1,266 @@
+"""
+RetroAuto v2 - Batch Lint/Format
+
+Project-wide lint and format for `retro lint` / `retro fmt`:
+- Files are fanned out over a process pool; each worker process keeps one
+  LiveValidator / Formatter instead of re-creating it per file
+- Results are cached in .retroauto/ by file content hash (plus a
+  fingerprint of the linter/formatter code), so unchanged files are skipped
+- Results stream back in sorted path order, so output is deterministic
+  whatever order the workers finish in
+- File lists can come from stdin, e.g.
+  git diff --name-only <rev> | retro lint --stdin
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR = Path(".retroauto")
+CACHE_VERSION = 1
+SOURCE_SUFFIXES = (".retro",)
+
+TASKS = ("lint", "fmt", "fmt-check")
+
+# Modules whose code decides each task's result
+_TASK_MODULES = {
+    "lint": "app.ide.quick_fixes",
+    "fmt": "app.ide.formatter",  # fmt and fmt-check share the "already formatted" cache
+    "fmt-check": "app.ide.formatter",
+}
+
+
+@dataclass
+class FileResult:
+    """Outcome of one file."""
+
+    path: Path
+    issues: list[dict[str, Any]] = field(default_factory=list)  # lint
+    changed: bool = False  # fmt: file was (or would be) reformatted
+    cached: bool = False
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON form (cache state left out so output does not vary between runs)."""
+        result: dict[str, Any] = {"file": self.path.as_posix()}
+        if self.error:
+            result["error"] = self.error
+        else:
+            result["issues"] = self.issues
+            result["changed"] = self.changed
+        return result
+
+
+def collect_files(path: Path | None = None, listed: Iterable[str] | None = None) -> list[Path]:
+    """
+    Source files to process, sorted and de-duplicated.
+
+    listed (e.g. lines read from stdin) takes precedence over path;
+    entries that are not existing .retro files are ignored, so a raw
+    `git diff --name-only` list can be piped in.
+    """
+    if listed is not None:
+        candidates = [Path(line.strip()) for line in listed if line.strip()]
+        files = [p for p in candidates if p.suffix in SOURCE_SUFFIXES and p.is_file()]
+    elif path is None or path.is_dir():
+        root = path or Path(".")
+        files = [p for suffix in SOURCE_SUFFIXES for p in root.glob(f"**/*{suffix}")]
+    else:
+        files = [path]
+    return sorted(set(files))
+
+
+def file_digest(data: bytes) -> str:
+    """Content hash of a source file."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Per-task JSON cache of results keyed by file content hash.
+
+    Usage:
+        cache = ResultCache.for_task("lint")
+        hit = cache.get(digest)
+        cache.put(digest, issues)
+        cache.save()
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self._path = Path(path)
+        self._fingerprint = fingerprint
+        self._entries: dict[str, Any] = {}
+        self._used: dict[str, Any] = {}  # Entries seen this run; the rest are dropped on save
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_task(cls, task: str, cache_dir: Path = CACHE_DIR) -> ResultCache:
+        return cls(Path(cache_dir) / f"{task}-cache.json", task_fingerprint(task))
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return  # Missing or corrupt: start empty
+        if (
+            isinstance(data, dict)
+            and data.get("version") == CACHE_VERSION
+            and data.get("fingerprint") == self._fingerprint
+        ):
+            self._entries = data.get("entries", {})
+
+    def get(self, digest: str) -> Any | None:
+        value = self._entries.get(digest)
+        if value is not None:
+            self._used[digest] = value
+        return value
+
+    def put(self, digest: str, value: Any) -> None:
+        self._entries[digest] = value
+        self._used[digest] = value
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write entries used by this run (atomic replace)."""
+        if not self._dirty and len(self._used) == len(self._entries):
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CACHE_VERSION, "fingerprint": self._fingerprint, "entries": self._used}
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self._path)
+        self._entries = dict(self._used)
+        self._dirty = False
+
+
+def task_fingerprint(task: str) -> str:
+    """Hash of the code behind a task, so cached results expire when it changes."""
+    spec = importlib.util.find_spec(_TASK_MODULES[task])
+    origin = spec.origin if spec else None
+    code = Path(origin).read_bytes() if origin else b""
+    return file_digest(f"{task}:{CACHE_VERSION}:".encode() + code)
+
+
+def run_batch(
+    task: str,
+    files: list[Path],
+    jobs: int | None = None,
+    cache: ResultCache | None = None,
+) -> Iterator[FileResult]:
+    """
+    Lint or format files, yielding results in the order of files.
+
+    Cached files are yielded without being processed. The rest run on a
+    pool of jobs processes (default: CPU count), or in this process when
+    jobs is 1 or only one file needs work.
+    """
+    if task not in TASKS:
+        raise ValueError(f"Unknown batch task: {task}")
+
+    pending: list[tuple[int, Path, str]] = []
+    ready: dict[int, FileResult] = {}
+    for i, path in enumerate(files):
+        try:
+            digest = file_digest(path.read_bytes())
+        except OSError as e:
+            ready[i] = FileResult(path, error=str(e))
+            continue
+        hit = cache.get(digest) if cache else None
+        if hit is not None:
+            ready[i] = _from_cache(task, path, hit)
+        else:
+            pending.append((i, path, digest))
+
+    jobs = jobs or os.cpu_count() or 1
+    paths = [str(path) for _, path, _ in pending]
+    if jobs == 1 or len(pending) <= 1:
+        _init_worker()
+        results: Iterator[dict[str, Any]] = (_process_file(task, p) for p in paths)
+        executor = None
+    else:
+        workers = min(jobs, len(pending))
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        chunksize = max(1, len(paths) // (jobs * 4))
+        results = executor.map(_process_file, [task] * len(paths), paths, chunksize=chunksize)
+
+    try:
+        next_index = 0
+        for (i, path, digest), raw in zip(pending, results, strict=True):
+            result = FileResult(
+                path,
+                issues=raw.get("issues", []),
+                changed=raw.get("changed", False),
+                error=raw.get("error"),
+            )
+            if cache is not None and result.error is None:
+                if task == "lint":
+                    cache.put(digest, result.issues)
+                elif not result.changed:
+                    cache.put(digest, True)  # Already formatted
+            ready[i] = result
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+        while next_index in ready:
+            yield ready.pop(next_index)
+            next_index += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.save()
+
+
+def _from_cache(task: str, path: Path, value: Any) -> FileResult:
+    if task == "lint":
+        return FileResult(path, issues=value, cached=True)
+    return FileResult(path, changed=False, cached=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# Worker process
+# ─────────────────────────────────────────────────────────────
+
+_validator: Any = None
+_formatter: Any = None
+
+
+def _init_worker() -> None:
+    """Create the validator and formatter once per process."""
+    global _validator, _formatter
+    if _validator is None:
+        from app.ide.formatter import Formatter
+        from app.ide.quick_fixes import LiveValidator
+
+        _validator = LiveValidator()
+        _formatter = Formatter()
+
+
+def _process_file(task: str, path_str: str) -> dict[str, Any]:
+    """Lint or format one file. Returns plain data (picklable, cacheable)."""
+    path = Path(path_str)
+    try:
+        source = path.read_text(encoding="utf-8")
+        if task == "lint":
+            issues = [
+                {"line": e.line, "severity": e.severity, "message": e.message}
+                for e in _validator.validate(source)
+            ]
+            return {"issues": issues}
+
+        formatted = _formatter.format(source)
+        changed = formatted != source
+        if changed and task == "fmt":
+            path.write_text(formatted, encoding="utf-8")
+        return {"changed": changed}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
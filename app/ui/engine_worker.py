@@ -8,10 +8,12 @@ from pathlib import Path
 
 from PySide6.QtCore import QThread, Signal
 
+from core.analytics.metrics import ACTION_STATS_PATH
 from core.engine import ExecutionContext, InterruptManager, Runner
 from core.models import Script
 from core.script.io import create_empty_script, load_script, save_script
 from core.templates import TemplateStore
+from core.vision.template_cache import TemplateDiskCache
 from vision.matcher import Matcher
 from vision.waiter import ImageWaiter
 from infra import get_logger
@@ -113,7 +115,12 @@ class EngineWorker(QThread):
         if self._script is None:
             return
 
-        self._templates = TemplateStore(self._project_path or Path("."))
+        self._templates = TemplateStore(
+            self._project_path or Path("."),
+            disk_cache=(
+                TemplateDiskCache.for_project(self._project_path) if self._project_path else None
+            ),
+        )
 
         # Preload templates if we have a project path
         if self._project_path and self._script.assets:
@@ -131,6 +138,7 @@ class EngineWorker(QThread):
             on_step=self._on_step,
             on_complete=self._on_flow_complete,
             on_notify=self._on_notify_callback,
+            stats_path=ACTION_STATS_PATH,
         )
 
         self._interrupt_mgr = InterruptManager(self._ctx)
@@ -169,7 +177,7 @@ class EngineWorker(QThread):
                 # Also need to update context's matcher
                 if self._ctx:
                     self._ctx.templates = self._templates
-                    self._ctx.matcher = Matcher(self._templates, self._ctx.capture)
+                    self._ctx.matcher = Matcher(self._templates, self._ctx.capture, self._ctx.frames)
                     self._ctx.waiter = ImageWaiter(self._ctx.matcher)
 
             # Refresh templates before run to pick up newly added assets
@@ -7,17 +7,23 @@ Part of RetroScript Phase 17 - Analytics & Monitoring.
 
 from __future__ import annotations
 
+import functools
 import json
+import math
+import os
 import statistics
 import time
 from collections.abc import Callable
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
 from pathlib import Path
-from threading import Lock
+from threading import Lock, get_ident
 from typing import Any
 
+from infra.logging import LOG_DIR
+
 # ─────────────────────────────────────────────────────────────
 # Metric Types
 # ─────────────────────────────────────────────────────────────
@@ -135,6 +141,110 @@ class Timer:
         }
 
 
+# Linear sub-buckets per power of two: values keep ~3% precision
+HISTOGRAM_SUB_BUCKETS = 32
+_SUB_BITS = HISTOGRAM_SUB_BUCKETS.bit_length()  # Bits of value >> shift
+
+
+def _bucket_index(us: int) -> int:
+    """Log-linear bucket of a microsecond value."""
+    if us < HISTOGRAM_SUB_BUCKETS:
+        return max(us, 0)
+    shift = us.bit_length() - _SUB_BITS
+    return HISTOGRAM_SUB_BUCKETS * shift + (us >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest microsecond value that falls into a bucket."""
+    if index < HISTOGRAM_SUB_BUCKETS:
+        return index
+    shift = index // HISTOGRAM_SUB_BUCKETS - 1
+    mantissa = index - HISTOGRAM_SUB_BUCKETS * shift
+    return ((mantissa + 1) << shift) - 1
+
+
+@dataclass
+class Histogram:
+    """
+    HDR-style latency histogram.
+
+    Durations are counted in log-linear microsecond buckets: recording is
+    O(1) and memory stays bounded whatever the number of samples, so it
+    can stay on in production. Percentiles are the upper bound of their
+    bucket (at most ~3% high).
+    """
+
+    name: str
+    labels: dict[str, str] = field(default_factory=dict)
+    count: int = 0
+    total: float = 0.0  # Sum of recorded durations (seconds)
+    max: float = 0.0
+    buckets: dict[int, int] = field(default_factory=dict)
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record(self, duration: float) -> None:
+        """Record a duration in seconds."""
+        index = _bucket_index(int(duration * 1_000_000))
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += duration
+            if duration > self.max:
+                self.max = duration
+
+    def percentile(self, p: float) -> float:
+        """Duration (seconds) at or below which p percent of samples fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_bucket_upper(index) / 1_000_000, self.max)
+        return self.max
+
+    def get_stats(self) -> dict[str, float]:
+        """Get histogram statistics."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+    def reset(self) -> None:
+        """Reset histogram."""
+        with self._lock:
+            self.buckets.clear()
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializable snapshot (sparse buckets)."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "labels": dict(self.labels),
+                "count": self.count,
+                "total": self.total,
+                "max": self.max,
+                "buckets": {str(index): n for index, n in self.buckets.items()},
+            }
+
+    def merge(self, data: dict[str, Any]) -> None:
+        """Add the samples of a to_dict() snapshot."""
+        with self._lock:
+            for index, n in data["buckets"].items():
+                self.buckets[int(index)] = self.buckets.get(int(index), 0) + n
+            self.count += data["count"]
+            self.total += data["total"]
+            self.max = max(self.max, data["max"])
+
+
 class TimerContext:
     """Context manager for timing."""
 
@@ -167,14 +277,18 @@ class MetricsRegistry:
         metrics.gauge("active_scripts").set(5)
 
         # Timer
-        with metrics.timer("request_duration").time():
+        with metrics.time("request_duration"):
             do_something()
+
+        # Histogram
+        metrics.histogram("action_latency_seconds", action="Click").record(0.012)
     """
 
     def __init__(self) -> None:
         self._counters: dict[str, Counter] = {}
         self._gauges: dict[str, Gauge] = {}
         self._timers: dict[str, Timer] = {}
+        self._histograms: dict[str, Histogram] = {}
         self._lock = Lock()
 
     def counter(self, name: str, **labels: str) -> Counter:
@@ -204,6 +318,19 @@ class MetricsRegistry:
                     self._timers[key] = Timer(name=name, labels=labels)
         return self._timers[key]
 
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """Get or create a histogram."""
+        key = self._make_key(name, labels)
+        if key not in self._histograms:
+            with self._lock:
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(name=name, labels=labels)
+        return self._histograms[key]
+
+    def histograms(self, name: str) -> list[Histogram]:
+        """All histograms with a name, whatever their labels."""
+        return [h for h in list(self._histograms.values()) if h.name == name]
+
     def time(self, name: str, **labels: str) -> TimerContext:
         """Context manager for timing."""
         return TimerContext(self.timer(name, **labels))
@@ -228,8 +355,27 @@ class MetricsRegistry:
         for key, timer in self._timers.items():
             result[key] = {"type": "timer", **timer.get_stats()}
 
+        for key, histogram in self._histograms.items():
+            result[key] = {"type": "histogram", **histogram.get_stats()}
+
         return result
 
+    def save_histograms(self, path: str | Path) -> None:
+        """Write all histograms to a JSON file (atomic replace: readers never see half a file)."""
+        snapshot = [h.to_dict() for h in list(self._histograms.values())]
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+        try:
+            tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def load_histograms(self, path: str | Path) -> None:
+        """Merge histograms saved with save_histograms."""
+        for data in json.loads(Path(path).read_text(encoding="utf-8")):
+            self.histogram(data["name"], **data["labels"]).merge(data)
+
     def reset_all(self) -> None:
         """Reset all metrics."""
         for counter in self._counters.values():
@@ -238,6 +384,8 @@ class MetricsRegistry:
             gauge.set(0.0)
         for timer in self._timers.values():
             timer.values.clear()
+        for histogram in self._histograms.values():
+            histogram.reset()
 
 
 # ─────────────────────────────────────────────────────────────
@@ -347,6 +495,157 @@ class ScriptMetrics:
         }
 
 
+# ─────────────────────────────────────────────────────────────
+# Action Metrics
+# ─────────────────────────────────────────────────────────────
+
+ACTION_PHASES = ("capture", "match", "input", "wait")
+ACTION_STATS_PATH = LOG_DIR / "action_stats.json"  # Written by Runner, read by `retro stats`
+
+
+class ActionSpan:
+    """Exclusive time per phase of one running action."""
+
+    __slots__ = ("phases", "_stack", "_token")
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self._stack: list[float] = []  # Time spent in nested phases, per open phase
+        self._token: Any = None
+
+
+_current_span: ContextVar[ActionSpan | None] = ContextVar("action_span", default=None)
+
+
+class PhaseTimer:
+    """Context manager adding a block's time to a phase of the current action.
+
+    Time spent in nested phases counts for the nested phase only. Outside
+    an action (or on other threads) it does nothing.
+    """
+
+    __slots__ = ("_name", "_span", "_start")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._span: ActionSpan | None = None
+        self._start = 0.0
+
+    def __enter__(self) -> PhaseTimer:
+        span = _current_span.get()
+        if span is not None:
+            self._span = span
+            span._stack.append(0.0)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        span = self._span
+        if span is None:
+            return
+        self._span = None
+        elapsed = time.perf_counter() - self._start
+        stack = span._stack
+        span.phases[self._name] = span.phases.get(self._name, 0.0) + elapsed - stack.pop()
+        if stack:
+            stack[-1] += elapsed
+
+
+def phase(name: str) -> PhaseTimer:
+    """Attribute a block to a phase (capture, match, input, wait) of the current action."""
+    return PhaseTimer(name)
+
+
+def in_phase(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator form of phase() for whole functions."""
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with PhaseTimer(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class ActionMetrics:
+    """Per-action latency histograms, split into phases.
+
+    Histograms are keyed by action type and asset:
+    `action_latency_seconds` holds the whole action,
+    `action_phase_seconds` the exclusive time of each phase.
+
+    Usage:
+        am = ActionMetrics()
+        span = am.begin()
+        try:
+            with phase("match"):
+                matcher.find("button")
+        finally:
+            am.end(span, "ClickImage", "button", elapsed)
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or get_metrics()
+        # (action, asset) -> (total histogram, {phase: histogram})
+        self._histograms: dict[tuple[str, str], tuple[Histogram, dict[str, Histogram]]] = {}
+
+    def begin(self) -> ActionSpan:
+        """Start collecting phases for an action on the current thread/task."""
+        span = ActionSpan()
+        span._token = _current_span.set(span)
+        return span
+
+    def end(self, span: ActionSpan, action: str, asset: str, duration: float) -> None:
+        """Stop collecting and record the action's latency and phases."""
+        _current_span.reset(span._token)
+        entry = self._histograms.get((action, asset))
+        if entry is None:
+            entry = self._histograms[(action, asset)] = (
+                self.registry.histogram("action_latency_seconds", action=action, asset=asset),
+                {},
+            )
+        total, phases = entry
+        total.record(duration)
+        for name, seconds in span.phases.items():
+            histogram = phases.get(name)
+            if histogram is None:
+                histogram = phases[name] = self.registry.histogram(
+                    "action_phase_seconds", action=action, asset=asset, phase=name
+                )
+            histogram.record(seconds)
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Rows of {action, asset, phase, count, p50, p95, p99, max}; phase "" is the total."""
+        rows = []
+        for name in ("action_latency_seconds", "action_phase_seconds"):
+            for histogram in self.registry.histograms(name):
+                labels = histogram.labels
+                rows.append(
+                    {
+                        "action": labels.get("action", ""),
+                        "asset": labels.get("asset", ""),
+                        "phase": labels.get("phase", ""),
+                        **histogram.get_stats(),
+                    }
+                )
+
+        def order(row: dict[str, Any]) -> tuple[str, str, int]:
+            phase_name = row["phase"]
+            rank = ACTION_PHASES.index(phase_name) + 1 if phase_name in ACTION_PHASES else 0
+            return row["action"], row["asset"], rank if phase_name else -1
+
+        return sorted(rows, key=order)
+
+    def save(self, path: str | Path) -> None:
+        """Write the histograms to a JSON file (read back by `retro stats`)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.registry.save_histograms(path)
+
+
 # ─────────────────────────────────────────────────────────────
 # Structured Logger
 # ─────────────────────────────────────────────────────────────
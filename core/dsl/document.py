@@ -4,6 +4,7 @@ RetroAuto v2 - Script Document
 Manages the document state for a script:
 - Holds the IR (source of truth)
 - Syncs code ↔ IR ↔ GUI
+- Re-parses and re-checks only the declarations an edit touched
 - Handles dirty state and undo/redo
 - Graceful error handling with recovery hints
 """
@@ -17,13 +18,13 @@ from enum import Enum, auto
 from pathlib import Path
 from typing import Any
 
+from core.dsl.incremental import IncrementalParser, ParseStats
 from core.dsl.ir import (
     ActionIR,
     AssetIR,
     FlowIR,
     ScriptIR,
     ir_to_code,
-    parse_to_ir,
 )
 from core.dsl.parser import Parser
 from core.dsl.semantic import analyze
@@ -94,6 +95,13 @@ class ScriptDocument:
         self._last_code_length = 0
         self._typing_direction = 0  # +1 = adding, -1 = deleting
 
+        # Incremental sync: per-declaration parse cache, and semantic
+        # warnings per chunk text with the symbols they depend on and the
+        # chunk's line offset they were computed for
+        self._parser = IncrementalParser()
+        self._semantic_cache: dict[str, tuple[frozenset[str], list[ParseError], int]] = {}
+        self._symbols: frozenset[str] = frozenset()
+
         # Callbacks
         self._on_ir_changed: list[Callable[[str], None]] = []
         self._on_code_changed: list[Callable[[str], None]] = []
@@ -239,8 +247,8 @@ class ScriptDocument:
             # Don't parse incomplete code - avoid error spam
             return
 
-        # Parse to IR
-        ir, errors = parse_to_ir(new_code)
+        # Parse to IR (only edited declarations are re-parsed)
+        ir, errors = self._parser.parse(new_code)
 
         if errors:
             # Enrich errors with recovery hints
@@ -267,7 +275,7 @@ class ScriptDocument:
             self._notify_state_changed()
         else:
             # Parse successful - run semantic analysis
-            semantic_errors = self._run_semantic_analysis(ir)
+            semantic_errors = self._run_incremental_semantic_analysis(ir)
 
             if semantic_errors:
                 # Semantic errors are warnings - still update IR
@@ -351,13 +359,84 @@ class ScriptDocument:
 
     def _run_semantic_analysis(self, ir: ScriptIR) -> list[ParseError]:
         """Run semantic analysis and return errors as ParseError list."""
-        errors = []
+        asset_ids = {a.id for a in ir.assets}
+        flow_names = {f.name for f in ir.flows}
+        return self._check_flows(ir.flows, asset_ids, flow_names)
+
+    def _run_incremental_semantic_analysis(self, ir: ScriptIR) -> list[ParseError]:
+        """
+        Semantic analysis reusing the results of unchanged declarations.
+
+        A chunk is re-checked only when its text is new or one of the
+        symbols it references was added or removed since the last run.
+        """
+        if self._parser.stats.full_parse:
+            self._semantic_cache = {}
+            self._symbols = frozenset()
+            return self._run_semantic_analysis(ir)
 
-        # Check asset references
         asset_ids = {a.id for a in ir.assets}
         flow_names = {f.name for f in ir.flows}
+        symbols = frozenset(
+            [f"asset:{a}" for a in asset_ids] + [f"flow:{name}" for name in flow_names]
+        )
+        # Copied so the (usually empty) difference gets a table of its own
+        # size: intersecting with it scans its whole table on every chunk
+        changed = set(symbols ^ self._symbols)
+
+        errors: list[ParseError] = []
+        cache: dict[str, tuple[frozenset[str], list[ParseError], int]] = {}
+        for chunk in self._parser.chunks:
+            cached = cache.get(chunk.text) or self._semantic_cache.get(chunk.text)
+            offset = chunk.line_offset
+            if cached is None or cached[0] & changed:
+                refs = self._flow_refs(chunk.flows)
+                cached = (refs, self._check_flows(chunk.flows, asset_ids, flow_names), offset)
+            elif cached[2] != offset:
+                # The chunk moved: shift its warnings once
+                cached = (cached[0], self._shift_errors(cached[1], offset - cached[2]), offset)
+            cache.setdefault(chunk.text, cached)
+            errors.extend(cached[1])
+
+        self._semantic_cache = cache
+        self._symbols = symbols
+        return errors
 
-        for flow in ir.flows:
+    @staticmethod
+    def _shift_errors(errors: list[ParseError], offset: int) -> list[ParseError]:
+        """Copies of errors with their line moved by offset (line 0 = no line)."""
+        return [
+            ParseError(
+                e.message, e.line + offset, e.column, e.severity, e.recovery_hint, e.quick_fix
+            )
+            if e.line
+            else e
+            for e in errors
+        ]
+
+    @staticmethod
+    def _flow_refs(flows: list[FlowIR]) -> frozenset[str]:
+        """Symbols (asset:<id>, flow:<name>) referenced by the flows' actions."""
+        refs: set[str] = set()
+        for flow in flows:
+            for action in flow.actions:
+                ref = action.params.get("arg0", "")
+                if not ref:
+                    continue
+                if action.action_type in ("wait_image", "if_image", "while_image"):
+                    refs.add(f"asset:{ref}")
+                elif action.action_type == "run_flow":
+                    refs.add(f"flow:{ref}")
+        return frozenset(refs)
+
+    @staticmethod
+    def _check_flows(
+        flows: list[FlowIR], asset_ids: set[str], flow_names: set[str]
+    ) -> list[ParseError]:
+        """Check asset and flow references of the flows' actions."""
+        errors = []
+
+        for flow in flows:
             for _i, action in enumerate(flow.actions):
                 # Check wait_image/if_image asset references
                 if action.action_type in ("wait_image", "if_image", "while_image"):
@@ -406,6 +485,11 @@ class ScriptDocument:
         """Get current parse errors."""
         return self._parse_errors
 
+    @property
+    def parse_stats(self) -> ParseStats:
+        """What the latest code sync re-parsed and reused."""
+        return self._parser.stats
+
     @property
     def last_valid_ir(self) -> ScriptIR | None:
         """Get the last successfully parsed IR."""
@@ -444,6 +528,7 @@ class ScriptDocument:
             obj[final_part] = value
         else:
             setattr(obj, final_part, value)
+        self._parser.clear()  # The IR objects are shared with the parse cache
 
     def _parse_path(self, path: str) -> list[str | int]:
         """Parse a path like 'flows[0].name' into parts."""
@@ -499,6 +584,7 @@ class ScriptDocument:
         flow = self._ir.get_flow(flow_name)
         if flow:
             flow.actions.append(action)
+            self._parser.clear()  # The IR objects are shared with the parse cache
             self._is_dirty = True
             self._regenerate_code()
             self._notify_ir_changed("action_added")
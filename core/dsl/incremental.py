@@ -0,0 +1,267 @@
+"""
+RetroAuto v2 - Incremental Parsing
+
+Re-parses only the top-level declarations that changed between two
+versions of a script:
+- The source is split into chunks at lines that start a declaration in
+  column 0 (flow, interrupt, const, hotkeys, import, @decorator)
+- Only the edited region is split again; chunks before and after it are
+  taken from the previous split
+- Each chunk is parsed on its own and cached by its text, with IR lines
+  absolute for the line the chunk last sat on
+- Unchanged chunks on the same line reuse their IR objects; chunks that
+  moved are copied once with shifted lines
+- Any chunk with errors (a split inside a block, an unterminated comment)
+  falls back to a full parse, so results and error messages always match
+  parse_to_ir()
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from core.dsl.ast import Program
+from core.dsl.ir import ActionIR, FlowIR, HotkeysIR, InterruptIR, IRMapper, ScriptIR, parse_to_ir
+from core.dsl.parser import Parser
+
+_DECLARATION_START = re.compile(r"^(?=(?:flow|interrupt|const|hotkeys|import)\b|@)", re.MULTILINE)
+# Characters after a line start that decide whether it starts a declaration
+_LOOKAHEAD = len("interrupt") + 1
+
+
+class Chunk(NamedTuple):
+    """A top-level slice of the source."""
+
+    text: str
+    start_line: int  # 1-based line of the chunk's first character
+
+
+def split_chunks(source: str) -> list[Chunk]:
+    """Split source at column-0 declaration starts. Joining the texts gives source back."""
+    return _split(source, 0, len(source), 1) or [Chunk("", 1)]
+
+
+def resplit_chunks(previous: list[Chunk], source: str) -> list[Chunk]:
+    """
+    split_chunks(source), given the split of an earlier version of it.
+
+    Chunks before and after the edited region are matched by text and
+    reused (the ones after it with shifted lines); only the region between
+    them is scanned again.
+    """
+    # Leading chunks that are unchanged
+    head, pos = 0, 0
+    while head < len(previous) and source.startswith(previous[head].text, pos):
+        pos += len(previous[head].text)
+        head += 1
+    # Trailing chunks that are unchanged, not overlapping the leading ones
+    tail, end = len(previous), len(source)
+    while tail > head and source.endswith(previous[tail - 1].text, pos, end):
+        tail -= 1
+        end -= len(previous[tail].text)
+
+    # A line start just before the edit may turn into (or stop being) a
+    # declaration start, so rescan from a chunk start far enough before it
+    start = pos
+    while head > 0 and start + _LOOKAHEAD > pos:
+        head -= 1
+        start -= len(previous[head].text)
+    # The first trailing chunk must still start a declaration; the one after
+    # it does, as everything it depends on is unchanged
+    if tail < len(previous) and not _DECLARATION_START.match(source, end):
+        end += len(previous[tail].text)
+        tail += 1
+
+    line = previous[head].start_line if head < len(previous) else 1
+    chunks = previous[:head]
+    chunks.extend(_split(source, start, end, line))
+    if tail < len(previous):
+        shift = line + source.count("\n", start, end) - previous[tail].start_line
+        chunks.extend(
+            Chunk(chunk.text, chunk.start_line + shift) if shift else chunk
+            for chunk in previous[tail:]
+        )
+    return chunks or [Chunk("", 1)]
+
+
+def _split(source: str, start: int, end: int, line: int) -> list[Chunk]:
+    """Chunks of source[start:end]; start is a line start on the given line."""
+    chunks: list[Chunk] = []
+    for m in _DECLARATION_START.finditer(source, start):
+        pos = m.start()
+        if pos >= end:
+            break
+        if pos > start:
+            chunks.append(Chunk(source[start:pos], line))
+            line += source.count("\n", start, pos)
+            start = pos
+    if start < end:
+        chunks.append(Chunk(source[start:end], line))
+    return chunks
+
+
+@dataclass
+class ChunkEntry:
+    """Parsed form of one chunk. AST spans are relative to the chunk, IR lines absolute."""
+
+    text: str
+    program: Program
+    flows: list[FlowIR]
+    interrupts: list[InterruptIR]
+    hotkeys: HotkeysIR | None
+    start_line: int = 1  # Line the IR lines were computed for
+
+    @property
+    def line_offset(self) -> int:
+        return self.start_line - 1
+
+
+@dataclass
+class ParseStats:
+    """What the latest incremental parse did."""
+
+    reused: int = 0  # Chunks taken from the cache
+    parsed: int = 0  # Chunks parsed
+    full_parse: bool = False  # Fell back to parsing the whole source
+
+    def __str__(self) -> str:
+        mode = "full parse" if self.full_parse else "incremental"
+        return f"{mode}: {self.parsed} parsed, {self.reused} reused"
+
+
+@dataclass
+class IncrementalParser:
+    """
+    parse_to_ir() with a per-declaration cache.
+
+    Usage:
+        parser = IncrementalParser()
+        ir, errors = parser.parse(code)
+        ir, errors = parser.parse(edited_code)  # Only edited chunks re-parsed
+
+    Flows, interrupts and hotkeys of the returned IR are shared with the
+    cache: call clear() after changing them in place.
+    """
+
+    chunks: list[ChunkEntry] = field(default_factory=list)
+    stats: ParseStats = field(default_factory=ParseStats)
+    _cache: dict[str, ChunkEntry] = field(default_factory=dict, repr=False)
+    _layout: list[Chunk] = field(default_factory=list, repr=False)  # Latest split
+
+    def parse(self, source: str) -> tuple[ScriptIR, list[str]]:
+        """Parse source to IR. Same result as parse_to_ir(source)."""
+        stats = ParseStats()
+        cache: dict[str, ChunkEntry] = {}
+        entries: list[ChunkEntry] = []
+
+        self._layout = resplit_chunks(self._layout, source)
+        for chunk in self._layout:
+            if chunk.text in cache:
+                # Same text twice in one file: each position gets its own entry
+                entry = _moved(cache[chunk.text], chunk.start_line)
+                stats.reused += 1
+            else:
+                cached = self._cache.get(chunk.text)
+                if cached is None:
+                    cached = self._parse_chunk(chunk)
+                    if cached is None:
+                        # Keep what parsed so the next edit is incremental again
+                        self._cache.update(cache)
+                        return self._full_parse(source)
+                    stats.parsed += 1
+                else:
+                    stats.reused += 1
+                entry = _moved(cached, chunk.start_line)
+                cache[chunk.text] = entry
+            entries.append(entry)
+
+        self._cache = cache
+        self.chunks = entries
+        self.stats = stats
+        return self._assemble(entries), []
+
+    def clear(self) -> None:
+        """Forget cached chunks (after a returned IR was changed in place)."""
+        self._cache = {}
+        self.chunks = []
+
+    def _parse_chunk(self, chunk: Chunk) -> ChunkEntry | None:
+        """Parse one chunk, or None if it does not parse cleanly on its own."""
+        parser = Parser(chunk.text)
+        program = parser.parse()
+        if parser.errors:
+            return None
+        ir = IRMapper.ast_to_ir(program, chunk.text)
+        offset = chunk.start_line - 1
+        for flow in ir.flows:
+            _shift_in_place(flow.actions, offset)
+        for interrupt in ir.interrupts:
+            _shift_in_place(interrupt.actions, offset)
+        return ChunkEntry(
+            text=chunk.text,
+            program=program,
+            flows=ir.flows,
+            interrupts=ir.interrupts,
+            hotkeys=ir.hotkeys if program.hotkeys else None,
+            start_line=chunk.start_line,
+        )
+
+    def _full_parse(self, source: str) -> tuple[ScriptIR, list[str]]:
+        self.chunks = []
+        self.stats = ParseStats(parsed=1, full_parse=True)
+        return parse_to_ir(source)
+
+    @staticmethod
+    def _assemble(entries: list[ChunkEntry]) -> ScriptIR:
+        """Build a ScriptIR from chunk entries, sharing their flows and interrupts."""
+        ir = ScriptIR()
+        for entry in entries:
+            ir.flows.extend(entry.flows)
+            ir.interrupts.extend(entry.interrupts)
+            if entry.hotkeys is not None:
+                ir.hotkeys = entry.hotkeys
+        ir.is_valid = True
+        return ir
+
+
+def _moved(entry: ChunkEntry, start_line: int) -> ChunkEntry:
+    """The entry itself if it sits on start_line, else a copy with shifted IR lines."""
+    offset = start_line - entry.start_line
+    if not offset:
+        return entry
+    return ChunkEntry(
+        text=entry.text,
+        program=entry.program,
+        flows=[FlowIR(name=f.name, actions=_shift_actions(f.actions, offset)) for f in entry.flows],
+        interrupts=[
+            InterruptIR(
+                priority=i.priority,
+                when_asset=i.when_asset,
+                actions=_shift_actions(i.actions, offset),
+            )
+            for i in entry.interrupts
+        ],
+        hotkeys=entry.hotkeys,
+        start_line=start_line,
+    )
+
+
+def _shift_in_place(actions: list[ActionIR], offset: int) -> None:
+    """Move span_line of freshly mapped actions by offset."""
+    for action in actions:
+        if action.span_line is not None:
+            action.span_line += offset
+
+
+def _shift_actions(actions: list[ActionIR], offset: int) -> list[ActionIR]:
+    """Copy actions with span_line moved by offset."""
+    return [
+        ActionIR(
+            action_type=action.action_type,
+            params=dict(action.params),
+            span_line=None if action.span_line is None else action.span_line + offset,
+        )
+        for action in actions
+    ]
@@ -8,12 +8,68 @@ Supports:
 - Literals (strings, numbers, durations, booleans)
 - Operators and delimiters
 - Comments (line and block)
+
+Two scanners produce the same token stream: the character scanner
+(_scan_token) and a fast path that consumes whole tokens with one compiled
+regex and derives line/column from newline offsets only at token starts.
+The fast path hands any token it cannot prove identical (escapes, errors,
+non-ASCII identifiers and numbers) to the character scanner.
 """
 
 from __future__ import annotations
 
+import re
+
 from core.dsl.tokens import KEYWORDS, Token, TokenType
 
+# Fast path: one alternative per token class, tried in _scan_token's order
+_FAST_TOKEN = re.compile(
+    r"""
+    (?P<ws>[ \t\r\n]+)
+  | (?P<line_comment>//[^\n]*|\#[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>"[^"\\\n]*"|'[^'\\\n]*')
+  | (?P<float>[0-9]+\.[0-9]+)
+  | (?P<number>[0-9]+)(?P<suffix>[A-Za-z]*)
+  | (?P<variable>\$[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<operator>==|!=|<=|>=|&&|\|\||->|[-+*/%<>!=(){}\[\];:,.@])
+    """,
+    re.VERBOSE,
+)
+
+_DURATION_SUFFIXES = frozenset(("ms", "s", "m", "h"))
+
+_OPERATORS = {
+    "==": TokenType.EQ,
+    "!=": TokenType.NEQ,
+    "<=": TokenType.LTE,
+    ">=": TokenType.GTE,
+    "&&": TokenType.AND,
+    "||": TokenType.OR,
+    "->": TokenType.ARROW,
+    "+": TokenType.PLUS,
+    "-": TokenType.MINUS,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "%": TokenType.PERCENT,
+    "<": TokenType.LT,
+    ">": TokenType.GT,
+    "!": TokenType.NOT,
+    "=": TokenType.ASSIGN,
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    "{": TokenType.LBRACE,
+    "}": TokenType.RBRACE,
+    "[": TokenType.LBRACKET,
+    "]": TokenType.RBRACKET,
+    ";": TokenType.SEMICOLON,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "@": TokenType.AT_SIGN,
+}
+
 
 class LexerError(Exception):
     """Lexer error with position information."""
@@ -32,10 +88,14 @@ class Lexer:
     Usage:
         lexer = Lexer(source_code)
         tokens = lexer.tokenize()
+
+        # Character scanner only (reference for the fast path)
+        tokens = Lexer(source_code, fast=False).tokenize()
     """
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, fast: bool = True) -> None:
         self.source = source
+        self.fast = fast
         self.pos = 0
         self.line = 1
         self.column = 1
@@ -50,13 +110,123 @@ class Lexer:
         self.line = 1
         self.column = 1
 
-        while not self._at_end():
-            self._scan_token()
+        if self.fast:
+            self._tokenize_fast()
+        else:
+            while not self._at_end():
+                self._scan_token()
 
         # Add EOF token
         self.tokens.append(Token(TokenType.EOF, "", self.line, self.column))
         return self.tokens
 
+    def _tokenize_fast(self) -> None:
+        """Consume whole tokens with _FAST_TOKEN; see the module docstring."""
+        source = self.source
+        length = len(source)
+        append = self.tokens.append
+        match = _FAST_TOKEN.match
+
+        pos = 0
+        line = 1
+        line_start = 0  # Offset of the first character of `line`
+        counted = 0  # Newlines before this offset are counted in `line`
+
+        while pos < length:
+            m = match(source, pos)
+            kind = m.lastgroup if m is not None else None
+            if kind == "ws":
+                pos = m.end()  # type: ignore[union-attr]
+                continue
+
+            # Line and column of pos, from the newlines since the last token
+            newlines = source.count("\n", counted, pos)
+            if newlines:
+                line += newlines
+                line_start = source.rfind("\n", counted, pos) + 1
+            counted = pos
+            column = pos - line_start + 1
+
+            scanned = None if m is None else self._fast_token(m, line, column)
+            if scanned is not None:
+                token, pos = scanned
+                append(token)
+                continue
+
+            # Escapes, errors and non-ASCII tokens: one step of the character scanner
+            self.pos, self.line, self.column = pos, line, column
+            self._scan_token()
+            pos = self.pos
+            if pos >= length:
+                return  # EOF at the character scanner's position
+
+        # Position of the end of the source, for the EOF token
+        newlines = source.count("\n", counted, length)
+        if newlines:
+            line += newlines
+            line_start = source.rfind("\n", counted, length) + 1
+        self.pos, self.line, self.column = length, line, length - line_start + 1
+
+    def _fast_token(self, m: re.Match[str], line: int, column: int) -> tuple[Token, int] | None:
+        """
+        Token for a _FAST_TOKEN match and the offset after it.
+
+        None if the character scanner must decide (see module docstring).
+        """
+        source = m.string
+        kind = m.lastgroup
+        start, end = m.span()
+
+        if kind == "identifier" or kind == "variable":
+            # A Unicode letter or digit next would extend the name
+            if end < len(source) and not source[end].isascii():
+                return None
+            value = m.group()
+            token_type = TokenType.VARIABLE
+            if kind == "identifier":
+                token_type = KEYWORDS.get(value.lower(), TokenType.IDENTIFIER)
+                if token_type is not TokenType.IDENTIFIER:
+                    value = value.lower()  # Keywords are lowercase
+        elif kind == "operator":
+            value = m.group()
+            token_type = _OPERATORS[value]
+        elif kind == "float" or kind == "suffix":
+            # Unicode digits/letters next would extend the number or its suffix,
+            # and "." before a Unicode digit would make it a float
+            after = source[end : end + 2]
+            if not after[:1].isascii() or (after[:1] == "." and not after.isascii()):
+                return None
+            if kind == "float":
+                token_type = TokenType.FLOAT
+            elif m.group("suffix").lower() in _DURATION_SUFFIXES:
+                token_type = TokenType.DURATION
+            else:
+                token_type = TokenType.INTEGER
+                end = m.end("number")  # The suffix is scanned as the next token
+            value = source[start:end]
+        elif kind == "line_comment":
+            value = m.group()
+            token_type = TokenType.LINE_COMMENT
+        elif kind == "string":
+            value = source[start + 1 : end - 1]
+            token_type = TokenType.STRING
+        elif kind == "block_comment":
+            close = source.find("*/", start + 2)
+            if close < 0:
+                return None  # Unterminated: reported by the character scanner
+            end = close + 2
+            value = source[start:end]
+            newlines = value.count("\n")
+            if newlines:
+                end_column = end - source.rfind("\n", start, end)
+                end_line = line + newlines
+                return Token(TokenType.BLOCK_COMMENT, value, line, column, end_line, end_column), end
+            token_type = TokenType.BLOCK_COMMENT
+        else:
+            return None
+
+        return Token(token_type, value, line, column, line, column + end - start), end
+
     def _at_end(self) -> bool:
         """Check if we've reached the end of source."""
         return self.pos >= len(self.source)
@@ -0,0 +1,148 @@
+"""
+RetroAuto v2 - Parsed Module Cache
+
+Persistent cache of parsed module ASTs for the ModuleLoader, so a module
+is parsed once and then loaded from disk by every later process.
+
+- One file per module under .retroauto/modules/, named by a hash of the
+  module path and validated by the hash of the module's content
+- ASTs are stored in a compact marshal form of plain tuples/lists; only
+  core.dsl.ast node classes are ever rebuilt from it (no pickle)
+- A fingerprint of the lexer/parser/AST code expires entries when the
+  parser changes
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import threading
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from core.dsl import ast as ast_module
+from core.dsl.ast import Program
+
+CACHE_DIR = Path(".retroauto") / "modules"
+FORMAT_VERSION = 1
+
+_NODE = "N"
+_TUPLE = "T"
+
+# Classes the decoder may build, by name
+_NODE_TYPES: dict[str, type[Any]] = {
+    name: cls
+    for name, cls in vars(ast_module).items()
+    if isinstance(cls, type) and is_dataclass(cls) and cls.__module__ == ast_module.__name__
+}
+_FIELDS: dict[type[Any], tuple[str, ...]] = {
+    cls: tuple(f.name for f in fields(cls)) for cls in _NODE_TYPES.values()
+}
+
+
+def content_digest(data: bytes) -> str:
+    """Content hash of a module source."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """Hash of the code that produces ASTs; cached entries expire when it changes."""
+    root = Path(__file__).parent
+    code = b"".join((root / name).read_bytes() for name in ("lexer.py", "parser.py", "ast.py"))
+    return content_digest(f"{FORMAT_VERSION}:".encode() + code)
+
+
+def encode_ast(value: Any) -> Any:
+    """AST to nested marshal-able tuples/lists/dicts."""
+    if type(value) in _FIELDS:
+        names = _FIELDS[type(value)]
+        return (_NODE, type(value).__name__, tuple(encode_ast(getattr(value, n)) for n in names))
+    if isinstance(value, list):
+        return [encode_ast(item) for item in value]
+    if isinstance(value, tuple):
+        return (_TUPLE, tuple(encode_ast(item) for item in value))
+    if isinstance(value, dict):
+        return {key: encode_ast(item) for key, item in value.items()}
+    return value
+
+
+def decode_ast(value: Any) -> Any:
+    """Inverse of encode_ast(). Raises ValueError on unknown node types."""
+    if isinstance(value, tuple):
+        if value[0] == _NODE:
+            cls = _NODE_TYPES.get(value[1])
+            if cls is None:
+                raise ValueError(f"Unknown AST node type: {value[1]}")
+            node = object.__new__(cls)
+            # Bypass __init__: restores ids as stored, no default factories
+            node.__dict__.update(zip(_FIELDS[cls], map(decode_ast, value[2]), strict=True))
+            return node
+        return tuple(decode_ast(item) for item in value[1])
+    if isinstance(value, list):
+        return [decode_ast(item) for item in value]
+    if isinstance(value, dict):
+        return {key: decode_ast(item) for key, item in value.items()}
+    return value
+
+
+class ModuleCache:
+    """
+    On-disk cache of parsed modules.
+
+    Usage:
+        cache = ModuleCache(project_dir / CACHE_DIR)
+        program = cache.get(path, digest)
+        if program is None:
+            program = Parser(source).parse()
+            cache.put(path, digest, program)
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._dir = Path(directory)
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def _entry_path(self, path: str) -> Path:
+        name = hashlib.blake2b(path.encode("utf-8"), digest_size=16).hexdigest()
+        return self._dir / f"{name}.ast"
+
+    def get(self, path: str, digest: str) -> Program | None:
+        """Cached AST of a module, or None if missing, stale or unreadable."""
+        try:
+            version, stored_digest, encoded = marshal.loads(self._entry_path(path).read_bytes())
+            if version != parser_fingerprint() or stored_digest != digest:
+                raise ValueError("stale")
+            program = decode_ast(encoded)
+            if not isinstance(program, Program):
+                raise ValueError("not a program")
+        except (OSError, ValueError, EOFError, TypeError, IndexError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return program
+
+    def put(self, path: str, digest: str, program: Program) -> None:
+        """Store a module's AST (atomic replace; errors only lose the entry)."""
+        target = self._entry_path(path)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(marshal.dumps((parser_fingerprint(), digest, encode_ast(program))))
+            os.replace(tmp, target)
+        except (OSError, ValueError):
+            tmp.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Delete all cached modules."""
+        for entry in self._dir.glob("*.ast"):
+            entry.unlink(missing_ok=True)
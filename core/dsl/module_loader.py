@@ -3,13 +3,25 @@ RetroAuto v2 - Module Loader
 
 Handles import resolution, caching, and circular dependency detection.
 Part of RetroScript Phase 3 - Package Manager + Ecosystem.
+
+- Parsed modules persist in a ModuleCache (.retroauto/modules/), keyed by
+  path and content hash, so later processes skip parsing
+- The import tree is loaded breadth-first; the modules of one level are
+  read and decoded/parsed in parallel
+- A ModuleGraph records who imports whom, so a change invalidates only
+  the changed module and its importers
 """
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from core.dsl.module_cache import CACHE_DIR, ModuleCache, content_digest
 
 if TYPE_CHECKING:
     from core.dsl.ast import Program
@@ -22,7 +34,57 @@ class LoadedModule:
     path: str  # Absolute path to module
     alias: str | None  # Import alias
     ast: Program | None = None  # Parsed AST
-    exports: dict[str, any] = field(default_factory=dict)  # Exported symbols
+    exports: dict[str, Any] = field(default_factory=dict)  # Exported symbols
+
+
+class ModuleGraph:
+    """
+    Import dependency graph between resolved module paths.
+
+    Usage:
+        graph.set_imports(a, [b, c])
+        graph.dependents(c)  # [c, a]: what a change to c affects
+    """
+
+    def __init__(self) -> None:
+        self._imports: dict[str, list[str]] = {}
+        self._importers: dict[str, set[str]] = {}
+
+    def set_imports(self, path: str, imports: list[str]) -> None:
+        """Record (or replace) the modules path imports."""
+        for old in self._imports.get(path, []):
+            self._importers.get(old, set()).discard(path)
+        self._imports[path] = list(imports)
+        for dep in imports:
+            self._importers.setdefault(dep, set()).add(path)
+
+    def imports_of(self, path: str) -> list[str]:
+        """Modules path imports directly."""
+        return list(self._imports.get(path, []))
+
+    def importers_of(self, path: str) -> set[str]:
+        """Modules importing path directly."""
+        return set(self._importers.get(path, set()))
+
+    def dependents(self, path: str) -> list[str]:
+        """path and every module importing it, directly or not (nearest first)."""
+        seen = {path}
+        order = [path]
+        queue = deque([path])
+        while queue:
+            for importer in sorted(self._importers.get(queue.popleft(), ())):
+                if importer not in seen:
+                    seen.add(importer)
+                    order.append(importer)
+                    queue.append(importer)
+        return order
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._imports
+
+    def clear(self) -> None:
+        self._imports.clear()
+        self._importers.clear()
 
 
 class ModuleLoader:
@@ -34,20 +96,35 @@ class ModuleLoader:
         # Access module.ast or module.exports
     """
 
-    def __init__(self, base_path: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        base_path: str | Path | None = None,
+        cache_dir: str | Path | None = None,
+        persistent: bool = True,
+        max_workers: int | None = None,
+    ) -> None:
         """Initialize module loader.
 
         Args:
             base_path: Base directory for resolving imports
+            cache_dir: Parsed-module cache (default: base_path/.retroauto/modules)
+            persistent: Keep parsed modules on disk between processes
+            max_workers: Threads loading one import level (default: min(8, CPUs))
         """
         self.base_path = Path(base_path) if base_path else Path.cwd()
         self._cache: dict[str, LoadedModule] = {}
-        self._loading: set[str] = set()  # For circular dependency detection
         self._search_paths: list[Path] = [
             self.base_path,
             self.base_path / "lib",
             self.base_path / "modules",
         ]
+        self.graph = ModuleGraph()
+        self.disk_cache: ModuleCache | None = None
+        if persistent:
+            cache_dir = Path(cache_dir) if cache_dir else self.base_path / CACHE_DIR
+            self.disk_cache = ModuleCache(cache_dir)
+        self._max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._roots: dict[str, tuple[str, str | None]] = {}  # Top-level loads, for reload()
 
     def add_search_path(self, path: str | Path) -> None:
         """Add a path to search for modules."""
@@ -84,15 +161,16 @@ class ModuleLoader:
     def load(self, import_path: str, alias: str | None = None) -> LoadedModule | None:
         """Load a module by import path.
 
+        Nested imports are loaded too and linked into exports. A module is
+        loaded once per loader, so circular imports link to the same
+        LoadedModule instead of recursing.
+
         Args:
             import_path: Path from import statement
             alias: Optional alias for the module
 
         Returns:
             LoadedModule if successful, None if not found
-
-        Raises:
-            ModuleError: If circular dependency detected
         """
         # Resolve to absolute path
         resolved = self.resolve_path(import_path)
@@ -105,50 +183,134 @@ class ModuleLoader:
         if abs_path in self._cache:
             return self._cache[abs_path]
 
-        # Detect circular dependency
-        if abs_path in self._loading:
-            raise ModuleError(f"Circular dependency detected: {import_path}")
-
-        self._loading.add(abs_path)
-
+        self._roots.setdefault(abs_path, (import_path, alias))
+        resolutions: dict[str, str | None] = {}
+        programs = self._load_tree(abs_path, resolutions)
+        return self._link(abs_path, alias or import_path.split("/")[-1], programs, resolutions)
+
+    def _resolve_import(self, import_path: str, resolutions: dict[str, str | None]) -> str | None:
+        """resolve_path() memoized for one load."""
+        if import_path not in resolutions:
+            resolved = self.resolve_path(import_path)
+            resolutions[import_path] = str(resolved.resolve()) if resolved else None
+        return resolutions[import_path]
+
+    def _load_tree(self, root: str, resolutions: dict[str, str | None]) -> dict[str, Program]:
+        """Read/parse root and everything it imports that is not loaded yet, level by level."""
+        programs: dict[str, Program] = {}
+        frontier = [root]
+        pool: ThreadPoolExecutor | None = None
         try:
-            # Read and parse module
-            source = resolved.read_text(encoding="utf-8")
-
-            # Import parser here to avoid circular import
-            from core.dsl.parser import Parser
-
-            parser = Parser(source)
-            ast = parser.parse()
-
-            # Create module
-            module = LoadedModule(
-                path=abs_path,
-                alias=alias or import_path.split("/")[-1],
-                ast=ast,
-            )
-
-            # Cache it
-            self._cache[abs_path] = module
+            while frontier:
+                if len(frontier) > 1 and self._max_workers > 1:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(self._max_workers, thread_name_prefix="modules")
+                    loaded = list(pool.map(self._read_module, frontier))
+                else:
+                    loaded = [self._read_module(path) for path in frontier]
+
+                queued = set(frontier)
+                next_frontier: list[str] = []
+                for path, program in zip(frontier, loaded, strict=True):
+                    programs[path] = program
+                    deps = []
+                    for import_stmt in program.imports:
+                        dep = self._resolve_import(import_stmt.path, resolutions)
+                        if dep is None:
+                            continue
+                        deps.append(dep)
+                        if dep not in programs and dep not in self._cache and dep not in queued:
+                            queued.add(dep)
+                            next_frontier.append(dep)
+                    self.graph.set_imports(path, deps)
+                frontier = next_frontier
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return programs
+
+    def _read_module(self, path: str) -> Program:
+        """AST of one module file, from the disk cache when its content is unchanged."""
+        data = Path(path).read_bytes()
+        digest = content_digest(data)
+        if self.disk_cache is not None:
+            program = self.disk_cache.get(path, digest)
+            if program is not None:
+                return program
+
+        # Import parser here to avoid circular import
+        from core.dsl.parser import Parser
+
+        program = Parser(data.decode("utf-8")).parse()
+        if self.disk_cache is not None:
+            self.disk_cache.put(path, digest, program)
+        return program
+
+    def _link(
+        self,
+        path: str,
+        alias: str,
+        programs: dict[str, Program],
+        resolutions: dict[str, str | None],
+    ) -> LoadedModule:
+        """Create LoadedModules depth-first in import order, filling exports."""
+        if path in self._cache:
+            return self._cache[path]
+
+        module = LoadedModule(path=path, alias=alias, ast=programs[path])
+        self._cache[path] = module
+
+        for import_stmt in programs[path].imports:
+            dep = self._resolve_import(import_stmt.path, resolutions)
+            if dep is None:
+                continue
+            nested_alias = import_stmt.alias or import_stmt.path.split("/")[-1]
+            nested = self._link(dep, nested_alias, programs, resolutions)
+            module.exports[nested.alias] = nested
+
+        return module
+
+    def invalidate(self, path: str | Path) -> list[str]:
+        """Drop a changed module and everything importing it from memory.
 
-            # Process nested imports
-            for import_stmt in ast.imports:
-                nested = self.load(import_stmt.path, import_stmt.alias)
-                if nested:
-                    module.exports[nested.alias] = nested
+        Returns:
+            Affected module paths, the changed module first
+        """
+        affected = self.graph.dependents(str(Path(path).resolve()))
+        for abs_path in affected:
+            self._cache.pop(abs_path, None)
+        return affected
 
-            return module
+    def reload(self, path: str | Path) -> list[LoadedModule]:
+        """Invalidate a changed module and re-load the affected top-level modules.
 
-        finally:
-            self._loading.discard(abs_path)
+        Unaffected modules stay loaded; affected ones with unchanged
+        content come back from the disk cache, so only the changed file
+        is parsed again.
+        """
+        affected = self.invalidate(path)
+        reloaded = []
+        for abs_path in affected:
+            if abs_path in self._roots:
+                import_path, alias = self._roots[abs_path]
+                module = self.load(import_path, alias)
+                if module:
+                    reloaded.append(module)
+        return reloaded
+
+    def loaded_paths(self) -> list[str]:
+        """Absolute paths of all loaded modules."""
+        return list(self._cache)
 
     def get_cached(self, path: str) -> LoadedModule | None:
         """Get a cached module by path."""
         return self._cache.get(path)
 
     def clear_cache(self) -> None:
-        """Clear all cached modules."""
+        """Clear all cached modules (the disk cache is kept)."""
         self._cache.clear()
+        self.graph.clear()
+        self._roots.clear()
 
 
 class ModuleError(Exception):
@@ -0,0 +1,388 @@
+"""
+RetroAuto v2 - DSL Optimizer
+
+AST pass run between Parser.parse and execution:
+- Folds arithmetic, comparisons, string concatenation and and/or/not
+  on constant operands
+- Folds duration literals to milliseconds ("2s" -> 2000)
+- Inlines `const` values that no flow reassigns or shadows
+- Removes `if false` branches and `while false` loops
+
+Folded nodes keep the span and id of the expression they replace, so
+diagnostics and the debugger still point at the original source. Results
+match the interpreter exactly; an expression that would fail at run time
+(e.g. `1 / 0`) is left unfolded so it still fails there.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from core.dsl.ast import (
+    ArrayExpr,
+    AssignStmt,
+    ASTNode,
+    BinaryExpr,
+    BlockStmt,
+    CallExpr,
+    ExprStmt,
+    ForStmt,
+    Identifier,
+    IfStmt,
+    LetStmt,
+    Literal,
+    Program,
+    ReturnStmt,
+    TryStmt,
+    UnaryExpr,
+    WhileStmt,
+)
+from core.dsl.values import is_truthy, literal_value
+
+MAX_FOLDED_STRING = 4096  # Longer string results stay unfolded
+
+
+def _add(left: Any, right: Any) -> Any:
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+
+def _div(left: Any, right: Any) -> Any:
+    if right == 0:
+        raise ZeroDivisionError  # Interpreter raises "Division by zero" at run time
+    return left / right
+
+
+_BINARY_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "+": _add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": _div,
+    "%": operator.mod,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@dataclass
+class OptimizeStats:
+    """What an optimization pass changed."""
+
+    folded: int = 0  # Expressions replaced by a literal
+    inlined: int = 0  # Const references replaced by their value
+    removed: int = 0  # Dead branches and loops dropped
+
+    def __str__(self) -> str:
+        return f"{self.folded} folded, {self.inlined} inlined, {self.removed} removed"
+
+
+class Optimizer:
+    """Constant folding and dead-branch elimination.
+
+    Usage:
+        optimizer = Optimizer()
+        program = optimizer.optimize(Parser(source).parse())
+        print(optimizer.stats)
+    """
+
+    def __init__(self) -> None:
+        self.stats = OptimizeStats()
+        self._consts: dict[str, Literal] = {}
+
+        self._stmt_dispatch: dict[type, Callable[[Any], list[ASTNode]]] = {
+            LetStmt: self._optimize_let,
+            AssignStmt: self._optimize_assign,
+            IfStmt: self._optimize_if,
+            WhileStmt: self._optimize_while,
+            ForStmt: self._optimize_for,
+            TryStmt: self._optimize_try,
+            ReturnStmt: self._optimize_return,
+            BlockStmt: lambda n: [self._block(n)],
+            ExprStmt: lambda n: [self._replace(n, expr=self._expr(n.expr))],
+            CallExpr: lambda n: [self._expr(n)],
+        }
+        self._expr_dispatch: dict[type, Callable[[Any], ASTNode]] = {
+            Literal: self._fold_literal,
+            Identifier: self._fold_identifier,
+            BinaryExpr: self._fold_binary,
+            UnaryExpr: self._fold_unary,
+            CallExpr: self._fold_call,
+            ArrayExpr: self._fold_array,
+        }
+
+    def optimize(self, program: Program) -> Program:
+        """Return an optimized copy of a program (the input is not modified)."""
+        self.stats = OptimizeStats()
+        assigned = _assigned_names(program)
+
+        # Constants see only the constants defined before them
+        self._consts = {}
+        constants = []
+        for const in program.constants:
+            initializer = self._expr(const.initializer)
+            constants.append(self._replace(const, initializer=initializer))
+            if isinstance(initializer, Literal) and const.name not in assigned:
+                self._consts[const.name] = initializer
+            else:
+                self._consts.pop(const.name, None)
+
+        flows = [self._replace(flow, body=self._block(flow.body)) for flow in program.flows]
+        interrupts = [
+            self._replace(interrupt, body=self._block(interrupt.body))
+            for interrupt in program.interrupts
+        ]
+        self._consts = {}
+        return replace(program, constants=constants, flows=flows, interrupts=interrupts)
+
+    # ─────────────────────────────────────────────────────────────
+    # Statements
+    # ─────────────────────────────────────────────────────────────
+
+    def _block(self, block: BlockStmt) -> BlockStmt:
+        statements: list[ASTNode] = []
+        for stmt in block.statements:
+            statements.extend(self._stmt(stmt))
+        return self._replace(block, statements=statements)
+
+    def _stmt(self, node: ASTNode) -> list[ASTNode]:
+        """Optimize a statement; dead code becomes an empty list."""
+        handler = self._stmt_dispatch.get(type(node))
+        return handler(node) if handler else [node]
+
+    def _optimize_let(self, node: LetStmt) -> list[ASTNode]:
+        if node.initializer is None:
+            return [node]
+        return [self._replace(node, initializer=self._expr(node.initializer))]
+
+    def _optimize_assign(self, node: AssignStmt) -> list[ASTNode]:
+        return [self._replace(node, value=self._expr(node.value))]
+
+    def _optimize_return(self, node: ReturnStmt) -> list[ASTNode]:
+        if node.value is None:
+            return [node]
+        return [self._replace(node, value=self._expr(node.value))]
+
+    def _optimize_if(self, node: IfStmt) -> list[ASTNode]:
+        branches = [(self._expr(node.condition), self._block(node.then_branch))]
+        for condition, block in node.elif_branches:
+            branches.append((self._expr(condition), self._block(block)))
+        else_branch = self._block(node.else_branch) if node.else_branch else None
+
+        # Drop constant-false branches; a constant-true one becomes the else
+        kept: list[tuple[ASTNode, BlockStmt]] = []
+        for index, (condition, block) in enumerate(branches):
+            found, value = _constant(condition)
+            if not found:
+                kept.append((condition, block))
+                continue
+            if is_truthy(value):
+                self.stats.removed += len(branches) - index - 1 + (else_branch is not None)
+                else_branch = block
+                break
+            self.stats.removed += 1
+
+        if not kept:
+            # Blocks do not open a scope, so the taken branch is spliced in
+            return list(else_branch.statements) if else_branch else []
+        (condition, then_branch), *elifs = kept
+        return [
+            self._replace(
+                node,
+                condition=condition,
+                then_branch=then_branch,
+                elif_branches=elifs,
+                else_branch=else_branch,
+            )
+        ]
+
+    def _optimize_while(self, node: WhileStmt) -> list[ASTNode]:
+        condition = self._expr(node.condition)
+        found, value = _constant(condition)
+        if found and not is_truthy(value):
+            self.stats.removed += 1
+            return []
+        return [self._replace(node, condition=condition, body=self._block(node.body))]
+
+    def _optimize_for(self, node: ForStmt) -> list[ASTNode]:
+        return [
+            self._replace(node, iterable=self._expr(node.iterable), body=self._block(node.body))
+        ]
+
+    def _optimize_try(self, node: TryStmt) -> list[ASTNode]:
+        catch_block = self._block(node.catch_block) if node.catch_block else None
+        return [
+            self._replace(node, try_block=self._block(node.try_block), catch_block=catch_block)
+        ]
+
+    # ─────────────────────────────────────────────────────────────
+    # Expressions
+    # ─────────────────────────────────────────────────────────────
+
+    def _expr(self, node: ASTNode) -> ASTNode:
+        handler = self._expr_dispatch.get(type(node))
+        return handler(node) if handler else node
+
+    def _fold_literal(self, node: Literal) -> ASTNode:
+        if node.literal_type != "duration":
+            return node
+        return self._fold(node, lambda: literal_value(node))
+
+    def _fold_identifier(self, node: Identifier) -> ASTNode:
+        name = node.name[1:] if node.name.startswith("$") else node.name
+        const = self._consts.get(name)
+        if const is None:
+            return node
+        self.stats.inlined += 1
+        return self._replace(const, span=node.span, id=node.id)
+
+    def _fold_binary(self, node: BinaryExpr) -> ASTNode:
+        left = self._expr(node.left)
+        right = self._expr(node.right)
+        op = node.operator
+        found, left_value = _constant(left)
+
+        # and/or return an operand: decided by a constant left side alone
+        if op in ("and", "&&", "or", "||"):
+            if not found:
+                return self._replace(node, left=left, right=right)
+            self.stats.folded += 1
+            if is_truthy(left_value) == (op in ("or", "||")):
+                return left
+            return right
+
+        right_found, right_value = _constant(right)
+        func = _BINARY_OPS.get(op)
+        if found and right_found and func is not None:
+            folded = self._fold(node, lambda: func(left_value, right_value))
+            if folded is not node:
+                return folded
+        return self._replace(node, left=left, right=right)
+
+    def _fold_unary(self, node: UnaryExpr) -> ASTNode:
+        operand = self._expr(node.operand)
+        found, value = _constant(operand)
+        if found:
+            if node.operator == "-":
+                folded = self._fold(node, lambda: -value)
+                if folded is not node:
+                    return folded
+            elif node.operator in ("!", "not"):
+                return self._fold(node, lambda: not is_truthy(value))
+        return self._replace(node, operand=operand)
+
+    def _fold_call(self, node: CallExpr) -> ASTNode:
+        return self._replace(
+            node,
+            args=[self._expr(arg) for arg in node.args],
+            kwargs={key: self._expr(value) for key, value in node.kwargs.items()},
+        )
+
+    def _fold_array(self, node: ArrayExpr) -> ASTNode:
+        return self._replace(node, elements=[self._expr(e) for e in node.elements])
+
+    def _fold(self, node: ASTNode, compute: Callable[[], Any]) -> ASTNode:
+        """Replace node by the literal compute() returns, unless it fails."""
+        try:
+            value = compute()
+        except Exception:
+            return node  # Fails at run time, with the interpreter's error
+        literal = _literal(value, node)
+        if literal is None:
+            return node
+        self.stats.folded += 1
+        return literal
+
+    @staticmethod
+    def _replace(node: Any, **changes: Any) -> Any:
+        """Copy of node with changes, or node itself if nothing changed."""
+        if all(_same(getattr(node, key), value) for key, value in changes.items()):
+            return node
+        return replace(node, **changes)
+
+
+def _same(old: Any, new: Any) -> bool:
+    """True if new holds the very same nodes as old."""
+    if isinstance(old, list) and isinstance(new, list):
+        return len(old) == len(new) and all(a is b for a, b in zip(old, new, strict=True))
+    if isinstance(old, dict) and isinstance(new, dict):
+        return old.keys() == new.keys() and all(old[k] is new[k] for k in old)
+    return old is new
+
+
+def _constant(node: ASTNode) -> tuple[bool, Any]:
+    """(True, value) if node is a literal with a valid runtime value."""
+    if not isinstance(node, Literal):
+        return False, None
+    try:
+        return True, literal_value(node)
+    except (TypeError, ValueError):
+        return False, None
+
+
+def _literal(value: Any, like: ASTNode) -> Literal | None:
+    """Literal node for a runtime value, at the position of `like`."""
+    if value is None:
+        literal_type = "null"
+    elif isinstance(value, bool):
+        literal_type = "bool"
+    elif isinstance(value, int):
+        literal_type = "int"
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        literal_type = "float"
+    elif isinstance(value, str):
+        if len(value) > MAX_FOLDED_STRING:
+            return None
+        literal_type = "string"
+    else:
+        return None  # Lists stay as ArrayExpr
+    return Literal(
+        value=value,
+        literal_type=literal_type,
+        span=like.span,
+        id=like.id,
+        leading_comments=like.leading_comments,
+        trailing_comment=like.trailing_comment,
+    )
+
+
+def _assigned_names(node: Any, names: set[str] | None = None) -> set[str]:
+    """Variable names written anywhere in a program (let, assign, for, catch)."""
+    if names is None:
+        names = set()
+    if isinstance(node, LetStmt):
+        names.add(node.name)
+    elif isinstance(node, ForStmt):
+        names.add(node.variable)
+    elif isinstance(node, TryStmt) and node.catch_var:
+        names.add(node.catch_var)
+    elif isinstance(node, AssignStmt) and isinstance(node.target, Identifier):
+        name = node.target.name
+        names.add(name[1:] if name.startswith("$") else name)
+
+    if isinstance(node, ASTNode):
+        for key, child in vars(node).items():
+            if key != "span":
+                _assigned_names(child, names)
+    elif isinstance(node, (list, tuple)):
+        for child in node:
+            _assigned_names(child, names)
+    elif isinstance(node, dict):
+        for child in node.values():
+            _assigned_names(child, names)
+    return names
+
+
+def optimize(program: Program) -> Program:
+    """Return an optimized copy of a program."""
+    return Optimizer().optimize(program)
@@ -0,0 +1,55 @@
+"""
+RetroAuto v2 - DSL Runtime Values
+
+Value semantics shared by the interpreter, the bytecode compiler and the
+AST optimizer: truthiness, duration literals and literal values.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from core.dsl.ast import Literal
+
+
+def is_truthy(value: Any) -> bool:
+    """RetroScript truthiness: null, false, 0, "" and empty lists/dicts are false."""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        return len(value) > 0
+    if isinstance(value, (list, dict)):
+        return len(value) > 0
+    return True
+
+
+def parse_duration_ms(value: Any) -> int:
+    """Parse a duration literal ("500ms", "2s", "1m", "1h") to milliseconds."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    s = str(value).strip().lower()
+    if s.endswith("ms"):
+        return int(s[:-2])
+    elif s.endswith("s"):
+        return int(float(s[:-1]) * 1000)
+    elif s.endswith("m"):
+        return int(float(s[:-1]) * 60000)
+    elif s.endswith("h"):
+        return int(float(s[:-1]) * 3600000)
+    return int(value)
+
+
+def literal_value(node: Literal) -> Any:
+    """Runtime value of a literal node."""
+    if node.literal_type == "null":
+        return None
+    elif node.literal_type == "bool":
+        return node.value in (True, "true", "True")
+    elif node.literal_type == "duration":
+        # Return duration in milliseconds
+        return parse_duration_ms(node.value)
+    return node.value
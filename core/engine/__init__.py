@@ -1,5 +1,6 @@
 """RetroAuto v2 - Engine package."""
 
+from core.engine.async_runner import AsyncRunner, run_concurrently
 from core.engine.context import EngineState, ExecutionContext
 from core.engine.interrupts import InterruptManager, InterruptWatcher
 from core.engine.memory_manager import MemoryManager, get_memory_manager
@@ -16,6 +17,8 @@ __all__ = [
     "ExecutionContext",
     "EngineState",
     "Runner",
+    "AsyncRunner",
+    "run_concurrently",
     "InterruptWatcher",
     "InterruptManager",
     "MemoryManager",
@@ -0,0 +1,435 @@
+"""
+RetroAuto v2 - Async Runner
+
+Cooperative asyncio execution of the same Flow/Action models as Runner.
+
+Blocking actions (Delay, WaitImage, WaitPixel, ClickUntil, ClickImage and
+click intervals) await instead of sleeping, so one event
+loop can drive several flows - e.g. one per game account - against a shared
+FrameBus, and stop() cancels a run immediately instead of at the next
+100ms chunk boundary. Input and matching run inline: they are short and
+must not interleave mid-action anyway.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from core.analytics.metrics import ActionMetrics, phase
+from core.engine.context import EngineState, ExecutionContext
+from core.engine.flight_recorder import verify_enabled
+from core.engine.flow_compiler import (
+    OP_BRANCH,
+    OP_CALL,
+    OP_GOTO,
+    OP_JUMP,
+    Conditional,
+    FlowCompiler,
+    else_branch,
+)
+from core.engine.runner import Runner, Steps
+from core.models import (
+    Action,
+    Click,
+    ClickImage,
+    ClickRandom,
+    ClickUntil,
+    Delay,
+    DelayRandom,
+    Drag,
+    Flow,
+    Goto,
+    Hotkey,
+    Loop,
+    RunFlow,
+    Scroll,
+    TypeText,
+    WaitImage,
+    WaitPixel,
+    WhileImage,
+)
+from infra import get_logger
+
+logger = get_logger("AsyncRunner")
+
+PAUSE_POLL_S = 0.05  # Pause checkpoint granularity
+
+# Actions after which the shared frame is stale
+INPUT_ACTIONS = (Click, ClickImage, ClickRandom, ClickUntil, Drag, Hotkey, Scroll, TypeText)
+
+AsyncHandler = Callable[[Action], Awaitable[bool | int | None]]
+
+
+class AsyncRunner(Runner):
+    """
+    Execute flows as asyncio coroutines.
+
+    Features:
+    - Same Action models, compiled plans and handlers as Runner
+    - Awaitable delays and waits (no thread per flow)
+    - Immediate cancellation via stop()
+    - Several flows per event loop (run_concurrently)
+
+    Frames are not re-grabbed per action as in Runner: concurrent flows share
+    the FrameBus frame for up to its max_age_ms, and input actions invalidate
+    it. Graph-mode flows run in a worker thread.
+
+    Usage:
+        runner = AsyncRunner(ctx)
+        ok = await runner.run("main")
+
+        # One context per account, all reading one capture
+        bus = FrameBus(ScreenCapture())
+        runners = [AsyncRunner(ExecutionContext(script, templates, frames=bus)) for ...]
+        results = await run_concurrently((r, "main") for r in runners)
+    """
+
+    def __init__(
+        self,
+        ctx: ExecutionContext,
+        on_step: Callable[[str, int, Action], None] | None = None,
+        on_complete: Callable[[str, bool], None] | None = None,
+        on_notify: Callable[[str, str], None] | None = None,
+        metrics: ActionMetrics | None = None,
+        stats_path: Path | None = None,
+    ) -> None:
+        super().__init__(ctx, on_step, on_complete, on_notify, metrics, stats_path)
+
+        # Blocking action type -> steps generator, driven with asyncio.sleep
+        self._step_handlers: dict[type, Callable[[Any], Steps]] = {
+            Delay: self._delay_steps,
+            DelayRandom: self._delay_random_steps,
+            WaitImage: self._wait_image_steps,
+            WaitPixel: self._wait_pixel_steps,
+            ClickUntil: self._click_until_steps,
+            ClickImage: self._click_image_steps,
+            Click: self._click_steps,
+        }
+        # Action type -> async handler(action)
+        self._async_handlers: dict[type, Callable[[Any], Awaitable[bool | int | None]]] = {
+            RunFlow: self._aexec_run_flow,
+        }
+        # Action type -> async handler(action, flow, labels)
+        self._async_flow_handlers: dict[type, Callable[..., Awaitable[bool | int | None]]] = {
+            Loop: self._aexec_loop,
+            WhileImage: self._aexec_while_image,
+            **dict.fromkeys(self._predicates, self._aexec_conditional),
+        }
+        self._async_compiler = FlowCompiler(
+            self._resolve_async_handler,
+            self._resolve_predicate,
+            recorded=verify_enabled,
+        )
+        self._tasks: set[asyncio.Task[bool]] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self, flow_name: str, from_step: int = 0) -> bool:
+        """
+        Run a flow as a cancellable task.
+
+        Returns:
+            True if completed successfully, False if stopped/error
+        """
+        self._loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(self.run_flow_async(flow_name, from_step))
+        self._tasks.add(task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not (task.cancelled() and self._ctx.should_stop):
+                raise  # Cancelled by the caller, not by stop()
+            logger.info("Flow %s stopped by user", flow_name)
+            return False
+        finally:
+            self._tasks.discard(task)
+
+    def stop(self) -> None:
+        """Request stop and cancel running flows immediately (thread-safe)."""
+        self._ctx.request_stop()
+        if self._loop is None:
+            return
+        for task in list(self._tasks):
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def run_flow_async(self, flow_name: str, from_step: int = 0) -> bool:
+        """Execute a flow (awaitable counterpart of run_flow)."""
+        flow = self._start_flow(flow_name, from_step)
+        if flow is None:
+            return False
+
+        try:
+            if flow.graph and flow.graph.nodes:
+                logger.info("Executing flow using graph mode (worker thread)")
+                return await asyncio.to_thread(self._execute_graph, flow)
+
+            return await self._aexecute_list(flow, from_step, flow_name)
+        finally:
+            if not self._call_stack:
+                self._save_stats()
+
+    async def _aexecute_list(self, flow: Flow, from_step: int, flow_name: str) -> bool:
+        """Execute a compiled plan; see Runner._execute_list."""
+        plan = self._async_compiler.get(flow)
+        steps = plan.steps
+        pc = plan.index_of(from_step)
+        step = from_step
+        success = True
+
+        run_options = getattr(self._ctx, "run_options", {})
+        watchdog_cfg = run_options.get("watchdog", {}) if run_options else None
+
+        try:
+            while pc < len(steps):
+                op, handler, action, target, end, step, top, recorded = steps[pc]
+
+                if top and watchdog_cfg is not None:
+                    is_healthy, msg = self._watchdog.check_health(watchdog_cfg)
+                    if not is_healthy:
+                        logger.error(f"🛑 Watchdog Stop: {msg}")
+                        raise RuntimeError(f"System Watchdog failed: {msg}")
+
+                if not await self._checkpoint():
+                    logger.info("Flow stopped by user")
+                    success = False
+                    break
+
+                if op == OP_JUMP:
+                    pc = target
+                    continue
+
+                if top:
+                    self._ctx.update_step(flow_name, step)
+                    if self._on_step:
+                        self._on_step(flow_name, step, action)
+
+                if op == OP_GOTO and isinstance(action, Goto):
+                    logger.info("Goto: %s (step %d)", action.label, steps[target].step)
+                    pc = target
+                    continue
+
+                if op == OP_BRANCH and handler is not None:
+                    taken = self._evaluate(handler, action)
+                    pc = end if taken is None else pc + 1 if taken else target
+                    continue
+
+                if op != OP_CALL or handler is None:  # Label
+                    pc += 1
+                    continue
+
+                result = await self._aexecute_action(action, handler, recorded)
+
+                if result is False:
+                    success = False
+                    break
+                elif isinstance(result, int) and result is not True:
+                    pc = plan.index_of(result)
+                else:
+                    pc += 1
+
+        except asyncio.CancelledError:
+            if self._on_complete:
+                self._on_complete(flow_name, False)
+            raise
+        except Exception as e:
+            logger.exception("Error in flow %s step %d: %s", flow_name, step, e)
+            success = False
+
+        if self._on_complete:
+            self._on_complete(flow_name, success)
+
+        if success:
+            self._ctx.set_state(EngineState.IDLE)
+        return success
+
+    async def _aexecute_action(
+        self, action: Action, handler: AsyncHandler, recorded: bool
+    ) -> bool | int | None:
+        """Execute one action; the Flight Recorder verifies in the background."""
+        self._verify_action = recorded
+        try:
+            result = await self._adispatch(action, handler)
+        finally:
+            self._verify_action = False
+
+        if isinstance(action, INPUT_ACTIONS) and self._ctx.frames is not None:
+            self._ctx.frames.invalidate()
+        return result
+
+    async def _adispatch(self, action: Action, handler: AsyncHandler) -> bool | int | None:
+        """Await a handler with the same logging and error recovery as Runner."""
+        span = self._metrics.begin()  # Context variable: one span per flow task
+        start_time = time.perf_counter()
+        try:
+            result = await handler(action)
+            logger.debug(
+                "%s completed in %.1fms",
+                type(action).__name__,
+                (time.perf_counter() - start_time) * 1000,
+            )
+            return result
+        except Exception as e:
+            self._log_action_error(action, e, start_time)
+            return None
+        finally:
+            self._metrics.end(
+                span,
+                type(action).__name__,
+                getattr(action, "asset_id", None) or "",
+                time.perf_counter() - start_time,
+            )
+
+    def _resolve_async_handler(
+        self, action: Action, flow: Flow, labels: dict[str, int]
+    ) -> AsyncHandler:
+        """Async counterpart of _resolve_handler."""
+        action_type = type(action)
+
+        steps = self._step_handlers.get(action_type)
+        if steps is not None:
+            return partial(self._adrive_action, steps)
+
+        handler = self._async_handlers.get(action_type)
+        if handler is not None:
+            return handler
+
+        flow_handler = self._async_flow_handlers.get(action_type)
+        if flow_handler is not None:
+            return partial(flow_handler, flow=flow, labels=labels)
+
+        return partial(self._acall, self._resolve_handler(action, flow, labels))
+
+    async def _acall(
+        self, handler: Callable[[Action], bool | int | None], action: Action
+    ) -> bool | int | None:
+        """Run a non-blocking handler inline."""
+        return handler(action)
+
+    async def _adrive_action(
+        self, steps: Callable[[Any], Steps], action: Action
+    ) -> bool | int | None:
+        """Run a blocking action's steps with asyncio sleeps."""
+        return await self._adrive(steps(action))
+
+    async def _adrive(self, steps: Steps) -> bool | int | None:
+        """Async counterpart of _drive (stop -> False)."""
+        try:
+            delay = next(steps)
+            while await self._asleep(delay):
+                delay = next(steps)
+            return False
+        except StopIteration as done:
+            return done.value
+        finally:
+            steps.close()
+
+    async def _asleep(self, seconds: float) -> bool:
+        """Sleep without blocking other flows. Returns False if stopped."""
+        if seconds > 0:
+            with phase("wait"):
+                await asyncio.sleep(seconds)
+        return await self._checkpoint()
+
+    async def _checkpoint(self) -> bool:
+        """Async wait_if_paused; always yields once so other flows get a turn."""
+        await asyncio.sleep(0)
+        while self._ctx.is_paused and not self._ctx.should_stop:
+            await asyncio.sleep(PAUSE_POLL_S)
+        return not self._ctx.should_stop
+
+    async def _arun_actions(
+        self, actions: list[Action], flow: Flow, labels: dict[str, int]
+    ) -> bool | int | None:
+        """Run nested actions in order (loop bodies, uncompiled branches)."""
+        for sub_action in actions:
+            if not await self._checkpoint():
+                return False
+            result = await self._aexecute_action(
+                sub_action,
+                self._resolve_async_handler(sub_action, flow, labels),
+                verify_enabled(sub_action, flow),
+            )
+            if result is False:
+                return False
+            if isinstance(result, int) and result is not True:
+                return result
+        return None
+
+    async def _aexec_conditional(
+        self, action: Conditional, flow: Flow, labels: dict[str, int]
+    ) -> bool | int | None:
+        """Conditional outside a compiled plan (e.g. inside a loop body)."""
+        if self._predicates[type(action)](action):
+            branch = action.then_actions
+        else:
+            branch = else_branch(action)
+        return await self._arun_actions(branch, flow, labels)
+
+    async def _aexec_loop(self, action: Loop, flow: Flow, labels: dict[str, int]) -> bool | None:
+        """Execute Loop action with nested actions."""
+        iterations = action.count if action.count is not None else 100000  # Safety limit
+        logger.info("Loop: %s iterations", "∞" if action.count is None else action.count)
+
+        for i in range(iterations):
+            if not await self._checkpoint():
+                return False
+            logger.debug("Loop iteration %d/%s", i + 1, action.count or "∞")
+            if await self._arun_actions(action.actions, flow, labels) is False:
+                return False
+        return None
+
+    async def _aexec_while_image(
+        self, action: WhileImage, flow: Flow, labels: dict[str, int]
+    ) -> bool | None:
+        """Execute WhileImage action - repeat while image present/absent."""
+        logger.info("WhileImage: %s (while_present=%s)", action.asset_id, action.while_present)
+        matcher = self._ctx.matcher
+        if matcher is None:
+            raise RuntimeError("WhileImage needs a matcher")
+
+        for _ in range(action.max_iterations):
+            if not await self._checkpoint():
+                return False
+
+            found = matcher.find(action.asset_id, roi_override=action.roi_override)
+            is_present = found.found if hasattr(found, "found") else bool(found)
+            if not (is_present if action.while_present else not is_present):
+                logger.info("WhileImage: condition no longer met, exiting loop")
+                break
+
+            if await self._arun_actions(action.actions, flow, labels) is False:
+                return False
+
+        return None
+
+    async def _aexec_run_flow(self, action: RunFlow) -> bool | None:
+        """Execute RunFlow action (nested flow call)."""
+        logger.info("RunFlow: %s", action.flow_name)
+
+        if len(self._call_stack) > 10:
+            logger.error("RunFlow: Maximum recursion depth exceeded")
+            return False
+
+        self._call_stack.append((self._ctx.current_flow, self._ctx.current_step))
+        try:
+            success = await self.run_flow_async(action.flow_name)
+        finally:
+            self._call_stack.pop()
+
+        return None if success else False
+
+
+async def run_concurrently(jobs: Iterable[tuple[AsyncRunner, str]]) -> list[bool]:
+    """
+    Run several flows in the current event loop.
+
+    Args:
+        jobs: (runner, flow name) pairs; give each runner its own
+            ExecutionContext, sharing the FrameBus between contexts
+
+    Returns:
+        Success of each flow, in job order
+    """
+    return list(await asyncio.gather(*(runner.run(flow_name) for runner, flow_name in jobs)))
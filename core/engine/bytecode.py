@@ -0,0 +1,508 @@
+"""
+RetroAuto v2 - Bytecode Compiler
+
+Compile a RetroScript Program AST into compact bytecode for the stack VM
+(core.engine.vm).
+
+Each flow becomes a CodeObject: parallel `ops`/`args` lists plus the
+flow's ScopeLayout from core.engine.resolver. Names a flow declares or
+assigns are slot loads; names no flow binds read the global dict; other
+names are looked up by name at run time (caller flows, then globals),
+exactly as the tree walker's scope chain does.
+Operators, literals and callees are resolved once here instead of on
+every evaluation.
+"""
+
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from core.dsl.ast import (
+    ArrayExpr,
+    AssignStmt,
+    ASTNode,
+    BinaryExpr,
+    BlockStmt,
+    BreakStmt,
+    CallExpr,
+    ContinueStmt,
+    ExprStmt,
+    FlowDecl,
+    ForStmt,
+    Identifier,
+    IfStmt,
+    LetStmt,
+    Literal,
+    Program,
+    ReturnStmt,
+    Span,
+    TryStmt,
+    UnaryExpr,
+    WhileStmt,
+)
+from core.dsl.values import literal_value, parse_duration_ms
+from core.engine.builtins import BuiltinRegistry
+from core.engine.resolver import Resolution, resolve_program, var_name
+from core.engine.scope import GLOBAL, ScopeLayout
+
+# ─────────────────────────────────────────────────────────────
+# Opcodes (ordered roughly by frequency; the VM tests them in this order)
+# ─────────────────────────────────────────────────────────────
+
+OP_LOAD_LOCAL = 0  # arg: slot
+OP_LOAD_CONST = 1  # arg: value
+OP_STORE_LOCAL = 2  # arg: slot (assignment: updates an outer variable if one exists)
+OP_ADD = 3  # arg: unused (string concatenation if either side is a string)
+OP_BINARY = 4  # arg: operator function
+OP_JUMP_IF_FALSE = 5  # arg: target
+OP_JUMP = 6  # arg: target
+OP_LOAD_NAME = 7  # arg: name (not a local of this flow)
+OP_DEFINE_LOCAL = 8  # arg: slot (let/for/catch: always this flow)
+OP_POP = 9
+OP_DIV = 10  # arg: node (for the division-by-zero error)
+OP_CALL_BUILTIN = 11  # arg: (name, argc, kwarg names)
+OP_CALL_FLOW = 12  # arg: CodeObject
+OP_RETURN = 13
+OP_FOR_ITER = 14  # arg: target when exhausted (iterator popped)
+OP_GET_ITER = 15  # arg: node
+OP_JUMP_IF_FALSE_OR_POP = 16  # arg: target ("and")
+OP_JUMP_IF_TRUE_OR_POP = 17  # arg: target ("or")
+OP_NOT = 18
+OP_NEG = 19
+OP_BUILD_LIST = 20  # arg: count
+OP_SETUP_TRY = 21  # arg: handler target
+OP_POP_TRY = 22
+OP_CALL_RUN = 23  # arg: node (run("flow") with a computed name)
+OP_THUNK = 24  # arg: zero-arg callable, result pushed
+OP_FAIL = 25  # arg: (message, node) -> InterpreterError
+OP_LOAD_GLOBAL = 26  # arg: name (bound by no flow)
+
+OP_NAMES = {
+    value: name[3:]
+    for name, value in list(globals().items())
+    if name.startswith("OP_") and isinstance(value, int)
+}
+
+# Binary operators without special cases
+BINARY_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "-": operator.sub,
+    "*": operator.mul,
+    "%": operator.mod,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@dataclass(eq=False)
+class CodeObject:
+    """Bytecode of one flow (or constant initializer)."""
+
+    name: str
+    ops: list[int] = field(default_factory=list)
+    args: list[Any] = field(default_factory=list)
+    spans: list[Span | None] = field(default_factory=list)  # Source span per op
+    layout: ScopeLayout = field(default_factory=lambda: ScopeLayout(name="<none>"))
+
+    @property
+    def slots(self) -> dict[str, int]:
+        """Local name -> slot."""
+        return self.layout.slots
+
+    @property
+    def names(self) -> list[str]:
+        """Slot -> local name."""
+        return self.layout.names
+
+    @property
+    def nlocals(self) -> int:
+        """Number of local slots."""
+        return len(self.layout.names)
+
+    def disassemble(self) -> list[str]:
+        """Human-readable listing, one instruction per line."""
+        lines = []
+        for pc, (op, arg) in enumerate(zip(self.ops, self.args, strict=True)):
+            if op in (OP_LOAD_LOCAL, OP_STORE_LOCAL, OP_DEFINE_LOCAL):
+                text = f"{arg} ({self.names[arg]})"
+            elif op == OP_BINARY:
+                text = getattr(arg, "__name__", repr(arg))
+            elif op == OP_CALL_FLOW:
+                text = arg.name
+            elif op in (OP_DIV, OP_GET_ITER, OP_CALL_RUN) or arg is None:
+                text = ""
+            else:
+                text = repr(arg)
+            lines.append(f"{pc:4d} {OP_NAMES[op]:<22} {text}".rstrip())
+        return lines
+
+
+@dataclass
+class CompiledProgram:
+    """A program compiled for the VM."""
+
+    flows: dict[str, CodeObject]
+    constants: list[tuple[str, CodeObject]]
+    main: CodeObject | None
+    permissions: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Loop:
+    """Jump targets of the innermost loop being compiled."""
+
+    continue_target: int
+    break_jumps: list[int]  # JUMP ops to patch to the loop's break target
+    try_depth: int  # Open try blocks when the loop started
+
+
+class BytecodeCompiler:
+    """
+    Compile a Program AST to CodeObjects.
+
+    Semantics follow Interpreter (the tree walker): flow calls ignore their
+    arguments, `+` concatenates when either side is a string, `and`/`or`
+    return an operand, and errors in unknown constructs are raised when the
+    construct is executed, not at compile time. A break/continue outside
+    any loop ends the flow.
+
+    Usage:
+        compiled = BytecodeCompiler(builtins).compile(program)
+    """
+
+    def __init__(self, builtins: BuiltinRegistry) -> None:
+        self._builtins = builtins
+        self._flows: dict[str, CodeObject] = {}
+        self._code = CodeObject("<none>")
+        self._resolution = Resolution()
+        self._loops: list[_Loop] = []
+        self._try_depth = 0
+        self._span: Span | None = None
+
+        self._stmt_dispatch: dict[type, Callable[[Any], None]] = {
+            LetStmt: self._compile_let,
+            AssignStmt: self._compile_assign,
+            IfStmt: self._compile_if,
+            WhileStmt: self._compile_while,
+            ForStmt: self._compile_for,
+            TryStmt: self._compile_try,
+            ReturnStmt: self._compile_return,
+            BreakStmt: self._compile_break,
+            ContinueStmt: self._compile_continue,
+            BlockStmt: self._compile_block,
+            ExprStmt: lambda n: self._compile_expr_stmt(n.expr),
+            CallExpr: self._compile_expr_stmt,
+        }
+        self._expr_dispatch: dict[type, Callable[[Any], None]] = {
+            Literal: self._compile_literal,
+            Identifier: self._compile_identifier,
+            BinaryExpr: self._compile_binary,
+            UnaryExpr: self._compile_unary,
+            CallExpr: self._compile_call,
+            ArrayExpr: self._compile_array,
+        }
+
+    def compile(self, program: Program) -> CompiledProgram:
+        """Compile every flow and constant initializer of a program."""
+        self._resolution = resolve_program(program)
+
+        # Constants run before flows are registered, so they cannot call flows
+        self._flows = {}
+        constants = [
+            (const.name, self._compile_unit(f"<const {const.name}>", const.initializer))
+            for const in program.constants
+        ]
+
+        # Shells first so calls can refer to flows compiled later (last wins)
+        self._flows = {flow.name: CodeObject(flow.name) for flow in program.flows}
+        for flow in reversed(program.flows):
+            self._compile_flow(flow)
+
+        main_flow = program.main_flow
+        return CompiledProgram(
+            flows=self._flows,
+            constants=constants,
+            main=self._flows[main_flow.name] if main_flow else None,
+            permissions=list(program.permissions),
+        )
+
+    # ─────────────────────────────────────────────────────────────
+    # Units
+    # ─────────────────────────────────────────────────────────────
+
+    def _compile_flow(self, flow: FlowDecl) -> None:
+        """Compile a flow body into its CodeObject shell."""
+        code = self._flows[flow.name]
+        if code.ops:
+            return  # Duplicate name: the last declaration is called
+        code.layout = self._resolution.layouts[id(flow)]
+        self._begin(code, flow.span)
+        self._compile_block(flow.body)
+        self._emit(OP_LOAD_CONST, None)
+        self._emit(OP_RETURN)
+
+    def _compile_unit(self, name: str, expr: ASTNode) -> CodeObject:
+        """Compile a standalone expression (constant initializer)."""
+        code = CodeObject(name)
+        self._begin(code, expr.span)
+        self._compile_expr(expr)
+        self._emit(OP_RETURN)
+        return code
+
+    def _begin(self, code: CodeObject, span: Span) -> None:
+        self._code = code
+        self._loops = []
+        self._try_depth = 0
+        self._span = span
+
+    # ─────────────────────────────────────────────────────────────
+    # Emission
+    # ─────────────────────────────────────────────────────────────
+
+    def _emit(self, op: int, arg: Any = None) -> int:
+        """Append an instruction, returning its index."""
+        code = self._code
+        code.ops.append(op)
+        code.args.append(arg)
+        code.spans.append(self._span)
+        return len(code.ops) - 1
+
+    def _here(self) -> int:
+        return len(self._code.ops)
+
+    def _patch(self, index: int, target: int | None = None) -> None:
+        """Point a jump at `target` (default: the next instruction)."""
+        self._code.args[index] = self._here() if target is None else target
+
+    def _fail(self, message: str, node: ASTNode) -> None:
+        self._emit(OP_FAIL, (message, node))
+
+    # ─────────────────────────────────────────────────────────────
+    # Statements
+    # ─────────────────────────────────────────────────────────────
+
+    def _compile_stmt(self, node: ASTNode) -> None:
+        self._span = node.span
+        handler = self._stmt_dispatch.get(type(node))
+        if handler:
+            handler(node)
+        else:
+            # The tree walker evaluates unknown statements as expressions
+            self._compile_expr_stmt(node)
+
+    def _compile_block(self, block: BlockStmt) -> None:
+        for stmt in block.statements:
+            self._compile_stmt(stmt)
+
+    def _compile_expr_stmt(self, expr: ASTNode) -> None:
+        self._compile_expr(expr)
+        self._emit(OP_POP)
+
+    def _compile_let(self, node: LetStmt) -> None:
+        if node.initializer:
+            self._compile_expr(node.initializer)
+        else:
+            self._emit(OP_LOAD_CONST, None)
+        self._emit(OP_DEFINE_LOCAL, self._code.slots[node.name])
+
+    def _compile_assign(self, node: AssignStmt) -> None:
+        self._compile_expr(node.value)
+        if isinstance(node.target, Identifier):
+            self._emit(OP_STORE_LOCAL, self._code.slots[var_name(node.target)])
+        else:
+            self._fail(f"Invalid assignment target: {node.target}", node)
+
+    def _compile_if(self, node: IfStmt) -> None:
+        end_jumps: list[int] = []
+        branches = [(node.condition, node.then_branch), *node.elif_branches]
+        for condition, block in branches:
+            self._compile_expr(condition)
+            skip = self._emit(OP_JUMP_IF_FALSE)
+            self._compile_block(block)
+            end_jumps.append(self._emit(OP_JUMP))
+            self._patch(skip)
+        if node.else_branch:
+            self._compile_block(node.else_branch)
+        for jump in end_jumps:
+            self._patch(jump)
+
+    def _compile_while(self, node: WhileStmt) -> None:
+        top = self._here()
+        self._compile_expr(node.condition)
+        exit_jump = self._emit(OP_JUMP_IF_FALSE)
+
+        loop = _Loop(continue_target=top, break_jumps=[], try_depth=self._try_depth)
+        self._loops.append(loop)
+        self._compile_block(node.body)
+        self._loops.pop()
+
+        self._emit(OP_JUMP, top)
+        self._patch(exit_jump)
+        for jump in loop.break_jumps:
+            self._patch(jump)
+
+    def _compile_for(self, node: ForStmt) -> None:
+        self._compile_expr(node.iterable)
+        self._emit(OP_GET_ITER, node)
+        top = self._emit(OP_FOR_ITER)
+        self._emit(OP_DEFINE_LOCAL, self._code.slots[node.variable])
+
+        loop = _Loop(continue_target=top, break_jumps=[], try_depth=self._try_depth)
+        self._loops.append(loop)
+        self._compile_block(node.body)
+        self._loops.pop()
+
+        self._emit(OP_JUMP, top)
+        # break leaves the iterator on the stack; exhaustion has popped it
+        for jump in loop.break_jumps:
+            self._patch(jump)
+        if loop.break_jumps:
+            self._emit(OP_POP)
+        self._patch(top)
+
+    def _compile_try(self, node: TryStmt) -> None:
+        setup = self._emit(OP_SETUP_TRY)
+        self._try_depth += 1
+        self._compile_block(node.try_block)
+        self._try_depth -= 1
+        self._emit(OP_POP_TRY)
+        done = self._emit(OP_JUMP)
+
+        # Handler: the VM pushes str(exception)
+        self._patch(setup)
+        if node.catch_var:
+            self._emit(OP_DEFINE_LOCAL, self._code.slots[node.catch_var])
+        else:
+            self._emit(OP_POP)
+        if node.catch_block:
+            self._compile_block(node.catch_block)
+        self._patch(done)
+
+    def _compile_return(self, node: ReturnStmt) -> None:
+        if node.value:
+            self._compile_expr(node.value)
+        else:
+            self._emit(OP_LOAD_CONST, None)
+        self._emit(OP_RETURN)
+
+    def _compile_break(self, node: BreakStmt) -> None:
+        if not self._loops:
+            self._compile_return(ReturnStmt(span=node.span))
+            return
+        loop = self._loops[-1]
+        self._close_tries(loop)
+        loop.break_jumps.append(self._emit(OP_JUMP))
+
+    def _compile_continue(self, node: ContinueStmt) -> None:
+        if not self._loops:
+            self._compile_return(ReturnStmt(span=node.span))
+            return
+        loop = self._loops[-1]
+        self._close_tries(loop)
+        self._emit(OP_JUMP, loop.continue_target)
+
+    def _close_tries(self, loop: _Loop) -> None:
+        """Pop try handlers opened inside the loop before jumping out of them."""
+        for _ in range(self._try_depth - loop.try_depth):
+            self._emit(OP_POP_TRY)
+
+    # ─────────────────────────────────────────────────────────────
+    # Expressions
+    # ─────────────────────────────────────────────────────────────
+
+    def _compile_expr(self, node: ASTNode) -> None:
+        handler = self._expr_dispatch.get(type(node))
+        if handler:
+            handler(node)
+        else:
+            self._fail(f"Unknown expression type: {type(node)}", node)
+
+    def _compile_literal(self, node: Literal) -> None:
+        try:
+            value = literal_value(node)
+        except (TypeError, ValueError):
+            # Malformed duration: fail when evaluated, like the tree walker
+            self._emit(OP_THUNK, partial(parse_duration_ms, node.value))
+            return
+        self._emit(OP_LOAD_CONST, value)
+
+    def _compile_identifier(self, node: Identifier) -> None:
+        name = var_name(node)
+        slot = self._code.slots.get(name)
+        if slot is not None:
+            self._emit(OP_LOAD_LOCAL, slot)
+        elif self._resolution.bindings.get(id(node), (GLOBAL, -1))[0] == GLOBAL:
+            self._emit(OP_LOAD_GLOBAL, name)
+        else:
+            self._emit(OP_LOAD_NAME, name)
+
+    def _compile_binary(self, node: BinaryExpr) -> None:
+        op = node.operator
+        if op in ("and", "&&", "or", "||"):
+            self._compile_expr(node.left)
+            short = op in ("or", "||")
+            jump = self._emit(OP_JUMP_IF_TRUE_OR_POP if short else OP_JUMP_IF_FALSE_OR_POP)
+            self._compile_expr(node.right)
+            self._patch(jump)
+            return
+
+        self._compile_expr(node.left)
+        self._compile_expr(node.right)
+        if op == "+":
+            self._emit(OP_ADD)
+        elif op == "/":
+            self._emit(OP_DIV, node)
+        elif op in BINARY_OPS:
+            self._emit(OP_BINARY, BINARY_OPS[op])
+        else:
+            self._fail(f"Unknown operator: {op}", node)
+
+    def _compile_unary(self, node: UnaryExpr) -> None:
+        self._compile_expr(node.operand)
+        if node.operator == "-":
+            self._emit(OP_NEG)
+        elif node.operator in ("!", "not"):
+            self._emit(OP_NOT)
+        else:
+            self._fail(f"Unknown unary operator: {node.operator}", node)
+
+    def _compile_call(self, node: CallExpr) -> None:
+        name = node.callee
+
+        # Flow call (arguments are not evaluated)
+        if name in self._flows:
+            self._emit(OP_CALL_FLOW, self._flows[name])
+            return
+
+        if self._builtins.has(name):
+            for arg in node.args:
+                self._compile_expr(arg)
+            for value in node.kwargs.values():
+                self._compile_expr(value)
+            self._emit(OP_CALL_BUILTIN, (name, len(node.args), tuple(node.kwargs)))
+            return
+
+        # Special built-in "run" with a computed flow name
+        if name == "run" and node.args:
+            self._compile_expr(node.args[0])
+            self._emit(OP_CALL_RUN, node)
+            return
+
+        self._fail(f"Unknown function: {name}", node)
+
+    def _compile_array(self, node: ArrayExpr) -> None:
+        for element in node.elements:
+            self._compile_expr(element)
+        self._emit(OP_BUILD_LIST, len(node.elements))
+
+
+def compile_program(program: Program, builtins: BuiltinRegistry) -> CompiledProgram:
+    """Compile a program for the VM."""
+    return BytecodeCompiler(builtins).compile(program)
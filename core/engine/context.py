@@ -6,15 +6,16 @@ Shared state and resources for action execution.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from threading import Event, Lock
+from threading import Condition, Event, Lock
 from typing import Any
 
+from core.game.pixel_detect import get_checker
 from core.models import Match, Script
 from core.security.policy import SecurityPolicy
 from core.templates import TemplateStore
 from infra import get_logger
 from input import KeyboardController, MouseController
-from vision import ImageWaiter, Matcher, ScreenCapture, WaitOutcome
+from vision import FrameBus, ImageWaiter, Matcher, ScreenCapture, WaitOutcome
 
 logger = get_logger("Context")
 
@@ -46,6 +47,7 @@ class ExecutionContext:
 
     # Services
     capture: ScreenCapture = field(default_factory=ScreenCapture)
+    frames: FrameBus | None = None
     matcher: Matcher | None = None
     waiter: ImageWaiter | None = None
     mouse: MouseController = field(default_factory=MouseController)
@@ -66,11 +68,16 @@ class ExecutionContext:
     _lock: Lock = field(default_factory=Lock)
     _pause_event: Event = field(default_factory=Event)
     _stop_event: Event = field(default_factory=Event)
+    _control: Condition = field(default_factory=Condition)  # Notified on pause/resume/stop
+    _control_generation: int = 0
 
     def __post_init__(self) -> None:
         """Initialize derived services."""
+        if self.frames is None:
+            self.frames = FrameBus(self.capture)
+        get_checker(self.frames)  # Pixel checks read the same frames
         if self.matcher is None:
-            self.matcher = Matcher(self.templates, self.capture)
+            self.matcher = Matcher(self.templates, self.capture, self.frames)
         if self.waiter is None:
             self.waiter = ImageWaiter(self.matcher)
         self._pause_event.set()  # Not paused initially
@@ -90,6 +97,33 @@ class ExecutionContext:
         """Check if stop was requested."""
         return self._stop_event.is_set()
 
+    @property
+    def pause_requested(self) -> bool:
+        """Check if pause was requested (wait_if_paused would block)."""
+        return not self._pause_event.is_set()
+
+    @property
+    def control_generation(self) -> int:
+        """Counter bumped by every pause/resume/stop/reset request."""
+        return self._control_generation
+
+    def wait_for_control(self, generation: int, timeout: float) -> bool:
+        """
+        Block until a control request newer than `generation` or timeout.
+
+        Returns True if woken by a pause/resume/stop/reset request.
+        """
+        with self._control:
+            return self._control.wait_for(
+                lambda: self._control_generation != generation, timeout
+            )
+
+    def _notify_control(self) -> None:
+        """Wake threads blocked in wait_for_control."""
+        with self._control:
+            self._control_generation += 1
+            self._control.notify_all()
+
     def set_state(self, state: EngineState) -> None:
         """Thread-safe state change."""
         with self._lock:
@@ -100,23 +134,27 @@ class ExecutionContext:
     def request_pause(self) -> None:
         """Request pause (blocks execution at next checkpoint)."""
         self._pause_event.clear()
+        self._notify_control()
         self.set_state(EngineState.PAUSED)
 
     def request_resume(self) -> None:
         """Resume from pause."""
         self._pause_event.set()
+        self._notify_control()
         self.set_state(EngineState.RUNNING)
 
     def request_stop(self) -> None:
         """Request stop (sets flag, also unblocks pause)."""
         self._stop_event.set()
         self._pause_event.set()  # Unblock if paused
+        self._notify_control()
         self.set_state(EngineState.STOPPING)
 
     def reset(self) -> None:
         """Reset state for new execution."""
         self._stop_event.clear()
         self._pause_event.set()
+        self._notify_control()
         self.current_flow = ""
         self.current_step = 0
         self.last_match = None
@@ -0,0 +1,290 @@
+"""
+RetroAuto v2 - Flight Recorder
+
+Background check that input actions (Click, ClickImage, ClickRandom, Drag)
+produced a visual reaction near the point they acted on.
+
+Before the input event the recorder copies a small region around the
+point from the current frame. The flow then continues immediately. A
+worker thread waits for the next frame the flow captures anyway, once it is
+at least `settle_ms` old. If no such frame arrives by `deadline_ms`, it
+grabs the region itself. It then compares the two regions tile by tile and
+logs the verdict, passes it to `on_verdict` and records the latency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+
+from core.analytics.metrics import MetricsRegistry, get_metrics
+from core.models import ROI, Action, Click, ClickImage, ClickRandom, Drag, Flow
+from core.vision.hasher import TileGrid, dirty_bounds
+from infra import get_logger
+
+logger = get_logger("FlightRecorder")
+
+# Actions checked for a visual reaction
+VERIFIED_ACTIONS = (Click, ClickImage, ClickRandom, Drag)
+
+POLL_S = 0.01  # Worker poll interval while waiting for a frame
+
+
+def verify_enabled(action: Action, flow: Flow | None = None) -> bool:
+    """
+    Should this action be checked?
+
+    Per-action `verify` wins; otherwise the flow's `verify_actions` applies.
+    """
+    if not isinstance(action, VERIFIED_ACTIONS):
+        return False
+    if action.verify is not None:
+        return action.verify
+    return flow.verify_actions if flow is not None else True
+
+
+@dataclass
+class FlightCheck:
+    """A pending check: the region around an input point before the action."""
+
+    action: str
+    x: int
+    y: int
+    roi: ROI  # Screen region compared before/after
+    before: np.ndarray  # Grayscale copy of the region
+    seq: int  # FrameBus sequence of the before frame
+    done_at: float = 0.0  # perf_counter when the input finished
+
+
+@dataclass
+class FlightVerdict:
+    """Outcome of a check."""
+
+    action: str
+    x: int
+    y: int
+    changed: bool
+    region: tuple[int, int, int, int] | None  # Changed screen area (x, y, w, h)
+    latency_ms: float  # Input finished -> verdict
+    forced: bool  # After-region was grabbed at the deadline, not from the flow
+
+
+class FlightRecorder:
+    """
+    Asynchronous visual-change verifier.
+
+    Usage:
+        recorder = FlightRecorder(frames)
+        check = recorder.snapshot(action, x, y)
+        mouse.click(x, y)
+        recorder.submit(check)  # Returns immediately
+    """
+
+    def __init__(
+        self,
+        frames: Any,
+        radius: int = 64,
+        settle_ms: float = 100,
+        deadline_ms: float = 400,
+        tile_size: int = 16,
+        threshold: int = 2,
+        capture: Any | None = None,
+        on_verdict: Callable[[FlightVerdict], None] | None = None,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """
+        Args:
+            frames: FrameBus the flow reads from
+            radius: Half size of the compared region around the point
+            settle_ms: Minimum time after the input before a frame counts
+            deadline_ms: Grab the region directly if no frame arrived by then
+            tile_size: Tile edge for the region comparison
+            threshold: Tile Hamming distance that counts as a change
+            capture: ScreenCapture for deadline grabs (created in the worker
+                thread if None, since mss handles are per thread)
+            on_verdict: Called from the worker thread with every verdict
+            metrics: Registry for latency/verdict metrics (default: global)
+        """
+        self._frames = frames
+        self._radius = radius
+        self._settle_s = settle_ms / 1000.0
+        self._deadline_s = deadline_ms / 1000.0
+        self._grid = TileGrid(tile_size=tile_size, threshold=threshold)
+        self._capture = capture
+        self.on_verdict = on_verdict
+
+        registry = metrics or get_metrics()
+        self._latency = registry.timer("flight_recorder_latency_seconds")
+        self._changed = registry.counter("flight_recorder_checks_total", result="changed")
+        self._unchanged = registry.counter("flight_recorder_checks_total", result="unchanged")
+        self._forced = registry.counter("flight_recorder_forced_total")
+
+        self._pending: deque[FlightCheck] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._worker: threading.Thread | None = None
+
+    def snapshot(self, action: Action, x: int, y: int) -> FlightCheck | None:
+        """Copy the region around (x, y) from the current frame, before the input."""
+        try:
+            frame = self._frames.frame()
+            left = max(frame.left, x - self._radius)
+            top = max(frame.top, y - self._radius)
+            right = min(frame.left + frame.width, x + self._radius)
+            bottom = min(frame.top + frame.height, y + self._radius)
+            if right <= left or bottom <= top:
+                return None  # Point is off the captured monitor
+
+            roi = ROI(x=left, y=top, w=right - left, h=bottom - top)
+            before = cv2.cvtColor(frame.view(roi), cv2.COLOR_BGR2GRAY)
+            return FlightCheck(type(action).__name__, x, y, roi, before, frame.seq)
+        except Exception as e:
+            logger.debug("FlightRecorder snapshot failed: %s", e)
+            return None
+
+    def submit(self, check: FlightCheck) -> None:
+        """Queue a check after the input finished; returns immediately."""
+        check.done_at = time.perf_counter()
+        with self._cond:
+            self._pending.append(check)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="FlightRecorder", daemon=True
+                )
+                self._worker.start()
+            self._cond.notify()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until every queued check has a verdict. Returns False on timeout."""
+        end = time.perf_counter() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = end - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, POLL_S))
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """Verdict counts and latency statistics."""
+        return {
+            "changed": self._changed.get(),
+            "unchanged": self._unchanged.get(),
+            "forced": self._forced.get(),
+            "pending": len(self._pending),
+            "latency": self._latency.get_stats(),
+        }
+
+    def _run(self) -> None:
+        """Worker: verify queued checks in order."""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                check = self._pending.popleft()
+                self._busy = True
+            try:
+                self._emit(self._verify(check))
+            except Exception as e:
+                logger.debug("FlightRecorder check failed: %s", e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _verify(self, check: FlightCheck) -> FlightVerdict:
+        """Wait for an after-frame and compare it with the before region."""
+        ready_at = check.done_at + self._settle_s
+        deadline = check.done_at + self._deadline_s
+
+        after: np.ndarray | None = None
+        forced = False
+        while after is None:
+            now = time.perf_counter()
+            if now < ready_at:
+                time.sleep(ready_at - now)
+                continue
+
+            after = self._natural_region(check, ready_at)
+            if after is None:
+                if time.perf_counter() >= deadline:
+                    after = self._grab_region(check.roi)
+                    forced = True
+                else:
+                    time.sleep(POLL_S)
+
+        dirty = self._compare(check.before, after)
+        region = dirty_bounds(dirty)
+        if region is not None:
+            region = (region[0] + check.roi.x, region[1] + check.roi.y, region[2], region[3])
+
+        latency = time.perf_counter() - check.done_at
+        return FlightVerdict(
+            action=check.action,
+            x=check.x,
+            y=check.y,
+            changed=bool(dirty),
+            region=region,
+            latency_ms=latency * 1000,
+            forced=forced,
+        )
+
+    def _natural_region(self, check: FlightCheck, ready_at: float) -> np.ndarray | None:
+        """The region from a frame the flow captured after the settle time, if any."""
+        frame = self._frames.latest
+        if frame is None or frame.seq <= check.seq or frame.timestamp < ready_at:
+            return None
+        region = cv2.cvtColor(frame.view(check.roi), cv2.COLOR_BGR2GRAY)
+        if self._frames.seq > frame.seq + 1:
+            return None  # Ring buffer may have been reused mid-copy; try again
+        return region
+
+    def _grab_region(self, roi: ROI) -> np.ndarray:
+        """Deadline fallback: grab the region with the worker's own capture."""
+        if self._capture is None:
+            from vision.capture import ScreenCapture
+
+            self._capture = ScreenCapture()
+        return self._capture.capture_roi(roi, grayscale=True)
+
+    def _compare(self, before: np.ndarray, after: np.ndarray) -> list[Any]:
+        """Dirty tiles between the two regions (cropped to a common size)."""
+        h = min(before.shape[0], after.shape[0])
+        w = min(before.shape[1], after.shape[1])
+        before, after = before[:h, :w], after[:h, :w]
+        return self._grid.diff(self._grid.hash_frame(before), self._grid.hash_frame(after))
+
+    def _emit(self, verdict: FlightVerdict) -> None:
+        """Record metrics, log and forward a verdict."""
+        self._latency.record(verdict.latency_ms / 1000.0)
+        (self._changed if verdict.changed else self._unchanged).inc()
+        if verdict.forced:
+            self._forced.inc()
+
+        if verdict.changed:
+            logger.debug(
+                "FlightRecorder: %s at (%d, %d) changed region=%s (%.0fms)",
+                verdict.action,
+                verdict.x,
+                verdict.y,
+                verdict.region,
+                verdict.latency_ms,
+            )
+        else:
+            logger.warning(
+                f"✈️ FlightRecorder: Action '{verdict.action}' at ({verdict.x}, {verdict.y}) "
+                "resulted in NO VISUAL CHANGE. Possible failure."
+            )
+
+        if self.on_verdict is not None:
+            try:
+                self.on_verdict(verdict)
+            except Exception as e:
+                logger.debug("FlightRecorder on_verdict failed: %s", e)
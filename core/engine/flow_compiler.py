@@ -0,0 +1,247 @@
+"""
+RetroAuto v2 - Flow Compiler
+
+Compile a Flow's action list into a flat dispatch plan for the Runner.
+
+Every action is resolved to its handler once, Label/Goto become plan
+indexes and the then/else branches of conditionals are flattened into the
+plan with branch offsets, so a Goto inside a branch jumps like any other.
+Plans are cached per flow and rebuilt when the flow's structure changes.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from core.models import (
+    Action,
+    Flow,
+    Goto,
+    IfAllImages,
+    IfAnyImage,
+    IfImage,
+    IfNotImage,
+    IfPixel,
+    IfText,
+    Label,
+)
+from infra import get_logger
+
+logger = get_logger("FlowCompiler")
+
+# Plan opcodes
+OP_CALL = 0  # result = handler(action)
+OP_BRANCH = 1  # handler(action) -> bool; False continues at target
+OP_JUMP = 2  # continue at target (end of a then-branch)
+OP_GOTO = 3  # Goto with a resolved label: continue at target
+OP_NOP = 4  # Label
+
+# Actions with then (and optionally else) branches
+Conditional = IfImage | IfNotImage | IfPixel | IfText | IfAllImages | IfAnyImage
+_CONDITIONALS = (IfImage, IfNotImage, IfPixel, IfText, IfAllImages, IfAnyImage)
+
+# Resolves an action to a handler: resolve(action, flow, step_labels)
+Resolver = Callable[[Action, Flow, dict[str, int]], Callable[[Action], Any]]
+# Resolves a conditional to its predicate, or None if it does not branch
+PredicateResolver = Callable[[Action], Callable[[Action], bool] | None]
+# Decides whether the Flight Recorder checks an action: recorded(action, flow)
+RecordedFilter = Callable[[Action, Flow], bool]
+
+
+class PlanStep(NamedTuple):
+    """One entry of a compiled plan."""
+
+    op: int
+    handler: Callable[[Action], Any] | None
+    action: Action
+    target: int  # Jump target (OP_BRANCH: else branch, OP_JUMP/OP_GOTO: destination)
+    end: int  # OP_BRANCH: first step after the whole conditional
+    step: int  # Index of the enclosing top-level action in flow.actions
+    top: bool  # True for top-level actions of the flow
+    recorded: bool  # Checked by the Flight Recorder
+
+
+@dataclass
+class CompiledFlow:
+    """Flat dispatch plan for one version of a flow."""
+
+    steps: list[PlanStep]
+    labels: dict[str, int]  # Label name -> plan index
+    entries: list[int]  # Top-level step index -> plan index
+    fingerprint: tuple[Any, ...]
+
+    def index_of(self, step: int) -> int:
+        """Plan index of a top-level step (past the end if out of range)."""
+        if 0 <= step < len(self.entries):
+            return self.entries[step]
+        return len(self.steps)
+
+
+def flow_fingerprint(flow: Flow) -> tuple[Any, ...]:
+    """
+    Structural fingerprint of a flow.
+
+    Covers action identity, nesting, Label/Goto names and Flight Recorder
+    toggles - everything baked into a plan. Other fields are read from the
+    action at run time.
+    """
+    parts: list[Any] = [flow.verify_actions]
+
+    def walk(seq: Sequence[Action]) -> None:
+        parts.append(len(seq))
+        for action in seq:
+            parts.append(id(action))
+            if isinstance(action, Label):
+                parts.append(action.name)
+            elif isinstance(action, Goto):
+                parts.append(action.label)
+            verify = getattr(action, "verify", None)
+            if verify is not None:
+                parts.append(verify)
+            then_actions = getattr(action, "then_actions", None)
+            if then_actions is not None:
+                walk(then_actions)
+                walk(getattr(action, "else_actions", []))
+
+    walk(flow.actions)
+    return tuple(parts)
+
+
+def else_branch(action: Conditional) -> list[Action]:
+    """Else branch of a conditional (IfNotImage has none)."""
+    return [] if isinstance(action, IfNotImage) else action.else_actions
+
+
+def compile_flow(
+    flow: Flow,
+    resolve: Resolver,
+    predicate: PredicateResolver,
+    recorded: RecordedFilter | None = None,
+) -> CompiledFlow:
+    """
+    Compile flow.actions into a flat plan.
+
+    A conditional with a predicate compiles to::
+
+        BRANCH  -> else_start (when the predicate is False)
+        <then actions>
+        JUMP    -> end        (only when there is an else branch)
+        <else actions>
+
+    Args:
+        flow: Flow to compile
+        resolve: Returns the handler for an action
+        predicate: Returns the predicate of a conditional, None otherwise
+        recorded: Returns True for actions the Flight Recorder checks
+
+    Returns:
+        CompiledFlow
+    """
+    step_labels = {
+        action.name: i for i, action in enumerate(flow.actions) if isinstance(action, Label)
+    }
+    steps: list[PlanStep] = []
+    labels: dict[str, int] = {}
+    entries: list[int] = []
+    gotos: list[tuple[int, Goto]] = []  # Goto steps, resolved at the end
+
+    def emit(op: int, handler: Any, action: Action, step: int, top: bool) -> int:
+        steps.append(PlanStep(op, handler, action, -1, -1, step, top, False))
+        return len(steps) - 1
+
+    def patch(index: int, **fields: Any) -> None:
+        steps[index] = steps[index]._replace(**fields)
+
+    def compile_list(seq: Sequence[Action], step: int | None) -> None:
+        for i, action in enumerate(seq):
+            top = step is None
+            owner = i if step is None else step
+            if top:
+                entries.append(len(steps))
+
+            if isinstance(action, Label):
+                labels[action.name] = len(steps)
+                emit(OP_NOP, None, action, owner, top)
+                continue
+
+            if isinstance(action, Goto):
+                gotos.append((emit(OP_GOTO, None, action, owner, top), action))
+                continue
+
+            check = predicate(action)
+            if check is None or not isinstance(action, _CONDITIONALS):
+                index = emit(OP_CALL, resolve(action, flow, step_labels), action, owner, top)
+                if recorded is not None and recorded(action, flow):
+                    patch(index, recorded=True)
+                continue
+
+            branch = emit(OP_BRANCH, check, action, owner, top)
+            compile_list(action.then_actions, owner)
+            else_actions = else_branch(action)
+            jump = emit(OP_JUMP, None, action, owner, False) if else_actions else None
+            else_start = len(steps)
+            compile_list(else_actions, owner)
+            patch(branch, target=else_start, end=len(steps))
+            if jump is not None:
+                patch(jump, target=len(steps))
+
+    compile_list(flow.actions, None)
+
+    # Resolve Goto targets; unknown labels fall back to the runtime handler
+    for index, goto in gotos:
+        if goto.label in labels:
+            patch(index, target=labels[goto.label])
+        else:
+            logger.warning("Flow '%s': Goto to unknown label '%s'", flow.name, goto.label)
+            patch(index, op=OP_CALL, handler=resolve(goto, flow, step_labels))
+
+    return CompiledFlow(
+        steps=steps,
+        labels=labels,
+        entries=entries,
+        fingerprint=flow_fingerprint(flow),
+    )
+
+
+class FlowCompiler:
+    """
+    Compile flows on first run and reuse the plan while the flow is unchanged.
+
+    Usage:
+        compiler = FlowCompiler(resolve, predicate, recorded=verify_enabled)
+        plan = compiler.get(flow)
+    """
+
+    def __init__(
+        self,
+        resolve: Resolver,
+        predicate: PredicateResolver,
+        recorded: RecordedFilter | None = None,
+    ) -> None:
+        self._resolve = resolve
+        self._predicate = predicate
+        self._recorded = recorded
+        # id(flow) -> (flow, plan); holding the flow keeps its id unique
+        self._plans: dict[int, tuple[Flow, CompiledFlow]] = {}
+        self.compiles = 0
+
+    def get(self, flow: Flow) -> CompiledFlow:
+        """Return the plan for this version of the flow, compiling if needed."""
+        cached = self._plans.get(id(flow))
+        if cached is not None and cached[0] is flow:
+            plan = cached[1]
+            if plan.fingerprint == flow_fingerprint(flow):
+                return plan
+
+        plan = compile_flow(flow, self._resolve, self._predicate, self._recorded)
+        self._plans[id(flow)] = (flow, plan)
+        self.compiles += 1
+        logger.debug("Compiled flow '%s': %d steps", flow.name, len(plan.steps))
+        return plan
+
+    def invalidate(self, flow: Flow | None = None) -> None:
+        """Drop the cached plan for a flow, or all plans."""
+        if flow is None:
+            self._plans.clear()
+        else:
+            self._plans.pop(id(flow), None)
@@ -31,13 +31,18 @@ from core.dsl.ast import (
     UnaryExpr,
     WhileStmt,
 )
+from core.dsl.values import is_truthy, literal_value, parse_duration_ms
 from core.engine.builtins import BuiltinRegistry, get_builtins
-from core.engine.scope import ExecutionContext
+from core.engine.resolver import Binding, resolve_program
+from core.engine.scope import LOCAL, UNSET, ExecutionContext, ScopeLayout
 
 if TYPE_CHECKING:
     pass
 
 
+MAX_CALL_DEPTH = 500  # Flow recursion guard
+
+
 class InterpreterError(Exception):
     """Error during script interpretation."""
 
@@ -62,6 +67,8 @@ class Interpreter:
         self.context = ExecutionContext()
         self.builtins.set_context(self.context)  # Bind context for security checks
         self._flows: dict[str, FlowDecl] = {}
+        self._bindings: dict[int, Binding] = {}  # Variable slots from the resolver
+        self._layouts: dict[int, ScopeLayout] = {}
 
         # Optimization: Dispatch tables
         self._stmt_dispatch = {
@@ -97,23 +104,12 @@ class Interpreter:
         Returns:
             Result of main flow, if any
         """
-        # Phase 15: Apply Security Policy
-        if program.permissions:
-            # Parse permissions list ["FS_READ", "NET_ALL"]
-            allowed = Permission.NONE
-            for perm_str in program.permissions:
-                try:
-                    # Support single flags (FS_READ) and combined (FS_ALL)
-                    p = getattr(Permission, perm_str)
-                    allowed |= p
-                except AttributeError:
-                    print(f"[WARN] Unknown permission: {perm_str}")
+        self._apply_permissions(program.permissions)
 
-            # Update policy (restrictive)
-            self.context.policy = SecurityPolicy(permissions=allowed)
-        else:
-            # Default policy (Safe or Unsafe depending on config - defaulting to Unsafe for now to not break existing scripts)
-            pass
+        # Assign variable slots (flows of earlier programs fall back to names)
+        resolution = resolve_program(program)
+        self._bindings = resolution.bindings
+        self._layouts = resolution.layouts
 
         # Register constants
         for const in program.constants:
@@ -131,15 +127,36 @@ class Interpreter:
 
         return None
 
+    def _apply_permissions(self, permissions: list[str]) -> None:
+        """Phase 15: Apply the program's security policy."""
+        if permissions:
+            # Parse permissions list ["FS_READ", "NET_ALL"]
+            allowed = Permission.NONE
+            for perm_str in permissions:
+                try:
+                    # Support single flags (FS_READ) and combined (FS_ALL)
+                    p = getattr(Permission, perm_str)
+                    allowed |= p
+                except AttributeError:
+                    print(f"[WARN] Unknown permission: {perm_str}")
+
+            # Update policy (restrictive)
+            self.context.policy = SecurityPolicy(permissions=allowed)
+        else:
+            # Default policy (Safe or Unsafe depending on config - defaulting to Unsafe for now to not break existing scripts)
+            pass
+
     def _execute_flow(self, flow: FlowDecl) -> Any:
         """Execute a flow."""
         self.context.call_depth += 1
-        if self.context.call_depth > 500:
+        if self.context.call_depth > MAX_CALL_DEPTH:
             # Reset to avoid lock-up state if caught
             self.context.call_depth -= 1
-            raise InterpreterError("Stack Overflow: Max recursion depth exceeded (500)")
+            raise InterpreterError(
+                f"Stack Overflow: Max recursion depth exceeded ({MAX_CALL_DEPTH})"
+            )
 
-        self.context.enter_flow(flow.name)
+        self.context.enter_flow(flow.name, self._layouts.get(id(flow)))
         try:
             self._execute_block(flow.body)
             return self.context.get_return()
@@ -174,7 +191,11 @@ class Interpreter:
         value = None
         if node.initializer:
             value = self._eval(node.initializer)
-        self.context.scope.define(node.name, value)
+        binding = self._bindings.get(id(node))
+        if binding is not None and binding[0] == LOCAL:
+            self.context.scope.define_slot(binding[1], value)
+        else:
+            self.context.scope.define(node.name, value)
 
     def _execute_assign(self, node: AssignStmt) -> None:
         """Execute assignment."""
@@ -185,7 +206,11 @@ class Interpreter:
             # Handle $variable syntax
             if name.startswith("$"):
                 name = name[1:]
-            self.context.scope.assign(name, value)
+            binding = self._bindings.get(id(node))
+            if binding is not None and binding[0] == LOCAL:
+                self.context.scope.store(binding[1], name, value)
+            else:
+                self.context.scope.assign(name, value)
         else:
             raise InterpreterError(f"Invalid assignment target: {node.target}", node)
 
@@ -227,8 +252,13 @@ class Interpreter:
         if not hasattr(iterable, "__iter__"):
             raise InterpreterError(f"Cannot iterate over: {type(iterable)}", node)
 
+        scope = self.context.scope
+        binding = self._bindings.get(id(node))
         for item in iterable:
-            self.context.scope.define(node.variable, item)
+            if binding is not None and binding[0] == LOCAL:
+                scope.define_slot(binding[1], item)
+            else:
+                scope.define(node.variable, item)
             self._execute_block(node.body)
 
             # Handle break/continue
@@ -247,7 +277,11 @@ class Interpreter:
         except Exception as e:
             # Set catch variable
             if node.catch_var:
-                self.context.scope.define(node.catch_var, str(e))
+                binding = self._bindings.get(id(node))
+                if binding is not None and binding[0] == LOCAL:
+                    self.context.scope.define_slot(binding[1], str(e))
+                else:
+                    self.context.scope.define(node.catch_var, str(e))
             self._execute_block(node.catch_block)
 
     def _execute_return(self, node: ReturnStmt) -> None:
@@ -267,21 +301,23 @@ class Interpreter:
 
     def _eval_literal(self, node: Literal) -> Any:
         """Evaluate literal value."""
-        if node.literal_type == "null":
-            return None
-        elif node.literal_type == "bool":
-            return node.value in (True, "true", "True")
-        elif node.literal_type == "duration":
-            # Return duration in milliseconds
-            return self._parse_duration_ms(node.value)
-        return node.value
+        return literal_value(node)
 
     def _eval_identifier(self, node: Identifier) -> Any:
         """Evaluate identifier."""
+        scope = self.context.scope
+        binding = self._bindings.get(id(node))
+        if binding is not None and binding[0] == LOCAL:
+            value = scope.frame.values[binding[1]]  # type: ignore[union-attr]
+            if value is not UNSET:
+                return value
+
         name = node.name
         if name.startswith("$"):
             name = name[1:]
-        return self.context.scope.get(name)
+        if binding is None:
+            return scope.get(name)
+        return scope.load(binding[0], binding[1], name)
 
     def _eval_binary(self, node: BinaryExpr) -> Any:
         """Evaluate binary expression."""
@@ -384,39 +420,22 @@ class Interpreter:
 
     def _is_truthy(self, value: Any) -> bool:
         """Check if value is truthy."""
-        if value is None:
-            return False
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, (int, float)):
-            return value != 0
-        if isinstance(value, str):
-            return len(value) > 0
-        if isinstance(value, (list, dict)):
-            return len(value) > 0
-        return True
+        return is_truthy(value)
 
     def _parse_duration_ms(self, value: Any) -> int:
         """Parse duration to milliseconds."""
-        if isinstance(value, (int, float)):
-            return int(value)
-        s = str(value).strip().lower()
-        if s.endswith("ms"):
-            return int(s[:-2])
-        elif s.endswith("s"):
-            return int(float(s[:-1]) * 1000)
-        elif s.endswith("m"):
-            return int(float(s[:-1]) * 60000)
-        elif s.endswith("h"):
-            return int(float(s[:-1]) * 3600000)
-        return int(value)
-
-
-def interpret(source: str) -> Any:
+        return parse_duration_ms(value)
+
+
+def interpret(source: str, bytecode: bool = False, optimize: bool = True) -> Any:
     """Convenience function to parse and interpret source code.
 
     Args:
         source: RetroScript source code
+        bytecode: Compile to bytecode and run on the stack VM instead of
+            walking the AST
+        optimize: Fold constants and drop dead branches first
+            (core.dsl.optimizer)
 
     Returns:
         Result of execution
@@ -429,5 +448,15 @@ def interpret(source: str) -> Any:
     if parser.errors:
         raise InterpreterError(f"Parse errors: {parser.errors}")
 
+    if optimize:
+        from core.dsl.optimizer import Optimizer
+
+        program = Optimizer().optimize(program)
+
+    if bytecode:
+        from core.engine.vm import VirtualMachine
+
+        return VirtualMachine().execute(program)
+
     interpreter = Interpreter()
     return interpreter.execute(program)
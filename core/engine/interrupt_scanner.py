@@ -3,27 +3,52 @@ RetroAuto v2 - Interrupt Scanner
 
 Background thread that monitors screen for interrupt triggers.
 When an interrupt image is detected, it pauses main flow and executes interrupt actions.
+
+Scans are incremental: the scanner follows the frames the flow captures
+anyway, re-matches a rule only when the pixels of its search region
+changed since its last miss (exact checksum), matches due rules sharing a
+region in one pass, and slows down rules whose matching is expensive.
+
+Frames live in the bus's ring buffers, which the runner's next grabs
+overwrite, so each scan first copies the due regions out of the frame
+and works on that snapshot only.
 """
 
 from __future__ import annotations
 
 import threading
 import time
+import zlib
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 
 from core.engine.hotkey_listener import get_hotkey_listener
-from core.models import Action, InterruptRule
+from core.models import ROI, Action, InterruptRule
 from infra import get_logger
+from vision.frame_bus import Frame
 
 if TYPE_CHECKING:
     from core.engine.context import ExecutionContext
-    from vision import TemplateMatcher
+    from vision import Matcher
+    from vision.matcher import BatchMatch
 
 logger = get_logger("InterruptScanner")
 
+RULE_CPU_SHARE = 0.05  # Fraction of one core a single rule may spend matching
+MAX_RULE_INTERVAL_S = 2.0  # Slowest per-rule scan interval
+COST_EMA_ALPHA = 0.3  # Smoothing of per-rule matching cost
+MAX_FRAME_AGE_MS = 250  # Older flow frames are replaced by an own grab
+
+RoiKey = tuple[int, int, int, int] | None
+
+
+def _roi_key(roi: ROI | None) -> RoiKey:
+    return (roi.x, roi.y, roi.w, roi.h) if roi is not None else None
+
 
 class InterruptState(Enum):
     """Interrupt scanner state."""
@@ -47,12 +72,30 @@ class InterruptMatch:
     timestamp: float = field(default_factory=time.time)
 
 
+@dataclass
+class RuleScanState:
+    """Incremental scan state and matching cost of one image rule."""
+
+    rule: InterruptRule
+    asset_id: str
+    roi: ROI | None  # Search region (None = full frame)
+    cost_ms: float = 0.0  # Smoothed matching cost
+    interval: float = 0.0  # Current scan interval in seconds
+    next_due: float = 0.0  # perf_counter of the next scan
+    checksum: int | None = None  # Region checksum at the last miss
+    evaluations: int = 0
+    skipped_unchanged: int = 0
+
+
 class InterruptScanner:
     """
     Background scanner for interrupt triggers.
 
     Features:
-    - Scans screen at configurable interval
+    - Follows the runner's frame bus (grabs only if the flow stops capturing)
+    - Re-matches a rule only when its region's pixels changed
+    - Batches due rules sharing a region into one matching pass
+    - Per-rule scan rate adapts to the rule's matching cost
     - Checks interrupts by priority order
     - Pauses main flow when interrupt triggered
     - Executes interrupt actions
@@ -69,20 +112,38 @@ class InterruptScanner:
     def __init__(
         self,
         ctx: ExecutionContext,
-        matcher: TemplateMatcher,
+        matcher: Matcher,
         scan_interval_ms: int = 200,
+        match_workers: int = 1,
+        rule_cpu_share: float = RULE_CPU_SHARE,
     ) -> None:
         """
         Initialize interrupt scanner.
 
         Args:
             ctx: Execution context with script and state
-            matcher: Template matcher for image detection
-            scan_interval_ms: Time between scans in milliseconds
+            matcher: Template matcher for image detection (shares the
+                runner's frame bus, so scans reuse the current frame)
+            scan_interval_ms: Time between scans in milliseconds (fastest
+                per-rule rate)
+            match_workers: Threads used to match rule groups in parallel
+            rule_cpu_share: Fraction of one core each rule may spend matching;
+                expensive rules are scanned less often to stay within it
         """
         self._ctx = ctx
         self._matcher = matcher
         self._scan_interval = scan_interval_ms / 1000.0
+        self._match_workers = match_workers
+        self._rule_cpu_share = rule_cpu_share
+
+        # Incremental scanning: per-rule state, rebuilt when the rules change
+        self._rules: list[RuleScanState] = []
+        self._rules_key: tuple[Any, ...] = ()
+        self._last_seq = 0
+        self._frames_scanned = 0
+        self._own_grabs = 0
+        self._stale_frames = 0
+        self._pinned_assets: list[str] = []  # Exactly what start() pinned
 
         self._state = InterruptState.IDLE
         self._thread: threading.Thread | None = None
@@ -137,10 +198,17 @@ class InterruptScanner:
         self._stop_event.clear()
         self._pause_event.set()
         self._state = InterruptState.SCANNING
+        self._rules_key = ()
+        self._last_seq = 0
 
         # Register hotkey-type interrupts
         self._register_hotkey_interrupts()
 
+        # Interrupt templates must stay resident in byte-bounded stores
+        self._release_pins()  # Left over if the previous thread died without stop()
+        self._pinned_assets = self._rule_assets()
+        self._ctx.templates.pin(self._pinned_assets)
+
         self._thread = threading.Thread(target=self._scan_loop, daemon=True)
         self._thread.start()
         logger.info("Interrupt scanner started (interval: %.0fms)", self._scan_interval * 1000)
@@ -157,8 +225,19 @@ class InterruptScanner:
             self._thread.join(timeout=2.0)
             self._thread = None
 
+        self._release_pins()
         logger.info("Interrupt scanner stopped")
 
+    def _rule_assets(self) -> list[str]:
+        """Asset IDs watched by interrupt rules."""
+        return [r.when_image for r in self._ctx.script.interrupts if r.when_image]
+
+    def _release_pins(self) -> None:
+        """Unpin exactly what start() pinned, once (the store's pins are shared)."""
+        if self._pinned_assets:
+            self._ctx.templates.unpin(self._pinned_assets)
+            self._pinned_assets = []
+
     def pause(self) -> None:
         """Pause scanning (e.g., while executing interrupt)."""
         self._pause_event.clear()
@@ -208,7 +287,7 @@ class InterruptScanner:
 
             # Scan for interrupts
             try:
-                match = self._check_interrupts()
+                match = self._check_interrupts(self._next_frame())
                 if match is not None:
                     self._handle_interrupt(match)
                     self._last_scan_had_activity = True
@@ -217,12 +296,30 @@ class InterruptScanner:
             except Exception as e:
                 logger.error("Error in interrupt scan: %s", e)
 
-            # Adaptive interval: slower when idle, faster when active
-            interval = self._get_adaptive_interval()
-            time.sleep(interval)
+            # Sleep until the next rule is due
+            self._stop_event.wait(self._time_until_due())
 
         self._state = InterruptState.STOPPED
 
+    def _next_frame(self) -> Frame:
+        """The flow's next capture, or an own grab if the flow is not capturing."""
+        frames = self._matcher.frames
+        frame = frames.wait_frame(self._last_seq, timeout=self._get_adaptive_interval())
+        if frame is None or frame.age_ms > MAX_FRAME_AGE_MS:
+            frame = frames.frame()
+            self._own_grabs += 1
+        self._last_seq = frame.seq
+        self._frames_scanned += 1
+        return frame
+
+    def _time_until_due(self) -> float:
+        """Seconds until the earliest rule is due (at most the adaptive interval)."""
+        interval = self._get_adaptive_interval()
+        if not self._rules:
+            return interval
+        wait = min(s.next_due for s in self._rules) - time.perf_counter()
+        return min(max(0.0, wait), interval)
+
     def _get_adaptive_interval(self) -> float:
         """Calculate adaptive scan interval based on engine state."""
         # If engine is not running (idle), use slow interval to save CPU
@@ -239,68 +336,205 @@ class InterruptScanner:
         else:
             return self._interval_active
 
-    def _check_interrupts(self) -> InterruptMatch | None:
+    def _check_interrupts(self, frame: Frame) -> InterruptMatch | None:
         """
-        Check all interrupts in priority order.
+        Check due interrupts against a frame, in priority order.
 
         Returns:
             InterruptMatch if an interrupt is triggered, None otherwise
         """
-        # Get interrupts sorted by priority (high first)
-        interrupts = sorted(self._ctx.script.interrupts, key=lambda r: r.priority, reverse=True)
-
+        now = time.perf_counter()
         current_time = time.time()
 
-        for rule in interrupts:
-            # Skip hotkey-type rules (handled by HotkeyListener)
-            if rule.trigger_type == "hotkey":
-                continue
-
-            # Skip if no when_image for image-type
-            if not rule.when_image:
+        # Due rules, then the ones whose region changed
+        candidates: list[RuleScanState] = []
+        for state in self._rule_states():
+            if now < state.next_due:
                 continue
 
             # Skip if in cooldown
-            cooldown_key = rule.when_image
-            if (
-                cooldown_key in self._cooldown
-                and current_time - self._cooldown[cooldown_key] < self._cooldown_duration
-            ):
+            cooled_at = self._cooldown.get(state.rule.when_image or "")
+            if cooled_at is not None and current_time - cooled_at < self._cooldown_duration:
+                state.next_due = now + self._cooldown_duration - (current_time - cooled_at)
+                continue
+            candidates.append(state)
+
+        if not candidates:
+            return None
+
+        snapshot = self._snapshot(frame, [s.roi for s in candidates])
+        if snapshot is None:
+            self._stale_frames += 1
+            return None  # The next frame is scanned instead
+
+        due: list[RuleScanState] = []
+        checksums: dict[RoiKey, int | None] = {}
+        for state in candidates:
+            checksum = self._region_checksum(snapshot, state.roi, checksums)
+            if checksum is not None and checksum == state.checksum:
+                state.skipped_unchanged += 1
+                state.next_due = now + state.interval
                 continue
 
-            # Get asset for this interrupt
-            asset = self._ctx.script.get_asset(rule.when_image)
+            state.checksum = checksum
+            due.append(state)
+
+        if not due:
+            return None
+
+        results = self._match(due, snapshot)
+
+        # Highest priority hit wins
+        hit: tuple[RuleScanState, Any] | None = None
+        for state, result in zip(due, results, strict=True):
+            self._update_rate(state, result.elapsed_ms, now)
+            if result.skipped or result.match is not None:
+                # Re-check even if the region stays the same (asset not
+                # loaded yet, or the trigger is still visible after cooldown)
+                state.checksum = None
+            if result.match is not None and hit is None:
+                hit = (state, result.match)
+
+        if hit is None:
+            return None
+
+        state, result = hit
+        rule = state.rule
+        logger.info("Interrupt triggered: %s (priority %d)", rule.when_image, rule.priority)
+
+        # Set cooldown
+        self._cooldown[rule.when_image] = current_time
+
+        return InterruptMatch(
+            rule=rule,
+            match_x=result.x,
+            match_y=result.y,
+            match_w=result.w,
+            match_h=result.h,
+            confidence=result.confidence,
+        )
+
+    def _rule_states(self) -> list[RuleScanState]:
+        """Image rules in priority order (high first), rebuilt when rules/assets change."""
+        script = self._ctx.script
+        rules = sorted(script.interrupts, key=lambda r: r.priority, reverse=True)
+        key = (*map(id, rules), len(script.assets))
+        if key == self._rules_key:
+            return self._rules
+
+        previous = {id(s.rule): s for s in self._rules}
+        states: list[RuleScanState] = []
+        for rule in rules:
+            # Hotkey-type rules are handled by HotkeyListener
+            if rule.trigger_type == "hotkey" or not rule.when_image:
+                continue
+            asset = script.get_asset(rule.when_image)
             if asset is None:
                 continue
+            state = previous.get(id(rule))
+            if state is None:
+                state = RuleScanState(rule, asset.id, rule.roi_override or asset.roi)
+            states.append(state)
 
-            # Determine ROI
-            roi = rule.roi_override or asset.roi
-            roi_tuple = (roi.x, roi.y, roi.w, roi.h) if roi else None
-
-            # Try to match
-            result = self._matcher.find(
-                asset_id=asset.id,
-                threshold=asset.threshold,
-                roi=roi_tuple,
-            )
-
-            if result is not None:
-                # Found a match!
-                logger.info("Interrupt triggered: %s (priority %d)", rule.when_image, rule.priority)
+        self._rules, self._rules_key = states, key
+        return states
 
-                # Set cooldown
-                self._cooldown[cooldown_key] = current_time
+    def _snapshot(self, frame: Frame, rois: list[ROI | None]) -> Frame | None:
+        """
+        Private copy of the part of frame covering rois.
 
-                return InterruptMatch(
-                    rule=rule,
-                    match_x=result.x,
-                    match_y=result.y,
-                    match_w=result.w,
-                    match_h=result.h,
-                    confidence=result.confidence,
-                )
+        Returns None if the bus grabbed another frame meanwhile: with two
+        ring buffers, frame's buffer can only be overwritten after a newer
+        grab completed, so an unchanged seq proves the copy is intact.
+        """
+        inside = [r for r in rois if r is None or frame.contains_origin(r)]
+        if any(r is None for r in inside):
+            x0, y0, x1, y1 = 0, 0, frame.width, frame.height
+        elif inside:
+            x0 = min(r.x for r in inside if r is not None) - frame.left
+            y0 = min(r.y for r in inside if r is not None) - frame.top
+            x1 = max(r.x + r.w for r in inside if r is not None) - frame.left
+            y1 = max(r.y + r.h for r in inside if r is not None) - frame.top
+        else:
+            x0 = y0 = x1 = y1 = 0  # Nothing on screen: every rule is skipped
+
+        bgr = frame.bgr[y0:y1, x0:x1].copy()
+        if self._matcher.frames.seq != frame.seq:
+            return None
+        return Frame(frame.seq, bgr, (frame.left + x0, frame.top + y0))
+
+    def _region_checksum(
+        self, snapshot: Frame, roi: ROI | None, cache: dict[RoiKey, int | None]
+    ) -> int | None:
+        """CRC32 of a search region (None if it lies outside the frame)."""
+        key = _roi_key(roi)
+        if key not in cache:
+            if roi is not None and not snapshot.contains_origin(roi):
+                cache[key] = None
+            else:
+                cache[key] = zlib.crc32(np.ascontiguousarray(snapshot.view(roi)))
+        return cache[key]
+
+    def _match(self, due: list[RuleScanState], snapshot: Frame) -> list[BatchMatch]:
+        """
+        Match due rules against the snapshot, one result per rule.
 
-        return None
+        find_many() takes one ROI per asset, so rules watching the same
+        asset in different regions go to separate batches; rules sharing
+        asset and region share one result.
+        """
+        batches: list[dict[str, ROI | None]] = []
+        for state in due:
+            for batch in batches:
+                if batch.get(state.asset_id, state.roi) == state.roi:
+                    batch[state.asset_id] = state.roi
+                    break
+            else:
+                batches.append({state.asset_id: state.roi})
+
+        found: dict[tuple[str, RoiKey], BatchMatch] = {}
+        for batch in batches:
+            results = self._matcher.find_many(
+                list(batch),
+                roi_overrides={aid: roi for aid, roi in batch.items() if roi is not None},
+                max_workers=self._match_workers,
+                frame=snapshot,
+            )
+            for aid, roi in batch.items():
+                found[(aid, _roi_key(roi))] = results[aid]
+        return [found[(s.asset_id, _roi_key(s.roi))] for s in due]
+
+    def _update_rate(self, state: RuleScanState, elapsed_ms: float, now: float) -> None:
+        """Record a rule's matching cost and schedule its next scan."""
+        state.evaluations += 1
+        if state.evaluations == 1:
+            state.cost_ms = elapsed_ms
+        else:
+            state.cost_ms += COST_EMA_ALPHA * (elapsed_ms - state.cost_ms)
+
+        # Expensive rules slow down so each stays within its CPU share
+        budget_interval = state.cost_ms / 1000.0 / self._rule_cpu_share
+        state.interval = min(
+            MAX_RULE_INTERVAL_S, max(self._get_adaptive_interval(), budget_interval)
+        )
+        state.next_due = now + state.interval
+
+    def get_stats(self) -> dict[str, Any]:
+        """Scan counters and per-rule cost/rate."""
+        return {
+            "frames_scanned": self._frames_scanned,
+            "own_grabs": self._own_grabs,
+            "stale_frames": self._stale_frames,
+            "rules": {
+                s.asset_id: {
+                    "evaluations": s.evaluations,
+                    "skipped_unchanged": s.skipped_unchanged,
+                    "cost_ms": round(s.cost_ms, 2),
+                    "interval_ms": round(s.interval * 1000),
+                }
+                for s in self._rules
+            },
+        }
 
     def _handle_interrupt(self, match: InterruptMatch) -> None:
         """Handle a triggered interrupt."""
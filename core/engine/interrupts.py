@@ -55,12 +55,17 @@ class InterruptWatcher:
         self._running = False
         self._lock = threading.Lock()
         self._triggered_cooldown: dict[str, float] = {}  # Prevent spam
+        self._pinned_assets: list[str] = []  # Exactly what start() pinned
 
     def start(self) -> None:
         """Start the watcher thread."""
         if self._running:
             return
 
+        # Interrupt templates must stay resident in byte-bounded stores
+        self._pinned_assets = self._rule_assets()
+        self._ctx.templates.pin(self._pinned_assets)
+
         self._running = True
         self._thread = threading.Thread(target=self._watch_loop, daemon=True)
         self._thread.start()
@@ -72,8 +77,16 @@ class InterruptWatcher:
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
+        # Release only our own pins, once: the store's pins are shared
+        if self._pinned_assets:
+            self._ctx.templates.unpin(self._pinned_assets)
+            self._pinned_assets = []
         logger.info("InterruptWatcher stopped")
 
+    def _rule_assets(self) -> list[str]:
+        """Asset IDs watched by interrupt rules."""
+        return [r.when_image for r in self._ctx.script.interrupts if r.when_image]
+
     def _watch_loop(self) -> None:
         """Main watch loop."""
         current_poll = self._poll_ms
@@ -108,17 +121,27 @@ class InterruptWatcher:
         """
         rules = self._get_sorted_rules()
 
-        for rule in rules:
-            # Check cooldown
+        # Skip rules still in cooldown, then match the rest in one batch
+        now = time.time()
+        candidates = [
+            rule
+            for rule in rules
+            if rule.when_image
+            and now - self._triggered_cooldown.get(rule.when_image, 0.0) >= 1.0
+        ]
+        if not candidates:
+            return False
+
+        results = self._ctx.matcher.find_many(
+            [rule.when_image for rule in candidates],
+            roi_overrides={r.when_image: r.roi_override for r in candidates if r.roi_override},
+        )
+
+        for rule in candidates:
             cooldown_key = rule.when_image
-            if (
-                cooldown_key in self._triggered_cooldown
-                and time.time() - self._triggered_cooldown[cooldown_key] < 1.0
-            ):
-                continue  # Skip, still in cooldown
 
             # Check if image is present
-            match = self._ctx.matcher.find(rule.when_image, rule.roi_override)
+            match = results[rule.when_image].match
             if match is None:
                 continue
 
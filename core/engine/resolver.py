@@ -0,0 +1,174 @@
+"""
+RetroAuto v2 - Variable Resolver
+
+Static pass over a Program that gives every variable reference a
+(depth, slot) binding before execution.
+
+Each flow gets a ScopeLayout with one slot per name it declares or
+assigns (let, assignment, for and catch targets). References are bound
+as:
+    (LOCAL, slot)  - local of the flow: a list index in its frame
+    (GLOBAL, -1)   - no flow binds the name: read the global dict
+    (DYNAMIC, -1)  - bound by another flow: search the caller frames
+
+Flows see their caller's variables, so names of other flows cannot be
+given a fixed depth; those keep the frame walk. The tree walker and the
+bytecode compiler share this pass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.dsl.ast import (
+    AssignStmt,
+    ASTNode,
+    BlockStmt,
+    FlowDecl,
+    ForStmt,
+    Identifier,
+    IfStmt,
+    LetStmt,
+    Program,
+    TryStmt,
+    WhileStmt,
+)
+from core.engine.scope import DYNAMIC, GLOBAL, LOCAL, ScopeLayout
+
+Binding = tuple[int, int]  # (depth, slot)
+
+
+@dataclass
+class Resolution:
+    """Result of resolving a program."""
+
+    layouts: dict[int, ScopeLayout] = field(default_factory=dict)  # id(FlowDecl) -> layout
+    bindings: dict[int, Binding] = field(default_factory=dict)  # id(node) -> binding
+    flow_names: set[str] = field(default_factory=set)  # Names bound by any flow
+
+    def layout(self, flow: FlowDecl) -> ScopeLayout | None:
+        """Slots of a resolved flow."""
+        return self.layouts.get(id(flow))
+
+    def binding(self, node: ASTNode) -> Binding | None:
+        """Binding of a variable reference or declaring statement."""
+        return self.bindings.get(id(node))
+
+
+class Resolver:
+    """
+    Assign scope slots for a Program.
+
+    Bindings are recorded for Identifier references and for the
+    statements that write a variable (LetStmt, AssignStmt, ForStmt and
+    TryStmt's catch variable), keyed by node identity. The program must
+    stay alive (and unmodified) while the resolution is used.
+
+    Usage:
+        resolution = Resolver().resolve(program)
+        depth, slot = resolution.binding(identifier)
+    """
+
+    def __init__(self) -> None:
+        self._result = Resolution()
+        self._layout: ScopeLayout | None = None
+
+    def resolve(self, program: Program) -> Resolution:
+        """Resolve every flow and constant initializer."""
+        self._result = result = Resolution()
+
+        for flow in program.flows:
+            layout = ScopeLayout.from_names(f"flow:{flow.name}", local_names(flow.body))
+            result.layouts[id(flow)] = layout
+            result.flow_names.update(layout.names)
+
+        # Constants are evaluated at global scope
+        self._layout = None
+        for const in program.constants:
+            self._visit(const.initializer)
+
+        for flow in program.flows:
+            self._layout = result.layouts[id(flow)]
+            self._visit(flow.body)
+        self._layout = None
+
+        return result
+
+    def _bind(self, name: str) -> Binding:
+        if self._layout is not None:
+            slot = self._layout.slots.get(name)
+            if slot is not None:
+                return (LOCAL, slot)
+            if name in self._result.flow_names:
+                return (DYNAMIC, -1)
+        return (GLOBAL, -1)
+
+    def _visit(self, node: Any) -> None:
+        if isinstance(node, ASTNode):
+            bindings = self._result.bindings
+            if isinstance(node, Identifier):
+                bindings[id(node)] = self._bind(var_name(node))
+                return
+            if isinstance(node, LetStmt):
+                bindings[id(node)] = self._bind(node.name)
+            elif isinstance(node, ForStmt):
+                bindings[id(node)] = self._bind(node.variable)
+            elif isinstance(node, TryStmt) and node.catch_var:
+                bindings[id(node)] = self._bind(node.catch_var)
+            elif isinstance(node, AssignStmt) and isinstance(node.target, Identifier):
+                bindings[id(node)] = self._bind(var_name(node.target))
+            for key, child in vars(node).items():
+                if key != "span":
+                    self._visit(child)
+        elif isinstance(node, (list, tuple)):
+            for child in node:
+                self._visit(child)
+        elif isinstance(node, dict):
+            for child in node.values():
+                self._visit(child)
+
+
+def var_name(node: Identifier) -> str:
+    """Variable name without the `$` sigil."""
+    name = node.name
+    return name[1:] if name.startswith("$") else name
+
+
+def local_names(block: BlockStmt) -> list[str]:
+    """Names a flow body declares or assigns, in first-seen order."""
+    names: dict[str, None] = {}
+
+    def walk(node: Any) -> None:
+        if isinstance(node, LetStmt):
+            names[node.name] = None
+        elif isinstance(node, ForStmt):
+            names[node.variable] = None
+        elif isinstance(node, TryStmt) and node.catch_var:
+            names[node.catch_var] = None
+        elif isinstance(node, AssignStmt) and isinstance(node.target, Identifier):
+            names[var_name(node.target)] = None
+
+        if isinstance(node, BlockStmt):
+            for stmt in node.statements:
+                walk(stmt)
+        elif isinstance(node, IfStmt):
+            walk(node.then_branch)
+            for _, elif_block in node.elif_branches:
+                walk(elif_block)
+            if node.else_branch:
+                walk(node.else_branch)
+        elif isinstance(node, (WhileStmt, ForStmt)):
+            walk(node.body)
+        elif isinstance(node, TryStmt):
+            walk(node.try_block)
+            if node.catch_block:
+                walk(node.catch_block)
+
+    walk(block)
+    return list(names)
+
+
+def resolve_program(program: Program) -> Resolution:
+    """Resolve variable slots of a program."""
+    return Resolver().resolve(program)
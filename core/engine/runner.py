@@ -4,11 +4,25 @@ RetroAuto v2 - Core Runner
 Execute flows with Label/Goto support and action dispatch.
 """
 
+import random
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
 from typing import Any
 
+from core.analytics.metrics import ActionMetrics, phase
 from core.engine.context import EngineState, ExecutionContext
+from core.engine.flight_recorder import FlightRecorder, verify_enabled
+from core.engine.flow_compiler import (
+    OP_BRANCH,
+    OP_CALL,
+    OP_GOTO,
+    OP_JUMP,
+    FlowCompiler,
+)
+from core.engine.timing import PrecisionTimer, ticks
 from core.graph.walker import GraphWalker
 from core.models import (
     Action,
@@ -32,6 +46,7 @@ from core.models import (
     Loop,
     Notify,
     NotifyMethod,
+    ROI,
     ReadText,
     RunFlow,
     Scroll,
@@ -40,13 +55,16 @@ from core.models import (
     WaitPixel,
     WhileImage,
 )
-from core.vision.hasher import calculate_phash, hamming_distance
 from infra import get_logger
-from vision import WaitResult
+from vision import WaitOutcome, WaitResult
 from vision.ocr import TextReader
 
 logger = get_logger("Runner")
 
+# Blocking actions are generators that yield seconds to sleep and return the
+# action result; Runner drives them with PrecisionTimer, AsyncRunner with asyncio
+Steps = Generator[float, None, bool | int | None]
+
 
 from core.watchdog import SystemWatchdog
 
@@ -57,8 +75,9 @@ class Runner:
 
     Features:
     - Single-step and full-flow execution
-    - Label/Goto flow control
+    - Label/Goto flow control (also inside branches)
     - IfImage conditional branching
+    - Compiled dispatch plans (no per-step type dispatch)
     - Nested flow calls (RunFlow)
     - Stop/Pause support
     - System Watchdog monitoring
@@ -70,6 +89,8 @@ class Runner:
         on_step: Callable[[str, int, Action], None] | None = None,
         on_complete: Callable[[str, bool], None] | None = None,
         on_notify: Callable[[str, str], None] | None = None,
+        metrics: ActionMetrics | None = None,
+        stats_path: Path | None = None,
     ) -> None:
         """
         Initialize runner.
@@ -78,6 +99,10 @@ class Runner:
             ctx: Execution context with all services
             on_step: Callback when step starts (flow, index, action)
             on_complete: Callback when flow completes (flow, success)
+            metrics: Per-action latency histograms (default: global registry)
+            stats_path: Where the histograms are saved after each top-level
+                flow, for `retro stats` (None = don't save; the app and the
+                CLI pass ACTION_STATS_PATH)
         """
         self._ctx = ctx
         self._on_step = on_step
@@ -86,6 +111,57 @@ class Runner:
         self._call_stack: list[tuple[str, int]] = []  # For nested RunFlow
         self._ocr = TextReader()
         self._watchdog = SystemWatchdog()
+        self._flight = FlightRecorder(ctx.frames)  # Background visual-change checks
+        self._verify_action = False  # Current action is checked by the Flight Recorder
+        self._timer = PrecisionTimer(ctx)  # Drift-free, stop/pause-aware sleeps
+        self._metrics = metrics or ActionMetrics()
+        self._stats_path = stats_path
+
+        # Action type -> handler(action)
+        self._handlers: dict[type, Callable[[Any], bool | int | None]] = {
+            WaitImage: self._exec_wait_image,
+            Click: self._exec_click,
+            ClickRandom: self._exec_click_random,
+            Hotkey: self._exec_hotkey,
+            TypeText: self._exec_type_text,
+            Label: self._exec_label,
+            RunFlow: self._exec_run_flow,
+            Delay: self._exec_delay,
+            ReadText: self._exec_read_text,
+            ClickImage: self._exec_click_image,
+            Drag: self._exec_drag,
+            Notify: self._exec_notify,
+            Scroll: self._exec_scroll,
+            DelayRandom: self._exec_delay_random,
+            WaitPixel: self._exec_wait_pixel,
+            ClickUntil: self._exec_click_until,
+        }
+        # Action type -> handler(action, flow, labels)
+        self._flow_handlers: dict[type, Callable[..., bool | int | None]] = {
+            IfImage: self._exec_if_image,
+            Goto: lambda action, flow, labels: self._exec_goto(action, labels),
+            IfText: self._exec_if_text,
+            Loop: self._exec_loop,
+            WhileImage: self._exec_while_image,
+            IfPixel: self._exec_if_pixel,
+            IfNotImage: self._exec_if_not_image,
+            IfAllImages: self._exec_if_all_images,
+            IfAnyImage: self._exec_if_any_image,
+        }
+        # Conditional type -> predicate(action); True runs then_actions
+        self._predicates: dict[type, Callable[[Any], bool]] = {
+            IfImage: self._cond_if_image,
+            IfText: self._cond_if_text,
+            IfPixel: self._cond_if_pixel,
+            IfNotImage: self._cond_if_not_image,
+            IfAllImages: self._cond_if_all_images,
+            IfAnyImage: self._cond_if_any_image,
+        }
+        self._compiler = FlowCompiler(
+            self._resolve_handler,
+            self._resolve_predicate,
+            recorded=verify_enabled,
+        )
 
     def run_flow(self, flow_name: str, from_step: int = 0) -> bool:
         """
@@ -98,10 +174,43 @@ class Runner:
         Returns:
             True if completed successfully, False if stopped/error
         """
+        flow = self._start_flow(flow_name, from_step)
+        if flow is None:
+            return False
+
+        try:
+            # Check if flow has a graph representation
+            if flow.graph and flow.graph.nodes:
+                logger.info("Executing flow using graph mode")
+                return self._execute_graph(flow)
+
+            # Legacy mode: execute as linear list
+            logger.info("Executing flow using legacy list mode")
+            return self._execute_list(flow, from_step, flow_name)
+        finally:
+            if not self._call_stack:
+                self._save_stats()
+
+    @property
+    def metrics(self) -> ActionMetrics:
+        """Per-action latency histograms."""
+        return self._metrics
+
+    def _save_stats(self) -> None:
+        """Persist the latency histograms for `retro stats`."""
+        if self._stats_path is None:
+            return
+        try:
+            self._metrics.save(self._stats_path)
+        except OSError as e:
+            logger.warning("Could not save action stats to %s: %s", self._stats_path, e)
+
+    def _start_flow(self, flow_name: str, from_step: int) -> Flow | None:
+        """Look up a flow, enter RUNNING and run the pre-flight checks."""
         flow = self._ctx.script.get_flow(flow_name)
         if flow is None:
             logger.error("Flow not found: %s", flow_name)
-            return False
+            return None
 
         self._ctx.set_state(EngineState.RUNNING)
         logger.info("Starting flow: %s (from step %d)", flow_name, from_step)
@@ -120,15 +229,7 @@ class Runner:
                 "⚠️ OCR not available (Tesseract not found). ReadText/IfText actions may fail."
             )
 
-        # Check if flow has a graph representation
-        if flow.graph and flow.graph.nodes:
-            logger.info("Executing flow using graph mode")
-            return self._execute_graph(flow)
-
-        # Legacy mode: execute as linear list
-        logger.info("Executing flow using legacy list mode")
-        labels = self._build_label_index(flow)
-        return self._execute_list(flow, from_step, labels, flow_name)
+        return flow
 
     def _execute_graph(self, flow: Flow) -> bool:
         """Execute flow using graph walker."""
@@ -155,27 +256,37 @@ class Runner:
             logger.error(f"Graph execution failed: {e}")
             return False
 
-    def _execute_list(
-        self, flow: Flow, from_step: int, labels: dict[str, int], flow_name: str = "main"
-    ) -> bool:
-        """Execute flow using traditional linear list walker (backward compat)."""
-        # Build label index for fast Goto
-        labels = self._build_label_index(flow)
+    def _execute_list(self, flow: Flow, from_step: int, flow_name: str = "main") -> bool:
+        """
+        Execute flow as a linear list (backward compat).
 
-        pc = from_step  # Program counter
+        The flow is compiled once into a flat plan (see flow_compiler):
+        handlers are pre-resolved, Goto targets are plan indexes and
+        conditional branches are inlined, so each step is a tuple unpack
+        and a direct call.
+        """
+        plan = self._compiler.get(flow)
+        steps = plan.steps
+        pc = plan.index_of(from_step)  # Program counter (plan index)
+        step = from_step
         success = True
 
+        # System Watchdog config (only if run_options available)
+        run_options = getattr(self._ctx, "run_options", {})
+        watchdog_cfg = run_options.get("watchdog", {}) if run_options else None
+
         try:
-            while pc < len(flow.actions):
-                # 1. System Watchdog Check (only if run_options available)
-                run_options = getattr(self._ctx, "run_options", {})
-                if run_options:
-                    watchdog_cfg = run_options.get("watchdog", {})
-                    is_healthy, msg = self._watchdog.check_health(watchdog_cfg)
-                    if not is_healthy:
-                        logger.error(f"🛑 Watchdog Stop: {msg}")
-                        # Handle as error to stop script
-                        raise RuntimeError(f"System Watchdog failed: {msg}")
+            while pc < len(steps):
+                op, handler, action, target, end, step, top, recorded = steps[pc]
+
+                if top:
+                    # 1. System Watchdog Check
+                    if watchdog_cfg is not None:
+                        is_healthy, msg = self._watchdog.check_health(watchdog_cfg)
+                        if not is_healthy:
+                            logger.error(f"🛑 Watchdog Stop: {msg}")
+                            # Handle as error to stop script
+                            raise RuntimeError(f"System Watchdog failed: {msg}")
 
                 # 2. Check stop/pause
                 if not self._ctx.wait_if_paused():
@@ -183,31 +294,49 @@ class Runner:
                     success = False
                     break
 
-                action = flow.actions[pc]
-                self._ctx.update_step(flow_name, pc)
+                if op == OP_JUMP:
+                    pc = target
+                    continue
+
+                if top:
+                    self._ctx.update_step(flow_name, step)
+
+                    # Callback
+                    if self._on_step:
+                        self._on_step(flow_name, step, action)
+
+                if op == OP_GOTO:
+                    logger.info("Goto: %s (step %d)", action.label, steps[target].step)
+                    pc = target
+                    continue
 
-                # Callback
-                if self._on_step:
-                    self._on_step(flow_name, pc, action)
+                if op == OP_BRANCH:
+                    self._new_tick()
+                    taken = self._evaluate(handler, action)
+                    pc = end if taken is None else pc + 1 if taken else target
+                    continue
+
+                if op != OP_CALL:  # Label
+                    pc += 1
+                    continue
 
                 # Execute action
                 start_time = time.perf_counter()
-                result = self._execute_action(action, flow, labels)
+                result = self._execute_action(action, flow, {}, handler, recorded)
                 elapsed = int((time.perf_counter() - start_time) * 1000)
 
-                logger.debug("Step %d completed in %dms", pc, elapsed)
+                logger.debug("Step %d completed in %dms", step, elapsed)
 
-                # Handle Goto
-                if isinstance(result, int):
-                    pc = result
-                elif result is False:
+                if result is False:
                     success = False
                     break
+                elif isinstance(result, int) and result is not True:
+                    pc = plan.index_of(result)  # Step index from an uncompiled handler
                 else:
                     pc += 1
 
         except Exception as e:
-            logger.exception("Error in flow %s step %d: %s", flow_name, pc, e)
+            logger.exception("Error in flow %s step %d: %s", flow_name, step, e)
             success = False
 
         # Callback
@@ -308,169 +437,204 @@ class Runner:
         action: Action,
         flow: Flow,
         labels: dict[str, int],
+        handler: Callable[[Action], bool | int | None] | None = None,
+        recorded: bool | None = None,
     ) -> bool | int | None:
         """
         Execute single action.
 
+        Args:
+            handler: Pre-resolved handler from a compiled plan
+            recorded: Pre-computed Flight Recorder flag from a compiled plan
+
         Returns:
             - None: Continue to next step
             - int: Jump to this step index (Goto)
             - False: Stop execution
         """
-        if isinstance(action, (Click, ClickImage, ClickRandom, Drag)):
-            hash_before = self._capture_hash()
-
-            # Execute
-            result = self._dispatch_action(action, flow, labels)
-
-            # Flight Recorder: Check for change
-            if hash_before is not None:
-                # Wait for reaction (small delay)
-                time.sleep(0.1)
-                hash_after = self._capture_hash()
-                if hash_after is not None:
-                    dist = hamming_distance(hash_before, hash_after)
-                    if dist <= 1:  # Allow exceedingly minor noise (0 or 1 bit)
-                        logger.warning(
-                            f"✈️ FlightRecorder: Action '{type(action).__name__}' resulted in NO VISUAL CHANGE (dist={dist}). Possible failure."
-                        )
-                    else:
-                        logger.debug(f"FlightRecorder: Visual change confirmed (dist={dist})")
+        self._new_tick()
 
-            return result
-        else:
-            return self._dispatch_action(action, flow, labels)
+        # Flight Recorder: input handlers check via _flight_check, off-thread
+        self._verify_action = verify_enabled(action, flow) if recorded is None else recorded
+        try:
+            return self._dispatch_action(action, flow, labels, handler)
+        finally:
+            self._verify_action = False
+
+    def _new_tick(self) -> None:
+        """Each action is one frame-bus tick: all reads share one capture."""
+        avoided = self._ctx.frames.new_tick()
+        if avoided:
+            logger.debug("FrameBus: previous tick avoided %d grabs", avoided)
+
+    @property
+    def flight_recorder(self) -> FlightRecorder:
+        """Background verifier for input actions."""
+        return self._flight
+
+    @contextmanager
+    def _flight_check(self, action: Action, x: int, y: int) -> Iterator[None]:
+        """
+        Flight Recorder: snapshot the region around (x, y) before the input
+        and queue the check after it. The flow does not wait for the verdict.
+        """
+        check = self._flight.snapshot(action, x, y) if self._verify_action else None
+        with phase("input"):
+            yield
+        if check is not None:
+            self._flight.submit(check)
 
     def _dispatch_action(
-        self, action: Action, flow: Flow, labels: dict[str, int]
+        self,
+        action: Action,
+        flow: Flow,
+        labels: dict[str, int],
+        handler: Callable[[Action], bool | int | None] | None = None,
     ) -> bool | int | None:
         """
         Internal dispatch with error handling wrapper.
 
         All action execution is wrapped for:
-        - Execution time logging
+        - Per-action latency histograms (ActionMetrics)
         - Graceful error recovery
         - Detailed error context
         """
-        action_type = type(action).__name__
+        span = self._metrics.begin()
         start_time = time.perf_counter()
 
         try:
-            result = self._safe_execute(action, flow, labels)
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-            logger.info(f"✅ {action_type} completed in {elapsed_ms}ms")
+            if handler is not None:
+                result = handler(action)
+            else:
+                result = self._safe_execute(action, flow, labels)
+            logger.debug(
+                "%s completed in %.1fms",
+                type(action).__name__,
+                (time.perf_counter() - start_time) * 1000,
+            )
             return result
 
-        except TimeoutError as e:
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-            logger.error(f"⏱️ {action_type} TIMEOUT after {elapsed_ms}ms: {e}")
-            return None  # Continue to next action
+        except Exception as e:
+            self._log_action_error(action, e, start_time)
+            return None  # Continue to next action (don't crash flow)
+
+        finally:
+            self._metrics.end(
+                span,
+                type(action).__name__,
+                getattr(action, "asset_id", None) or "",
+                time.perf_counter() - start_time,
+            )
 
-        except FileNotFoundError as e:
-            logger.error(f"❌ {action_type} Asset not found: {e}")
-            return None  # Continue to next action
+    def _log_action_error(self, action: Action, error: Exception, start_time: float) -> None:
+        """Log a failed action; the flow continues with the next action."""
+        action_type = type(action).__name__
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
 
-        except Exception as e:
-            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
-            logger.error(f"❌ {action_type} FAILED after {elapsed_ms}ms: {e}")
+        if isinstance(error, TimeoutError):
+            logger.error(f"⏱️ {action_type} TIMEOUT after {elapsed_ms}ms: {error}")
+        elif isinstance(error, FileNotFoundError):
+            logger.error(f"❌ {action_type} Asset not found: {error}")
+        else:
+            logger.error(f"❌ {action_type} FAILED after {elapsed_ms}ms: {error}")
             # Log full traceback at debug level
             logger.debug(f"Traceback for {action_type}:", exc_info=True)
-            return None  # Continue to next action (don't crash flow)
 
     def _safe_execute(
         self, action: Action, flow: Flow, labels: dict[str, int]
     ) -> bool | int | None:
         """Execute action with specific handlers."""
-        if isinstance(action, WaitImage):
-            return self._exec_wait_image(action)
+        return self._resolve_handler(action, flow, labels)(action)
 
-        elif isinstance(action, Click):
-            return self._exec_click(action)
+    def _resolve_handler(
+        self, action: Action, flow: Flow, labels: dict[str, int]
+    ) -> Callable[[Action], bool | int | None]:
+        """Look up the handler for an action, binding flow context if it needs it."""
+        action_type = type(action)
+        handler = self._handlers.get(action_type)
+        if handler is not None:
+            return handler
 
-        elif isinstance(action, ClickRandom):
-            return self._exec_click_random(action)
+        handler = self._flow_handlers.get(action_type)
+        if handler is not None:
+            return partial(handler, flow=flow, labels=labels)
 
-        elif isinstance(action, IfImage):
-            return self._exec_if_image(action, flow, labels)
+        return self._exec_unknown
 
-        elif isinstance(action, Hotkey):
-            return self._exec_hotkey(action)
+    def _resolve_predicate(self, action: Action) -> Callable[[Action], bool] | None:
+        """Look up the predicate of a conditional (None if the action does not branch)."""
+        return self._predicates.get(type(action))
 
-        elif isinstance(action, TypeText):
-            return self._exec_type_text(action)
+    def _evaluate(self, predicate: Callable[[Action], bool], action: Action) -> bool | None:
+        """
+        Evaluate a compiled conditional, recorded in ActionMetrics like any action.
 
-        elif isinstance(action, Label):
-            # Labels are no-ops at runtime
+        Returns:
+            The predicate result, or None if it failed (the conditional is skipped)
+        """
+        span = self._metrics.begin()
+        start_time = time.perf_counter()
+        try:
+            return predicate(action)
+        except Exception as e:
+            logger.error(f"❌ {type(action).__name__} FAILED: {e}")
+            logger.debug(f"Traceback for {type(action).__name__}:", exc_info=True)
             return None
+        finally:
+            self._metrics.end(
+                span,
+                type(action).__name__,
+                getattr(action, "asset_id", None) or "",
+                time.perf_counter() - start_time,
+            )
 
-        elif isinstance(action, Goto):
-            return self._exec_goto(action, labels)
-
-        elif isinstance(action, RunFlow):
-            return self._exec_run_flow(action)
-
-        elif isinstance(action, Delay):
-            return self._exec_delay(action)
-
-        elif isinstance(action, ReadText):
-            return self._exec_read_text(action)
-
-        elif isinstance(action, IfText):
-            return self._exec_if_text(action, flow, labels)
-
-        elif isinstance(action, ClickImage):
-            return self._exec_click_image(action)
-
-        elif isinstance(action, Drag):
-            return self._exec_drag(action)
-
-        elif isinstance(action, Notify):
-            return self._exec_notify(action)
-
-        elif isinstance(action, Scroll):
-            return self._exec_scroll(action)
-
-        elif isinstance(action, DelayRandom):
-            return self._exec_delay_random(action)
-
-        elif isinstance(action, Loop):
-            return self._exec_loop(action, flow, labels)
-
-        elif isinstance(action, WhileImage):
-            return self._exec_while_image(action, flow, labels)
-
-        elif isinstance(action, WaitPixel):
-            return self._exec_wait_pixel(action)
-
-        elif isinstance(action, IfPixel):
-            return self._exec_if_pixel(action, flow, labels)
-
-        elif isinstance(action, ClickUntil):
-            return self._exec_click_until(action)
-
-        elif isinstance(action, IfNotImage):
-            return self._exec_if_not_image(action, flow, labels)
+    def _run_branch(
+        self, branch: list[Action], flow: Flow, labels: dict[str, int]
+    ) -> bool | int | None:
+        """Execute branch actions inline (uncompiled path), propagating Goto and stop."""
+        for sub_action in branch:
+            if not self._ctx.wait_if_paused():
+                return False
+            result = self._execute_action(sub_action, flow, labels)
+            if result is False:
+                return False
+            if isinstance(result, int) and result is not True:
+                return result  # Propagate Goto
 
-        elif isinstance(action, IfAllImages):
-            return self._exec_if_all_images(action, flow, labels)
+        return None
 
-        elif isinstance(action, IfAnyImage):
-            return self._exec_if_any_image(action, flow, labels)
+    def _exec_label(self, action: Label) -> None:
+        """Labels are no-ops at runtime."""
+        return None
 
-        else:
-            logger.warning("Unknown action type: %s", type(action).__name__)
-            return None
+    def _exec_unknown(self, action: Action) -> None:
+        """Fallback for action types without a handler."""
+        logger.warning("Unknown action type: %s", type(action).__name__)
+        return None
 
-    def _capture_hash(self) -> int | None:
-        """Capture screen and calculate hash for Flight Recorder."""
+    def _drive(self, steps: Steps) -> bool | int | None:
+        """Run a blocking action's steps, sleeping between them (stop -> False)."""
         try:
-            # We need to grab screen.
-            # self._ctx.capture (ScreenCapture) usually has grab() returning numpy/PIL
-            img = self._ctx.capture.grab()
-            return calculate_phash(img)
-        except Exception as e:
-            logger.warning(f"FlightRecorder capture failed: {e}")
-            return None
+            delay = next(steps)
+            while self._sleep(delay):
+                delay = next(steps)
+            return False
+        except StopIteration as done:
+            return done.value
+        finally:
+            steps.close()
+
+    def _sleep(self, seconds: float) -> bool:
+        """Sleep until a precise deadline, waking on stop/pause. Returns False if stopped."""
+        if seconds > 0:
+            with phase("wait"):
+                return self._timer.sleep(seconds)
+        return self._ctx.wait_if_paused()
+
+    def _read_pixel(self, x: int, y: int) -> tuple[int, int, int]:
+        """Read (r, g, b) at screen position from the current frame."""
+        b, g, r = self._ctx.frames.get(ROI(x=x, y=y, w=1, h=1))[0, 0]
+        return int(r), int(g), int(b)
 
     # ─────────────────────────────────────────────────────────────
     # Action Executors
@@ -533,12 +697,8 @@ class Runner:
     def _exec_read_text(self, action: ReadText) -> None:
         """Execute ReadText action."""
         try:
-            # Capture screen (returns PIL Image usually, depends on Capture impl)
-            # ctx.capture.grab() -> Image
-            screenshot = self._ctx.capture.grab()
-
-            text = self._ocr.read_from_image(
-                screenshot,
+            text = self._ocr.read_from_frame(
+                self._ctx.frames,
                 roi=action.roi,
                 allowlist=action.allowlist,
                 scale=action.scale,
@@ -553,8 +713,15 @@ class Runner:
         except Exception as e:
             logger.error("ReadText failed: %s", e)
 
-    def _exec_if_text(self, action: IfText, flow: Flow, labels: dict[str, int]) -> None:
+    def _exec_if_text(
+        self, action: IfText, flow: Flow, labels: dict[str, int]
+    ) -> bool | int | None:
         """Execute IfText conditional."""
+        branch = action.then_actions if self._cond_if_text(action) else action.else_actions
+        return self._run_branch(branch, flow, labels)
+
+    def _cond_if_text(self, action: IfText) -> bool:
+        """Evaluate the IfText condition against the stored variable."""
         # Get variable value
         var_val = str(self._ctx.variables.get(action.variable_name, ""))
         target = action.value
@@ -581,66 +748,56 @@ class Runner:
             result = False
 
         logger.info("IfText: '%s' %s '%s' -> %s", var_val, op, target, result)
+        return result
 
-        branch = action.then_actions if result else action.else_actions
-
-        # Execute branch
-        for sub_action in branch:
-            # Check stop/pause between sub-actions
-            if not self._ctx.wait_if_paused():
-                return None
-
-            # Recursive execution? No, flat execution context needed for goto/labels usually
-            # But action models support nesting. We can execute purely.
-            # Note: Goto inside IfText won't work well unless we flatten the flow.
-            # For now, we just execute simple actions.
-            self._execute_action(sub_action, flow, labels)
-
-    def _exec_click_image(self, action: ClickImage) -> None:
+    def _exec_click_image(self, action: ClickImage) -> bool | None:
         """Execute ClickImage with wait and retry/backoff."""
-        import time
-        
+        return self._drive(self._click_image_steps(action))
+
+    def _click_image_steps(self, action: ClickImage) -> Steps:
+        """ClickImage as polling steps."""
         # Retry configuration
         max_retries = getattr(action, 'max_retries', 3)
         base_delay_ms = 500  # Start with 500ms backoff
-        
+
         last_error = None
         for attempt in range(max_retries):
             # Exponential backoff delay (skip on first attempt)
             if attempt > 0:
                 backoff_delay = base_delay_ms * (2 ** (attempt - 1)) / 1000.0
                 logger.debug(f"ClickImage retry {attempt}/{max_retries} after {backoff_delay:.1f}s")
-                time.sleep(backoff_delay)
-                
+                yield backoff_delay
+
                 # Clear matcher cache for fresh capture
                 if self._ctx.matcher:
                     self._ctx.matcher.clear_cache()
-            
-            result = self._ctx.wait_for_image(
+
+            result = yield from self._ctx.waiter.poll(
                 action.asset_id,
                 timeout_ms=action.timeout_ms,
-                appear=True,
                 smart_wait=action.smart_wait,
             )
-            
-            if result and result.found:
+
+            if result.found and result.match:
                 # Click with offset
-                x = result.location[0] + action.offset_x
-                y = result.location[1] + action.offset_y
+                cx, cy = result.match.center
+                x = cx + action.offset_x
+                y = cy + action.offset_y
 
                 logger.info(
                     f"ClickImage '{action.asset_id}' at ({x},{y}) button={action.button} clicks={action.clicks}"
                 )
 
                 # Perform clicks
-                for i in range(action.clicks):
-                    if i > 0:
-                        time.sleep(action.interval_ms / 1000.0)
-                    self._ctx.mouse.click(x, y, button=action.button)
-                return  # Success!
-            
+                with self._flight_check(action, x, y):
+                    for i in range(action.clicks):
+                        if i > 0:
+                            yield action.interval_ms / 1000.0
+                        self._ctx.mouse.click(x, y, button=action.button)
+                return None  # Success!
+
             last_error = f"Image not found: {action.asset_id}"
-        
+
         # All retries exhausted
         raise RuntimeError(f"{last_error} (after {max_retries} attempts)")
 
@@ -669,6 +826,34 @@ class Runner:
                 roi_override=action.roi_override,
                 smart_wait=action.smart_wait,
             )
+        return self._wait_image_result(action, outcome)
+
+    def _wait_image_steps(self, action: WaitImage) -> Steps:
+        """WaitImage as polling steps."""
+        logger.info(
+            "WaitImage: %s (appear=%s, timeout=%dms)",
+            action.asset_id,
+            action.appear,
+            action.timeout_ms,
+        )
+        outcome = yield from self._ctx.waiter.poll(
+            action.asset_id,
+            appear=action.appear,
+            timeout_ms=action.timeout_ms,
+            poll_ms=action.poll_ms,
+            roi_override=action.roi_override,
+            smart_wait=action.smart_wait,
+        )
+        return self._wait_image_result(action, outcome)
+
+    def _wait_image_result(self, action: WaitImage, outcome: WaitOutcome) -> bool | None:
+        """Map a WaitImage outcome to the action result."""
+        logger.debug(
+            "WaitImage %s: %d matches, %d avoided (region unchanged)",
+            action.asset_id,
+            outcome.matches_run,
+            outcome.matches_avoided,
+        )
 
         if outcome.result == WaitResult.SUCCESS:
             if outcome.match:
@@ -682,6 +867,10 @@ class Runner:
 
     def _exec_click(self, action: Click) -> None:
         """Execute click action."""
+        return self._drive(self._click_steps(action))
+
+    def _click_steps(self, action: Click) -> Steps:
+        """Click as steps (interval between clicks is yielded)."""
         if action.x is not None and action.y is not None:
             x, y = action.x, action.y
         else:
@@ -694,14 +883,11 @@ class Runner:
         logger.info(f"Clicking at ({x}, {y}) button={action.button} clicks={action.clicks}")
 
         # Perform clicks
-        for i in range(action.clicks):
-            if i > 0:
-                # Wait interval between clicks
-                import time
-
-                time.sleep(action.interval_ms / 1000.0)
-
-            self._ctx.mouse.click(x, y, button=action.button)
+        with self._flight_check(action, x, y):
+            for i in range(action.clicks):
+                if i > 0:
+                    yield action.interval_ms / 1000.0  # Wait interval between clicks
+                self._ctx.mouse.click(x, y, button=action.button)
         return None
 
     def _exec_if_image(
@@ -711,27 +897,20 @@ class Runner:
         labels: dict[str, int],
     ) -> bool | int | None:
         """Execute IfImage conditional."""
+        branch = action.then_actions if self._cond_if_image(action) else action.else_actions
+        return self._run_branch(branch, flow, labels)
+
+    def _cond_if_image(self, action: IfImage) -> bool:
+        """True if the IfImage asset is on screen."""
         match = self._ctx.matcher.find(action.asset_id, action.roi_override)
 
         if match:
             logger.info("IfImage: %s FOUND (conf=%.2f)", action.asset_id, match.confidence)
             self._ctx.last_match = match
-            branch = action.then_actions
-        else:
-            logger.info("IfImage: %s NOT FOUND", action.asset_id)
-            branch = action.else_actions
-
-        # Execute branch actions inline
-        for sub_action in branch:
-            if not self._ctx.wait_if_paused():
-                return False
-            result = self._execute_action(sub_action, flow, labels)
-            if result is False:
-                return False
-            if isinstance(result, int):
-                return result  # Propagate Goto
+            return True
 
-        return None
+        logger.info("IfImage: %s NOT FOUND", action.asset_id)
+        return False
 
     def _exec_if_not_image(
         self,
@@ -740,25 +919,22 @@ class Runner:
         labels: dict[str, int],
     ) -> bool | int | None:
         """Execute IfNotImage conditional (runs when image NOT found)."""
+        if not self._cond_if_not_image(action):
+            return None  # Image found, skip then_actions
+
+        # Execute then_actions since image is NOT found
+        return self._run_branch(action.then_actions, flow, labels)
+
+    def _cond_if_not_image(self, action: IfNotImage) -> bool:
+        """True if the IfNotImage asset is NOT on screen."""
         match = self._ctx.matcher.find(action.asset_id, action.roi_override)
 
         if match:
             logger.info("IfNotImage: %s FOUND - skipping actions", action.asset_id)
-            return None  # Image found, skip then_actions
+            return False
 
         logger.info("IfNotImage: %s NOT FOUND - executing actions", action.asset_id)
-
-        # Execute then_actions since image is NOT found
-        for sub_action in action.then_actions:
-            if not self._ctx.wait_if_paused():
-                return False
-            result = self._execute_action(sub_action, flow, labels)
-            if result is False:
-                return False
-            if isinstance(result, int):
-                return result  # Propagate Goto
-
-        return None
+        return True
 
     def _exec_if_all_images(
         self,
@@ -767,14 +943,20 @@ class Runner:
         labels: dict[str, int],
     ) -> bool | int | None:
         """Execute IfAllImages - AND logic, all images must be found."""
+        branch = action.then_actions if self._cond_if_all_images(action) else action.else_actions
+        return self._run_branch(branch, flow, labels)
+
+    def _cond_if_all_images(self, action: IfAllImages) -> bool:
+        """True if every IfAllImages asset is on screen."""
         all_found = True
         found_ids = []
 
-        for asset_id in action.asset_ids:
-            match = self._ctx.matcher.find(asset_id)
-            if match:
+        # One batched pass over the shared frame for every asset
+        results = self._ctx.matcher.find_many(action.asset_ids)
+        for asset_id, result in results.items():
+            if result.match:
                 found_ids.append(asset_id)
-                self._ctx.last_match = match
+                self._ctx.last_match = result.match
             else:
                 all_found = False
                 logger.info("IfAllImages: %s NOT FOUND - AND failed", asset_id)
@@ -782,21 +964,9 @@ class Runner:
 
         if all_found:
             logger.info("IfAllImages: ALL found (%s) - executing then_actions", found_ids)
-            branch = action.then_actions
         else:
             logger.info("IfAllImages: Not all found - executing else_actions")
-            branch = action.else_actions
-
-        for sub_action in branch:
-            if not self._ctx.wait_if_paused():
-                return False
-            result = self._execute_action(sub_action, flow, labels)
-            if result is False:
-                return False
-            if isinstance(result, int):
-                return result
-
-        return None
+        return all_found
 
     def _exec_if_any_image(
         self,
@@ -805,40 +975,28 @@ class Runner:
         labels: dict[str, int],
     ) -> bool | int | None:
         """Execute IfAnyImage - OR logic, at least one image must be found."""
-        any_found = False
-        found_id = None
-
-        for asset_id in action.asset_ids:
-            match = self._ctx.matcher.find(asset_id)
-            if match:
-                any_found = True
-                found_id = asset_id
-                self._ctx.last_match = match
+        branch = action.then_actions if self._cond_if_any_image(action) else action.else_actions
+        return self._run_branch(branch, flow, labels)
+
+    def _cond_if_any_image(self, action: IfAnyImage) -> bool:
+        """True if at least one IfAnyImage asset is on screen."""
+        # One batched pass; the first found asset in list order wins
+        results = self._ctx.matcher.find_many(action.asset_ids)
+        for asset_id, result in results.items():
+            if result.match:
+                self._ctx.last_match = result.match
                 logger.info("IfAnyImage: %s FOUND - OR satisfied", asset_id)
-                break
-
-        if any_found:
-            logger.info("IfAnyImage: Found '%s' - executing then_actions", found_id)
-            branch = action.then_actions
-        else:
-            logger.info("IfAnyImage: NONE found - executing else_actions")
-            branch = action.else_actions
-
-        for sub_action in branch:
-            if not self._ctx.wait_if_paused():
-                return False
-            result = self._execute_action(sub_action, flow, labels)
-            if result is False:
-                return False
-            if isinstance(result, int):
-                return result
+                logger.info("IfAnyImage: Found '%s' - executing then_actions", asset_id)
+                return True
 
-        return None
+        logger.info("IfAnyImage: NONE found - executing else_actions")
+        return False
 
     def _exec_hotkey(self, action: Hotkey) -> None:
         """Execute Hotkey action."""
         logger.info("Hotkey: %s", "+".join(action.keys))
-        self._ctx.keyboard.hotkey(action.keys)
+        with phase("input"):
+            self._ctx.keyboard.hotkey(action.keys)
         return None
 
     def _exec_type_text(self, action: TypeText) -> None:
@@ -848,7 +1006,8 @@ class Runner:
             action.text[:20] if len(action.text) > 20 else action.text,
             action.paste_mode,
         )
-        self._ctx.keyboard.type_text(action.text, action.paste_mode, action.enter)
+        with phase("input"):
+            self._ctx.keyboard.type_text(action.text, action.paste_mode, action.enter)
         return None
 
     def _exec_goto(self, action: Goto, labels: dict[str, int]) -> int | None:
@@ -882,27 +1041,19 @@ class Runner:
 
         return None if success else False
 
-    def _exec_delay(self, action: Delay) -> None:
+    def _exec_delay(self, action: Delay) -> bool | None:
         """Execute Delay action."""
-        logger.info("Delay: %dms", action.ms)
-
-        # Sleep in small chunks to allow stop/pause
-        remaining = action.ms
-        chunk = 100  # 100ms chunks
-
-        while remaining > 0:
-            if not self._ctx.wait_if_paused():
-                return None
-            sleep_time = min(chunk, remaining)
-            time.sleep(sleep_time / 1000.0)
-            remaining -= sleep_time
+        return self._drive(self._delay_steps(action))
 
+    def _delay_steps(self, action: Delay) -> Steps:
+        """Delay as polling steps."""
+        logger.info("Delay: %dms", action.ms)
+        if action.ms > 0:
+            yield action.ms / 1000.0
         return None
 
     def _exec_click_random(self, action: ClickRandom) -> None:
         """Execute ClickRandom action."""
-        import random
-
         # Calculate random point within ROI
         # Use normal distribution (gaussian) for more human-like "center-bias"
         # but clamp to ROI bounds
@@ -933,13 +1084,14 @@ class Runner:
             action.roi.h,
         )
 
-        self._ctx.mouse.click(
-            x=x,
-            y=y,
-            button=action.button,
-            clicks=action.clicks,
-            interval=action.interval_ms / 1000.0,
-        )
+        with self._flight_check(action, x, y):
+            self._ctx.mouse.click(
+                x=x,
+                y=y,
+                button=action.button,
+                clicks=action.clicks,
+                interval=action.interval_ms / 1000.0,
+            )
         return None
 
     # ═══════════════════════════════════════════════════════════════
@@ -954,14 +1106,15 @@ class Runner:
             action.to_x, action.to_y,
             action.duration_ms,
         )
-        self._ctx.mouse.drag(
-            from_x=action.from_x,
-            from_y=action.from_y,
-            to_x=action.to_x,
-            to_y=action.to_y,
-            duration=action.duration_ms / 1000.0,
-            button=action.button,
-        )
+        with self._flight_check(action, action.to_x, action.to_y):
+            self._ctx.mouse.drag(
+                from_x=action.from_x,
+                from_y=action.from_y,
+                to_x=action.to_x,
+                to_y=action.to_y,
+                duration=action.duration_ms / 1000.0,
+                button=action.button,
+            )
         return None
 
     def _exec_scroll(self, action: Scroll) -> None:
@@ -969,24 +1122,20 @@ class Runner:
         x = action.x if action.x is not None else self._ctx.mouse.position()[0]
         y = action.y if action.y is not None else self._ctx.mouse.position()[1]
         logger.info("Scroll: amount=%d at (%d, %d)", action.amount, x, y)
-        self._ctx.mouse.scroll(x=x, y=y, amount=action.amount)
+        with phase("input"):
+            self._ctx.mouse.scroll(x=x, y=y, amount=action.amount)
         return None
 
-    def _exec_delay_random(self, action: DelayRandom) -> None:
+    def _exec_delay_random(self, action: DelayRandom) -> bool | None:
         """Execute DelayRandom action."""
-        import random
+        return self._drive(self._delay_random_steps(action))
+
+    def _delay_random_steps(self, action: DelayRandom) -> Steps:
+        """DelayRandom as polling steps."""
         delay_ms = random.randint(action.min_ms, action.max_ms)
         logger.info("DelayRandom: %dms (range %d-%d)", delay_ms, action.min_ms, action.max_ms)
-
-        # Sleep in chunks for stop/pause support
-        remaining = delay_ms
-        chunk = 100
-        while remaining > 0:
-            if not self._ctx.wait_if_paused():
-                return None
-            sleep_time = min(chunk, remaining)
-            time.sleep(sleep_time / 1000.0)
-            remaining -= sleep_time
+        if delay_ms > 0:
+            yield delay_ms / 1000.0
         return None
 
     def _exec_loop(self, action: Loop, flow: Flow, labels: dict[str, int]) -> None:
@@ -1032,6 +1181,10 @@ class Runner:
 
     def _exec_wait_pixel(self, action: WaitPixel) -> bool | None:
         """Execute WaitPixel action - wait for pixel color."""
+        return self._drive(self._wait_pixel_steps(action))
+
+    def _wait_pixel_steps(self, action: WaitPixel) -> Steps:
+        """WaitPixel as polling steps."""
         logger.info(
             "WaitPixel: (%d, %d) color=RGB(%d,%d,%d) appear=%s",
             action.x, action.y,
@@ -1039,22 +1192,13 @@ class Runner:
             action.appear,
         )
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         timeout_sec = action.timeout_ms / 1000.0
 
         while True:
-            if not self._ctx.wait_if_paused():
-                return False
-
             # Get pixel color at position
             try:
-                img = self._ctx.capture.grab()
-                # Access pixel at (x, y) - assumed PIL Image or numpy array
-                if hasattr(img, 'getpixel'):
-                    r, g, b = img.getpixel((action.x, action.y))[:3]
-                else:
-                    r, g, b = img[action.y, action.x][:3]
-
+                r, g, b = self._read_pixel(action.x, action.y)
                 color_matches = action.color.matches(r, g, b)
                 if (action.appear and color_matches) or (not action.appear and not color_matches):
                     logger.info("WaitPixel: condition met")
@@ -1063,53 +1207,53 @@ class Runner:
                 logger.warning("WaitPixel pixel check failed: %s", e)
 
             # Check timeout
-            if time.time() - start_time > timeout_sec:
+            if time.perf_counter() - start_time > timeout_sec:
                 logger.warning("WaitPixel: timeout after %dms", action.timeout_ms)
                 return None
 
-            time.sleep(action.poll_ms / 1000.0)
+            yield action.poll_ms / 1000.0
+            self._ctx.frames.invalidate()
 
-    def _exec_if_pixel(self, action: IfPixel, flow: Flow, labels: dict[str, int]) -> None:
+    def _exec_if_pixel(
+        self, action: IfPixel, flow: Flow, labels: dict[str, int]
+    ) -> bool | int | None:
         """Execute IfPixel conditional based on pixel color."""
+        # Execute appropriate branch
+        branch = action.then_actions if self._cond_if_pixel(action) else action.else_actions
+        return self._run_branch(branch, flow, labels)
+
+    def _cond_if_pixel(self, action: IfPixel) -> bool:
+        """True if the pixel matches the IfPixel color."""
         # Get pixel color
         try:
-            img = self._ctx.capture.grab()
-            if hasattr(img, 'getpixel'):
-                r, g, b = img.getpixel((action.x, action.y))[:3]
-            else:
-                r, g, b = img[action.y, action.x][:3]
-
+            r, g, b = self._read_pixel(action.x, action.y)
             color_matches = action.color.matches(r, g, b)
         except Exception as e:
             logger.warning("IfPixel pixel check failed: %s", e)
             color_matches = False
 
-        # Execute appropriate branch
-        actions_to_run = action.then_actions if color_matches else action.else_actions
+        branch = action.then_actions if color_matches else action.else_actions
         logger.info("IfPixel: (%d,%d) matched=%s, running %d actions",
-                    action.x, action.y, color_matches, len(actions_to_run))
-
-        for nested_action in actions_to_run:
-            result = self._dispatch_action(nested_action, flow, labels)
-            if result is False:
-                return False
-        return None
+                    action.x, action.y, color_matches, len(branch))
+        return color_matches
 
     def _exec_click_until(self, action: ClickUntil) -> bool | None:
         """Execute ClickUntil - click repeatedly until condition met."""
+        return self._drive(self._click_until_steps(action))
+
+    def _click_until_steps(self, action: ClickUntil) -> Steps:
+        """ClickUntil as polling steps."""
         logger.info(
             "ClickUntil: click=%s until=%s (appear=%s)",
             action.click_asset_id, action.until_asset_id, action.until_appear,
         )
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         timeout_sec = action.timeout_ms / 1000.0
         click_count = 0
+        schedule = ticks(action.click_interval_ms / 1000.0)  # Clicks at a fixed rate
 
         while click_count < action.max_clicks:
-            if not self._ctx.wait_if_paused():
-                return False
-
             # Check if target condition is met
             found = self._ctx.matcher.find(action.until_asset_id)
             is_present = found.found if hasattr(found, 'found') else bool(found)
@@ -1128,11 +1272,11 @@ class Runner:
                 logger.debug("ClickUntil: clicked %s (%d/%d)", action.click_asset_id, click_count, action.max_clicks)
 
             # Check timeout
-            if time.time() - start_time > timeout_sec:
+            if time.perf_counter() - start_time > timeout_sec:
                 logger.warning("ClickUntil: timeout after %dms, %d clicks", action.timeout_ms, click_count)
                 return None
 
-            time.sleep(action.click_interval_ms / 1000.0)
+            yield max(0.0, next(schedule) - time.perf_counter())
 
         logger.warning("ClickUntil: max clicks reached (%d)", action.max_clicks)
         return None
@@ -3,6 +3,12 @@ RetroAuto v2 - Scope Manager
 
 Variable scoping and lookup for RetroScript execution.
 Part of RetroScript Phase 9 - Script Execution Engine.
+
+Each flow call gets a Frame whose locals live in a fixed-size list; the
+slot of every local is assigned ahead of time by core.engine.resolver.
+Flow scopes are dynamic (a flow sees its caller's variables), so names
+that are not locals of the running flow are found by walking the caller
+frames and finally the global dict.
 """
 
 from __future__ import annotations
@@ -10,10 +16,27 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
+# Binding depths assigned by the resolver
+LOCAL = 0  # Slot in the running flow's frame
+GLOBAL = -1  # Global dict: no flow binds the name
+DYNAMIC = -2  # Bound by some other flow: walk the caller frames
+
+
+class _Unset:
+    """Marker for a local slot the flow has not defined (yet)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<unset>"
+
+
+UNSET: Any = _Unset()
+
 
 @dataclass
 class Scope:
-    """A single scope level."""
+    """A dict-backed scope level (the global scope)."""
 
     name: str  # Scope name (e.g., "global", "flow:main")
     variables: dict[str, Any] = field(default_factory=dict)
@@ -58,6 +81,86 @@ class Scope:
         return False
 
 
+@dataclass
+class ScopeLayout:
+    """Local variable slots of a flow, fixed before it runs."""
+
+    name: str  # Scope name (e.g., "flow:main")
+    names: list[str] = field(default_factory=list)  # Slot -> name
+    slots: dict[str, int] = field(default_factory=dict)  # Name -> slot
+
+    @classmethod
+    def from_names(cls, name: str, names: list[str]) -> ScopeLayout:
+        """Layout with one slot per name, in order."""
+        return cls(name=name, names=list(names), slots={n: i for i, n in enumerate(names)})
+
+
+class Frame:
+    """Variables of one flow call, stored by slot."""
+
+    __slots__ = ("layout", "values", "parent", "extra", "is_flow")
+
+    def __init__(self, layout: ScopeLayout, parent: Frame | None, is_flow: bool = True) -> None:
+        self.layout = layout
+        self.values: list[Any] = [UNSET] * len(layout.names)
+        self.parent = parent  # Caller frame (None = called from global scope)
+        self.extra: dict[str, Any] | None = None  # Names outside the layout
+        self.is_flow = is_flow
+
+    @property
+    def name(self) -> str:
+        return self.layout.name
+
+    def find(self, name: str) -> tuple[Any, bool]:
+        """Get a variable defined in this frame only."""
+        slot = self.layout.slots.get(name)
+        if slot is not None:
+            value = self.values[slot]
+            if value is not UNSET:
+                return value, True
+        if self.extra and name in self.extra:
+            return self.extra[name], True
+        return None, False
+
+    def set(self, name: str, value: Any) -> None:
+        """Define a variable in this frame."""
+        slot = self.layout.slots.get(name)
+        if slot is not None:
+            self.values[slot] = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+    def update(self, name: str, value: Any) -> bool:
+        """Update a variable already defined in this frame."""
+        slot = self.layout.slots.get(name)
+        if slot is not None and self.values[slot] is not UNSET:
+            self.values[slot] = value
+            return True
+        if self.extra and name in self.extra:
+            self.extra[name] = value
+            return True
+        return False
+
+    @property
+    def variables(self) -> dict[str, Any]:
+        """Defined variables of this frame as a dict."""
+        result = {
+            name: value
+            for name, value in zip(self.layout.names, self.values, strict=True)
+            if value is not UNSET
+        }
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def clear(self) -> None:
+        """Undefine every variable of this frame."""
+        self.values = [UNSET] * len(self.layout.names)
+        self.extra = None
+
+
 class ScopeManager:
     """Manages variable scopes for script execution.
 
@@ -68,49 +171,123 @@ class ScopeManager:
         scope.define("local_var", 20)
         print(scope.get("x"))  # 10 (from global)
         scope.pop()
+
+    The interpreter uses the slot API (`load`, `store`, `define_slot`) with
+    bindings from core.engine.resolver; the name API works on any frame.
     """
 
     def __init__(self) -> None:
         self._global = Scope(name="global")
-        self._stack: list[Scope] = [self._global]
+        self.globals: dict[str, Any] = self._global.variables
+        self.frame: Frame | None = None  # Innermost frame (None = global scope)
+        self._depth = 1
 
     @property
-    def current(self) -> Scope:
+    def current(self) -> Frame | Scope:
         """Get current scope."""
-        return self._stack[-1]
+        return self.frame if self.frame is not None else self._global
 
     @property
     def global_scope(self) -> Scope:
         """Get global scope."""
         return self._global
 
-    def push(self, name: str, is_flow: bool = False) -> Scope:
+    def push(self, name: str, is_flow: bool = False, layout: ScopeLayout | None = None) -> Frame:
         """Push a new scope onto the stack.
 
         Args:
             name: Scope name
             is_flow: Whether this is a flow scope
+            layout: Precomputed slots (from the resolver), if any
 
         Returns:
-            The new scope
+            The new frame
         """
-        new_scope = Scope(
-            name=name,
-            parent=self.current,
-            is_flow=is_flow,
-        )
-        self._stack.append(new_scope)
-        return new_scope
-
-    def pop(self) -> Scope | None:
+        self.frame = Frame(layout or ScopeLayout(name=name), self.frame, is_flow)
+        self._depth += 1
+        return self.frame
+
+    def pop(self) -> Frame | None:
         """Pop the current scope.
 
         Returns:
-            The popped scope, or None if at global
+            The popped frame, or None if at global
+        """
+        frame = self.frame
+        if frame is None:
+            return None
+        self.frame = frame.parent
+        self._depth -= 1
+        return frame
+
+    # ─────────────────────────────────────────────────────────────
+    # Slot API
+    # ─────────────────────────────────────────────────────────────
+
+    def load(self, depth: int, slot: int, name: str) -> Any:
+        """Get a variable by its resolved binding."""
+        if depth == LOCAL:
+            frame = self.frame
+            value = frame.values[slot]  # type: ignore[union-attr]
+            if value is not UNSET:
+                return value
+            return self.lookup(frame.parent, name)  # type: ignore[union-attr]
+        if depth == GLOBAL:
+            try:
+                return self.globals[name]
+            except KeyError:
+                pass  # Defined through the name API: search the frames
+        return self.lookup(self.frame, name)
+
+    def define_slot(self, slot: int, value: Any) -> None:
+        """Define a local of the current frame by slot."""
+        self.frame.values[slot] = value  # type: ignore[union-attr]
+
+    def store(self, slot: int, name: str, value: Any) -> None:
+        """Assign a local by slot: update the nearest existing variable,
+        or define it in the current frame."""
+        frame = self.frame
+        values = frame.values  # type: ignore[union-attr]
+        if values[slot] is not UNSET or not self.update_from(frame.parent, name, value):  # type: ignore[union-attr]
+            values[slot] = value
+
+    def lookup(self, frame: Frame | None, name: str) -> Any:
+        """Get a variable from a frame, its callers, then the globals.
+
+        Raises:
+            NameError: If variable not found
+        """
+        while frame is not None:
+            slot = frame.layout.slots.get(name)
+            if slot is not None:
+                value = frame.values[slot]
+                if value is not UNSET:
+                    return value
+            if frame.extra and name in frame.extra:
+                return frame.extra[name]
+            frame = frame.parent
+        if name in self.globals:
+            return self.globals[name]
+        raise NameError(f"Undefined variable: {name}")
+
+    def update_from(self, frame: Frame | None, name: str, value: Any) -> bool:
+        """Update an existing variable in a frame, its callers or the globals.
+
+        Returns:
+            True if variable was found and updated
         """
-        if len(self._stack) > 1:
-            return self._stack.pop()
-        return None
+        while frame is not None:
+            if frame.update(name, value):
+                return True
+            frame = frame.parent
+        if name in self.globals:
+            self.globals[name] = value
+            return True
+        return False
+
+    # ─────────────────────────────────────────────────────────────
+    # Name API
+    # ─────────────────────────────────────────────────────────────
 
     def define(self, name: str, value: Any) -> None:
         """Define a new variable in current scope."""
@@ -123,7 +300,7 @@ class ScopeManager:
             True if existing variable was updated
         """
         # Try to update existing
-        if self.current.update(name, value):
+        if self.update_from(self.frame, name, value):
             return True
         # Create new in current scope
         self.current.set(name, value)
@@ -135,19 +312,22 @@ class ScopeManager:
         Raises:
             NameError: If variable not found
         """
-        value, found = self.current.get(name)
-        if not found:
-            raise NameError(f"Undefined variable: {name}")
-        return value
+        return self.lookup(self.frame, name)
 
     def get_or_default(self, name: str, default: Any = None) -> Any:
         """Get variable value or default."""
-        value, found = self.current.get(name)
-        return value if found else default
+        try:
+            return self.lookup(self.frame, name)
+        except NameError:
+            return default
 
     def has(self, name: str) -> bool:
         """Check if variable exists."""
-        return self.current.has(name)
+        try:
+            self.lookup(self.frame, name)
+        except NameError:
+            return False
+        return True
 
     def set_global(self, name: str, value: Any) -> None:
         """Set variable in global scope."""
@@ -162,7 +342,7 @@ class ScopeManager:
 
     def depth(self) -> int:
         """Get current scope depth."""
-        return len(self._stack)
+        return self._depth
 
     def get_all_locals(self) -> dict[str, Any]:
         """Get all local variables in current scope."""
@@ -174,12 +354,17 @@ class ScopeManager:
 
     def clear_locals(self) -> None:
         """Clear current scope variables."""
-        self.current.variables.clear()
+        if self.frame is not None:
+            self.frame.clear()
+        else:
+            self._global.variables.clear()
 
     def reset(self) -> None:
         """Reset to initial state."""
         self._global = Scope(name="global")
-        self._stack = [self._global]
+        self.globals = self._global.variables
+        self.frame = None
+        self._depth = 1
 
 
 from core.security.policy import SecurityPolicy  # noqa: E402
@@ -205,9 +390,9 @@ class ExecutionContext:
         self._should_continue = False
         self._call_stack: list[str] = []
 
-    def enter_flow(self, name: str) -> None:
+    def enter_flow(self, name: str, layout: ScopeLayout | None = None) -> None:
         """Enter a new flow context."""
-        self.scope.push(f"flow:{name}", is_flow=True)
+        self.scope.push(f"flow:{name}", is_flow=True, layout=layout)
         self._call_stack.append(name)
 
     def exit_flow(self) -> None:
@@ -0,0 +1,90 @@
+"""
+RetroAuto v2 - Precision Timing
+
+Central sleep service for Delay, DelayRandom, ClickUntil and the other
+blocking actions of the Runner.
+
+- Monotonic deadlines (time.perf_counter), so early or late OS wake-ups
+  do not accumulate
+- Hybrid wait: block until SPIN_S before the deadline, then spin for the
+  last stretch instead of trusting the OS scheduler's granularity
+- Pause-aware: time spent paused moves the deadline back, so a paused
+  Delay still waits its full duration after resume
+- Wakes immediately on stop/pause/resume through ExecutionContext
+  instead of polling in chunks
+"""
+
+import time
+from collections.abc import Iterator
+
+from core.engine.context import ExecutionContext
+
+SPIN_S = 0.001  # The last millisecond before a deadline is spun
+
+
+class PrecisionTimer:
+    """
+    Drift-free, stop/pause-aware sleeps for one ExecutionContext.
+
+    Usage:
+        timer = PrecisionTimer(ctx)
+        if not timer.sleep(0.1):
+            return False  # Stopped
+    """
+
+    def __init__(self, ctx: ExecutionContext, spin_s: float = SPIN_S) -> None:
+        self._ctx = ctx
+        self._spin_s = spin_s
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep for seconds. Returns False if stopped."""
+        return self.sleep_until(time.perf_counter() + seconds)
+
+    def sleep_until(self, deadline: float) -> bool:
+        """
+        Sleep until a time.perf_counter() deadline. Returns False if stopped.
+
+        Time spent paused shifts the deadline.
+        """
+        ctx = self._ctx
+        spin_s = self._spin_s
+
+        while True:
+            generation = ctx.control_generation
+            if ctx.should_stop:
+                return False
+            if ctx.pause_requested:
+                paused_at = time.perf_counter()
+                if not ctx.wait_if_paused():
+                    return False
+                deadline += time.perf_counter() - paused_at
+                continue
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            if remaining > spin_s:
+                # Returns early on pause/resume/stop; the loop re-checks
+                ctx.wait_for_control(generation, remaining - spin_s)
+                continue
+
+            while time.perf_counter() < deadline:
+                pass
+            return not ctx.should_stop
+
+
+def ticks(interval: float) -> Iterator[float]:
+    """
+    Deadlines of a fixed-rate schedule: start + interval, start + 2 * interval, ...
+
+    The schedule does not drift with the caller's work. If the caller
+    falls a whole interval behind (slow step, pause), it restarts from
+    now instead of firing a burst of overdue ticks.
+    """
+    deadline = time.perf_counter()
+    while True:
+        deadline += interval
+        now = time.perf_counter()
+        if deadline < now:
+            deadline = now + interval
+        yield deadline
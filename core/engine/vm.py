@@ -0,0 +1,258 @@
+"""
+RetroAuto v2 - Bytecode VM
+
+Stack VM executing CodeObjects from core.engine.bytecode.
+
+Results and errors match the tree-walking Interpreter, which it
+subclasses for builtins, the security policy and helpers. Each flow call
+runs in a scope Frame whose local slots are a plain list. Names that are
+not locals of the flow are looked up at run time through the caller
+frames and then the globals, like the tree walker's scope chain.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from core.dsl.ast import Program
+from core.dsl.values import is_truthy
+from core.engine.builtins import BuiltinRegistry
+from core.engine.bytecode import (
+    OP_ADD,
+    OP_BINARY,
+    OP_BUILD_LIST,
+    OP_CALL_BUILTIN,
+    OP_CALL_FLOW,
+    OP_CALL_RUN,
+    OP_DEFINE_LOCAL,
+    OP_DIV,
+    OP_FAIL,
+    OP_FOR_ITER,
+    OP_GET_ITER,
+    OP_JUMP,
+    OP_JUMP_IF_FALSE,
+    OP_JUMP_IF_FALSE_OR_POP,
+    OP_JUMP_IF_TRUE_OR_POP,
+    OP_LOAD_CONST,
+    OP_LOAD_GLOBAL,
+    OP_LOAD_LOCAL,
+    OP_LOAD_NAME,
+    OP_NEG,
+    OP_NOT,
+    OP_POP,
+    OP_POP_TRY,
+    OP_RETURN,
+    OP_SETUP_TRY,
+    OP_STORE_LOCAL,
+    OP_THUNK,
+    CodeObject,
+    CompiledProgram,
+    compile_program,
+)
+from core.engine.interpreter import MAX_CALL_DEPTH, Interpreter, InterpreterError
+from core.engine.scope import UNSET, Frame
+
+
+class VirtualMachine(Interpreter):
+    """
+    Bytecode interpreter for RetroScript.
+
+    Usage:
+        vm = VirtualMachine()
+        result = vm.execute(program)  # Compile + run
+
+        compiled = vm.compile(program)
+        result = vm.run(compiled)  # Re-run without recompiling
+    """
+
+    def __init__(self, builtins: BuiltinRegistry | None = None) -> None:
+        super().__init__(builtins)
+        # Global variables (constants) share the scope manager's global dict
+        self.globals: dict[str, Any] = self.context.scope.globals
+        self.compiled: CompiledProgram | None = None
+
+    def compile(self, program: Program) -> CompiledProgram:
+        """Compile a program against this VM's builtins."""
+        return compile_program(program, self.builtins)
+
+    def execute(self, program: Program) -> Any:
+        """Compile and run a program.
+
+        Returns:
+            Result of main flow, if any
+        """
+        return self.run(self.compile(program))
+
+    def run(self, compiled: CompiledProgram) -> Any:
+        """Run a compiled program."""
+        self._apply_permissions(compiled.permissions)
+
+        # Constants are evaluated before flows are registered (no run("flow"))
+        self.compiled = None
+        for name, code in compiled.constants:
+            self.globals[name] = self._run(code, None)
+        self.compiled = compiled
+
+        if compiled.main is not None:
+            return self._run(compiled.main, None)
+        return None
+
+    # ─────────────────────────────────────────────────────────────
+    # Execution
+    # ─────────────────────────────────────────────────────────────
+
+    def _run(self, code: CodeObject, parent: Frame | None) -> Any:
+        """Execute one flow call (or constant initializer)."""
+        context = self.context
+        context.call_depth += 1
+        if context.call_depth > MAX_CALL_DEPTH:
+            context.call_depth -= 1
+            raise InterpreterError(
+                f"Stack Overflow: Max recursion depth exceeded ({MAX_CALL_DEPTH})"
+            )
+
+        frame = Frame(code.layout, parent)
+        slots = frame.values
+        scope = self.context.scope
+        globals_ = self.globals
+        ops = code.ops
+        args = code.args
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        handlers: list[tuple[int, int]] = []  # (handler pc, stack depth)
+        pc = 0
+
+        try:
+            while True:
+                try:
+                    while True:
+                        op = ops[pc]
+                        arg = args[pc]
+                        pc += 1
+
+                        if op == OP_LOAD_LOCAL:
+                            value = slots[arg]
+                            if value is UNSET:
+                                value = scope.lookup(parent, code.names[arg])
+                            push(value)
+                        elif op == OP_LOAD_CONST:
+                            push(arg)
+                        elif op == OP_STORE_LOCAL:
+                            value = pop()
+                            if slots[arg] is not UNSET or not scope.update_from(
+                                parent, code.names[arg], value
+                            ):
+                                slots[arg] = value
+                        elif op == OP_ADD:
+                            right = pop()
+                            left = stack[-1]
+                            if isinstance(left, str) or isinstance(right, str):
+                                stack[-1] = str(left) + str(right)
+                            else:
+                                stack[-1] = left + right
+                        elif op == OP_BINARY:
+                            right = pop()
+                            stack[-1] = arg(stack[-1], right)
+                        elif op == OP_JUMP_IF_FALSE:
+                            value = pop()
+                            if value is False or (value is not True and not is_truthy(value)):
+                                pc = arg
+                        elif op == OP_JUMP:
+                            pc = arg
+                        elif op == OP_LOAD_NAME:
+                            push(scope.lookup(parent, arg))
+                        elif op == OP_LOAD_GLOBAL:
+                            if arg in globals_:
+                                push(globals_[arg])
+                            else:
+                                push(scope.lookup(parent, arg))
+                        elif op == OP_DEFINE_LOCAL:
+                            slots[arg] = pop()
+                        elif op == OP_POP:
+                            pop()
+                        elif op == OP_DIV:
+                            right = pop()
+                            if right == 0:
+                                raise InterpreterError("Division by zero", arg)
+                            stack[-1] = stack[-1] / right
+                        elif op == OP_CALL_BUILTIN:
+                            name, argc, kwnames = arg
+                            if kwnames:
+                                kwvalues = stack[len(stack) - len(kwnames) :]
+                                del stack[len(stack) - len(kwnames) :]
+                                kwargs = dict(zip(kwnames, kwvalues, strict=True))
+                            else:
+                                kwargs = {}
+                            if argc:
+                                call_args = stack[len(stack) - argc :]
+                                del stack[len(stack) - argc :]
+                            else:
+                                call_args = []
+                            push(self.builtins.call(name, *call_args, **kwargs))
+                        elif op == OP_CALL_FLOW:
+                            push(self._run(arg, frame))
+                        elif op == OP_RETURN:
+                            return pop()
+                        elif op == OP_FOR_ITER:
+                            try:
+                                push(next(stack[-1]))
+                            except StopIteration:
+                                pop()
+                                pc = arg
+                        elif op == OP_GET_ITER:
+                            iterable = stack[-1]
+                            if not hasattr(iterable, "__iter__"):
+                                raise InterpreterError(
+                                    f"Cannot iterate over: {type(iterable)}", arg
+                                )
+                            stack[-1] = iter(iterable)
+                        elif op == OP_JUMP_IF_FALSE_OR_POP:
+                            if is_truthy(stack[-1]):
+                                pop()
+                            else:
+                                pc = arg
+                        elif op == OP_JUMP_IF_TRUE_OR_POP:
+                            if is_truthy(stack[-1]):
+                                pc = arg
+                            else:
+                                pop()
+                        elif op == OP_NOT:
+                            stack[-1] = not is_truthy(stack[-1])
+                        elif op == OP_NEG:
+                            stack[-1] = -stack[-1]
+                        elif op == OP_BUILD_LIST:
+                            if arg:
+                                items = stack[len(stack) - arg :]
+                                del stack[len(stack) - arg :]
+                            else:
+                                items = []
+                            push(items)
+                        elif op == OP_SETUP_TRY:
+                            handlers.append((arg, len(stack)))
+                        elif op == OP_POP_TRY:
+                            handlers.pop()
+                        elif op == OP_CALL_RUN:
+                            flow_name = pop()
+                            target = None
+                            if isinstance(flow_name, str) and self.compiled is not None:
+                                target = self.compiled.flows.get(flow_name)
+                            if target is None:
+                                raise InterpreterError("Unknown function: run", arg)
+                            push(self._run(target, frame))
+                        elif op == OP_THUNK:
+                            push(arg())
+                        elif op == OP_FAIL:
+                            raise InterpreterError(*arg)
+                        else:
+                            raise InterpreterError(f"Bad opcode {op} in {code.name}")
+                except Exception as e:
+                    # try/catch: resume at the innermost handler of this call
+                    if not handlers:
+                        raise
+                    pc, depth = handlers.pop()
+                    del stack[depth:]
+                    push(str(e))
+        finally:
+            context.call_depth -= 1
+
@@ -109,9 +109,14 @@ class PixelChecker:
         result = checker.find_pixel(Color(255, 0, 0), region=(0, 0, 500, 500))
     """
 
-    def __init__(self) -> None:
-        self._screen_cache: Any = None
-        self._cache_time: float = 0
+    def __init__(self, frames: Any = None) -> None:
+        """Initialize checker.
+
+        Args:
+            frames: Optional shared FrameBus; when set, reads come from the
+                current frame instead of a fresh grab per call.
+        """
+        self._frames = frames
 
     def get_pixel(self, x: int, y: int) -> Color:
         """Get the color of a pixel at position.
@@ -206,6 +211,9 @@ class PixelChecker:
     ) -> PixelResult | None:
         """Find first pixel matching target color.
 
+        Pixels are scanned row by row (top-left first), so the result is the
+        same pixel the old per-pixel loop returned.
+
         Args:
             target: Target color to find
             region: (x, y, width, height) search region
@@ -214,35 +222,8 @@ class PixelChecker:
         Returns:
             PixelResult if found, None otherwise
         """
-        if isinstance(target, str):
-            target = Color.from_hex(target)
-
-        screen = self._capture_screen(region)
-        if screen is None:
-            return None
-
-        # Region offset
-        offset_x = region[0] if region else 0
-        offset_y = region[1] if region else 0
-
-        # Search for pixel
-        try:
-            if HAS_MSS and isinstance(screen, np.ndarray):
-                h, w = screen.shape[:2]
-                for y in range(0, h, step):
-                    for x in range(0, w, step):
-                        b, g, r = screen[y, x, :3]
-                        color = Color(int(r), int(g), int(b))
-                        if target.matches(color):
-                            return PixelResult(
-                                x=x + offset_x,
-                                y=y + offset_y,
-                                color=color,
-                            )
-        except (IndexError, ValueError, TypeError):
-            pass  # Screen capture failed or index out of bounds
-
-        return None
+        hits = self.find_pixels_multi([target], region, max_results=1, step=step)
+        return hits[0][0] if hits[0] else None
 
     def find_all_pixels(
         self,
@@ -256,42 +237,74 @@ class PixelChecker:
         Args:
             target: Target color to find
             region: Search region
-            max_results: Maximum results to return
+            max_results: Maximum results to return (in scan order)
             step: Search step
 
         Returns:
             List of PixelResults
         """
-        if isinstance(target, str):
-            target = Color.from_hex(target)
+        return self.find_pixels_multi([target], region, max_results, step)[0]
+
+    def find_pixels_multi(
+        self,
+        targets: list[Color | str],
+        region: tuple[int, int, int, int] | None = None,
+        max_results: int = 100,
+        step: int = 1,
+    ) -> list[list[PixelResult]]:
+        """Find pixels for several target colors with a single capture.
+
+        Each color is matched with a tolerance mask over the whole
+        (strided) region instead of a per-pixel loop.
+
+        Args:
+            targets: Target colors to find
+            region: (x, y, width, height) search region
+            max_results: Maximum results per color (in scan order)
+            step: Search step
+
+        Returns:
+            One list of PixelResults per target, in the order of targets
+        """
+        colors = [Color.from_hex(t) if isinstance(t, str) else t for t in targets]
+        results: list[list[PixelResult]] = [[] for _ in colors]
+        if not colors or max_results <= 0:
+            return results
 
-        results: list[PixelResult] = []
         screen = self._capture_screen(region)
-        if screen is None:
+        if screen is None or not (HAS_MSS and isinstance(screen, np.ndarray)):
             return results
 
         offset_x = region[0] if region else 0
         offset_y = region[1] if region else 0
+        step = max(1, step)
 
-        try:
-            if HAS_MSS and isinstance(screen, np.ndarray):
-                h, w = screen.shape[:2]
-                for y in range(0, h, step):
-                    for x in range(0, w, step):
-                        if len(results) >= max_results:
-                            break
-                        b, g, r = screen[y, x, :3]
-                        color = Color(int(r), int(g), int(b))
-                        if target.matches(color):
-                            results.append(
-                                PixelResult(
-                                    x=x + offset_x,
-                                    y=y + offset_y,
-                                    color=color,
-                                )
-                            )
-        except (IndexError, ValueError, TypeError):
-            pass  # Screen capture failed or index out of bounds
+        # BGR(A) -> strided BGR view, no copy
+        pixels = screen[::step, ::step, :3]
+        if pixels.size == 0:
+            return results
+        row_len = pixels.shape[1]
+
+        for i, color in enumerate(colors):
+            mask = _color_mask(pixels, color).ravel()
+
+            if max_results == 1:
+                # argmax stops at the first True in scan order
+                first = int(mask.argmax())
+                hits = np.array([first]) if mask[first] else np.empty(0, dtype=np.intp)
+            else:
+                hits = np.flatnonzero(mask)[:max_results]
+
+            for flat in hits.tolist():
+                y, x = divmod(flat, row_len)
+                b, g, r = pixels[y, x]
+                results[i].append(
+                    PixelResult(
+                        x=x * step + offset_x,
+                        y=y * step + offset_y,
+                        color=Color(int(r), int(g), int(b)),
+                    )
+                )
 
         return results
 
@@ -333,6 +346,14 @@ class PixelChecker:
         region: tuple[int, int, int, int] | None = None,
     ) -> Any:
         """Capture screen or region."""
+        if self._frames is not None:
+            from core.models import ROI
+
+            if region:
+                x, y, w, h = region
+                return self._frames.get(ROI(x=x, y=y, w=w, h=h))
+            return self._frames.get()
+
         if HAS_MSS:
             with mss.mss() as sct:
                 if region:
@@ -353,15 +374,30 @@ class PixelChecker:
         return None
 
 
+def _color_mask(pixels: Any, target: Color) -> Any:
+    """Boolean mask of BGR pixels within the target color's tolerance."""
+    bgr = np.array([target.b, target.g, target.r])
+    lower = np.clip(bgr - target.tolerance, 0, 255).astype(np.uint8)
+    upper = np.clip(bgr + target.tolerance, 0, 255).astype(np.uint8)
+    return np.all((pixels >= lower) & (pixels <= upper), axis=2)
+
+
 # Global instance
 _checker: PixelChecker | None = None
 
 
-def get_checker() -> PixelChecker:
-    """Get the default pixel checker."""
+def get_checker(frames: Any = None) -> PixelChecker:
+    """Get the default pixel checker.
+
+    Args:
+        frames: Runtime FrameBus to read from (ExecutionContext passes its
+            own); the checker keeps using the last bus passed in.
+    """
     global _checker
     if _checker is None:
-        _checker = PixelChecker()
+        _checker = PixelChecker(frames)
+    elif frames is not None:
+        _checker._frames = frames
     return _checker
 
 
@@ -5,16 +5,34 @@ Phase 5: Execution Engine
 - Traverse graph following exec connections
 - Handle branching (IfImage true/false paths)
 - Maintain execution order
+
+The graph is compiled once at construction: every node gets an integer
+index and a successor tuple (next, on_true, on_false) of node indexes, so
+a step is one tuple lookup. Wiring problems (dangling connections,
+duplicate outputs, half-wired branches) are reported at compile time.
 """
 
 from collections.abc import Callable
-from typing import Any
+from typing import Any, NamedTuple
 
 from core.models import Action, FlowGraph, GraphConnection, GraphNode
 from infra import get_logger
 
 logger = get_logger("GraphWalker")
 
+NO_NODE = -1  # Successor index for "end of flow"
+MAX_NODE_VISITS = 1000  # A node executed more often than this is an infinite loop
+
+EXEC_SOCKETS = ("exec_out", "true_out", "false_out")
+
+
+class Successors(NamedTuple):
+    """Compiled exec outputs of one node (node indexes or NO_NODE)."""
+
+    next: int  # No branch result: first exec connection of any socket
+    on_true: int  # Branch result truthy: first true_out connection
+    on_false: int  # Branch result falsy: first false_out connection
+
 
 class GraphWalker:
     """
@@ -28,7 +46,9 @@ class GraphWalker:
         self.graph = graph
 
         # Build lookup maps
-        self.node_map = {node.id: node for node in graph.nodes}
+        self.nodes: list[GraphNode] = list(graph.nodes)
+        self.node_map = {node.id: node for node in self.nodes}
+        self.node_index = {node.id: index for index, node in enumerate(self.nodes)}
 
         # Build adjacency map (outgoing connections from each node)
         self.outgoing: dict[str, list[GraphConnection]] = {node.id: [] for node in graph.nodes}
@@ -36,34 +56,80 @@ class GraphWalker:
             if conn.from_node in self.outgoing:
                 self.outgoing[conn.from_node].append(conn)
 
-        # Track visited nodes (for loop detection)
-        self.visited = set()
-        self.execution_count = {}  # Track how many times each node executed
-
-    def find_start_node(self) -> GraphNode | None:
-        """
-        Find the start node (node with no incoming exec connections).
-        """
+        self.successors: list[Successors] = [self._compile_node(node) for node in self.nodes]
+
+        # Executions per node index (for loop detection)
+        self.execution_counts = [0] * len(self.nodes)
+
+    @property
+    def execution_count(self) -> dict[str, int]:
+        """How many times each executed node ran in the last execute_graph."""
+        return {
+            self.nodes[index].id: count
+            for index, count in enumerate(self.execution_counts)
+            if count
+        }
+
+    def _compile_node(self, node: GraphNode) -> Successors:
+        """Resolve a node's exec outputs to node indexes, warning about bad wiring."""
+        targets: dict[str, list[int]] = {socket: [] for socket in EXEC_SOCKETS}
+        first = NO_NODE
+
+        for conn in self.outgoing[node.id]:
+            if conn.from_socket not in targets:
+                continue  # Data connection
+            index = self.node_index.get(conn.to_node, NO_NODE)
+            if index == NO_NODE:
+                logger.warning(
+                    f"Node {node.id} {conn.from_socket} connects to unknown node {conn.to_node}"
+                )
+            elif first == NO_NODE:
+                first = index
+            targets[conn.from_socket].append(index)
+
+        for socket, indexes in targets.items():
+            if len(indexes) > 1:
+                logger.warning(f"Multiple {socket} connections from node {node.id}, taking first")
+
+        on_true = targets["true_out"][0] if targets["true_out"] else NO_NODE
+        on_false = targets["false_out"][0] if targets["false_out"] else NO_NODE
+        if (on_true == NO_NODE) != (on_false == NO_NODE):
+            missing = "true_out" if on_true == NO_NODE else "false_out"
+            logger.warning(f"No {missing} connection found for node {node.id}")
+
+        return Successors(first, on_true, on_false)
+
+    def _find_start_index(self) -> int:
+        """Index of the start node, or NO_NODE."""
         # Count incoming exec connections
-        incoming_counts = {node.id: 0 for node in self.graph.nodes}
+        incoming_counts = [0] * len(self.nodes)
 
         for conn in self.graph.connections:
             if conn.to_socket == "exec_in":  # Only count exec flow
-                incoming_counts[conn.to_node] += 1
+                index = self.node_index.get(conn.to_node)
+                if index is not None:
+                    incoming_counts[index] += 1
 
         # Find nodes with no incoming connections
-        start_candidates = [nid for nid, count in incoming_counts.items() if count == 0]
+        start_candidates = [index for index, count in enumerate(incoming_counts) if count == 0]
 
         if not start_candidates:
             logger.warning("No clear start node found in graph")
-            return None
+            return NO_NODE
 
         if len(start_candidates) > 1:
             # Multiple start nodes - pick the topmost one
             logger.warning(f"Multiple start nodes found ({len(start_candidates)}), using topmost")
-            start_candidates.sort(key=lambda nid: self.node_map[nid].y)
+            start_candidates.sort(key=lambda index: self.nodes[index].y)
 
-        return self.node_map[start_candidates[0]]
+        return start_candidates[0]
+
+    def find_start_node(self) -> GraphNode | None:
+        """
+        Find the start node (node with no incoming exec connections).
+        """
+        index = self._find_start_index()
+        return self.nodes[index] if index != NO_NODE else None
 
     def get_next_node(self, current_id: str, branch_result: Any = None) -> GraphNode | None:
         """
@@ -76,33 +142,18 @@ class GraphWalker:
             current_id: Current node ID
             branch_result: Result of conditional check (True/False) for branching nodes
         """
-        connections = self.outgoing.get(current_id, [])
-
-        # Filter to exec flow connections
-        exec_connections = [
-            c for c in connections if c.from_socket in ("exec_out", "true_out", "false_out")
-        ]
-
-        if not exec_connections:
-            return None  # End of flow
-
-        # Handle branching
-        if branch_result is not None:
-            # This is a conditional node
-            target_socket = "true_out" if branch_result else "false_out"
-            for conn in exec_connections:
-                if conn.from_socket == target_socket:
-                    return self.node_map.get(conn.to_node)
-
-            logger.warning(f"No {target_socket} connection found for node {current_id}")
+        current = self.node_index.get(current_id)
+        if current is None:
             return None
+        index = self._next_index(current, branch_result)
+        return self.nodes[index] if index != NO_NODE else None
 
-        # Regular flow - just take the first exec connection
-        if len(exec_connections) > 1:
-            logger.warning(f"Multiple exec outputs from node {current_id}, taking first")
-
-        conn = exec_connections[0]
-        return self.node_map.get(conn.to_node)
+    def _next_index(self, current: int, branch_result: Any) -> int:
+        """Successor of a node index for a branch result."""
+        successors = self.successors[current]
+        if branch_result is None:
+            return successors.next
+        return successors.on_true if branch_result else successors.on_false
 
     def execute_graph(self, action_executor: Callable[[Action], Any], max_iterations: int = 10000):
         """
@@ -112,37 +163,43 @@ class GraphWalker:
             action_executor: Function that executes an action and returns result
             max_iterations: Safety limit to prevent infinite loops
         """
-        start_node = self.find_start_node()
+        current = self._find_start_index()
 
-        if not start_node:
+        if current == NO_NODE:
             logger.error("Cannot execute graph: no start node found")
             return
 
-        current_node = start_node
+        nodes = self.nodes
+        successors = self.successors
+        counts = self.execution_counts = [0] * len(nodes)
         iteration_count = 0
 
-        while current_node and iteration_count < max_iterations:
+        while current != NO_NODE and iteration_count < max_iterations:
             iteration_count += 1
-
-            # Track execution
-            self.execution_count[current_node.id] = self.execution_count.get(current_node.id, 0) + 1
+            node = nodes[current]
 
             # Detect infinite loops (node executed too many times)
-            if self.execution_count[current_node.id] > 1000:
-                logger.error(f"Infinite loop detected at node {current_node.id}")
+            counts[current] += 1
+            if counts[current] > MAX_NODE_VISITS:
+                logger.error(f"Infinite loop detected at node {node.id}")
                 break
 
-            logger.debug(f"Executing node {current_node.id}: {type(current_node.action).__name__}")
+            logger.debug("Executing node %s: %s", node.id, type(node.action).__name__)
 
             # Execute the action
             try:
-                result = action_executor(current_node.action)
+                result = action_executor(node.action)
             except Exception as e:
-                logger.error(f"Error executing node {current_node.id}: {e}")
+                logger.error(f"Error executing node {node.id}: {e}")
                 break
 
             # Get next node
-            current_node = self.get_next_node(current_node.id, branch_result=result)
+            if result is None:
+                current = successors[current].next
+            elif result:
+                current = successors[current].on_true
+            else:
+                current = successors[current].on_false
 
         if iteration_count >= max_iterations:
             logger.error("Execution stopped: max iterations reached (possible infinite loop)")
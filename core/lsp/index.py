@@ -0,0 +1,235 @@
+"""
+RetroAuto v2 - LSP Symbol Index
+
+Per-document symbols and references built from the real parser, and a
+workspace-wide inverted index over them:
+- Definitions (flows, consts, labels, let/for variables) come from the AST
+- References are the identifier and $variable tokens, plus string
+  arguments naming a flow (run_flow("farm"))
+- Diagnostics are the parser errors and SemanticAnalyzer results
+- WorkspaceIndex answers definition/reference lookups without rescanning
+  document text
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from core.dsl.ast import ASTNode, ConstStmt, FlowDecl, ForStmt, LabelStmt, LetStmt
+from core.dsl.diagnostics import Diagnostic as DslDiagnostic
+from core.dsl.diagnostics import Severity
+from core.dsl.parser import Parser
+from core.dsl.semantic import analyze
+from core.dsl.tokens import Token, TokenType
+from core.lsp.protocol import Diagnostic, DiagnosticSeverity, Location, Position, Range
+
+_SEVERITIES = {
+    Severity.ERROR: DiagnosticSeverity.ERROR,
+    Severity.WARNING: DiagnosticSeverity.WARNING,
+    Severity.INFO: DiagnosticSeverity.INFORMATION,
+    Severity.HINT: DiagnosticSeverity.HINT,
+}
+
+# Declarations whose name is the token right after the keyword
+_DEFINITIONS: dict[type, str] = {
+    FlowDecl: "flow",
+    ConstStmt: "const",
+    LabelStmt: "label",
+    LetStmt: "variable",
+    ForStmt: "variable",
+}
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A named definition in a document."""
+
+    name: str
+    kind: str  # "flow", "const", "label", "variable"
+    range: Range
+
+
+@dataclass
+class DocumentIndex:
+    """Symbols, references and diagnostics of one document version."""
+
+    uri: str
+    version: int
+    symbols: dict[str, Symbol] = field(default_factory=dict)
+    references: dict[str, list[Range]] = field(default_factory=dict)
+    diagnostics: list[Diagnostic] = field(default_factory=list)
+
+
+class AnalysisCancelled(Exception):
+    """A newer document version made the analysis stale."""
+
+
+def index_document(
+    uri: str,
+    text: str,
+    version: int = 0,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> DocumentIndex:
+    """
+    Parse text and index its symbols, references and diagnostics.
+
+    Raises AnalysisCancelled if is_cancelled() turns true between phases.
+    """
+
+    def check() -> None:
+        if is_cancelled is not None and is_cancelled():
+            raise AnalysisCancelled(uri)
+
+    parser = Parser(text)
+    program = parser.parse()
+    check()
+
+    index = DocumentIndex(uri=uri, version=version)
+    tokens = parser.tokens
+    by_start = {(t.line, t.column): i for i, t in enumerate(tokens)}
+
+    for node in _walk(program):
+        kind = _DEFINITIONS.get(type(node))
+        if kind is None:
+            continue
+        name = node.variable if isinstance(node, ForStmt) else getattr(node, "name", "")
+        i = by_start.get((node.span.start_line, node.span.start_col))
+        if i is None or i + 1 >= len(tokens) or tokens[i + 1].value != name:
+            continue
+        index.symbols.setdefault(name, Symbol(name, kind, _token_range(tokens[i + 1])))
+
+    references = index.references
+    for token in tokens:
+        if token.type in (TokenType.IDENTIFIER, TokenType.VARIABLE):
+            references.setdefault(token.value, []).append(_token_range(token))
+        elif token.type == TokenType.STRING and token.line == token.end_line:
+            symbol = index.symbols.get(token.value)
+            if symbol is not None and symbol.kind == "flow":
+                # Inside the quotes
+                start = Position(token.line - 1, token.column)
+                end = Position(token.line - 1, token.end_column - 2)
+                references.setdefault(token.value, []).append(Range(start, end))
+    check()
+
+    diagnostics = list(parser.errors)
+    if not parser.errors:
+        diagnostics.extend(analyze(program))
+    index.diagnostics = [_to_lsp_diagnostic(d) for d in diagnostics]
+    return index
+
+
+class WorkspaceIndex:
+    """
+    Inverted index over the DocumentIndex of every open document.
+
+    Thread-safe: the analysis worker swaps documents in while requests
+    read from the main thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._documents: dict[str, DocumentIndex] = {}
+        self._references: dict[str, dict[str, list[Range]]] = {}
+        self._definitions: dict[str, dict[str, Symbol]] = {}
+
+    def update(self, index: DocumentIndex) -> None:
+        """Replace the index of index.uri."""
+        with self._lock:
+            self._remove(index.uri)
+            self._documents[index.uri] = index
+            for name, ranges in index.references.items():
+                self._references.setdefault(name, {})[index.uri] = ranges
+            for name, symbol in index.symbols.items():
+                self._definitions.setdefault(name, {})[index.uri] = symbol
+
+    def remove(self, uri: str) -> None:
+        """Drop a closed document."""
+        with self._lock:
+            self._remove(uri)
+
+    def _remove(self, uri: str) -> None:
+        old = self._documents.pop(uri, None)
+        if old is None:
+            return
+        for name in old.references:
+            _discard(self._references, name, uri)
+        for name in old.symbols:
+            _discard(self._definitions, name, uri)
+
+    def get(self, uri: str) -> DocumentIndex | None:
+        """Latest index of a document."""
+        with self._lock:
+            return self._documents.get(uri)
+
+    def definitions(self, name: str, uri: str = "") -> list[Location]:
+        """Where name is defined, uri's own definition first."""
+        with self._lock:
+            by_uri = dict(self._definitions.get(name, {}))
+        ordered = sorted(by_uri.items(), key=lambda item: item[0] != uri)
+        return [Location(doc_uri, symbol.range) for doc_uri, symbol in ordered]
+
+    def references(self, name: str) -> list[Location]:
+        """Every occurrence of name in the open documents."""
+        with self._lock:
+            by_uri = dict(self._references.get(name, {}))
+        return [Location(doc_uri, r) for doc_uri, ranges in by_uri.items() for r in ranges]
+
+    def symbol(self, name: str) -> Symbol | None:
+        """Any definition of name."""
+        with self._lock:
+            by_uri = self._definitions.get(name)
+            return next(iter(by_uri.values()), None) if by_uri else None
+
+    def symbols(self, prefix: str = "") -> list[Symbol]:
+        """One definition per name starting with prefix."""
+        with self._lock:
+            return [
+                next(iter(by_uri.values()))
+                for name, by_uri in self._definitions.items()
+                if name.startswith(prefix)
+            ]
+
+
+def _discard(table: dict[str, dict[str, Any]], name: str, uri: str) -> None:
+    by_uri = table.get(name)
+    if by_uri is not None:
+        by_uri.pop(uri, None)
+        if not by_uri:
+            del table[name]
+
+
+def _walk(node: Any) -> Iterator[ASTNode]:
+    """Every AST node under node, depth first."""
+    if isinstance(node, ASTNode):
+        yield node
+        for f in fields(node):
+            if f.name not in ("span", "id", "leading_comments", "trailing_comment"):
+                yield from _walk(getattr(node, f.name))
+    elif isinstance(node, list | tuple):
+        for item in node:
+            yield from _walk(item)
+    elif isinstance(node, dict):
+        for item in node.values():
+            yield from _walk(item)
+
+
+def _token_range(token: Token) -> Range:
+    return Range(
+        Position(token.line - 1, token.column - 1),
+        Position(token.end_line - 1, token.end_column - 1),
+    )
+
+
+def _to_lsp_diagnostic(diagnostic: DslDiagnostic) -> Diagnostic:
+    span = diagnostic.span
+    return Diagnostic(
+        range=Range(
+            Position(max(0, span.start_line - 1), max(0, span.start_col - 1)),
+            Position(max(0, span.end_line - 1), max(0, span.end_col - 1)),
+        ),
+        message=diagnostic.message,
+        severity=_SEVERITIES.get(diagnostic.severity, DiagnosticSeverity.ERROR),
+    )
@@ -0,0 +1,137 @@
+"""
+RetroAuto v2 - LSP Protocol Types
+
+Dataclasses for the Language Server Protocol messages used by
+core.lsp.server, with to_dict() for JSON-RPC serialization.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+# ─────────────────────────────────────────────────────────────
+# LSP Protocol Types
+# ─────────────────────────────────────────────────────────────
+
+
+class MessageType(IntEnum):
+    """LSP message types."""
+
+    ERROR = 1
+    WARNING = 2
+    INFO = 3
+    LOG = 4
+
+
+class DiagnosticSeverity(IntEnum):
+    """LSP diagnostic severity."""
+
+    ERROR = 1
+    WARNING = 2
+    INFORMATION = 3
+    HINT = 4
+
+
+class CompletionItemKind(IntEnum):
+    """LSP completion item kinds."""
+
+    TEXT = 1
+    METHOD = 2
+    FUNCTION = 3
+    CONSTRUCTOR = 4
+    FIELD = 5
+    VARIABLE = 6
+    CLASS = 7
+    INTERFACE = 8
+    MODULE = 9
+    PROPERTY = 10
+    KEYWORD = 14
+    SNIPPET = 15
+
+
+@dataclass
+class Position:
+    """LSP position (0-indexed)."""
+
+    line: int
+    character: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {"line": self.line, "character": self.character}
+
+
+@dataclass
+class Range:
+    """LSP range."""
+
+    start: Position
+    end: Position
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"start": self.start.to_dict(), "end": self.end.to_dict()}
+
+
+@dataclass
+class Location:
+    """LSP location."""
+
+    uri: str
+    range: Range
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"uri": self.uri, "range": self.range.to_dict()}
+
+
+@dataclass
+class Diagnostic:
+    """LSP diagnostic."""
+
+    range: Range
+    message: str
+    severity: DiagnosticSeverity = DiagnosticSeverity.ERROR
+    source: str = "retroscript"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "range": self.range.to_dict(),
+            "message": self.message,
+            "severity": self.severity.value,
+            "source": self.source,
+        }
+
+
+@dataclass
+class CompletionItem:
+    """LSP completion item."""
+
+    label: str
+    kind: CompletionItemKind = CompletionItemKind.TEXT
+    detail: str = ""
+    documentation: str = ""
+    insert_text: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"label": self.label, "kind": self.kind.value}
+        if self.detail:
+            result["detail"] = self.detail
+        if self.documentation:
+            result["documentation"] = self.documentation
+        if self.insert_text:
+            result["insertText"] = self.insert_text
+        return result
+
+
+@dataclass
+class Hover:
+    """LSP hover result."""
+
+    contents: str
+    range: Range | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"contents": {"kind": "markdown", "value": self.contents}}
+        if self.range:
+            result["range"] = self.range.to_dict()
+        return result
@@ -3,6 +3,13 @@ RetroAuto v2 - Language Server Protocol
 
 LSP implementation for RetroScript IDE integration.
 Part of RetroScript Phase 12 - LSP.
+
+- Incremental text sync: range edits are spliced into a line array
+- Symbols and references come from the real parser (core.lsp.index), and
+  find-references answers from a workspace inverted index
+- Parsing and diagnostics run on a background worker; an analysis whose
+  document version is superseded is cancelled, so hover and completion
+  never wait for it
 """
 
 from __future__ import annotations
@@ -10,156 +17,97 @@ from __future__ import annotations
 import json
 import re
 import sys
+import threading
 from collections.abc import Callable
-from dataclasses import dataclass
-from enum import IntEnum
 from typing import Any
 
-# ─────────────────────────────────────────────────────────────
-# LSP Protocol Types
-# ─────────────────────────────────────────────────────────────
-
-
-class MessageType(IntEnum):
-    """LSP message types."""
-
-    ERROR = 1
-    WARNING = 2
-    INFO = 3
-    LOG = 4
-
-
-class DiagnosticSeverity(IntEnum):
-    """LSP diagnostic severity."""
-
-    ERROR = 1
-    WARNING = 2
-    INFORMATION = 3
-    HINT = 4
-
-
-class CompletionItemKind(IntEnum):
-    """LSP completion item kinds."""
-
-    TEXT = 1
-    METHOD = 2
-    FUNCTION = 3
-    CONSTRUCTOR = 4
-    FIELD = 5
-    VARIABLE = 6
-    CLASS = 7
-    INTERFACE = 8
-    MODULE = 9
-    PROPERTY = 10
-    KEYWORD = 14
-    SNIPPET = 15
-
-
-@dataclass
-class Position:
-    """LSP position (0-indexed)."""
-
-    line: int
-    character: int
-
-    def to_dict(self) -> dict[str, int]:
-        return {"line": self.line, "character": self.character}
-
-
-@dataclass
-class Range:
-    """LSP range."""
-
-    start: Position
-    end: Position
-
-    def to_dict(self) -> dict[str, Any]:
-        return {"start": self.start.to_dict(), "end": self.end.to_dict()}
-
-
-@dataclass
-class Location:
-    """LSP location."""
-
-    uri: str
-    range: Range
-
-    def to_dict(self) -> dict[str, Any]:
-        return {"uri": self.uri, "range": self.range.to_dict()}
-
-
-@dataclass
-class Diagnostic:
-    """LSP diagnostic."""
-
-    range: Range
-    message: str
-    severity: DiagnosticSeverity = DiagnosticSeverity.ERROR
-    source: str = "retroscript"
-
-    def to_dict(self) -> dict[str, Any]:
-        return {
-            "range": self.range.to_dict(),
-            "message": self.message,
-            "severity": self.severity.value,
-            "source": self.source,
-        }
-
-
-@dataclass
-class CompletionItem:
-    """LSP completion item."""
-
-    label: str
-    kind: CompletionItemKind = CompletionItemKind.TEXT
-    detail: str = ""
-    documentation: str = ""
-    insert_text: str = ""
-
-    def to_dict(self) -> dict[str, Any]:
-        result: dict[str, Any] = {"label": self.label, "kind": self.kind.value}
-        if self.detail:
-            result["detail"] = self.detail
-        if self.documentation:
-            result["documentation"] = self.documentation
-        if self.insert_text:
-            result["insertText"] = self.insert_text
-        return result
-
-
-@dataclass
-class Hover:
-    """LSP hover result."""
-
-    contents: str
-    range: Range | None = None
-
-    def to_dict(self) -> dict[str, Any]:
-        result: dict[str, Any] = {"contents": {"kind": "markdown", "value": self.contents}}
-        if self.range:
-            result["range"] = self.range.to_dict()
-        return result
-
+from core.lsp.index import AnalysisCancelled, WorkspaceIndex, index_document
+from core.lsp.protocol import (
+    CompletionItem,
+    CompletionItemKind,
+    Diagnostic,
+    DiagnosticSeverity,
+    Hover,
+    Location,
+    MessageType,
+    Position,
+    Range,
+)
+
+__all__ = [
+    "CompletionItem",
+    "CompletionItemKind",
+    "Diagnostic",
+    "DiagnosticSeverity",
+    "DocumentStore",
+    "Hover",
+    "Location",
+    "MessageType",
+    "Position",
+    "Range",
+    "RetroScriptLanguageServer",
+    "TextDocument",
+]
+
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+
+_WORD_CHAR = re.compile(r"[\w$@]")
+_WORD_PREFIX = re.compile(r"[\w$@]*$")
 
 # ─────────────────────────────────────────────────────────────
 # Document Management
 # ─────────────────────────────────────────────────────────────
 
 
-@dataclass
 class TextDocument:
-    """A text document being edited."""
+    """A text document being edited, held as a line array."""
+
+    def __init__(
+        self, uri: str, text: str, version: int = 0, language_id: str = "retroscript"
+    ) -> None:
+        self.uri = uri
+        self.version = version
+        self.language_id = language_id
+        self.lines = text.split("\n")
+        self._text: str | None = text
+
+    @property
+    def text(self) -> str:
+        """Full text (joined on demand after edits)."""
+        if self._text is None:
+            self._text = "\n".join(self.lines)
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.lines = value.split("\n")
+        self._text = value
+
+    def apply_change(self, change: dict[str, Any]) -> None:
+        """Apply one contentChanges entry: a range edit, or full text without a range."""
+        text = change.get("text", "")
+        edit_range = change.get("range")
+        if edit_range is None:
+            self.text = text
+            return
+
+        lines = self.lines
+        start_line, start_char = self._clamp(edit_range["start"])
+        end_line, end_char = self._clamp(edit_range["end"])
+        head = lines[start_line][:start_char]
+        tail = lines[end_line][end_char:]
+        lines[start_line : end_line + 1] = (head + text + tail).split("\n")
+        self._text = None
 
-    uri: str
-    text: str
-    version: int = 0
-    language_id: str = "retroscript"
+    def _clamp(self, position: dict[str, int]) -> tuple[int, int]:
+        line = min(max(position.get("line", 0), 0), len(self.lines) - 1)
+        character = min(max(position.get("character", 0), 0), len(self.lines[line]))
+        return line, character
 
     def get_line(self, line: int) -> str:
         """Get a specific line."""
-        lines = self.text.split("\n")
-        if 0 <= line < len(lines):
-            return lines[line]
+        if 0 <= line < len(self.lines):
+            return self.lines[line]
         return ""
 
     def get_word_at(self, position: Position) -> str:
@@ -172,43 +120,140 @@ class TextDocument:
         start = position.character
         end = position.character
 
-        while start > 0 and re.match(r"[\w$@]", line[start - 1]):
+        while start > 0 and _WORD_CHAR.match(line[start - 1]):
             start -= 1
 
-        while end < len(line) and re.match(r"[\w$@]", line[end]):
+        while end < len(line) and _WORD_CHAR.match(line[end]):
             end += 1
 
         return line[start:end]
 
 
 class DocumentStore:
-    """Store for open documents."""
+    """Store for open documents. Thread-safe snapshots for the analysis worker."""
 
     def __init__(self) -> None:
         self._documents: dict[str, TextDocument] = {}
+        self._lock = threading.Lock()
 
     def open(self, uri: str, text: str, version: int = 0) -> TextDocument:
         """Open a document."""
         doc = TextDocument(uri=uri, text=text, version=version)
-        self._documents[uri] = doc
+        with self._lock:
+            self._documents[uri] = doc
         return doc
 
     def update(self, uri: str, text: str, version: int) -> TextDocument | None:
-        """Update a document."""
-        if uri in self._documents:
-            self._documents[uri].text = text
-            self._documents[uri].version = version
-            return self._documents[uri]
-        return None
+        """Replace a document's text."""
+        return self.apply_changes(uri, [{"text": text}], version)
+
+    def apply_changes(
+        self, uri: str, changes: list[dict[str, Any]], version: int
+    ) -> TextDocument | None:
+        """Apply didChange contentChanges in order."""
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None:
+                return None
+            for change in changes:
+                doc.apply_change(change)
+            doc.version = version
+            return doc
 
     def close(self, uri: str) -> None:
         """Close a document."""
-        self._documents.pop(uri, None)
+        with self._lock:
+            self._documents.pop(uri, None)
 
     def get(self, uri: str) -> TextDocument | None:
         """Get a document."""
         return self._documents.get(uri)
 
+    def snapshot(self, uri: str) -> tuple[str, int] | None:
+        """(text, version) of a document, consistent with concurrent edits."""
+        with self._lock:
+            doc = self._documents.get(uri)
+            return (doc.text, doc.version) if doc else None
+
+    def version(self, uri: str) -> int | None:
+        """Current version, or None once closed."""
+        doc = self._documents.get(uri)
+        return doc.version if doc else None
+
+    def if_current(self, uri: str, version: int, apply: Callable[[], None]) -> bool:
+        """
+        Run apply() if the document is still open at version.
+
+        The check and apply() happen under the store lock, so a didChange or
+        didClose lands either before the check or after apply() returns.
+        """
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None or doc.version != version:
+                return False
+            apply()
+            return True
+
+
+# ─────────────────────────────────────────────────────────────
+# Background Analysis
+# ─────────────────────────────────────────────────────────────
+
+
+class AnalysisWorker:
+    """
+    Analyses documents on a background thread, latest version only.
+
+    Scheduling a document that is already pending just replaces the
+    request, and a running analysis of an older version is cancelled
+    between phases.
+    """
+
+    def __init__(self, analyze: Callable[[str], None]) -> None:
+        self._analyze = analyze
+        self._pending: list[str] = []  # FIFO of uris, no duplicates
+        self._busy = False
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, uri: str) -> None:
+        """Queue uri for analysis, starting the thread on first use."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="lsp-analysis", daemon=True
+                )
+                self._thread.start()
+            if uri not in self._pending:
+                self._pending.append(uri)
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until nothing is pending or running. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped:
+                    return
+                uri = self._pending.pop(0)
+                self._busy = True
+            try:
+                self._analyze(uri)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
 
 # ─────────────────────────────────────────────────────────────
 # Language Server
@@ -225,25 +270,32 @@ class RetroScriptLanguageServer:
 
     def __init__(self) -> None:
         self.documents = DocumentStore()
+        self.index = WorkspaceIndex()
         self._initialized = False
         self._shutdown = False
 
-        # Symbol cache
-        self._flows: dict[str, Location] = {}
-        self._variables: dict[str, Location] = {}
+        self._worker = AnalysisWorker(self._analyze_now)
+        self._write_lock = threading.Lock()
 
     def run(self) -> None:
         """Run the language server (stdio mode)."""
-        while not self._shutdown:
-            try:
-                message = self._read_message()
-                if message:
-                    response = self._handle_message(message)
-                    if response:
-                        self._write_message(response)
-            except Exception as e:
-                self._log(f"Error: {e}")
-                break
+        try:
+            while not self._shutdown:
+                try:
+                    message = self._read_message()
+                    if message:
+                        response = self._handle_message(message)
+                        if response:
+                            self._write_message(response)
+                except Exception as e:
+                    self._log(f"Error: {e}")
+                    break
+        finally:
+            self._worker.stop()
+
+    def wait_for_analysis(self, timeout: float | None = None) -> bool:
+        """Block until background analysis has caught up with all edits."""
+        return self._worker.wait_idle(timeout)
 
     def _read_message(self) -> dict[str, Any] | None:
         """Read a JSON-RPC message from stdin."""
@@ -269,8 +321,9 @@ class RetroScriptLanguageServer:
         """Write a JSON-RPC message to stdout."""
         content = json.dumps(message)
         header = f"Content-Length: {len(content)}\r\n\r\n"
-        sys.stdout.write(header + content)
-        sys.stdout.flush()
+        with self._write_lock:
+            sys.stdout.write(header + content)
+            sys.stdout.flush()
 
     def _handle_message(self, message: dict[str, Any]) -> dict[str, Any] | None:
         """Handle incoming message."""
@@ -284,6 +337,7 @@ class RetroScriptLanguageServer:
             "initialized": lambda _: None,
             "shutdown": self._handle_shutdown,
             "exit": self._handle_exit,
+            "$/cancelRequest": lambda _: None,  # Requests are answered in order, synchronously
             "textDocument/didOpen": self._handle_did_open,
             "textDocument/didChange": self._handle_did_change,
             "textDocument/didClose": self._handle_did_close,
@@ -317,7 +371,7 @@ class RetroScriptLanguageServer:
         self._initialized = True
         return {
             "capabilities": {
-                "textDocumentSync": 1,  # Full sync
+                "textDocumentSync": TEXT_DOCUMENT_SYNC_INCREMENTAL,
                 "completionProvider": {"triggerCharacters": [".", "$", "@"]},
                 "hoverProvider": True,
                 "definitionProvider": True,
@@ -333,6 +387,7 @@ class RetroScriptLanguageServer:
 
     def _handle_exit(self, params: dict[str, Any]) -> None:
         """Handle exit notification."""
+        self._worker.stop()
         sys.exit(0)
 
     def _handle_did_open(self, params: dict[str, Any]) -> None:
@@ -346,15 +401,13 @@ class RetroScriptLanguageServer:
         self._analyze_document(uri)
 
     def _handle_did_change(self, params: dict[str, Any]) -> None:
-        """Handle textDocument/didChange."""
+        """Handle textDocument/didChange (incremental or full changes)."""
         doc = params.get("textDocument", {})
         uri = doc.get("uri", "")
         version = doc.get("version", 0)
 
         changes = params.get("contentChanges", [])
-        if changes:
-            text = changes[-1].get("text", "")
-            self.documents.update(uri, text, version)
+        if changes and self.documents.apply_changes(uri, changes, version):
             self._analyze_document(uri)
 
     def _handle_did_close(self, params: dict[str, Any]) -> None:
@@ -362,6 +415,7 @@ class RetroScriptLanguageServer:
         doc = params.get("textDocument", {})
         uri = doc.get("uri", "")
         self.documents.close(uri)
+        self.index.remove(uri)
 
     def _handle_hover(self, params: dict[str, Any]) -> dict[str, Any] | None:
         """Handle textDocument/hover."""
@@ -395,7 +449,8 @@ class RetroScriptLanguageServer:
             return []
 
         line = doc.get_line(position.line)
-        prefix = line[: position.character].split()[-1] if line else ""
+        match = _WORD_PREFIX.search(line[: position.character])
+        prefix = match.group(0) if match else ""
 
         return self._get_completions(prefix)
 
@@ -413,11 +468,8 @@ class RetroScriptLanguageServer:
         if not word:
             return []
 
-        # Look up definition
-        if word in self._flows:
-            return [self._flows[word].to_dict()]
-
-        return []
+        # Look up definition, this document's first
+        return [location.to_dict() for location in self.index.definitions(word, uri)]
 
     def _handle_references(self, params: dict[str, Any]) -> list[dict[str, Any]]:
         """Handle textDocument/references."""
@@ -449,7 +501,7 @@ class RetroScriptLanguageServer:
             formatter = CodeFormatter()
             formatted = formatter.format(doc.text)
 
-            lines = doc.text.count("\n")
+            lines = len(doc.lines) - 1
             return [
                 {
                     "range": Range(
@@ -464,20 +516,32 @@ class RetroScriptLanguageServer:
             return []
 
     def _analyze_document(self, uri: str) -> None:
-        """Analyze document for symbols and diagnostics."""
-        doc = self.documents.get(uri)
-        if not doc:
+        """Schedule symbol indexing and diagnostics for a document."""
+        self._worker.schedule(uri)
+
+    def _analyze_now(self, uri: str) -> None:
+        """Index a document and publish its diagnostics (analysis worker)."""
+        snapshot = self.documents.snapshot(uri)
+        if snapshot is None:
             return
+        text, version = snapshot
 
-        # Find flow definitions
-        for i, line in enumerate(doc.text.split("\n")):
-            match = re.match(r"flow\s+(\w+)", line)
-            if match:
-                name = match.group(1)
-                self._flows[name] = Location(
-                    uri=uri,
-                    range=Range(Position(i, 0), Position(i, len(line))),
-                )
+        def is_stale() -> bool:
+            return self.documents.version(uri) != version
+
+        try:
+            index = index_document(uri, text, version, is_cancelled=is_stale)
+        except AnalysisCancelled:
+            return  # The newer version is already scheduled
+        except Exception as e:
+            self._log(f"Analysis failed for {uri}: {e}")
+            return
+
+        # A didClose between a version check and the update would put the
+        # closed document back into the index
+        if not self.documents.if_current(uri, version, lambda: self.index.update(index)):
+            return
+        self._publish_diagnostics(uri, index.diagnostics)
 
     def _get_hover_info(self, word: str) -> str | None:
         """Get hover information for a word."""
@@ -506,9 +570,10 @@ class RetroScriptLanguageServer:
         if word in keywords:
             return f"**{word}** - {keywords[word]}"
 
-        # Check if it's a known flow
-        if word in self._flows:
-            return f"**flow {word}**"
+        # Check if it's a known symbol
+        symbol = self.index.symbol(word)
+        if symbol:
+            return f"**{symbol.kind} {word}**"
 
         return None
 
@@ -528,31 +593,18 @@ class RetroScriptLanguageServer:
             if bi.startswith(prefix):
                 items.append(CompletionItem(bi, CompletionItemKind.FUNCTION))
 
-        # Flows
-        for name in self._flows:
-            if name.startswith(prefix):
-                items.append(CompletionItem(name, CompletionItemKind.METHOD))
+        # Symbols of the open documents
+        for symbol in self.index.symbols(prefix):
+            if symbol.kind == "flow":
+                items.append(CompletionItem(symbol.name, CompletionItemKind.METHOD))
+            elif symbol.kind != "label":
+                items.append(CompletionItem(symbol.name, CompletionItemKind.VARIABLE))
 
         return [item.to_dict() for item in items]
 
     def _find_references(self, uri: str, word: str) -> list[dict[str, Any]]:
-        """Find all references to a symbol."""
-        references: list[Location] = []
-
-        for doc_uri, doc in self.documents._documents.items():
-            for i, line in enumerate(doc.text.split("\n")):
-                for match in re.finditer(rf"\b{re.escape(word)}\b", line):
-                    references.append(
-                        Location(
-                            uri=doc_uri,
-                            range=Range(
-                                Position(i, match.start()),
-                                Position(i, match.end()),
-                            ),
-                        )
-                    )
-
-        return [ref.to_dict() for ref in references]
+        """Find all references to a symbol (inverted index lookup)."""
+        return [ref.to_dict() for ref in self.index.references(word)]
 
     def _log(self, message: str) -> None:
         """Log a message."""
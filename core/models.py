@@ -52,6 +52,12 @@ class AssetImage(BaseModel):
     method: MatchMethod = Field(default=MatchMethod.TM_CCOEFF_NORMED)
     grayscale: bool = Field(default=True, description="Use grayscale matching")
     roi: ROI | None = Field(default=None, description="Default search region")
+    pyramid_levels: int = Field(
+        default=0,
+        ge=0,
+        le=3,
+        description="Coarse-to-fine search depth (0=off, 1=1/2 scale, 2=1/4 scale)",
+    )
 
     @field_validator("path")
     @classmethod
@@ -111,6 +117,9 @@ class Click(ActionBase):
     )
     interval_ms: int = Field(default=100, ge=0, description="Interval between clicks in ms")
     use_match: bool = Field(default=False, description="Click at last match center")
+    verify: bool | None = Field(
+        default=None, description="Flight Recorder visual-change check (None = flow setting)"
+    )
 
 
 class ClickImage(ActionBase):
@@ -127,6 +136,9 @@ class ClickImage(ActionBase):
     offset_y: int = Field(default=0)
     smart_wait: bool = Field(default=True, description="Enable adaptive thresholding")
     interval_ms: int = Field(default=100, ge=0, description="Interval between clicks in ms")
+    verify: bool | None = Field(
+        default=None, description="Flight Recorder visual-change check (None = flow setting)"
+    )
 
 
 class ClickUntil(ActionBase):
@@ -150,6 +162,9 @@ class ClickRandom(ActionBase):
     clicks: int = Field(default=1, ge=1, le=10)
     interval_ms: int = Field(default=100, ge=0)
     button: Literal["left", "right", "middle"] = Field(default="left")
+    verify: bool | None = Field(
+        default=None, description="Flight Recorder visual-change check (None = flow setting)"
+    )
 
 
 class ReadText(ActionBase):
@@ -314,6 +329,9 @@ class Drag(ActionBase):
     to_y: int = Field(description="End Y coordinate")
     duration_ms: int = Field(default=500, ge=0, description="Drag duration")
     button: Literal["left", "right", "middle"] = Field(default="left")
+    verify: bool | None = Field(
+        default=None, description="Flight Recorder visual-change check (None = flow setting)"
+    )
 
 
 class Scroll(ActionBase):
@@ -480,6 +498,9 @@ class Flow(BaseModel):
     name: str = Field(description="Flow name")
     actions: list[Action] = Field(default_factory=list)
     graph: FlowGraph | None = Field(default=None, description="Visual graph representation")
+    verify_actions: bool = Field(
+        default=True, description="Flight Recorder checks clicks/drags for a visual reaction"
+    )
 
 
 class InterruptRule(BaseModel):
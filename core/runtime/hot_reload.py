@@ -13,7 +13,10 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Event, Thread
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from core.dsl.module_loader import ModuleLoader
 
 
 @dataclass
@@ -152,13 +155,18 @@ class HotReloader:
         reloader.watch("main.retro")
         reloader.on_reload = lambda path: print(f"Reloaded: {path}")
         reloader.start()
+
+    With a ModuleLoader, a change reloads only the changed module and the
+    modules importing it (see last_affected).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, loader: ModuleLoader | None = None) -> None:
         self._watcher = FileWatcher()
         self._watcher.on_change = self._handle_change
         self._state: dict[str, Any] = {}  # Preserved state between reloads
         self._reload_count = 0
+        self._loader = loader
+        self.last_affected: list[str] = []  # Modules invalidated by the last change
 
         # Callbacks
         self.on_reload: Callable[[Path], None] | None = None
@@ -174,6 +182,12 @@ class HotReloader:
         """Watch all matching files in a directory."""
         self._watcher.add_directory(directory, pattern)
 
+    def watch_imports(self) -> None:
+        """Watch every module the loader has loaded."""
+        if self._loader is not None:
+            for path in self._loader.loaded_paths():
+                self._watcher.add(path)
+
     def start(self) -> None:
         """Start hot reload watching."""
         self._watcher.start()
@@ -206,6 +220,10 @@ class HotReloader:
                 saved_state = self.before_reload(event.path)
 
             # Perform reload
+            if self._loader is not None:
+                self.last_affected = self._loader.graph.dependents(str(event.path.resolve()))
+                self._loader.reload(event.path)
+                self.watch_imports()  # Pick up newly imported modules
             self._reload_count += 1
 
             # Notify
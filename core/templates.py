@@ -5,8 +5,8 @@ Manages preloaded templates for fast matching.
 Phase 3.2.1: Lazy loading with LRU cache for memory efficiency.
 """
 
-from dataclasses import dataclass
-from functools import lru_cache
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
 from typing import Any
@@ -15,11 +15,64 @@ import cv2
 import numpy as np
 
 from core.models import AssetImage
+from core.vision.pyramid import build_pyramid
+from core.vision.template_cache import TemplateDiskCache, plane_norms
 from infra import get_logger
 
 logger = get_logger("TemplateStore")
 
 
+def load_planes(
+    path: Path, asset: AssetImage, disk_cache: TemplateDiskCache | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Decode and preprocess a template image.
+
+    Returns:
+        {"gray", "color" (colour assets only), "pyramid_<n>", "norms"}
+
+    Raises:
+        ValueError: If the image cannot be decoded
+    """
+    key = f"{path.resolve()}|gray={asset.grayscale}|pyramid={asset.pyramid_levels}"
+    if disk_cache is not None:
+        cached = disk_cache.get(key, path)
+        if cached is not None:
+            if "color" in cached:
+                cached = {**cached, "gray": cached["color"]}  # Same plane, stored once
+            return cached
+
+    img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise ValueError(f"Failed to read image: {path}")
+
+    # Convert to grayscale if needed
+    if asset.grayscale and len(img.shape) == 3:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = img
+
+    # Memory optimization: only store color if explicitly needed (not grayscale)
+    # This saves ~40% memory for grayscale templates
+    matched = gray if asset.grayscale else img
+    planes = {"gray": gray, "norms": plane_norms(matched)}
+    if not asset.grayscale:
+        planes["color"] = img
+    # Downscaled matching planes for coarse-to-fine search
+    for level, plane in enumerate(build_pyramid(matched, asset.pyramid_levels)):
+        planes[f"pyramid_{level}"] = plane
+
+    if disk_cache is not None:
+        stored = {k: v for k, v in planes.items() if not (k == "gray" and "color" in planes)}
+        disk_cache.put(key, path, stored)
+    return planes
+
+
+def _pyramid_planes(planes: dict[str, np.ndarray]) -> list[np.ndarray]:
+    """Pyramid levels of a plane dict, finest first."""
+    return [planes[f"pyramid_{i}"] for i in range(len(planes)) if f"pyramid_{i}" in planes]
+
+
 @dataclass
 class TemplateData:
     """Cached template data."""
@@ -28,6 +81,16 @@ class TemplateData:
     gray: np.ndarray
     color: np.ndarray | None
     shape: tuple[int, int]
+    pyramid: list[np.ndarray] = field(default_factory=list)
+    norms: np.ndarray | None = None  # [mean, std, L2 norm] of the matched plane
+
+
+def _template_bytes(data: TemplateData) -> int:
+    """Memory held by a template's planes."""
+    size = data.gray.nbytes + sum(p.nbytes for p in data.pyramid)
+    if data.color is not None and data.color is not data.gray:
+        size += data.color.nbytes
+    return size
 
 
 class TemplateStore:
@@ -38,11 +101,17 @@ class TemplateStore:
     - Preload all templates on script load
     - Cache grayscale converted versions
     - Memory management
+    - Optional on-disk cache of decoded planes for near-instant startup
     """
 
-    def __init__(self, base_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        base_path: Path | None = None,
+        disk_cache: TemplateDiskCache | None = None,
+    ) -> None:
         self._base_path = base_path or Path(".")
         self._templates: dict[str, dict[str, Any]] = {}
+        self._disk_cache = disk_cache
 
     def set_base_path(self, path: Path) -> None:
         """Set base path for relative asset paths."""
@@ -64,6 +133,9 @@ class TemplateStore:
             except Exception as e:
                 errors.append(f"{asset.id}: {e}")
 
+        if self._disk_cache is not None:
+            self._disk_cache.save()
+
         logger.info("Preloaded %d templates (%d errors)", len(self._templates), len(errors))
         return errors
 
@@ -80,27 +152,19 @@ class TemplateStore:
         if not path.exists():
             raise FileNotFoundError(f"Template not found: {path}")
 
-        # Load image
-        img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
-        if img is None:
-            raise ValueError(f"Failed to read image: {path}")
-
-        # Convert to grayscale if needed
-        if asset.grayscale and len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img
+        planes = load_planes(path, asset, self._disk_cache)
+        gray = planes["gray"]
 
-        # Memory optimization: only store color if explicitly needed (not grayscale)
-        # This saves ~40% memory for grayscale templates
         self._templates[asset.id] = {
             "asset": asset,
-            "color": None if asset.grayscale else img,  # Don't duplicate color for grayscale
+            "color": planes.get("color"),  # None for grayscale assets
             "gray": gray,
-            "shape": img.shape[:2],  # (h, w)
+            "shape": gray.shape[:2],  # (h, w)
+            "pyramid": _pyramid_planes(planes),
+            "norms": planes["norms"],  # [mean, std, L2 norm] of the matched plane
         }
 
-        logger.debug("Loaded template: %s (%dx%d, grayscale=%s)", asset.id, img.shape[1], img.shape[0], asset.grayscale)
+        logger.debug("Loaded template: %s (%dx%d, grayscale=%s)", asset.id, gray.shape[1], gray.shape[0], asset.grayscale)
 
     def get(self, asset_id: str) -> dict[str, Any] | None:
         """Get preloaded template."""
@@ -113,6 +177,17 @@ class TemplateStore:
             return None
         return data["gray"] if grayscale else data["color"]
 
+    def get_pyramid(self, asset_id: str) -> list[np.ndarray]:
+        """Get downscaled template planes ([1/2, 1/4, ...], empty if pyramid is off)."""
+        data = self._templates.get(asset_id)
+        return data.get("pyramid", []) if data else []
+
+    def pin(self, asset_ids: list[str]) -> None:
+        """No-op: preloaded templates are always resident."""
+
+    def unpin(self, asset_ids: list[str]) -> None:
+        """No-op: preloaded templates are always resident."""
+
     def get_asset(self, asset_id: str) -> AssetImage | None:
         """Get asset metadata."""
         data = self._templates.get(asset_id)
@@ -132,15 +207,22 @@ class TemplateStore:
 
 class LazyTemplateStore:
     """
-    Lazy-loading template store with LRU cache.
+    Lazy-loading template store with a byte-bounded LRU cache.
     
     Loads templates on-demand instead of upfront, with LRU eviction
     to manage memory usage for large asset libraries.
     
     Phase 3.2.1: Performance optimization.
     
+    Features:
+    - Per-instance cache bounded by total bytes and entry count
+    - Pinned assets (e.g. interrupt rules) are never evicted
+    - Accurate hit/miss/eviction counters
+    - Thread-safe (runner + interrupt scanner threads)
+
     Usage:
-        store = LazyTemplateStore(base_path, max_cached=50)
+        store = LazyTemplateStore(base_path, max_bytes=256 * 1024 * 1024)
+        store.pin(["popup_close"])  # Keep interrupt templates resident
         template = store.get("button_ok")  # Loads on first access
         stats = store.get_cache_stats()  # Monitor cache performance
     """
@@ -149,15 +231,27 @@ class LazyTemplateStore:
         self,
         base_path: Path | None = None,
         max_cached: int = 50,
+        disk_cache: TemplateDiskCache | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
     ) -> None:
         self._base_path = base_path or Path(".")
         self._max_cached = max_cached
+        self._max_bytes = max_bytes
+        self._disk_cache = disk_cache
         self._assets: dict[str, AssetImage] = {}  # Asset metadata registry
         self._lock = Lock()
         
+        # asset_id -> (asset path, data, size in bytes), least recently used first
+        self._cache: OrderedDict[str, tuple[str, TemplateData, int]] = OrderedDict()
+        self._bytes = 0
+        # asset_id -> number of holders (interrupt watcher, scanner, ...)
+        self._pinned: Counter[str] = Counter()
+
         # Statistics
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._load_failures = 0
         
     def set_base_path(self, path: Path) -> None:
         """Set base path for relative asset paths."""
@@ -169,6 +263,23 @@ class LazyTemplateStore:
             self._assets[asset.id] = asset
         logger.info("Registered %d assets for lazy loading", len(assets))
     
+    def pin(self, asset_ids: list[str]) -> None:
+        """Keep assets resident: pinned entries are never evicted.
+
+        Pins are counted, so each pin() must be matched by one unpin().
+        """
+        with self._lock:
+            self._pinned.update(asset_ids)
+
+    def unpin(self, asset_ids: list[str]) -> None:
+        """Release one pin per asset; evictable again once no holder is left."""
+        with self._lock:
+            self._pinned.subtract(asset_ids)
+            for asset_id in set(asset_ids):
+                if self._pinned[asset_id] <= 0:
+                    del self._pinned[asset_id]
+            self._evict()
+
     def get(self, asset_id: str) -> TemplateData | None:
         """
         Get template, loading it lazily if not cached.
@@ -184,57 +295,77 @@ class LazyTemplateStore:
         if asset is None:
             return None
         
-        # Use cached loader
-        return self._load_cached(asset_id, asset.path)
-    
-    @lru_cache(maxsize=50)
-    def _load_cached(self, asset_id: str, asset_path: str) -> TemplateData | None:
-        """
-        Load template with LRU caching.
-        
-        Uses asset_id + path as cache key for invalidation on path changes.
-        """
-        asset = self._assets.get(asset_id)
-        if asset is None:
+        with self._lock:
+            cached = self._cache.get(asset_id)
+            # Asset path is part of the key: a changed path reloads
+            if cached is not None and cached[0] == asset.path:
+                self._cache.move_to_end(asset_id)
+                self._hits += 1
+                return cached[1]
             self._misses += 1
+
+        # Decode outside the lock so other threads keep hitting the cache
+        data = self._load(asset)
+        if data is None:
             return None
         
+        with self._lock:
+            cached = self._cache.get(asset_id)
+            if cached is not None and cached[0] == asset.path:
+                return cached[1]  # Another thread loaded it meanwhile
+            if cached is not None:
+                self._bytes -= cached[2]
+            size = _template_bytes(data)
+            self._cache[asset_id] = (asset.path, data, size)
+            self._bytes += size
+            self._evict()
+        return data
+
+    def _evict(self) -> None:
+        """Drop least recently used unpinned entries until within bounds (lock held)."""
+        for asset_id in list(self._cache):
+            if self._bytes <= self._max_bytes and len(self._cache) <= self._max_cached:
+                break
+            if asset_id in self._pinned:
+                continue
+            _, _, size = self._cache.pop(asset_id)
+            self._bytes -= size
+            self._evictions += 1
+            logger.debug("Evicted template: %s (%d bytes)", asset_id, size)
+
+    def _load(self, asset: AssetImage) -> TemplateData | None:
+        """Decode a template from disk (or the disk cache)."""
         try:
-            path = Path(asset_path)
+            path = Path(asset.path)
             if not path.is_absolute():
-                path = self._base_path / asset_path
+                path = self._base_path / asset.path
             
             if not path.exists():
                 logger.warning("Template not found: %s", path)
-                self._misses += 1
+                self._load_failures += 1
                 return None
             
-            # Load image
-            img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
-            if img is None:
+            try:
+                planes = load_planes(path, asset, self._disk_cache)
+            except ValueError:
                 logger.warning("Failed to read image: %s", path)
-                self._misses += 1
+                self._load_failures += 1
                 return None
             
-            # Convert to grayscale if needed
-            if asset.grayscale and len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = img
-            
-            self._hits += 1
-            logger.debug("Lazy-loaded template: %s", asset_id)
+            logger.debug("Lazy-loaded template: %s", asset.id)
             
             return TemplateData(
                 asset=asset,
-                gray=gray,
-                color=None if asset.grayscale else img,
-                shape=img.shape[:2],
+                gray=planes["gray"],
+                color=planes.get("color"),
+                shape=planes["gray"].shape[:2],
+                pyramid=_pyramid_planes(planes),
+                norms=planes["norms"],
             )
             
         except (OSError, cv2.error) as e:
-            logger.error("Error loading template %s: %s", asset_id, e)
-            self._misses += 1
+            logger.error("Error loading template %s: %s", asset.id, e)
+            self._load_failures += 1
             return None
     
     def get_template_image(
@@ -253,25 +384,33 @@ class LazyTemplateStore:
         Get cache statistics.
         
         Returns:
-            Dict with hits, misses, hit_rate, cache_size
+            Dict with hits, misses, evictions, hit_rate, cache_size, bytes
         """
-        cache_info = self._load_cached.cache_info()
-        total = self._hits + self._misses
-        
-        return {
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_rate": self._hits / total if total > 0 else 0.0,
-            "cache_size": cache_info.currsize,
-            "max_size": cache_info.maxsize,
-            "registered_assets": len(self._assets),
-        }
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "load_failures": self._load_failures,
+                "hit_rate": self._hits / total if total > 0 else 0.0,
+                "cache_size": len(self._cache),
+                "max_size": self._max_cached,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "pinned": len(self._pinned),
+                "registered_assets": len(self._assets),
+            }
     
     def clear_cache(self) -> None:
-        """Clear the LRU cache."""
-        self._load_cached.cache_clear()
-        self._hits = 0
-        self._misses = 0
+        """Clear the LRU cache (pins are kept)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._load_failures = 0
         logger.debug("Lazy template cache cleared")
     
     def __contains__(self, asset_id: str) -> bool:
@@ -4,11 +4,84 @@ Part of "Titan Light" Phase 3 (Flight Recorder).
 
 Provides methods to calculate perceptual hashes (aHash/pHash) of images
 to detect if the screen content has changed effectively.
+
+Hashing is vectorised: the low-frequency 8x8 DCT block is computed with two
+small matrix products over a whole batch of 32x32 thumbnails, and bits are
+packed with numpy instead of Python loops. A tile grid hashes every tile of a
+frame in one batch so callers can see *where* the screen changed.
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 import cv2
 import numpy as np
-from PIL import Image
+
+try:
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+    Image = None
+
+HASH_SIZE = 32  # Thumbnail size fed to the DCT
+LOW_FREQ = 8  # Low-frequency block kept (8x8 = 64 bits)
+
+
+def _dct_basis(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix (same scaling as cv2.dct)."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    basis = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+# Only the first 8 DCT rows are needed: low = B @ X @ B.T
+_DCT_LOW = _dct_basis(HASH_SIZE)[:LOW_FREQ]
+
+# Bit counting for uint64 arrays (np.bitwise_count needs numpy >= 2.0)
+_bitwise_count = getattr(np, "bitwise_count", None)
+
+
+def _to_gray(image: Image.Image | np.ndarray) -> np.ndarray:
+    """Grayscale numpy plane from a PIL image (RGB) or numpy array (BGR)."""
+    if HAS_PIL and isinstance(image, Image.Image):
+        return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2GRAY)
+    if image.ndim == 3:
+        # Assuming BGR from cv2 standard or screen capture
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def _hash_thumbnails(thumbs: np.ndarray) -> np.ndarray:
+    """
+    pHash a batch of 32x32 thumbnails.
+
+    Args:
+        thumbs: (N, 32, 32) array
+
+    Returns:
+        (N,) uint64 hashes; bit i*8+j is set when DCT[i, j] > average
+    """
+    low = _DCT_LOW @ thumbs.astype(np.float32) @ _DCT_LOW.T  # (N, 8, 8)
+    flat = low.reshape(len(low), LOW_FREQ * LOW_FREQ)
+    # Average excluding the DC component (brightness)
+    avg = (flat.sum(axis=1) - flat[:, 0]) / (flat.shape[1] - 1)
+    bits = flat > avg[:, None]
+    packed = np.packbits(bits, axis=1, bitorder="little")  # (N, 8) bytes
+    return packed.view("<u8").ravel()
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """Number of set bits per element of a uint64 array."""
+    values = np.asarray(values, dtype=np.uint64)
+    if _bitwise_count is not None:
+        return _bitwise_count(values).astype(np.int64)
+    as_bytes = values.reshape(-1, 1).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1).reshape(values.shape).astype(np.int64)
 
 
 def calculate_phash(image: Image.Image | np.ndarray) -> int:
@@ -22,43 +95,28 @@ def calculate_phash(image: Image.Image | np.ndarray) -> int:
     Returns:
         64-bit integer hash
     """
-    # Convert PIL to numpy if needed
-    if isinstance(image, Image.Image):
-        image = np.array(image)
-        # Convert RGB to BGR for cv2 consistency if needed,
-        # but for grayscale conversion it largely doesn't matter
-        # as long as we use the right conversion code.
-        # PIL is RGB.
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-    elif isinstance(image, np.ndarray):
-        if len(image.shape) == 3:
-            # Assuming BGR from cv2 standard or screen capture
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-    # 1. Resize to 32x32
-    img_resized = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
-
-    # 2. Compute DCT
-    float_img = np.float32(img_resized)
-    dct = cv2.dct(float_img)
-
-    # 3. Take top-left 8x8 (low frequencies)
-    # Skipping DC component (0,0) usually recommended for robustness against brightness
-    dct_low_freq = dct[0:8, 0:8]
-
-    # 4. Compute average (excluding DC)
-    avg = (np.sum(dct_low_freq) - dct_low_freq[0, 0]) / 63
-
-    # 5. Compute hash
-    hash_val = 0
-    idx = 0
-    for i in range(8):
-        for j in range(8):
-            val = 1 if dct_low_freq[i, j] > avg else 0
-            hash_val |= val << idx
-            idx += 1
-
-    return hash_val
+    return phash_batch([image])[0]
+
+
+def phash_batch(images: list[Image.Image | np.ndarray]) -> list[int]:
+    """
+    Calculate pHashes of many images (e.g. ROIs) in one vectorised pass.
+
+    Args:
+        images: PIL Images or numpy arrays of any size
+
+    Returns:
+        64-bit integer hashes, in input order
+    """
+    if not images:
+        return []
+    thumbs = np.stack(
+        [
+            cv2.resize(_to_gray(img), (HASH_SIZE, HASH_SIZE), interpolation=cv2.INTER_AREA)
+            for img in images
+        ]
+    )
+    return [int(h) for h in _hash_thumbnails(thumbs)]
 
 
 def hamming_distance(hash1: int, hash2: int) -> int:
@@ -67,5 +125,122 @@ def hamming_distance(hash1: int, hash2: int) -> int:
     Unchanged screen ~ distance 0-2
     Significant change > 5
     """
-    x = hash1 ^ hash2
-    return bin(x).count("1")
+    return (hash1 ^ hash2).bit_count()
+
+
+def hamming_batch(hashes1: np.ndarray, hashes2: np.ndarray) -> np.ndarray:
+    """Element-wise Hamming distances between two uint64 hash arrays."""
+    return popcount64(np.bitwise_xor(hashes1, hashes2))
+
+
+@dataclass
+class DirtyTile:
+    """A screen tile whose content changed between two frames."""
+
+    row: int
+    col: int
+    x: int
+    y: int
+    w: int
+    h: int
+    distance: int  # Hamming distance of the tile hashes
+
+
+class TileGrid:
+    """
+    Hash-based dirty-region detector.
+
+    Splits a frame into a grid of tiles, pHashes every tile in one batch and
+    compares tile hashes between frames. Only the (rows, cols) hash grid
+    needs to be kept between frames, not the pixels.
+
+    Usage:
+        grid = TileGrid(tile_size=64)
+        before = grid.hash_frame(frame_a)
+        after = grid.hash_frame(frame_b)
+        for tile in grid.diff(before, after):
+            print(tile.x, tile.y, tile.distance)
+    """
+
+    def __init__(self, tile_size: int = 64, threshold: int = 2) -> None:
+        """
+        Args:
+            tile_size: Tile edge in pixels
+            threshold: Minimum Hamming distance for a tile to count as dirty
+        """
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self._shape: tuple[int, int] = (0, 0)  # (height, width) of the last frame
+
+    def grid_shape(self, height: int, width: int) -> tuple[int, int]:
+        """(rows, cols) of the grid for a frame size (edge tiles may be partial)."""
+        return -(-height // self.tile_size), -(-width // self.tile_size)
+
+    def hash_frame(self, image: Image.Image | np.ndarray) -> np.ndarray:
+        """
+        Hash every tile of a frame.
+
+        Returns:
+            (rows, cols) uint64 array of tile hashes
+        """
+        gray = _to_gray(image)
+        height, width = gray.shape[:2]
+        rows, cols = self.grid_shape(height, width)
+        self._shape = (height, width)
+
+        # Pad partial edge tiles, then shrink every tile to 32x32 in one resize
+        pad_h, pad_w = rows * self.tile_size - height, cols * self.tile_size - width
+        if pad_h or pad_w:
+            gray = cv2.copyMakeBorder(gray, 0, pad_h, 0, pad_w, cv2.BORDER_REPLICATE)
+        thumbs = cv2.resize(
+            gray, (cols * HASH_SIZE, rows * HASH_SIZE), interpolation=cv2.INTER_AREA
+        )
+        tiles = (
+            thumbs.reshape(rows, HASH_SIZE, cols, HASH_SIZE)
+            .transpose(0, 2, 1, 3)
+            .reshape(rows * cols, HASH_SIZE, HASH_SIZE)
+        )
+        return _hash_thumbnails(tiles).reshape(rows, cols)
+
+    def diff_mask(self, before: np.ndarray, after: np.ndarray) -> np.ndarray:
+        """(rows, cols) boolean mask of dirty tiles."""
+        return hamming_batch(before, after) >= self.threshold
+
+    def diff(self, before: np.ndarray, after: np.ndarray) -> list[DirtyTile]:
+        """Tiles whose hashes differ between two hash grids (row-major order)."""
+        distances = hamming_batch(before, after)
+        height, width = self._shape
+        size = self.tile_size
+
+        dirty: list[DirtyTile] = []
+        for row, col in zip(*np.nonzero(distances >= self.threshold), strict=True):
+            x, y = int(col) * size, int(row) * size
+            dirty.append(
+                DirtyTile(
+                    row=int(row),
+                    col=int(col),
+                    x=x,
+                    y=y,
+                    w=min(size, width - x) if width else size,
+                    h=min(size, height - y) if height else size,
+                    distance=int(distances[row, col]),
+                )
+            )
+        return dirty
+
+    def dirty_tiles(
+        self, before: Image.Image | np.ndarray, after: Image.Image | np.ndarray
+    ) -> list[DirtyTile]:
+        """Hash two frames and return the tiles that changed."""
+        return self.diff(self.hash_frame(before), self.hash_frame(after))
+
+
+def dirty_bounds(tiles: list[DirtyTile]) -> tuple[int, int, int, int] | None:
+    """Bounding box (x, y, w, h) around dirty tiles, None if nothing changed."""
+    if not tiles:
+        return None
+    x0 = min(t.x for t in tiles)
+    y0 = min(t.y for t in tiles)
+    x1 = max(t.x + t.w for t in tiles)
+    y1 = max(t.y + t.h for t in tiles)
+    return x0, y0, x1 - x0, y1 - y0
@@ -7,7 +7,10 @@ Part of RetroScript Phase 10 - Image Recognition.
 
 from __future__ import annotations
 
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
@@ -18,6 +21,10 @@ try:
     import cv2
     import numpy as np
 
+    from core.vision.nms import detect
+    from core.vision.pyramid import exhaustive_search, pyramid_search
+    from core.vision.template_cache import TemplateDiskCache
+
     HAS_CV2 = True
 except ImportError:
     HAS_CV2 = False
@@ -234,6 +241,19 @@ class ImageCache:
         self._cache.clear()
 
 
+# (score, (x, y), scale, (h, w)) of one evaluated scale
+_ScaleScore = tuple[float, tuple[int, int], float, tuple[int, int]]
+
+
+def _better(current: _ScaleScore | None, candidate: _ScaleScore | None) -> _ScaleScore | None:
+    """Pick the higher-scoring of two scale results (None = not evaluated)."""
+    if candidate is None:
+        return current
+    if current is None or candidate[0] > current[0]:
+        return candidate
+    return current
+
+
 class ImageMatcher:
     """Template matching engine for image detection.
 
@@ -249,13 +269,28 @@ class ImageMatcher:
         assets_dir: str | Path = "assets",
         confidence: float = 0.8,
         method: MatchMethod = MatchMethod.CCOEFF,
+        disk_cache: TemplateDiskCache | None = None,
+        scaled_cache_bytes: int = 32 * 1024 * 1024,
+        scale_workers: int = 4,
     ) -> None:
         self.assets_dir = Path(assets_dir)
         self.confidence = confidence
         self.method = method
         self._cache = ImageCache()
+        self._disk_cache = disk_cache  # Decoded images shared across runs
         self._screen_capture: Any = None
 
+        # Multi-scale matching state
+        # (template, scale) -> (base image, resized), least recently used first
+        self._scaled_cache: OrderedDict[tuple[str, float], tuple[Any, Any]] = OrderedDict()
+        self._scaled_bytes = 0
+        self._max_scaled_bytes = scaled_cache_bytes
+        self._last_scale: dict[str, float] = {}  # Winning scale per template
+        self._scale_lock = threading.Lock()
+        # Fixed-size pool shared by every caller thread, created on first use
+        self._scale_pool: ThreadPoolExecutor | None = None
+        self._scale_pool_workers = max(1, scale_workers)
+
         if not HAS_CV2:
             print("[WARN] OpenCV not installed. Using stub mode.")
 
@@ -266,6 +301,7 @@ class ImageMatcher:
         confidence: float | None = None,
         grayscale: bool = True,
         adaptive: bool = True,
+        pyramid: int = 0,
     ) -> MatchResult:
         """Find template on screen.
 
@@ -274,6 +310,7 @@ class ImageMatcher:
             roi: Region of interest to search in
             confidence: Override default confidence
             grayscale: Convert to grayscale for matching
+            pyramid: Coarse-to-fine search depth (0=off, 1=1/2 scale, 2=1/4 scale)
 
         Returns:
             MatchResult with position if found
@@ -299,7 +336,7 @@ class ImageMatcher:
             screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
 
         # Perform template matching
-        result = self._match(screen, template_img, confidence)
+        result = self._match(screen, template_img, confidence, pyramid)
 
         # Adaptive Fallback
         if not result.found and adaptive and confidence > 0.6:
@@ -307,7 +344,7 @@ class ImageMatcher:
             for fallback_conf in [
                 c * 0.05 for c in range(int(confidence * 20) - 1, 11, -1)
             ]:  # e.g., 0.75, 0.70... 0.60
-                fallback_result = self._match(screen, template_img, fallback_conf)
+                fallback_result = self._match(screen, template_img, fallback_conf, pyramid)
                 if fallback_result.found:
                     result = fallback_result
                     result.error_message = f"Matched with degraded confidence: {fallback_conf:.2f}"
@@ -328,17 +365,24 @@ class ImageMatcher:
         roi: ROI | tuple[int, int, int, int] | None = None,
         confidence: float | None = None,
         max_results: int = 10,
+        iou_threshold: float = 0.3,
+        min_distance: float = 0.0,
     ) -> list[MatchResult]:
         """Find all occurrences of template.
 
+        Each object is reported once: response-map local maxima are reduced
+        with non-maximum suppression and the best max_results are kept.
+
         Args:
             template: Path to template image
             roi: Region of interest
             confidence: Minimum confidence
             max_results: Maximum number of results
+            iou_threshold: Overlap above which weaker hits are suppressed
+            min_distance: Optional minimum spacing between results (pixels)
 
         Returns:
-            List of MatchResults
+            List of MatchResults sorted by score (best first)
         """
         if not HAS_CV2:
             return [self._stub_find(str(template))]
@@ -369,30 +413,26 @@ class ImageMatcher:
 
         h, w = template_img.shape[:2]
 
-        # Find all locations above threshold
-        if self.method == MatchMethod.SQDIFF:
-            locations = np.where(match_result <= 1 - confidence)
-        else:
-            locations = np.where(match_result >= confidence)
-
-        for pt in zip(*locations[::-1], strict=False):
-            if len(results) >= max_results:
-                break
-
-            x, y = int(pt[0]), int(pt[1])
-            score = float(match_result[y, x])
-
-            if self.method == MatchMethod.SQDIFF:
-                score = 1 - score
+        # Distinct objects: local maxima + NMS instead of every pixel above threshold
+        detections = detect(
+            match_result,
+            confidence,
+            w,
+            h,
+            sqdiff=self.method == MatchMethod.SQDIFF,
+            max_results=max_results,
+            iou_threshold=iou_threshold,
+            min_distance=min_distance,
+        )
 
-            # Adjust for ROI
-            if roi:
-                if isinstance(roi, tuple):
-                    roi = ROI(*roi)
-                x += roi.x
-                y += roi.y
+        if isinstance(roi, tuple):
+            roi = ROI(*roi)
+        offset_x, offset_y = (roi.x, roi.y) if roi else (0, 0)
 
-            results.append(MatchResult.found_at(x, y, w, h, score))
+        for det in detections:
+            results.append(
+                MatchResult.found_at(det.x + offset_x, det.y + offset_y, w, h, det.score)
+            )
 
         if not results:
             results.append(MatchResult.not_found())
@@ -405,17 +445,32 @@ class ImageMatcher:
         scales: list[float] | None = None,
         roi: ROI | None = None,
         confidence: float | None = None,
+        early_exit: bool = True,
+        coarse_to_fine: bool = False,
+        max_workers: int = 4,
     ) -> MatchResult:
         """Find template at multiple scales.
 
+        The scale that won last time for this template is tried first; with
+        early_exit a hit there skips the other scales entirely. Remaining
+        scales run on a thread pool (nearest to the remembered scale first)
+        and resized templates are cached per template and scale.
+
         Args:
             template: Path to template
             scales: List of scales to try (default: 0.5 to 1.5)
             roi: Region of interest
             confidence: Minimum confidence
+            early_exit: Stop at the first scale scoring above confidence
+                instead of evaluating every scale for the best score
+            coarse_to_fine: Rank scales on a half-resolution screen first,
+                then verify the best scale and its half-step neighbours at
+                full resolution (finds in-between scales such as 1.125)
+            max_workers: Evaluate scales on the shared scale pool when > 1
+                (its size is fixed by scale_workers); 1 = serial
 
         Returns:
-            Best MatchResult across scales
+            Best MatchResult across scales (result.scale holds the winner)
         """
         if not HAS_CV2:
             return self._stub_find(str(template))
@@ -431,34 +486,173 @@ class ImageMatcher:
         if screen is None:
             return MatchResult.error("Failed to capture screen")
 
-        best_result = MatchResult.not_found()
+        key = str(template)
+        if coarse_to_fine:
+            best = self._search_scales_coarse_to_fine(key, template_img, screen, scales)
+        else:
+            best = self._search_scales(
+                key, template_img, screen, scales, confidence, early_exit, max_workers
+            )
+
+        if best is None or best[0] < confidence:
+            return MatchResult.not_found()
+
+        score, (x, y), scale, (h, w) = best
+        with self._scale_lock:
+            self._last_scale[key] = scale
+
+        # Adjust for ROI
+        if roi:
+            if isinstance(roi, tuple):
+                roi = ROI(*roi)
+            x += roi.x
+            y += roi.y
+
+        result = MatchResult.found_at(x, y, w, h, score)
+        result.scale = scale
+        return result
+
+    def _search_scales(
+        self,
+        key: str,
+        template_img: Any,
+        screen: Any,
+        scales: list[float],
+        confidence: float,
+        early_exit: bool,
+        max_workers: int,
+    ) -> _ScaleScore | None:
+        """Evaluate scales (remembered winner first) and return the best."""
+        last = self._last_scale.get(key)
+        pivot = last if last is not None else 1.0
+        ordered = sorted(set(scales), key=lambda s: abs(s - pivot))
+
+        best: _ScaleScore | None = None
+
+        # Scale memory: the last winner usually still matches
+        if last is not None and early_exit:
+            best = self._score_scale(key, template_img, screen, last)
+            if best is not None and best[0] >= confidence:
+                return best
+            ordered = [s for s in ordered if s != last]
+
+        if max_workers <= 1 or len(ordered) <= 1:
+            for scale in ordered:
+                best = _better(best, self._score_scale(key, template_img, screen, scale))
+                if early_exit and best is not None and best[0] >= confidence:
+                    break
+            return best
+
+        pool = self._get_scale_pool()
+        futures = [
+            pool.submit(self._score_scale, key, template_img, screen, scale) for scale in ordered
+        ]
+        for future in as_completed(futures):
+            best = _better(best, future.result())
+            if early_exit and best is not None and best[0] >= confidence:
+                for f in futures:
+                    f.cancel()
+                break
+        return best
 
+    def _search_scales_coarse_to_fine(
+        self,
+        key: str,
+        template_img: Any,
+        screen: Any,
+        scales: list[float],
+    ) -> _ScaleScore | None:
+        """Rank scales at half resolution, then refine around the winner."""
+        coarse_screen = cv2.pyrDown(screen)
+        ranked: _ScaleScore | None = None
         for scale in scales:
-            # Resize template
-            scaled = cv2.resize(
-                template_img,
-                None,
-                fx=scale,
-                fy=scale,
-                interpolation=cv2.INTER_AREA,
+            ranked = _better(
+                ranked, self._score_scale(key, template_img, coarse_screen, scale / 2, scale)
             )
+        if ranked is None:
+            return None
 
-            # Skip if scaled template is larger than screen
-            if scaled.shape[0] > screen.shape[0] or scaled.shape[1] > screen.shape[1]:
-                continue
+        # Half a grid step either side of the coarse winner
+        winner = ranked[2]
+        ordered = sorted(set(scales))
+        idx = ordered.index(winner)
+        lower = ordered[idx - 1] if idx > 0 else winner
+        upper = ordered[idx + 1] if idx + 1 < len(ordered) else winner
+        candidates = {winner, round((lower + winner) / 2, 4), round((winner + upper) / 2, 4)}
 
-            result = self._match(screen, scaled, confidence)
-            result.scale = scale
+        best: _ScaleScore | None = None
+        for scale in sorted(candidates):
+            best = _better(best, self._score_scale(key, template_img, screen, scale))
+        return best
 
-            if result.found and result.score > best_result.score:
-                best_result = result
+    def _score_scale(
+        self,
+        key: str,
+        template_img: Any,
+        screen: Any,
+        scale: float,
+        report_scale: float | None = None,
+    ) -> _ScaleScore | None:
+        """Best (score, loc, scale, shape) of one scaled template, None if it does not fit."""
+        scaled = self._scaled_template(key, template_img, scale)
+        if scaled.shape[0] > screen.shape[0] or scaled.shape[1] > screen.shape[1]:
+            return None
+        if min(scaled.shape[:2]) < 1:
+            return None
 
-        # Adjust for ROI
-        if best_result.found and roi:
-            best_result.x += roi.x
-            best_result.y += roi.y
+        if len(scaled.shape) != len(screen.shape):
+            if len(scaled.shape) == 3:
+                scaled = cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
+            if len(screen.shape) == 3:
+                screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
 
-        return best_result
+        score, loc = exhaustive_search(screen, scaled, self._get_cv2_method())
+        if not np.isfinite(score):
+            return None
+        scale = report_scale if report_scale is not None else scale
+        return float(score), (int(loc[0]), int(loc[1])), scale, scaled.shape[:2]
+
+    def _scaled_template(self, key: str, template_img: Any, scale: float) -> Any:
+        """Resized template, cached per template and scale (LRU, byte-bounded)."""
+        cache_key = (key, scale)
+        with self._scale_lock:
+            cached = self._scaled_cache.get(cache_key)
+            if cached is not None:
+                self._scaled_cache.move_to_end(cache_key)
+        # The base image object changes when the file is reloaded
+        if cached is not None and cached[0] is template_img:
+            return cached[1]
+
+        if scale == 1.0:
+            scaled = template_img
+        else:
+            scaled = cv2.resize(
+                template_img,
+                None,
+                fx=scale,
+                fy=scale,
+                interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR,
+            )
+        with self._scale_lock:
+            previous = self._scaled_cache.pop(cache_key, None)
+            if previous is not None:
+                self._scaled_bytes -= previous[1].nbytes
+            self._scaled_cache[cache_key] = (template_img, scaled)
+            self._scaled_bytes += scaled.nbytes
+            # Drop least recently used scales, always keeping the newest one
+            while self._scaled_bytes > self._max_scaled_bytes and len(self._scaled_cache) > 1:
+                _, (_, evicted) = self._scaled_cache.popitem(last=False)
+                self._scaled_bytes -= evicted.nbytes
+        return scaled
+
+    def _get_scale_pool(self) -> ThreadPoolExecutor:
+        """Get the worker pool used by find_multiscale(), creating it once."""
+        with self._scale_lock:
+            if self._scale_pool is None:
+                self._scale_pool = ThreadPoolExecutor(
+                    max_workers=self._scale_pool_workers, thread_name_prefix="multiscale"
+                )
+            return self._scale_pool
 
     def wait(
         self,
@@ -507,7 +701,15 @@ class ImageMatcher:
         if not path.exists():
             return None
 
-        img = cv2.imread(path_str)
+        key = f"{path.resolve()}|imread"
+        planes = self._disk_cache.get(key, path) if self._disk_cache else None
+        if planes is not None:
+            img = planes["color"]
+        else:
+            img = cv2.imread(path_str)
+            if img is not None and self._disk_cache is not None:
+                self._disk_cache.put(key, path, {"color": img})
+
         if img is not None:
             self._cache.put(path_str, img)
 
@@ -558,8 +760,9 @@ class ImageMatcher:
         screen: Any,
         template: Any,
         confidence: float,
+        pyramid: int = 0,
     ) -> MatchResult:
-        """Perform template matching."""
+        """Perform template matching (coarse-to-fine when pyramid > 0)."""
         # Ensure same number of channels
         if len(template.shape) != len(screen.shape):
             if len(template.shape) == 3:
@@ -567,16 +770,10 @@ class ImageMatcher:
             if len(screen.shape) == 3:
                 screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
 
-        result = cv2.matchTemplate(screen, template, self._get_cv2_method())
-
-        if self.method == MatchMethod.SQDIFF:
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            score = 1 - min_val
-            loc = min_loc
+        if pyramid > 0:
+            score, loc = pyramid_search(screen, template, self._get_cv2_method(), levels=pyramid)
         else:
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            score = max_val
-            loc = max_loc
+            score, loc = exhaustive_search(screen, template, self._get_cv2_method())
 
         h, w = template.shape[:2]
 
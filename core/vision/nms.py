@@ -0,0 +1,137 @@
+"""
+Multi-Object Detection Module
+
+Turns a matchTemplate response map into a list of distinct detections:
+local-maxima extraction, top-K candidate selection with argpartition and
+IoU-based non-maximum suppression, with an optional minimum spacing.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+# Candidates considered per requested result before NMS
+CANDIDATES_PER_RESULT = 16
+
+
+@dataclass
+class Detection:
+    """A single detection in response-map coordinates."""
+
+    x: int
+    y: int
+    score: float
+
+
+def local_maxima(scores: np.ndarray, size: int = 3) -> np.ndarray:
+    """Boolean mask of pixels that are the maximum of their size x size window."""
+    kernel = np.ones((size, size), dtype=np.uint8)
+    return scores >= cv2.dilate(scores, kernel)
+
+
+def iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IoU of one (x, y, w, h) box against an (N, 4) array of boxes."""
+    x0 = np.maximum(box[0], boxes[:, 0])
+    y0 = np.maximum(box[1], boxes[:, 1])
+    x1 = np.minimum(box[0] + box[2], boxes[:, 0] + boxes[:, 2])
+    y1 = np.minimum(box[1] + box[3], boxes[:, 1] + boxes[:, 3])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    union = box[2] * box[3] + boxes[:, 2] * boxes[:, 3] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def non_max_suppression(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float = 0.3,
+    min_distance: float = 0.0,
+    max_results: int | None = None,
+) -> list[int]:
+    """
+    Greedy NMS.
+
+    Args:
+        boxes: (N, 4) array of (x, y, w, h)
+        scores: (N,) scores, higher is better
+        iou_threshold: Drop boxes overlapping a kept box by more than this
+        min_distance: Also drop boxes whose top-left corner is closer than
+            this (in pixels) to a kept box
+        max_results: Stop after this many boxes are kept
+
+    Returns:
+        Indices of kept boxes, best score first
+    """
+    order = np.argsort(-scores, kind="stable")
+    boxes = boxes.astype(np.float64)
+    keep: list[int] = []
+
+    while order.size and (max_results is None or len(keep) < max_results):
+        best = int(order[0])
+        keep.append(best)
+        rest = order[1:]
+        if not rest.size:
+            break
+
+        survivors = iou(boxes[best], boxes[rest]) <= iou_threshold
+        if min_distance > 0:
+            dist = np.hypot(boxes[rest, 0] - boxes[best, 0], boxes[rest, 1] - boxes[best, 1])
+            survivors &= dist >= min_distance
+        order = rest[survivors]
+
+    return keep
+
+
+def detect(
+    result: np.ndarray,
+    threshold: float,
+    template_w: int,
+    template_h: int,
+    sqdiff: bool = False,
+    max_results: int = 10,
+    iou_threshold: float = 0.3,
+    min_distance: float = 0.0,
+) -> list[Detection]:
+    """
+    Extract distinct detections from a matchTemplate response map.
+
+    Args:
+        result: Response map from cv2.matchTemplate
+        threshold: Minimum confidence (higher is better, also for SQDIFF)
+        template_w: Template width (detection box size)
+        template_h: Template height
+        sqdiff: Response map is TM_SQDIFF_NORMED (lower is better)
+        max_results: Maximum detections to return
+        iou_threshold: NMS overlap limit
+        min_distance: Optional minimum spacing between detections (pixels)
+
+    Returns:
+        Detections sorted by score (best first)
+    """
+    if max_results <= 0 or result.size == 0:
+        return []
+
+    scores = (1.0 - result) if sqdiff else result
+    scores = scores.astype(np.float32, copy=False)
+
+    mask = (scores >= threshold) & local_maxima(scores)
+    flat = np.flatnonzero(mask)
+    if not flat.size:
+        return []
+
+    # Top-K candidates only; NMS never needs more than a few per result
+    values = scores.ravel()[flat]
+    limit = max_results * CANDIDATES_PER_RESULT
+    if flat.size > limit:
+        top = np.argpartition(-values, limit - 1)[:limit]
+        flat, values = flat[top], values[top]
+
+    ys, xs = np.divmod(flat, result.shape[1])
+    boxes = np.column_stack(
+        [xs, ys, np.full_like(xs, template_w), np.full_like(xs, template_h)]
+    )
+    keep = non_max_suppression(boxes, values, iou_threshold, min_distance, max_results)
+
+    return [Detection(x=int(xs[i]), y=int(ys[i]), score=float(values[i])) for i in keep]
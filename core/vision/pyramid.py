@@ -0,0 +1,196 @@
+"""
+Image Pyramid Search Module
+
+Coarse-to-fine template matching: match a downscaled template against a
+downscaled screen first, then re-verify only the best candidate windows at
+full resolution. Roughly 4x less work per pyramid level on large screens.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+# Coarse templates smaller than this lose too much detail to be useful
+MIN_COARSE_SIZE = 6
+
+
+@dataclass
+class PyramidDrift:
+    """Score drift of a pyramid search compared with an exhaustive search."""
+
+    pyramid_score: float
+    exhaustive_score: float
+    pyramid_loc: tuple[int, int]
+    exhaustive_loc: tuple[int, int]
+    pyramid_ms: float
+    exhaustive_ms: float
+
+    @property
+    def drift(self) -> float:
+        """How much score the pyramid search lost (0 = same best score)."""
+        return self.exhaustive_score - self.pyramid_score
+
+    @property
+    def same_location(self) -> bool:
+        """Check if both searches found the same position."""
+        return self.pyramid_loc == self.exhaustive_loc
+
+    @property
+    def speedup(self) -> float:
+        """Exhaustive time divided by pyramid time."""
+        return self.exhaustive_ms / self.pyramid_ms if self.pyramid_ms > 0 else 0.0
+
+
+def build_pyramid(image: np.ndarray, levels: int) -> list[np.ndarray]:
+    """
+    Build downscaled copies of an image.
+
+    Returns:
+        [1/2 scale, 1/4 scale, ...] with `levels` entries
+    """
+    pyramid: list[np.ndarray] = []
+    current = image
+    for _ in range(levels):
+        current = cv2.pyrDown(current)
+        pyramid.append(current)
+    return pyramid
+
+
+def best_location(result: np.ndarray, sqdiff: bool) -> tuple[float, tuple[int, int]]:
+    """Best (confidence, (x, y)) of a matchTemplate response map."""
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+    if sqdiff:
+        return 1.0 - min_val, min_loc
+    return max_val, max_loc
+
+
+def top_peaks(
+    result: np.ndarray,
+    k: int,
+    sqdiff: bool,
+    suppress_w: int,
+    suppress_h: int,
+) -> list[tuple[float, tuple[int, int]]]:
+    """
+    Get up to k separated peaks of a response map.
+
+    After each peak, a template-sized window around it is suppressed so the
+    next peak comes from a different object.
+    """
+    scores = result.copy()
+    fill = np.inf if sqdiff else -np.inf
+    half_w, half_h = max(1, suppress_w // 2), max(1, suppress_h // 2)
+    peaks: list[tuple[float, tuple[int, int]]] = []
+
+    for _ in range(k):
+        conf, (x, y) = best_location(scores, sqdiff)
+        if not np.isfinite(conf):
+            break
+        peaks.append((conf, (x, y)))
+        scores[max(0, y - half_h) : y + half_h + 1, max(0, x - half_w) : x + half_w + 1] = fill
+
+    return peaks
+
+
+def exhaustive_search(
+    screen: np.ndarray, template: np.ndarray, method: int
+) -> tuple[float, tuple[int, int]]:
+    """Full-resolution search over the whole screen."""
+    result = cv2.matchTemplate(screen, template, method)
+    return best_location(result, method == cv2.TM_SQDIFF_NORMED)
+
+
+def pyramid_search(
+    screen: np.ndarray,
+    template: np.ndarray,
+    method: int,
+    levels: int = 1,
+    top_k: int = 3,
+    coarse_screen: np.ndarray | None = None,
+    coarse_template: np.ndarray | None = None,
+) -> tuple[float, tuple[int, int]]:
+    """
+    Coarse-to-fine template search.
+
+    Args:
+        screen: Full-resolution search region
+        template: Full-resolution template
+        method: OpenCV matchTemplate method
+        levels: Pyramid depth (1 = 1/2 scale, 2 = 1/4 scale)
+        top_k: Candidate windows re-verified at full resolution
+        coarse_screen: Precomputed downscaled screen (optional)
+        coarse_template: Precomputed downscaled template (optional)
+
+    Returns:
+        (confidence, (x, y)) of the best full-resolution match; falls back to
+        an exhaustive search when the coarse template would be too small
+    """
+    if levels <= 0:
+        return exhaustive_search(screen, template, method)
+
+    if coarse_template is None:
+        coarse_template = build_pyramid(template, levels)[-1]
+    cth, ctw = coarse_template.shape[:2]
+    if cth < MIN_COARSE_SIZE or ctw < MIN_COARSE_SIZE:
+        return exhaustive_search(screen, template, method)
+
+    if coarse_screen is None:
+        coarse_screen = build_pyramid(screen, levels)[-1]
+    if coarse_screen.shape[0] < cth or coarse_screen.shape[1] < ctw:
+        return exhaustive_search(screen, template, method)
+
+    sqdiff = method == cv2.TM_SQDIFF_NORMED
+    coarse = cv2.matchTemplate(coarse_screen, coarse_template, method)
+
+    scale = 1 << levels
+    margin = 2 * scale
+    th, tw = template.shape[:2]
+    sh, sw = screen.shape[:2]
+
+    best: tuple[float, tuple[int, int]] = (-np.inf, (0, 0))
+    for _, (cx, cy) in top_peaks(coarse, top_k, sqdiff, ctw, cth):
+        x0 = max(0, cx * scale - margin)
+        y0 = max(0, cy * scale - margin)
+        x1 = min(sw, cx * scale + tw + margin)
+        y1 = min(sh, cy * scale + th + margin)
+        window = screen[y0:y1, x0:x1]
+        if window.shape[0] < th or window.shape[1] < tw:
+            continue
+
+        conf, (lx, ly) = best_location(cv2.matchTemplate(window, template, method), sqdiff)
+        if conf > best[0]:
+            best = (conf, (x0 + lx, y0 + ly))
+
+    if not np.isfinite(best[0]):
+        return exhaustive_search(screen, template, method)
+    return best
+
+
+def measure_drift(
+    screen: np.ndarray,
+    template: np.ndarray,
+    method: int,
+    levels: int = 1,
+    top_k: int = 3,
+) -> PyramidDrift:
+    """Run pyramid and exhaustive search on the same input and compare."""
+    start = time.perf_counter()
+    p_score, p_loc = pyramid_search(screen, template, method, levels, top_k)
+    pyramid_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    e_score, e_loc = exhaustive_search(screen, template, method)
+    exhaustive_ms = (time.perf_counter() - start) * 1000
+
+    return PyramidDrift(
+        pyramid_score=float(p_score),
+        exhaustive_score=float(e_score),
+        pyramid_loc=(int(p_loc[0]), int(p_loc[1])),
+        exhaustive_loc=(int(e_loc[0]), int(e_loc[1])),
+        pyramid_ms=pyramid_ms,
+        exhaustive_ms=exhaustive_ms,
+    )
@@ -0,0 +1,348 @@
+"""
+Template Disk Cache Module
+
+Persistent cache of decoded and preprocessed template planes (grayscale,
+colour, pyramid levels, norms) in one memory-mapped file per project.
+
+Entries are keyed by source path + preprocessing options and validated by
+mtime/size, falling back to a content hash when the mtime changed (e.g. after
+a git checkout). Cached planes are returned as read-only, zero-copy views
+into the mapped file, so several runner processes share the same pages.
+
+Each save writes a new data file (templates.<n>.bin) and then repoints the
+small templates.cache pointer file at it. A mapped file is never replaced
+or rewritten, which Windows refuses. Older data files are deleted once
+nothing maps them anymore.
+
+Data file layout:
+    MAGIC | index length | data start | JSON index | padding | planes
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import re
+import struct
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from infra import get_logger
+
+logger = get_logger("TemplateCache")
+
+MAGIC = b"RATPL001"
+CACHE_DIR = ".retroauto"
+CACHE_FILENAME = "templates.cache"  # Pointer: name of the current data file
+_ALIGN = 64  # Plane alignment inside the file (SIMD-friendly)
+_HEADER = struct.Struct("<8sQQ")  # magic, index length, data start
+
+
+def file_digest(path: Path) -> str:
+    """Content hash of a source image."""
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def plane_norms(plane: np.ndarray) -> np.ndarray:
+    """Precomputed [mean, std, L2 norm] of a template plane."""
+    data = plane.astype(np.float64)
+    return np.array([data.mean(), data.std(), np.sqrt(np.square(data).sum())])
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class TemplateDiskCache:
+    """
+    Memory-mapped on-disk cache of preprocessed template planes.
+
+    Usage:
+        cache = TemplateDiskCache.for_project(project_dir)
+        planes = cache.get(key, source_path)
+        if planes is None:
+            planes = decode(...)
+            cache.put(key, source_path, planes)
+        cache.save()
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._lock = Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, dict[str, np.ndarray]] = {}  # Not yet written
+        self._mm: np.memmap | None = None
+        self._data_path: Path | None = None
+        self._generation = 0  # <n> of the mapped templates.<n>.bin
+        self._data_start = 0
+        self._dirty = False
+        self._atexit_registered = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+        self._open()
+
+    @classmethod
+    def for_project(cls, project_dir: Path) -> TemplateDiskCache:
+        """Cache file stored inside a project directory."""
+        return cls(Path(project_dir) / CACHE_DIR / CACHE_FILENAME)
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache file."""
+        return self._path
+
+    def _data_file(self, generation: int) -> Path:
+        return self._path.with_name(f"{self._path.stem}.{generation}.bin")
+
+    def _generation_of(self, name: str) -> int | None:
+        match = re.fullmatch(rf"{re.escape(self._path.stem)}\.(\d+)\.bin", name)
+        return int(match.group(1)) if match else None
+
+    def _open(self) -> None:
+        """Read the index and map the current data file (missing/corrupt = empty)."""
+        if not self._path.exists():
+            return
+
+        try:
+            name = self._path.read_text(encoding="utf-8").strip()
+            generation = self._generation_of(name)
+            if generation is None:
+                raise ValueError("bad pointer")
+            data_path = self._data_file(generation)
+            with open(data_path, "rb") as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    raise ValueError("truncated header")
+                magic, index_len, data_start = _HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError("bad magic")
+                index = json.loads(f.read(index_len))
+            mm = np.memmap(data_path, dtype=np.uint8, mode="r")
+            entries = index["entries"]
+            if not isinstance(entries, dict):
+                raise ValueError("bad index")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable template cache %s: %s", self._path, e)
+            self._entries = {}
+            self._mm = None
+            return
+
+        self._mm = mm
+        self._data_path = data_path
+        self._generation = generation
+        self._data_start = data_start
+        self._entries = {k: e for k, e in entries.items() if self._entry_fits(e, len(mm))}
+        if len(self._entries) < len(entries):
+            logger.warning(
+                "Dropped %d damaged template cache entries from %s",
+                len(entries) - len(self._entries),
+                data_path,
+            )
+
+    def _entry_fits(self, entry: Any, file_size: int) -> bool:
+        """Whether an index entry is well-formed and its planes lie inside the file."""
+        try:
+            if not (
+                isinstance(entry["path"], str)
+                and isinstance(entry["digest"], str)
+                and isinstance(entry["mtime_ns"], int)
+                and isinstance(entry["size"], int)
+            ):
+                return False
+            for offset, dtype, shape in entry["planes"].values():
+                dims = [int(d) for d in shape]
+                if not isinstance(offset, int) or offset < 0 or any(d < 0 for d in dims):
+                    return False
+                nbytes = int(np.prod(dims)) * np.dtype(dtype).itemsize
+                if self._data_start + offset + nbytes > file_size:
+                    return False
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+        return True
+
+    def get(self, key: str, source: Path) -> dict[str, np.ndarray] | None:
+        """
+        Get cached planes for a source image.
+
+        Returns:
+            {plane name: read-only array}, or None if missing or stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            try:
+                stat = source.stat()
+            except OSError:
+                self.misses += 1
+                return None
+
+            if stat.st_mtime_ns != entry["mtime_ns"] or stat.st_size != entry["size"]:
+                # Touched but possibly unchanged (checkout, copy): compare content
+                if stat.st_size != entry["size"] or file_digest(source) != entry["digest"]:
+                    del self._entries[key]
+                    self._pending.pop(key, None)
+                    self._dirty = True
+                    self.invalidated += 1
+                    self.misses += 1
+                    return None
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+
+            self.hits += 1
+            return self._planes(key, entry)
+
+    def put(self, key: str, source: Path, planes: dict[str, np.ndarray]) -> None:
+        """Add freshly decoded planes (written on the next save())."""
+        stat = source.stat()
+        with self._lock:
+            self._entries[key] = {
+                "path": str(source),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": file_digest(source),
+                "planes": {},
+            }
+            self._pending[key] = {name: np.ascontiguousarray(p) for name, p in planes.items()}
+            self._dirty = True
+
+            if not self._atexit_registered:
+                atexit.register(self.save)
+                self._atexit_registered = True
+
+    def _planes(self, key: str, entry: dict[str, Any]) -> dict[str, np.ndarray]:
+        """Zero-copy views of an entry's planes (lock held)."""
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+
+        planes: dict[str, np.ndarray] = {}
+        for name, (offset, dtype, shape) in entry["planes"].items():
+            count = int(np.prod(shape))
+            planes[name] = np.frombuffer(
+                self._mm, dtype=dtype, count=count, offset=self._data_start + offset
+            ).reshape(shape)
+        return planes
+
+    def save(self, prune: bool = True) -> bool:
+        """
+        Write the cache file if anything changed.
+
+        Planes go to a new data file and the pointer file is swapped to it
+        atomically, so this and other processes can keep the old file mapped.
+
+        Args:
+            prune: Drop entries whose source file no longer exists
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+
+            keys = [
+                k for k, e in self._entries.items() if not prune or Path(e["path"]).exists()
+            ]
+            planes = {k: self._planes(k, self._entries[k]) for k in keys}
+
+            index: dict[str, Any] = {}
+            layout: list[tuple[int, np.ndarray]] = []
+            offset = 0
+            for k in keys:
+                entry = dict(self._entries[k])
+                entry["planes"] = {}
+                for name, plane in planes[k].items():
+                    offset = _aligned(offset)
+                    entry["planes"][name] = [offset, plane.dtype.str, list(plane.shape)]
+                    layout.append((offset, plane))
+                    offset += plane.nbytes
+                index[k] = entry
+
+            return self._write(index, layout)
+
+    def _write(self, index: dict[str, Any], layout: list[tuple[int, np.ndarray]]) -> bool:
+        """Write a new data file, then point the cache at it (lock held)."""
+        index_bytes = json.dumps({"entries": index}).encode()
+        data_start = _aligned(_HEADER.size + len(index_bytes))
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        data_path: Path | None = None
+
+        try:
+            generation = self._claim_generation()
+            data_path = self._data_file(generation)
+            with open(data_path, "r+b") as f:
+                f.write(_HEADER.pack(MAGIC, len(index_bytes), data_start))
+                f.write(index_bytes)
+                for offset, plane in layout:
+                    f.seek(data_start + offset)
+                    f.write(plane.tobytes())
+            tmp.write_text(data_path.name, encoding="utf-8")
+            os.replace(tmp, self._path)  # The pointer is never mapped
+        except OSError as e:
+            logger.warning("Could not write template cache %s: %s", self._path, e)
+            tmp.unlink(missing_ok=True)
+            if data_path is not None:
+                data_path.unlink(missing_ok=True)
+            return False
+
+        self._entries = index
+        self._pending.clear()
+        self._data_start = data_start
+        self._mm = np.memmap(data_path, dtype=np.uint8, mode="r")
+        self._data_path = data_path
+        self._generation = generation
+        self._dirty = False
+        self._remove_old_files()
+        logger.debug("Wrote template cache: %s (%d entries)", data_path, len(index))
+        return True
+
+    def _claim_generation(self) -> int:
+        """Create an empty data file with an unused generation number (lock held).
+
+        Exclusive creation keeps a concurrently saving process from
+        writing the same file.
+        """
+        generation = self._generation + 1
+        while True:
+            try:
+                self._data_file(generation).touch(exist_ok=False)
+                return generation
+            except FileExistsError:
+                generation += 1
+
+    def _remove_old_files(self) -> None:
+        """Delete data files older than the current one (lock held).
+
+        On Windows a file still mapped here (planes handed out by get()) or
+        by another process cannot be deleted; it is retried on the next save.
+        """
+        for old in self._path.parent.glob(f"{self._path.stem}.*.bin"):
+            generation = self._generation_of(old.name)
+            if generation is not None and generation < self._generation:
+                with contextlib.suppress(OSError):
+                    old.unlink()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "entries": len(self._entries),
+            "path": str(self._path),
+        }
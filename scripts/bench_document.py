@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ScriptDocument.update_from_code, full vs incremental parse
+
+Builds a script of N flows, then times a one-character edit inside one
+flow synced through a document that re-parses everything (parse_to_ir)
+and through the incremental parser, and reports the best time of
+several repeats.
+
+Run: python scripts/bench_document.py [--flows 500] [--repeat 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Setup path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.dsl.document import ScriptDocument  # noqa: E402
+from core.dsl.ir import parse_to_ir  # noqa: E402
+
+FLOW = """flow step_%(i)d {
+  wait_image("ready")
+  click(%(x)d, 200)
+  if_image("popup")
+  run_flow("step_%(next)d")
+}
+
+"""
+
+
+def build_source(flows: int, x: int = 100) -> str:
+    parts = [
+        FLOW % {"i": i, "x": x if i == flows // 2 else 100, "next": i + 1} for i in range(flows)
+    ]
+    return 'hotkeys {\n  start = "F5"\n}\n\n' + "".join(parts)
+
+
+class FullParseDocument(ScriptDocument):
+    """ScriptDocument syncing the old way: whole-file parse and checks."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._parser.parse = parse_to_ir  # type: ignore[method-assign]
+        self._parser.stats.full_parse = True
+
+
+def best_time(doc: ScriptDocument, edits: list[str], repeat: int) -> float:
+    best = float("inf")
+    for i in range(repeat):
+        code = edits[i % len(edits)]
+        start = time.perf_counter()
+        doc.update_from_code(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--flows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    source = build_source(args.flows)
+    edits = [build_source(args.flows, x) for x in (101, 102)]
+    lines = source.count("\n")
+
+    print("=" * 72)
+    print(f"{args.flows} flows, {lines} lines: one-character edit in one flow")
+    print("=" * 72)
+    times = {}
+    for name, doc in (("full", FullParseDocument()), ("incremental", ScriptDocument())):
+        doc.update_from_code(source)
+        times[name] = best_time(doc, edits, args.repeat)
+        print(f"{name:>12}: {times[name] * 1000:8.2f}ms")
+    print(f"{'speedup':>12}: {times['full'] / times['incremental']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
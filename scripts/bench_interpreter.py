@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tree-walking Interpreter vs bytecode VirtualMachine
+
+Runs the same RetroScript programs (a while-loop counter with HP
+arithmetic, a for/range loop and nested flow calls) through both engines,
+checks the results agree and reports the best time of several repeats.
+
+Run: python scripts/bench_interpreter.py [--iterations 20000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Setup path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.dsl.parser import Parser  # noqa: E402
+from core.engine.interpreter import Interpreter  # noqa: E402
+from core.engine.vm import VirtualMachine  # noqa: E402
+
+PROGRAMS = {
+    "while counter": """
+        flow main {
+            let i = 0
+            let hp = 1000
+            while i < %(n)d {
+                i = i + 1
+                hp = hp - i %% 7 + 3
+                if hp < 0 { hp = 1000 }
+            }
+            return hp
+        }
+    """,
+    "for/range": """
+        flow main {
+            let total = 0
+            for k in range(%(n)d) {
+                if k %% 3 == 0 { continue }
+                total = total + k * 2
+            }
+            return total
+        }
+    """,
+    "flow calls": """
+        flow heal { $hp = $hp + amount; return $hp }
+        flow tick { let amount = 2; return heal() }
+        flow main {
+            $hp = 0
+            let i = 0
+            while i < %(calls)d { tick(); i = i + 1 }
+            return $hp
+        }
+    """,
+}
+
+
+def best_time(engine_cls: type, source: str, repeat: int) -> tuple[float, object]:
+    program = Parser(source).parse()
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        engine = engine_cls()
+        start = time.perf_counter()
+        result = engine.execute(program)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"Interpreter vs VM ({args.iterations} iterations, best of {args.repeat})")
+    print("=" * 60)
+
+    for name, template in PROGRAMS.items():
+        source = template % {"n": args.iterations, "calls": args.iterations // 10}
+        walker, expected = best_time(Interpreter, source, args.repeat)
+        vm, result = best_time(VirtualMachine, source, args.repeat)
+        status = "ok" if result == expected else f"MISMATCH {result!r} != {expected!r}"
+        print(
+            f"{name:>14}: walker {walker * 1000:8.1f}ms  vm {vm * 1000:8.1f}ms  "
+            f"speedup {walker / vm:5.1f}x  {status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DSL Lexer, character scanner vs regex fast path
+
+Tokenizes the bundled example scripts, repeated to a large script, with
+both scanners, checks the token streams agree and reports the best time
+and throughput of several repeats.
+
+Run: python scripts/bench_lexer.py [--lines 3000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Setup path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.dsl.lexer import Lexer  # noqa: E402
+
+EXAMPLES = ["scripts/main.dsl", "scripts/examples/tutorial_sandbox.retro"]
+
+
+def build_source(lines: int) -> str:
+    """Concatenate the example scripts until the source has lines lines."""
+    corpus = "\n".join((PROJECT_ROOT / name).read_text(encoding="utf-8") for name in EXAMPLES)
+    chunk = corpus.splitlines()
+    out: list[str] = []
+    while len(out) < lines:
+        out.extend(chunk)
+    return "\n".join(out[:lines]) + "\n"
+
+
+def best_time(source: str, fast: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Lexer(source, fast=fast).tokenize()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = build_source(args.lines)
+    size_mb = len(source.encode("utf-8")) / 1_000_000
+    slow_tokens = Lexer(source, fast=False).tokenize()
+    fast_tokens = Lexer(source).tokenize()
+    assert [(t.type, t.value, t.line, t.column) for t in slow_tokens] == [
+        (t.type, t.value, t.line, t.column) for t in fast_tokens
+    ], "scanners disagree"
+
+    print("=" * 72)
+    print(f"{args.lines} lines, {size_mb * 1000:.0f} KB, {len(fast_tokens)} tokens")
+    print("=" * 72)
+    times = {}
+    for name, fast in (("character", False), ("fast", True)):
+        times[name] = best_time(source, fast, args.repeat)
+        print(
+            f"{name:>10}: {times[name] * 1000:8.2f}ms  "
+            f"{size_mb / times[name]:6.2f} MB/s  "
+            f"{len(fast_tokens) / times[name] / 1000:8.0f}k tokens/s"
+        )
+    print(f"{'speedup':>10}: {times['character'] / times['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ModuleLoader cold vs disk-cached load of an import tree
+
+Writes a project whose main module imports N library modules (each
+with M flows), then times a fresh ModuleLoader loading it with an
+empty parsed-module cache and again with a warm one, reporting the
+best time of several repeats.
+
+Run: python scripts/bench_module_loader.py [--modules 40] [--flows 50] [--repeat 5]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Setup path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.dsl.module_loader import ModuleLoader  # noqa: E402
+
+FLOW = """flow step_%(i)d {
+  wait_image("ready")
+  click(%(i)d, 200)
+  if_image("popup")
+  run_flow("step_%(next)d")
+}
+
+"""
+
+
+def write_project(root: Path, modules: int, flows: int) -> None:
+    (root / "lib").mkdir(parents=True)
+    body = "".join(FLOW % {"i": i, "next": i + 1} for i in range(flows))
+    for m in range(modules):
+        (root / "lib" / f"mod{m}.retro").write_text(body, encoding="utf-8")
+    imports = "".join(f'import "lib/mod{m}"\n' for m in range(modules))
+    (root / "main.retro").write_text(imports + "flow main {\n}\n", encoding="utf-8")
+
+
+def best_time(root: Path, cache_dir: Path, repeat: int, warm: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if not warm:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        start = time.perf_counter()
+        ModuleLoader(root, cache_dir=cache_dir).load("main")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modules", type=int, default=40)
+    parser.add_argument("--flows", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        cache_dir = Path(tmp) / "cache"
+        write_project(root, args.modules, args.flows)
+
+        print("=" * 72)
+        print(f"main + {args.modules} modules x {args.flows} flows")
+        print("=" * 72)
+        cold = best_time(root, cache_dir, args.repeat, warm=False)
+        warm = best_time(root, cache_dir, args.repeat, warm=True)
+        print(f"{'cold':>12}: {cold * 1000:8.2f}ms")
+        print(f"{'cached':>12}: {warm * 1000:8.2f}ms")
+        print(f"{'speedup':>12}: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
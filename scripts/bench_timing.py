@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: delay jitter, chunked time.sleep vs PrecisionTimer
+
+Requests the same delays from the old chunked sleep loop (100ms
+time.sleep chunks with pause checks) and from PrecisionTimer, and reports
+the distribution of achieved minus requested delay (mean, p50, p99, max)
+plus the accumulated drift of a back-to-back delay loop.
+
+Run: python scripts/bench_timing.py [--delays 1,10,100] [--samples 200]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Setup path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.engine.context import ExecutionContext  # noqa: E402
+from core.engine.timing import PrecisionTimer  # noqa: E402
+from core.models import Script  # noqa: E402
+from core.templates import TemplateStore  # noqa: E402
+
+
+def chunked_sleep(ctx: ExecutionContext, seconds: float) -> bool:
+    """The Runner's previous sleep: 100ms chunks with pause checks."""
+    remaining = seconds
+    while remaining > 0:
+        if not ctx.wait_if_paused():
+            return False
+        sleep_time = min(0.1, remaining)
+        time.sleep(sleep_time)
+        remaining -= sleep_time
+    return ctx.wait_if_paused()
+
+
+def measure(sleep: Callable[[float], bool], seconds: float, samples: int) -> list[float]:
+    """Achieved minus requested delay in ms, per sample."""
+    errors = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        sleep(seconds)
+        errors.append((time.perf_counter() - start - seconds) * 1000)
+    return errors
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--delays", default="1,10,100", help="Requested delays in ms")
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    ctx = ExecutionContext(script=Script(name="Bench"), templates=TemplateStore())
+    timer = PrecisionTimer(ctx)
+    sleepers: dict[str, Callable[[float], bool]] = {
+        "chunked": lambda s: chunked_sleep(ctx, s),
+        "precision": timer.sleep,
+    }
+
+    for delay_ms in (int(d) for d in args.delays.split(",")):
+        samples = max(5, args.samples * 10 // max(delay_ms, 10))
+        print("\n" + "=" * 72)
+        print(f"Delay {delay_ms}ms x {samples} (error = achieved - requested, ms)")
+        print("=" * 72)
+
+        for name, sleep in sleepers.items():
+            errors = measure(sleep, delay_ms / 1000.0, samples)
+            print(
+                f"{name:>10}: mean {statistics.fmean(errors):7.3f}  "
+                f"p50 {percentile(errors, 0.5):7.3f}  p99 {percentile(errors, 0.99):7.3f}  "
+                f"max {max(errors):7.3f}  min {min(errors):7.3f}"
+            )
+            print(f"{'':>10}  drift over {samples} delays: {sum(errors):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
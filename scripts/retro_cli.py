@@ -21,12 +21,14 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.analytics.metrics import ACTION_STATS_PATH
 from core.engine.context import EngineState, ExecutionContext
 from core.engine.runner import Runner
 from core.models import Script
 from core.orchestration.history import RunHistory, get_run_history
 from core.script.io import load_script
 from core.templates import TemplateStore
+from core.vision.template_cache import TemplateDiskCache
 from infra import get_logger, setup_logging
 
 logger = get_logger("CLI")
@@ -63,7 +65,7 @@ def run_script(
 
     # Setup context
     project_dir = script_path.parent
-    templates = TemplateStore(project_dir)
+    templates = TemplateStore(project_dir, disk_cache=TemplateDiskCache.for_project(project_dir))
 
     if script.assets:
         errors = templates.preload(script.assets)
@@ -104,6 +106,7 @@ def run_script(
         ctx,
         on_step=on_step,
         on_complete=on_complete,
+        stats_path=ACTION_STATS_PATH,
     )
 
     # Run
@@ -0,0 +1,110 @@
+"""
+Test latency histograms and per-action phase metrics.
+"""
+
+import random
+import time
+
+import pytest
+
+from app.cli import main as cli_main
+from core.analytics.metrics import (
+    ActionMetrics,
+    Histogram,
+    MetricsRegistry,
+    phase,
+)
+
+
+class TestHistogram:
+    """Test HDR-style histogram buckets and percentiles."""
+
+    def test_percentiles_within_bucket_precision(self) -> None:
+        rng = random.Random(7)
+        values = sorted(rng.expovariate(1 / 0.02) for _ in range(5000))
+        histogram = Histogram("latency")
+        for value in values:
+            histogram.record(value)
+
+        for p in (50, 95, 99):
+            exact = values[int(p / 100 * len(values)) - 1]
+            assert histogram.percentile(p) == pytest.approx(exact, rel=0.04, abs=2e-6)
+        assert histogram.percentile(100) == values[-1]
+        assert histogram.count == 5000
+        assert len(histogram.buckets) < 400
+
+    def test_small_values_are_exact(self) -> None:
+        histogram = Histogram("latency")
+        for us in range(1, 11):
+            histogram.record(us / 1_000_000)
+        assert histogram.percentile(50) == pytest.approx(5e-6)
+
+    def test_save_and_load(self, tmp_path) -> None:  # type: ignore
+        registry = MetricsRegistry()
+        registry.histogram("h", action="Click").record(0.01)
+        registry.histogram("h", action="Click").record(0.03)
+        path = tmp_path / "stats.json"
+        registry.save_histograms(path)
+        registry.save_histograms(path)  # Replaces the file in place
+        assert [p.name for p in tmp_path.iterdir()] == ["stats.json"]
+
+        loaded = MetricsRegistry()
+        loaded.load_histograms(path)
+        histogram = loaded.histogram("h", action="Click")
+        assert histogram.count == 2
+        assert histogram.max == pytest.approx(0.03)
+        assert loaded.get_all()["h{action=Click}"]["type"] == "histogram"
+
+
+class TestActionMetrics:
+    """Test phase attribution and per-action recording."""
+
+    def test_nested_phases_are_exclusive(self) -> None:
+        metrics = ActionMetrics(MetricsRegistry())
+        span = metrics.begin()
+        with phase("match"):
+            time.sleep(0.01)
+            with phase("capture"):
+                time.sleep(0.02)
+        with phase("wait"):
+            time.sleep(0.01)
+        metrics.end(span, "ClickImage", "btn", 0.05)
+
+        assert span.phases["capture"] >= 0.02
+        assert 0.01 <= span.phases["match"] < 0.02
+        assert span.phases["wait"] >= 0.01
+
+    def test_phase_outside_action_is_ignored(self) -> None:
+        with phase("match"):
+            pass  # No span: nothing to record, no error
+
+    def test_summary_rows(self) -> None:
+        metrics = ActionMetrics(MetricsRegistry())
+        for _ in range(3):
+            span = metrics.begin()
+            with phase("input"):
+                pass
+            metrics.end(span, "Hotkey", "", 0.002)
+        span = metrics.begin()
+        metrics.end(span, "ClickImage", "btn", 0.01)
+
+        rows = [(r["action"], r["asset"], r["phase"], r["count"]) for r in metrics.summary()]
+        assert rows == [
+            ("ClickImage", "btn", "", 1),
+            ("Hotkey", "", "", 3),
+            ("Hotkey", "", "input", 3),
+        ]
+
+    def test_cli_stats(self, tmp_path, capsys) -> None:  # type: ignore
+        metrics = ActionMetrics(MetricsRegistry())
+        span = metrics.begin()
+        with phase("wait"):
+            pass
+        metrics.end(span, "Delay", "", 0.1)
+        path = tmp_path / "action_stats.json"
+        metrics.save(path)
+
+        assert cli_main(["stats", str(path), "--phases"]) == 0
+        out = capsys.readouterr().out
+        assert "Delay" in out and "wait" in out and "100.0" in out
+        assert cli_main(["stats", str(tmp_path / "missing.json")]) == 1
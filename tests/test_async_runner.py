@@ -0,0 +1,147 @@
+"""
+Test the asyncio runner.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.models import (
+    Delay,
+    Flow,
+    Goto,
+    Hotkey,
+    IfImage,
+    Label,
+    Loop,
+    Match,
+    RunFlow,
+    Script,
+    WaitImage,
+)
+from core.templates import TemplateStore
+
+
+class MockMatcher:
+    """Mock matcher: assets listed in `visible` are found."""
+
+    def __init__(self) -> None:
+        self.visible: set[str] = set()
+
+    def find(self, asset_id: str, roi_override=None, adaptive=True):  # type: ignore
+        if asset_id in self.visible:
+            return Match(x=0, y=0, w=10, h=10, confidence=0.99)
+        return None
+
+    def region_checksum(self, asset_id: str, roi_override=None):  # type: ignore
+        return None
+
+
+class MockKeyboard:
+    """Mock keyboard recording hotkeys."""
+
+    def __init__(self) -> None:
+        self.hotkeys: list[str] = []
+
+    def hotkey(self, keys: list[str]) -> None:
+        self.hotkeys.append("+".join(keys))
+
+
+@pytest.fixture
+def make_runner():  # type: ignore
+    from core.engine.async_runner import AsyncRunner
+    from core.engine.context import ExecutionContext
+    from vision.waiter import ImageWaiter
+
+    def make(*flows: Flow):  # type: ignore
+        script = Script(name="Test", flows=list(flows))
+        ctx = ExecutionContext(script=script, templates=TemplateStore())
+        ctx.matcher = MockMatcher()
+        ctx.waiter = ImageWaiter(ctx.matcher, default_poll_ms=10)
+        ctx.keyboard = MockKeyboard()
+        return AsyncRunner(ctx), ctx
+
+    return make
+
+
+class TestAsyncRunner:
+    """Test async execution, concurrency and cancellation."""
+
+    def test_runs_flow_with_branches_and_goto(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            Flow(
+                name="main",
+                actions=[
+                    Delay(ms=5),
+                    IfImage(
+                        asset_id="btn",
+                        then_actions=[Hotkey(keys=["a"]), Goto(label="end")],
+                        else_actions=[Hotkey(keys=["b"])],
+                    ),
+                    Hotkey(keys=["skipped"]),
+                    Label(name="end"),
+                    Loop(count=2, actions=[Hotkey(keys=["c"]), Delay(ms=1)]),
+                ],
+            )
+        )
+        ctx.matcher.visible.add("btn")
+
+        assert asyncio.run(runner.run("main"))
+        assert ctx.keyboard.hotkeys == ["a", "c", "c"]
+
+    def test_flows_interleave_in_one_loop(self, make_runner) -> None:  # type: ignore
+        from core.engine.async_runner import run_concurrently
+
+        flow = Flow(name="main", actions=[Delay(ms=100)] * 3)
+        runners = [make_runner(flow)[0] for _ in range(5)]
+
+        start = time.perf_counter()
+        results = asyncio.run(run_concurrently((r, "main") for r in runners))
+        elapsed = time.perf_counter() - start
+
+        assert results == [True] * 5
+        assert elapsed < 1.0  # 5 x 300ms sequentially
+
+    def test_stop_cancels_immediately(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(Flow(name="main", actions=[Delay(ms=10000)]))
+
+        async def scenario() -> tuple[bool, float]:
+            task = asyncio.ensure_future(runner.run("main"))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            runner.stop()
+            return await task, time.perf_counter() - start
+
+        ok, stop_latency = asyncio.run(scenario())
+        assert ok is False
+        assert stop_latency < 0.05
+
+    def test_wait_image_is_awaitable(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            Flow(name="main", actions=[WaitImage(asset_id="btn", timeout_ms=2000, poll_ms=10)])
+        )
+
+        async def scenario() -> bool:
+            task = asyncio.ensure_future(runner.run("main"))
+            await asyncio.sleep(0.05)
+            assert not task.done()  # Still waiting, loop not blocked
+            ctx.matcher.visible.add("btn")
+            return await task
+
+        assert asyncio.run(scenario())
+        assert ctx.last_match is not None
+
+    def test_wait_image_timeout_stops_flow(self, make_runner) -> None:  # type: ignore
+        runner, _ = make_runner(
+            Flow(name="main", actions=[WaitImage(asset_id="btn", timeout_ms=30, poll_ms=10)])
+        )
+        assert asyncio.run(runner.run("main")) is False
+
+    def test_run_flow_nested(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            Flow(name="main", actions=[RunFlow(flow_name="sub"), Hotkey(keys=["b"])]),
+            Flow(name="sub", actions=[Delay(ms=1), Hotkey(keys=["a"])]),
+        )
+        assert asyncio.run(runner.run("main"))
+        assert ctx.keyboard.hotkeys == ["a", "b"]
@@ -0,0 +1,96 @@
+"""
+Test project-wide batch lint/format (process pool, content-hash cache).
+"""
+
+import io
+import json
+
+from app.cli import main as cli_main
+from app.tools.batch import ResultCache, collect_files, run_batch
+
+CLEAN = "flow main {\n    click(1, 2)\n}\n"
+MESSY = "flow main {\nclick(1, 2)\n}\n"
+
+
+def make_project(tmp_path, count: int = 6):  # type: ignore
+    (tmp_path / "sub").mkdir(parents=True)
+    for i in range(count):
+        path = (tmp_path / "sub" if i % 2 else tmp_path) / f"s{i}.retro"
+        path.write_text(MESSY if i % 3 == 0 else CLEAN, encoding="utf-8")
+    (tmp_path / "notes.md").write_text("not a script", encoding="utf-8")
+    return tmp_path
+
+
+class TestCollectFiles:
+    """Test file selection."""
+
+    def test_directory_is_sorted(self, tmp_path) -> None:  # type: ignore
+        files = collect_files(make_project(tmp_path))
+        assert files == sorted(files)
+        assert len(files) == 6
+
+    def test_listed_paths_are_filtered(self, tmp_path) -> None:  # type: ignore
+        root = make_project(tmp_path)
+        listed = [str(root / "s0.retro"), str(root / "notes.md"), str(root / "gone.retro"), ""]
+        assert collect_files(listed=listed) == [root / "s0.retro"]
+
+
+class TestRunBatch:
+    """Test ordering and caching."""
+
+    def test_pool_matches_sequential_order(self, tmp_path) -> None:  # type: ignore
+        files = collect_files(make_project(tmp_path))
+        sequential = [r.to_dict() for r in run_batch("fmt-check", files, jobs=1)]
+        pooled = [r.to_dict() for r in run_batch("fmt-check", files, jobs=3)]
+        assert pooled == sequential
+        assert [r["changed"] for r in pooled] == [f.read_text() == MESSY for f in files]
+
+    def test_cache_skips_unchanged_files(self, tmp_path) -> None:  # type: ignore
+        files = collect_files(make_project(tmp_path / "p"))
+        cache_dir = tmp_path / "cache"
+
+        first = list(run_batch("lint", files, 1, ResultCache.for_task("lint", cache_dir)))
+        assert not any(r.cached for r in first)
+        second = list(run_batch("lint", files, 1, ResultCache.for_task("lint", cache_dir)))
+        assert all(r.cached for r in second)
+        assert [r.to_dict() for r in second] == [r.to_dict() for r in first]
+
+        files[0].write_text(CLEAN + "\n// edited\n", encoding="utf-8")
+        third = list(run_batch("lint", files, 1, ResultCache.for_task("lint", cache_dir)))
+        assert [r.cached for r in third] == [False] + [True] * (len(files) - 1)
+
+    def test_format_writes_and_caches(self, tmp_path) -> None:  # type: ignore
+        files = collect_files(make_project(tmp_path / "p"))
+        cache_dir = tmp_path / "cache"
+        results = run_batch("fmt", files, 2, ResultCache.for_task("fmt", cache_dir))
+        changed = [r.changed for r in results]
+        assert any(changed)
+
+        again = list(run_batch("fmt-check", files, 1, ResultCache.for_task("fmt", cache_dir)))
+        assert not any(r.changed for r in again)
+        # Reformatted files now hash like the files that were already clean
+        assert all(r.cached for r in again)
+
+
+class TestBatchCli:
+    """Test retro lint / retro fmt batch options."""
+
+    def test_fmt_check_json(self, tmp_path, capsys) -> None:  # type: ignore
+        root = make_project(tmp_path / "p")
+        args = ["fmt", str(root), "--check", "--json", "--cache-dir", str(tmp_path / "c")]
+        assert cli_main(args) == 1
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [row["file"] for row in rows] == [p.as_posix() for p in collect_files(root)]
+        assert sum(row["changed"] for row in rows) == 2
+
+    def test_lint_from_stdin(self, tmp_path, capsys, monkeypatch) -> None:  # type: ignore
+        root = make_project(tmp_path / "p")
+        script = root / "sub" / "s1.retro"
+        listed = f"{script}\n{root / 'notes.md'}\n"
+        monkeypatch.setattr("sys.stdin", io.StringIO(listed))
+        assert cli_main(["lint", "--stdin", "--no-cache", "--json"]) == 0
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows == [{"file": script.as_posix(), "issues": [], "changed": False}]
+
+    def test_missing_path(self, tmp_path) -> None:  # type: ignore
+        assert cli_main(["lint", str(tmp_path / "missing")]) == 1
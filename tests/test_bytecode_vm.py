@@ -0,0 +1,172 @@
+"""
+Test the bytecode compiler and VM against the tree-walking interpreter.
+"""
+
+import pytest
+
+from core.dsl.parser import Parser
+
+PROGRAMS = {
+    "arithmetic": """
+        const MAX = 5
+        flow main {
+            let a = 7
+            return [a + 2 * 3, (a - 10) % 4, a / 2, -a, MAX * 2s, 250ms, a >= 7, a != 7]
+        }
+    """,
+    "strings_and_logic": """
+        flow main {
+            let s = "hp:" + 10
+            return [s, 1 + "x", 0 or "fallback", 1 and 2, null or 0, not "", !0, "a" == "a"]
+        }
+    """,
+    "while_break_continue": """
+        flow main {
+            let i = 0
+            let total = 0
+            while i < 100 {
+                i = i + 1
+                if i % 2 == 0 { continue }
+                total = total + i
+                if total > 200 { break }
+            }
+            return [i, total]
+        }
+    """,
+    "for_and_repeat": """
+        flow main {
+            let out = []
+            for k in range(5) {
+                if k == 1 { continue }
+                if k == 4 { break }
+                out = out + [k]
+            }
+            let n = 0
+            repeat 3 { n = n + 1 }
+            for x in [1, 2] { for y in [10, 20] { if y == 20 { break } n = n + x * y } }
+            return [out, n, k]
+        }
+    """,
+    "elif_else": """
+        flow main {
+            let r = []
+            for v in range(4) {
+                if v == 0 { r = r + ["zero"] } elif v == 1 { r = r + ["one"] }
+                elif v == 2 { r = r + ["two"] } else { r = r + ["many"] }
+            }
+            return r
+        }
+    """,
+    "dynamic_scope": """
+        flow damage { $hp = $hp - amount; let local = 1; return local + $hp }
+        flow shadow { let hp = 1; hp = hp + 1; return hp }
+        flow main {
+            $hp = 100
+            let amount = 7
+            let r = damage()
+            let s = shadow()
+            return [$hp, r, s]
+        }
+    """,
+    "try_catch": """
+        flow main {
+            let log = []
+            try { let x = 1 / 0 } catch err { log = log + [err] }
+            try { log = log + [missing] } catch e2 { log = log + [e2] }
+            let i = 0
+            while i < 5 {
+                i = i + 1
+                try { if i == 3 { break } } catch e3 { log = log + ["never"] }
+            }
+            try { undefined_fn() } catch e4 { log = log + [e4] }
+            return [log, i]
+        }
+    """,
+    "return_from_loop_and_run": """
+        flow search { for i in range(100) { if i * i > 50 { return i } } }
+        flow main { let name = "search"; return [search(), run(name), run("search")] }
+    """,
+}
+
+ERRORS = {
+    "undefined": "flow main { return nope + 1 }",
+    "unknown_function": "flow main { whatever(1) }",
+    "divide": "flow main { let z = 0; return 5 / z }",
+}
+
+
+def run_both(source: str):  # type: ignore
+    """Run source through the tree walker and the VM."""
+    from core.engine.interpreter import Interpreter
+    from core.engine.vm import VirtualMachine
+
+    results = []
+    for engine in (Interpreter(), VirtualMachine()):
+        try:
+            results.append(("ok", engine.execute(Parser(source).parse())))
+        except Exception as e:
+            results.append((type(e).__name__, str(e)))
+    return results
+
+
+class TestDifferential:
+    """VM results and errors equal the tree walker's."""
+
+    @pytest.mark.parametrize("name", sorted(PROGRAMS))
+    def test_programs(self, name: str) -> None:
+        walker, vm = run_both(PROGRAMS[name])
+        assert walker[0] == "ok"
+        assert vm == walker
+
+    @pytest.mark.parametrize("name", sorted(ERRORS))
+    def test_errors(self, name: str) -> None:
+        walker, vm = run_both(ERRORS[name])
+        assert walker[0] != "ok"
+        assert vm == walker
+
+
+class TestCompiler:
+    """Test slot resolution and control-flow layout."""
+
+    @pytest.fixture
+    def compiled(self):  # type: ignore
+        from core.engine.vm import VirtualMachine
+
+        source = """
+            const LIMIT = 10
+            flow sub { $hp = $hp - dmg; return $hp + LIMIT }
+            flow main { let i = 0; while i < 3 { i = i + 1 } let dmg = 1 }
+        """
+        return VirtualMachine().compile(Parser(source).parse())
+
+    def test_locals_get_slots(self, compiled) -> None:  # type: ignore
+        assert compiled.flows["sub"].slots == {"hp": 0}
+        assert compiled.flows["main"].slots == {"i": 0, "dmg": 1}
+
+        listing = "\n".join(compiled.flows["sub"].disassemble())
+        assert "LOAD_LOCAL             0 (hp)" in listing
+        assert "LOAD_NAME              'dmg'" in listing  # Bound by a caller
+        assert "LOAD_GLOBAL            'LIMIT'" in listing  # Bound by no flow
+
+    def test_main_and_loop_jumps(self, compiled) -> None:  # type: ignore
+        from core.engine import bytecode
+
+        main = compiled.flows["main"]
+        assert compiled.main is main
+        jumps = [a for op, a in zip(main.ops, main.args, strict=True) if op == bytecode.OP_JUMP]
+        assert jumps == [2]  # Back edge to the loop condition
+
+    def test_recursion_limit(self) -> None:
+        from core.engine.vm import VirtualMachine
+
+        # The tree walker hits Python's recursion limit first; the VM reaches its own
+        source = "flow loop { return loop() } flow main { try { loop() } catch err { return err } }"
+        result = VirtualMachine().execute(Parser(source).parse())
+        assert result == "Stack Overflow: Max recursion depth exceeded (500)"
+
+    def test_vm_can_rerun_compiled_program(self) -> None:
+        from core.engine.vm import VirtualMachine
+
+        vm = VirtualMachine()
+        compiled = vm.compile(Parser("flow main { return 6 * 7 }").parse())
+        assert vm.run(compiled) == vm.run(compiled) == 42
@@ -0,0 +1,152 @@
+"""
+Test the background Flight Recorder.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from core.analytics.metrics import MetricsRegistry
+from core.models import ROI, Click, Delay, Drag, Flow
+
+
+class FakeFrame:
+    """Frame stand-in over a BGR array at the screen origin."""
+
+    def __init__(self, seq: int, bgr: np.ndarray) -> None:
+        self.seq = seq
+        self.timestamp = time.perf_counter()
+        self.bgr = bgr
+        self.left = 0
+        self.top = 0
+        self.height, self.width = bgr.shape[:2]
+
+    def view(self, roi: ROI) -> np.ndarray:
+        return self.bgr[roi.y : roi.y + roi.h, roi.x : roi.x + roi.w]
+
+
+class FakeFrames:
+    """FrameBus stand-in: `show` publishes a new frame as the flow would."""
+
+    def __init__(self) -> None:
+        self.latest: FakeFrame | None = None
+        self.seq = 0
+        self.show(np.zeros((200, 200, 3), np.uint8))
+
+    def show(self, bgr: np.ndarray) -> None:
+        self.seq += 1
+        self.latest = FakeFrame(self.seq, bgr)
+
+    def frame(self) -> FakeFrame:
+        assert self.latest is not None
+        return self.latest
+
+
+class FakeCapture:
+    """ScreenCapture stand-in for deadline grabs."""
+
+    def __init__(self, frames: FakeFrames) -> None:
+        self.frames = frames
+        self.grabs = 0
+
+    def capture_roi(self, roi: ROI, grayscale: bool = False) -> np.ndarray:
+        self.grabs += 1
+        return self.frames.frame().view(roi)[:, :, 0].copy()
+
+
+def changed_screen() -> np.ndarray:
+    bgr = np.zeros((200, 200, 3), np.uint8)
+    bgr[90:110, 90:110] = 255
+    return bgr
+
+
+@pytest.fixture
+def recorder():  # type: ignore
+    from core.engine.flight_recorder import FlightRecorder
+
+    frames = FakeFrames()
+    capture = FakeCapture(frames)
+    verdicts: list = []
+    rec = FlightRecorder(
+        frames,
+        radius=32,
+        settle_ms=10,
+        deadline_ms=80,
+        capture=capture,
+        on_verdict=verdicts.append,
+        metrics=MetricsRegistry(),
+    )
+    return rec, frames, capture, verdicts
+
+
+class TestFlightRecorder:
+    """Test off-thread verdicts."""
+
+    def test_submit_does_not_block(self, recorder) -> None:  # type: ignore
+        rec, frames, _, verdicts = recorder
+        check = rec.snapshot(Click(x=100, y=100), 100, 100)
+
+        start = time.perf_counter()
+        rec.submit(check)
+        assert time.perf_counter() - start < 0.01
+        assert not verdicts
+
+        assert rec.flush()
+        assert len(verdicts) == 1
+
+    def test_natural_frame_detects_change(self, recorder) -> None:  # type: ignore
+        rec, frames, capture, verdicts = recorder
+        check = rec.snapshot(Click(x=100, y=100), 100, 100)
+        assert check is not None
+        assert check.roi == ROI(x=68, y=68, w=64, h=64)
+
+        rec.submit(check)
+        time.sleep(0.02)
+        frames.show(changed_screen())  # The flow's next capture
+        assert rec.flush()
+
+        verdict = verdicts[0]
+        assert verdict.changed and not verdict.forced
+        assert verdict.region == (84, 84, 32, 32)  # Tiles of the 64px ROI at 68
+        assert capture.grabs == 0
+
+    def test_deadline_grab_reports_no_change(self, recorder) -> None:  # type: ignore
+        rec, _, capture, verdicts = recorder
+        rec.submit(rec.snapshot(Drag(from_x=0, from_y=0, to_x=50, to_y=50), 50, 50))
+        assert rec.flush()
+
+        verdict = verdicts[0]
+        assert not verdict.changed and verdict.forced
+        assert verdict.latency_ms >= 80
+        assert capture.grabs == 1
+
+    def test_latency_metric(self, recorder) -> None:  # type: ignore
+        rec, frames, _, _ = recorder
+        for _ in range(3):
+            rec.submit(rec.snapshot(Click(x=10, y=10), 10, 10))
+        assert rec.flush()
+
+        stats = rec.get_stats()
+        assert stats["latency"]["count"] == 3
+        assert stats["unchanged"] == stats["forced"] == 3
+        assert stats["changed"] == 0
+
+    def test_point_off_screen(self, recorder) -> None:  # type: ignore
+        rec, _, _, _ = recorder
+        assert rec.snapshot(Click(x=500, y=500), 500, 500) is None
+
+
+class TestVerifyEnabled:
+    """Test per-action and per-flow toggles."""
+
+    def test_toggles(self) -> None:
+        from core.engine.flight_recorder import verify_enabled
+
+        on, off = Flow(name="on"), Flow(name="off", verify_actions=False)
+
+        assert verify_enabled(Click(x=1, y=1), on)
+        assert not verify_enabled(Click(x=1, y=1), off)
+        assert verify_enabled(Click(x=1, y=1, verify=True), off)
+        assert not verify_enabled(Click(x=1, y=1, verify=False), on)
+        assert not verify_enabled(Delay(ms=1), on)
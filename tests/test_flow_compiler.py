@@ -0,0 +1,263 @@
+"""
+Test the flow compiler and compiled execution in the Runner.
+"""
+
+import pytest
+
+from core.models import (
+    Delay,
+    Flow,
+    Goto,
+    Hotkey,
+    IfImage,
+    IfNotImage,
+    Label,
+    Script,
+)
+from core.templates import TemplateStore
+
+
+def resolve(action, flow, labels):  # type: ignore
+    return lambda a: None
+
+
+def predicate(action):  # type: ignore
+    if isinstance(action, (IfImage, IfNotImage)):
+        return lambda a: True
+    return None
+
+
+def ops(plan) -> list[int]:  # type: ignore
+    return [s.op for s in plan.steps]
+
+
+@pytest.fixture
+def fc():  # type: ignore
+    """The flow_compiler module (core.engine imports platform input backends)."""
+    from core.engine import flow_compiler
+
+    return flow_compiler
+
+
+class TestCompileFlow:
+    """Test plan layout and jump resolution."""
+
+    def test_branches_are_flattened(self, fc) -> None:  # type: ignore
+        flow = Flow(
+            name="main",
+            actions=[
+                IfImage(
+                    asset_id="btn",
+                    then_actions=[Delay(ms=1), Delay(ms=2)],
+                    else_actions=[Delay(ms=3)],
+                ),
+                Delay(ms=4),
+            ],
+        )
+        plan = fc.compile_flow(flow, resolve, predicate)
+
+        call = fc.OP_CALL
+        assert ops(plan) == [fc.OP_BRANCH, call, call, fc.OP_JUMP, call, call]
+        branch, jump = plan.steps[0], plan.steps[3]
+        assert (branch.target, branch.end) == (4, 5)
+        assert jump.target == 5
+        assert plan.entries == [0, 5]
+        assert [s.step for s in plan.steps] == [0, 0, 0, 0, 0, 1]
+        assert [s.top for s in plan.steps] == [True, False, False, False, False, True]
+
+    def test_branch_without_else_has_no_jump(self, fc) -> None:  # type: ignore
+        flow = Flow(name="main", actions=[IfNotImage(asset_id="x", then_actions=[Delay(ms=1)])])
+        plan = fc.compile_flow(flow, resolve, predicate)
+
+        assert ops(plan) == [fc.OP_BRANCH, fc.OP_CALL]
+        assert plan.steps[0].target == plan.steps[0].end == 2
+
+    def test_goto_resolves_labels_inside_branches(self, fc) -> None:  # type: ignore
+        flow = Flow(
+            name="main",
+            actions=[
+                Goto(label="inner"),
+                IfImage(asset_id="btn", then_actions=[Label(name="inner"), Delay(ms=1)]),
+            ],
+        )
+        plan = fc.compile_flow(flow, resolve, predicate)
+
+        assert plan.steps[0].op == fc.OP_GOTO
+        assert plan.steps[0].target == plan.labels["inner"] == 2
+        assert plan.steps[2].op == fc.OP_NOP
+
+    def test_unknown_goto_falls_back_to_handler(self, fc) -> None:  # type: ignore
+        flow = Flow(name="main", actions=[Goto(label="nowhere")])
+        plan = fc.compile_flow(flow, resolve, predicate)
+        assert plan.steps[0].op == fc.OP_CALL
+        assert plan.steps[0].handler is not None
+
+    def test_recorded_flag(self, fc) -> None:  # type: ignore
+        flow = Flow(name="main", actions=[Delay(ms=1), Hotkey(keys=["a"])])
+        plan = fc.compile_flow(
+            flow, resolve, predicate, recorded=lambda a, f: isinstance(a, Hotkey)
+        )
+        assert [s.recorded for s in plan.steps] == [False, True]
+
+    def test_index_of_out_of_range(self, fc) -> None:  # type: ignore
+        plan = fc.compile_flow(Flow(name="main", actions=[Delay(ms=1)]), resolve, predicate)
+        assert plan.index_of(0) == 0
+        assert plan.index_of(5) == len(plan.steps)
+
+
+class TestFlowCompilerCache:
+    """Test plan reuse per flow version."""
+
+    def test_plan_is_reused_until_structure_changes(self, fc) -> None:  # type: ignore
+        compiler = fc.FlowCompiler(resolve, predicate)
+        flow = Flow(name="main", actions=[Label(name="a"), Goto(label="a")])
+
+        plan = compiler.get(flow)
+        assert compiler.get(flow) is plan
+        assert compiler.compiles == 1
+
+        flow.actions.append(Delay(ms=1))
+        assert compiler.get(flow) is not plan
+        assert compiler.compiles == 2
+
+        flow.actions[1].label = "b"
+        compiler.get(flow)
+        assert compiler.compiles == 3
+
+        flow.verify_actions = False
+        compiler.get(flow)
+        assert compiler.compiles == 4
+
+    def test_nested_changes_invalidate(self, fc) -> None:  # type: ignore
+        compiler = fc.FlowCompiler(resolve, predicate)
+        flow = Flow(name="main", actions=[IfImage(asset_id="btn")])
+        compiler.get(flow)
+
+        flow.actions[0].then_actions.append(Delay(ms=1))
+        assert len(compiler.get(flow).steps) == 2
+
+    def test_invalidate(self, fc) -> None:  # type: ignore
+        compiler = fc.FlowCompiler(resolve, predicate)
+        flow = Flow(name="main", actions=[Delay(ms=1)])
+        compiler.get(flow)
+        compiler.invalidate(flow)
+        compiler.get(flow)
+        assert compiler.compiles == 2
+
+
+class MockMatcher:
+    """Mock matcher: assets listed in `visible` are found."""
+
+    def __init__(self) -> None:
+        self.visible: set[str] = set()
+
+    def find(self, asset_id: str, roi_override=None):  # type: ignore
+        from core.models import Match
+
+        if asset_id in self.visible:
+            return Match(x=0, y=0, w=10, h=10, confidence=0.99)
+        return None
+
+
+class MockKeyboard:
+    """Mock keyboard recording hotkeys."""
+
+    def __init__(self) -> None:
+        self.hotkeys: list[str] = []
+
+    def hotkey(self, keys: list[str]) -> None:
+        self.hotkeys.append("+".join(keys))
+
+
+class TestCompiledRunner:
+    """Test Runner execution through compiled plans."""
+
+    @pytest.fixture
+    def make_runner(self):  # type: ignore
+        from core.engine.context import ExecutionContext
+        from core.engine.runner import Runner
+
+        def make(actions):  # type: ignore
+            script = Script(name="Test", flows=[Flow(name="main", actions=actions)])
+            ctx = ExecutionContext(script=script, templates=TemplateStore())
+            ctx.matcher = MockMatcher()
+            ctx.keyboard = MockKeyboard()
+            return Runner(ctx), ctx
+
+        return make
+
+    def test_goto_inside_branch(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            [
+                IfImage(
+                    asset_id="btn",
+                    then_actions=[Hotkey(keys=["a"]), Goto(label="end")],
+                    else_actions=[Hotkey(keys=["b"])],
+                ),
+                Hotkey(keys=["skipped"]),
+                Label(name="end"),
+                Hotkey(keys=["c"]),
+            ]
+        )
+        ctx.matcher.visible.add("btn")
+
+        assert runner.run_flow("main")
+        assert ctx.keyboard.hotkeys == ["a", "c"]
+
+    def test_else_branch_and_step_callbacks(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            [
+                IfImage(
+                    asset_id="btn",
+                    then_actions=[Hotkey(keys=["a"])],
+                    else_actions=[Hotkey(keys=["b"])],
+                ),
+                Hotkey(keys=["c"]),
+            ]
+        )
+        steps: list[int] = []
+        runner._on_step = lambda flow, idx, action: steps.append(idx)
+
+        assert runner.run_flow("main")
+        assert ctx.keyboard.hotkeys == ["b", "c"]
+        assert steps == [0, 1]
+
+    def test_goto_into_branch(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            [
+                Goto(label="inside"),
+                IfImage(
+                    asset_id="btn",
+                    then_actions=[Hotkey(keys=["a"]), Label(name="inside"), Hotkey(keys=["b"])],
+                    else_actions=[Hotkey(keys=["c"])],
+                ),
+                Hotkey(keys=["d"]),
+            ]
+        )
+
+        assert runner.run_flow("main")
+        assert ctx.keyboard.hotkeys == ["b", "d"]
+
+    def test_from_step(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner([Hotkey(keys=["a"]), Hotkey(keys=["b"])])
+        assert runner.run_flow("main", from_step=1)
+        assert ctx.keyboard.hotkeys == ["b"]
+
+    def test_failing_condition_skips_conditional(self, make_runner) -> None:  # type: ignore
+        runner, ctx = make_runner(
+            [
+                IfImage(
+                    asset_id="btn",
+                    then_actions=[Hotkey(keys=["a"])],
+                    else_actions=[Hotkey(keys=["b"])],
+                ),
+                Hotkey(keys=["c"]),
+            ]
+        )
+
+        def broken(asset_id, roi_override=None):  # type: ignore
+            raise RuntimeError("capture failed")
+
+        ctx.matcher.find = broken
+        assert runner.run_flow("main")
+        assert ctx.keyboard.hotkeys == ["c"]
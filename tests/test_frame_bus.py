@@ -0,0 +1,169 @@
+"""
+Test shared frame bus.
+"""
+
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import ROI, AssetImage
+from core.templates import TemplateStore
+from vision.frame_bus import FrameBus
+from vision.matcher import Matcher
+
+
+class CountingCapture:
+    """Mock screen capture that counts grabs."""
+
+    def __init__(self, image: np.ndarray) -> None:
+        self._image = image
+        self.full_grabs = 0
+        self.roi_grabs = 0
+
+    def capture_full_into(
+        self, out: np.ndarray | None = None, monitor: int = 1
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        self.full_grabs += 1
+        if out is None or out.shape != self._image.shape:
+            out = np.empty_like(self._image)
+        np.copyto(out, self._image)
+        return out, (0, 0)
+
+    def capture_full(self, monitor: int = 1, grayscale: bool = False) -> np.ndarray:
+        self.full_grabs += 1
+        return self._image
+
+    def capture_roi(self, roi: ROI, grayscale: bool = False) -> np.ndarray:
+        self.roi_grabs += 1
+        return np.zeros((roi.h, roi.w, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def screen() -> np.ndarray:
+    img = np.full((600, 800, 3), 200, dtype=np.uint8)
+    cv2.rectangle(img, (100, 100), (180, 140), (0, 0, 255), -1)
+    cv2.putText(img, "OK", (120, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    return img
+
+
+class TestFrameBus:
+    """Test frame sharing and counters."""
+
+    def test_reads_share_one_grab(self, screen: np.ndarray) -> None:
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture, max_age_ms=10_000)
+
+        bus.get(ROI(x=0, y=0, w=50, h=50))
+        bus.get(ROI(x=100, y=100, w=80, h=40), grayscale=True)
+        bus.get()
+
+        assert capture.full_grabs == 1
+        assert bus.seq == 1
+        assert bus.stats.grabs_avoided == 2
+        assert bus.stats.tick_grabs_avoided == 2
+
+    def test_new_tick_regrabs(self, screen: np.ndarray) -> None:
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture, max_age_ms=10_000)
+
+        bus.get()
+        bus.get()
+        assert bus.new_tick() == 1
+        bus.get()
+
+        assert capture.full_grabs == 2
+        assert bus.seq == 2
+        assert bus.stats.last_tick_grabs_avoided == 1
+        assert bus.stats.tick_grabs_avoided == 0
+
+    def test_stale_frame_regrabs(self, screen: np.ndarray) -> None:
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture, max_age_ms=0)
+
+        bus.get()
+        bus.get()
+        assert capture.full_grabs == 2
+
+    def test_roi_view_is_zero_copy(self, screen: np.ndarray) -> None:
+        bus = FrameBus(CountingCapture(screen))
+        frame = bus.frame()
+
+        view = bus.get(ROI(x=100, y=100, w=80, h=40))
+        assert view.shape == (40, 80, 3)
+        assert np.shares_memory(view, frame.bgr)
+        assert np.array_equal(view, screen[100:140, 100:180])
+
+    def test_gray_plane_converted_once(self, screen: np.ndarray) -> None:
+        bus = FrameBus(CountingCapture(screen), max_age_ms=10_000)
+
+        a = bus.get(ROI(x=0, y=0, w=10, h=10), grayscale=True)
+        b = bus.get(ROI(x=20, y=20, w=10, h=10), grayscale=True)
+        gray = bus.frame().gray
+        assert a.ndim == 2
+        assert np.shares_memory(a, gray)
+        assert np.shares_memory(b, gray)
+
+    def test_roi_outside_frame_falls_back(self, screen: np.ndarray) -> None:
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture)
+
+        region = bus.get(ROI(x=900, y=0, w=20, h=20))
+        assert region.shape == (20, 20, 3)
+        assert capture.roi_grabs == 1
+        assert bus.stats.fallback_grabs == 1
+
+    def test_ring_buffers_reused(self, screen: np.ndarray) -> None:
+        bus = FrameBus(CountingCapture(screen), ring_size=2)
+
+        first = bus.frame().bgr
+        bus.invalidate()
+        second = bus.frame().bgr
+        bus.invalidate()
+        third = bus.frame().bgr
+
+        assert first is not second
+        assert third is first
+
+    def test_wait_frame_follows_grabs(self, screen: np.ndarray) -> None:
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture)
+
+        assert bus.wait_frame(0, timeout=0.01) is None  # Never grabs itself
+        assert capture.full_grabs == 0
+
+        timer = threading.Timer(0.02, bus.frame)
+        timer.start()
+        frame = bus.wait_frame(0, timeout=1.0)
+        timer.join()
+        assert frame is not None and frame.seq == 1
+        assert bus.wait_frame(1, timeout=0.01) is None
+
+
+class TestMatcherOnFrameBus:
+    """Test matcher reads through the frame bus."""
+
+    def test_multiple_finds_one_grab(self, screen: np.ndarray, tmp_path: Path) -> None:
+        cv2.imwrite(str(tmp_path / "btn_ok.png"), screen[100:140, 100:180])
+        store = TemplateStore(tmp_path)
+        store.preload(
+            [
+                AssetImage(id="btn_ok", path="btn_ok.png"),
+                AssetImage(id="btn_roi", path="btn_ok.png", roi=ROI(x=50, y=50, w=200, h=200)),
+                AssetImage(id="btn_color", path="btn_ok.png", grayscale=False),
+            ]
+        )
+
+        capture = CountingCapture(screen)
+        bus = FrameBus(capture, max_age_ms=10_000)
+        matcher = Matcher(store, capture, bus)
+
+        for asset_id in ("btn_ok", "btn_roi", "btn_color"):
+            match = matcher.find(asset_id)
+            assert match is not None
+            assert (match.x, match.y) == (100, 100)
+
+        assert capture.full_grabs == 1
+        assert bus.stats.grabs_avoided == 2
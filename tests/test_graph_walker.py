@@ -0,0 +1,108 @@
+"""
+Test the compiled successor tables of the GraphWalker.
+"""
+
+from core.graph.walker import NO_NODE, GraphWalker
+from core.models import Delay, FlowGraph, GraphConnection, GraphNode, IfImage
+
+
+def node(node_id: str, ms: int = 0, y: float = 0) -> GraphNode:
+    return GraphNode(id=node_id, action=Delay(ms=ms), y=y)
+
+
+def conn(src: str, socket: str, dst: str) -> GraphConnection:
+    return GraphConnection(from_node=src, from_socket=socket, to_node=dst, to_socket="exec_in")
+
+
+def branch_graph() -> FlowGraph:
+    """a -> if -> (true: b, false: c) -> d"""
+    return FlowGraph(
+        nodes=[
+            node("a", 1),
+            GraphNode(id="if", action=IfImage(asset_id="btn"), y=1),
+            node("b", 2, y=2),
+            node("c", 3, y=2),
+            node("d", 4, y=3),
+        ],
+        connections=[
+            conn("a", "exec_out", "if"),
+            conn("if", "true_out", "b"),
+            conn("if", "false_out", "c"),
+            conn("b", "exec_out", "d"),
+            conn("c", "exec_out", "d"),
+        ],
+    )
+
+
+def run(walker: GraphWalker, branch: bool, **kwargs) -> list[int]:  # type: ignore
+    executed: list[int] = []
+
+    def execute(action):  # type: ignore
+        if isinstance(action, IfImage):
+            executed.append(-1)
+            return branch
+        executed.append(action.ms)
+        return None
+
+    walker.execute_graph(execute, **kwargs)
+    return executed
+
+
+class TestCompile:
+    """Test successor table construction."""
+
+    def test_successor_indexes(self) -> None:
+        walker = GraphWalker(branch_graph())
+        a, cond, b, c, d = range(5)
+
+        assert walker.successors[a] == (cond, NO_NODE, NO_NODE)
+        assert walker.successors[cond].on_true == b
+        assert walker.successors[cond].on_false == c
+        assert walker.successors[d] == (NO_NODE, NO_NODE, NO_NODE)
+
+    def test_dangling_connection_is_skipped(self) -> None:
+        graph = FlowGraph(
+            nodes=[node("a"), node("b")],
+            connections=[conn("a", "exec_out", "missing"), conn("a", "exec_out", "b")],
+        )
+        walker = GraphWalker(graph)
+        assert walker.successors[0].next == 1
+
+    def test_get_next_node(self) -> None:
+        walker = GraphWalker(branch_graph())
+        assert walker.get_next_node("a").id == "if"
+        assert walker.get_next_node("if", branch_result=False).id == "c"
+        assert walker.get_next_node("d") is None
+        assert walker.get_next_node("unknown") is None
+
+
+class TestExecute:
+    """Test graph execution."""
+
+    def test_branches(self) -> None:
+        walker = GraphWalker(branch_graph())
+        assert run(walker, True) == [1, -1, 2, 4]
+        assert run(walker, False) == [1, -1, 3, 4]
+        assert walker.execution_count == {"a": 1, "if": 1, "c": 1, "d": 1}
+
+    def test_loop_detection(self) -> None:
+        graph = FlowGraph(
+            nodes=[node("start", 0), node("a", 1, y=1), node("b", 2, y=2)],
+            connections=[
+                conn("start", "exec_out", "a"),
+                conn("a", "exec_out", "b"),
+                conn("b", "exec_out", "a"),
+            ],
+        )
+        walker = GraphWalker(graph)
+        executed = run(walker, True)
+
+        assert walker.execution_counts == [1, 1001, 1000]
+        assert len(executed) == 1 + 1000 + 1000  # The 1001st visit of "a" does not run
+
+    def test_max_iterations(self) -> None:
+        graph = FlowGraph(
+            nodes=[node("start", 0), node("a", 1, y=1)],
+            connections=[conn("start", "exec_out", "a"), conn("a", "exec_out", "a")],
+        )
+        assert len(run(GraphWalker(graph), True, max_iterations=50)) == 50
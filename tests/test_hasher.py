@@ -0,0 +1,87 @@
+"""
+Test vectorised perceptual hashing and the tile-grid dirty-region detector.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from core.vision import hasher
+from core.vision.hasher import (
+    TileGrid,
+    calculate_phash,
+    dirty_bounds,
+    hamming_batch,
+    hamming_distance,
+    phash_batch,
+)
+
+
+def reference_phash(image: np.ndarray) -> int:
+    """Original bit-by-bit pHash the vectorised version must reproduce."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    dct = cv2.dct(np.float32(cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)))[:8, :8]
+    avg = (np.sum(dct) - dct[0, 0]) / 63
+    value = 0
+    for idx, bit in enumerate((dct > avg).ravel()):
+        value |= int(bit) << idx
+    return value
+
+
+def noise(shape: tuple[int, ...], seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(0, 255, shape, dtype=np.uint8), (9, 9), 0)
+
+
+class TestPhash:
+    """Test the vectorised pHash."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed: int) -> None:
+        image = noise((120, 160, 3), seed)
+        assert calculate_phash(image) == reference_phash(image)
+
+    def test_batch_equals_single(self) -> None:
+        images = [noise((40 + 10 * i, 60, 3), i) for i in range(4)]
+        assert phash_batch(images) == [calculate_phash(img) for img in images]
+        assert phash_batch([]) == []
+
+    def test_hamming(self) -> None:
+        assert hamming_distance(0b1011, 0b0001) == 2
+        a = np.array([0, 0xFFFF_FFFF_FFFF_FFFF], dtype=np.uint64)
+        b = np.array([1, 0], dtype=np.uint64)
+        assert hamming_batch(a, b).tolist() == [1, 64]
+
+    def test_popcount_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(hasher, "_bitwise_count", None)
+        values = np.array([0, 7, 0x8000_0000_0000_0001], dtype=np.uint64)
+        assert hasher.popcount64(values).tolist() == [0, 3, 2]
+
+
+class TestTileGrid:
+    """Test dirty-region detection."""
+
+    def test_unchanged_frame_is_clean(self) -> None:
+        frame = noise((200, 300), 1)
+        grid = TileGrid(tile_size=64)
+        assert grid.hash_frame(frame).shape == (4, 5)  # Partial edge tiles included
+        assert grid.dirty_tiles(frame, frame.copy()) == []
+
+    def test_local_change_reports_tiles(self) -> None:
+        before = noise((200, 300), 2)
+        after = before.copy()
+        after[70:110, 140:180] = 255  # Inside tile row 1, col 2
+
+        grid = TileGrid(tile_size=64)
+        dirty = grid.dirty_tiles(before, after)
+        assert {(t.row, t.col) for t in dirty} == {(1, 2)}
+        assert dirty_bounds(dirty) == (128, 64, 64, 64)
+
+    def test_edge_tile_size_is_clipped(self) -> None:
+        before = noise((200, 300), 3)
+        after = before.copy()
+        after[194:200, 290:300] = 0
+
+        dirty = TileGrid(tile_size=64).dirty_tiles(before, after)
+        assert [(t.x, t.y, t.w, t.h) for t in dirty] == [(256, 192, 44, 8)]
+        assert dirty_bounds([]) is None
@@ -0,0 +1,182 @@
+"""
+Test incremental parsing and ScriptDocument code sync.
+"""
+
+from core.dsl.document import DocumentState, ScriptDocument
+from core.dsl.incremental import IncrementalParser, resplit_chunks, split_chunks
+from core.dsl.ir import ActionIR, parse_to_ir
+
+SOURCE = """// Farming script
+hotkeys {
+  start = "F9"
+}
+
+const DELAY = 500
+
+flow main {
+  wait_image("ready")
+  run_flow("farm")
+}
+
+flow farm {
+  label loop:
+  click(100, 200)
+  goto loop
+}
+
+interrupt {
+  priority 5
+  when image "popup"
+  { click(10, 10) }
+}
+"""
+
+
+def edit(source: str, old: str, new: str) -> str:
+    assert old in source
+    return source.replace(old, new, 1)
+
+
+class TestSplitChunks:
+    """Test splitting at top-level declarations."""
+
+    def test_chunks_cover_source(self) -> None:
+        chunks = split_chunks(SOURCE)
+        assert "".join(c.text for c in chunks) == SOURCE
+        assert [c.start_line for c in chunks] == [1, 2, 6, 8, 13, 19]
+
+    def test_indented_keywords_do_not_split(self) -> None:
+        chunks = split_chunks("flow a {\n  const x = 1\n}\n")
+        assert len(chunks) == 1
+
+    def test_empty_source(self) -> None:
+        assert split_chunks("") == [("", 1)]
+
+    def test_resplit_matches_split(self) -> None:
+        edits = [
+            ("click(100, 200)", "click(100, 200)\n  click(1, 2)"),  # Inside one chunk
+            ("// Farming script\n", "\n// Farming script\n"),  # Shifts everything
+            ("\nflow farm", "\nfl"),  # Declaration start disappears
+            ("const DELAY = 500\n", "const DELAY = 500\nflow x {\n}\n"),  # New chunk
+            ("\ninterrupt {", "\n// interrupt {"),
+        ]
+        previous = split_chunks(SOURCE)
+        for old, new in edits:
+            edited = edit(SOURCE, old, new)
+            assert resplit_chunks(previous, edited) == split_chunks(edited)
+            assert resplit_chunks(split_chunks(edited), SOURCE) == previous
+        assert resplit_chunks(previous, "") == [("", 1)]
+
+
+class TestIncrementalParser:
+    """Test that incremental results match a full parse."""
+
+    def test_matches_full_parse(self) -> None:
+        parser = IncrementalParser()
+        assert parser.parse(SOURCE) == parse_to_ir(SOURCE)
+
+    def test_reuses_unchanged_declarations(self) -> None:
+        parser = IncrementalParser()
+        parser.parse(SOURCE)
+        edited = edit(SOURCE, "click(100, 200)", "click(101, 200)")
+        ir, errors = parser.parse(edited)
+
+        assert (ir, errors) == parse_to_ir(edited)
+        assert parser.stats.parsed == 1
+        assert parser.stats.reused == 5
+
+    def test_shifts_lines_of_moved_declarations(self) -> None:
+        parser = IncrementalParser()
+        parser.parse(SOURCE)
+        edited = edit(SOURCE, "// Farming script\n", "// Farming script\n\n\n")
+        ir, _ = parser.parse(edited)
+
+        assert parser.stats.parsed == 1  # Only the comment chunk changed
+        assert ir == parse_to_ir(edited)[0]
+        assert ir.get_flow("farm").actions[0].span_line == 16
+
+    def test_unmoved_declarations_share_ir(self) -> None:
+        parser = IncrementalParser()
+        ir, _ = parser.parse(SOURCE)
+        edited = edit(SOURCE, "click(100, 200)", "click(100, 200)\n  click(1, 2)")
+        edited_ir, _ = parser.parse(edited)
+
+        assert edited_ir.get_flow("main") is ir.get_flow("main")  # Above the edit
+        assert edited_ir.interrupts[0] is not ir.interrupts[0]  # Moved down a line
+        assert edited_ir.interrupts[0].actions[0].span_line == 23
+
+    def test_clear_after_changing_ir_in_place(self) -> None:
+        parser = IncrementalParser()
+        ir, _ = parser.parse(SOURCE)
+        ir.flows[0].actions[0].params["arg0"] = "changed"
+        parser.clear()
+        assert parser.parse(SOURCE)[0] == parse_to_ir(SOURCE)[0]
+
+    def test_errors_fall_back_to_full_parse(self) -> None:
+        parser = IncrementalParser()
+        parser.parse(SOURCE)
+        broken = edit(SOURCE, "goto loop\n}", "goto loop\n")
+        assert parser.parse(broken) == parse_to_ir(broken)
+        assert parser.stats.full_parse
+
+        # Undoing the edit is served from the cache
+        parser.parse(SOURCE)
+        assert not parser.stats.full_parse
+        assert parser.stats.parsed == 0
+
+    def test_split_inside_block_falls_back(self) -> None:
+        source = "flow a {\nconst x = 1\n  click(1, 2)\n}\n"
+        parser = IncrementalParser()
+        assert parser.parse(source) == parse_to_ir(source)
+        assert parser.stats.full_parse
+
+    def test_duplicate_declarations(self) -> None:
+        source = "flow a {\n  click(1, 2)\n}\n" * 2
+        parser = IncrementalParser()
+        ir, _ = parser.parse(source)
+        assert [f.actions[0].span_line for f in ir.flows] == [2, 5]
+
+
+class TestDocumentSync:
+    """Test ScriptDocument.update_from_code with the incremental parser."""
+
+    def test_semantic_warnings_follow_dependencies(self) -> None:
+        doc = ScriptDocument()
+        doc.update_from_code(SOURCE)
+        assert [e.message for e in doc.parse_errors] == []
+        assert doc.state == DocumentState.VALID
+
+        warnings: list[list[str]] = []
+        doc.on_error(warnings.append)
+
+        # Renaming farm breaks main's run_flow, though main is unchanged
+        doc.update_from_code(edit(SOURCE, "flow farm", "flow grind"))
+        assert doc.parse_stats.parsed == 1
+        assert "Unknown flow 'farm'" in warnings[-1]
+        assert "Unknown asset 'ready' in main" in warnings[-1]
+
+        count = len(warnings)
+        doc.update_from_code(SOURCE)
+        assert len(warnings) == count + 1
+        assert "Unknown flow 'farm'" not in warnings[-1]
+
+    def test_gui_edits_do_not_leak_into_the_parse_cache(self) -> None:
+        doc = ScriptDocument()
+        doc.update_from_code(SOURCE)
+        doc.update_from_gui("flows[0].name", "start")
+        doc.add_action_to_flow("farm", ActionIR("wait", {"arg0": 1}))
+
+        doc.update_from_code(SOURCE)  # e.g. undo in the editor
+        assert doc.ir == parse_to_ir(SOURCE)[0]
+
+    def test_warning_lines_are_absolute(self) -> None:
+        shifted = "\n\n" + SOURCE
+        doc = ScriptDocument()
+        doc.update_from_code(SOURCE)
+        doc.update_from_code(shifted)
+        assert doc.parse_stats.parsed == 1
+
+        incremental = doc._run_incremental_semantic_analysis(doc.ir)
+        full = doc._run_semantic_analysis(parse_to_ir(shifted)[0])
+        assert [(e.message, e.line) for e in incremental] == [(e.message, e.line) for e in full]
+        assert incremental[0].line == 11
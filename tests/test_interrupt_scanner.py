@@ -0,0 +1,238 @@
+"""
+Test incremental interrupt scanning.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.models import ROI, AssetImage, InterruptRule, Match, Script
+from vision.frame_bus import FrameBus
+
+
+class MutableCapture:
+    """Mock screen capture over an image the test can change."""
+
+    def __init__(self) -> None:
+        self.image = np.full((300, 400, 3), 100, dtype=np.uint8)
+        self.full_grabs = 0
+
+    def capture_full_into(self, out=None, monitor: int = 1):  # type: ignore
+        self.full_grabs += 1
+        if out is None or out.shape != self.image.shape:
+            out = np.empty_like(self.image)
+        np.copyto(out, self.image)
+        return out, (0, 0)
+
+
+class MockMatcher:
+    """Mock matcher recording find_many batches."""
+
+    def __init__(self, frames: FrameBus) -> None:
+        self.frames = frames
+        self.batches: list[list[str]] = []
+        self.overrides: list[dict[str, ROI]] = []
+        self.visible: set[str] = set()
+        self.cost_ms: dict[str, float] = {}
+
+    def find_many(self, asset_ids, roi_overrides=None, max_workers=1, frame=None):  # type: ignore
+        from vision.matcher import BatchMatch
+
+        self.batches.append(list(asset_ids))
+        self.overrides.append(dict(roi_overrides or {}))
+        return {
+            aid: BatchMatch(
+                aid,
+                match=Match(x=5, y=5, w=10, h=10, confidence=0.99)
+                if aid in self.visible
+                else None,
+                elapsed_ms=self.cost_ms.get(aid, 1.0),
+            )
+            for aid in asset_ids
+        }
+
+
+@pytest.fixture
+def setup():  # type: ignore
+    from core.engine.context import EngineState
+    from core.engine.interrupt_scanner import InterruptScanner
+
+    top = ROI(x=0, y=0, w=128, h=128)
+    script = Script(
+        assets=[
+            AssetImage(id="popup", path="popup.png", roi=top),
+            AssetImage(id="close", path="close.png", roi=top),
+            AssetImage(id="boss", path="boss.png", roi=ROI(x=256, y=128, w=128, h=128)),
+        ],
+        interrupts=[
+            InterruptRule(when_image="popup", priority=5),
+            InterruptRule(when_image="close", priority=1),
+            InterruptRule(when_image="boss", priority=3),
+        ],
+    )
+    capture = MutableCapture()
+    frames = FrameBus(capture, max_age_ms=10_000)
+    matcher = MockMatcher(frames)
+    ctx = SimpleNamespace(script=script, state=EngineState.RUNNING)
+    scanner = InterruptScanner(ctx, matcher, scan_interval_ms=100)  # type: ignore
+    return scanner, matcher, frames, capture
+
+
+def rescan(scanner, frames):  # type: ignore
+    """Make every rule due and scan a fresh frame."""
+    for state in scanner._rule_states():
+        state.next_due = 0.0
+    frames.invalidate()
+    return scanner._check_interrupts(frames.frame())
+
+
+class TestIncrementalScan:
+    """Test dirty-region skipping, batching and per-rule rates."""
+
+    def test_rules_batched_in_priority_order(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, _ = setup
+        rescan(scanner, frames)
+        assert matcher.batches == [["popup", "boss", "close"]]
+
+    def test_unchanged_regions_are_not_rematched(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, capture = setup
+        rescan(scanner, frames)
+        rescan(scanner, frames)
+        assert len(matcher.batches) == 1
+
+        capture.image[300 - 40 :, 10:50] = 0  # Outside every rule region
+        rescan(scanner, frames)
+        assert len(matcher.batches) == 1
+
+        capture.image[160:180, 300:320] = 255  # Inside the boss region only
+        rescan(scanner, frames)
+        assert matcher.batches[-1] == ["boss"]
+
+        stats = scanner.get_stats()["rules"]
+        assert stats["popup"]["skipped_unchanged"] == 3
+        assert stats["boss"]["evaluations"] == 2
+
+    def test_single_pixel_change_is_rematched(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, capture = setup
+        rescan(scanner, frames)
+        capture.image[200, 301] = 101  # One grey level, one pixel, in the boss region
+        rescan(scanner, frames)
+        assert matcher.batches[-1] == ["boss"]
+
+    def test_rules_sharing_an_asset_keep_their_regions(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, _ = setup
+        left, right = ROI(x=0, y=0, w=64, h=64), ROI(x=200, y=0, w=64, h=64)
+        scanner._ctx.script.interrupts = [
+            InterruptRule(when_image="popup", roi_override=left, priority=2),
+            InterruptRule(when_image="popup", roi_override=right, priority=1),
+            InterruptRule(when_image="popup", roi_override=right),
+        ]
+        rescan(scanner, frames)
+        assert matcher.batches == [["popup"], ["popup"]]
+        assert matcher.overrides == [{"popup": left}, {"popup": right}]
+
+    def test_frame_overwritten_during_scan_is_dropped(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, _ = setup
+        for state in scanner._rule_states():
+            state.next_due = 0.0
+        frame = frames.frame()
+        frames.invalidate()
+        frames.frame()  # The runner grabbed again: frame's buffer is up for reuse
+
+        assert scanner._check_interrupts(frame) is None
+        assert matcher.batches == []
+        assert scanner.get_stats()["stale_frames"] == 1
+
+    def test_hit_triggers_and_rechecks_after_cooldown(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, _ = setup
+        matcher.visible.update({"popup", "close"})
+
+        match = rescan(scanner, frames)
+        assert match is not None and match.rule.when_image == "popup"
+
+        # popup is in cooldown; close was a hit too, so it is re-matched
+        assert rescan(scanner, frames).rule.when_image == "close"
+        assert matcher.batches[-1] == ["close"]
+
+        scanner.clear_cooldowns()
+        assert rescan(scanner, frames).rule.when_image == "popup"
+
+    def test_expensive_rules_scan_less_often(self, setup) -> None:  # type: ignore
+        scanner, matcher, frames, _ = setup
+        matcher.cost_ms["boss"] = 50.0  # 50ms / 5% CPU share -> 1s
+        rescan(scanner, frames)
+
+        rules = scanner.get_stats()["rules"]
+        assert rules["boss"]["interval_ms"] == 1000
+        assert rules["popup"]["interval_ms"] == 100
+
+
+class TestFrameSubscription:
+    """Test that the scanner follows the flow's captures."""
+
+    def test_reuses_flow_frames(self, setup) -> None:  # type: ignore
+        scanner, _, frames, capture = setup
+        flow_frame = frames.frame()  # Captured by the runner
+
+        assert scanner._next_frame() is flow_frame
+        assert capture.full_grabs == 1
+        assert scanner.get_stats()["own_grabs"] == 0
+
+    def test_grabs_when_flow_is_not_capturing(self, setup) -> None:  # type: ignore
+        scanner, _, frames, capture = setup
+        scanner._interval_active = 0.01
+        frames.frame()
+        scanner._next_frame()
+
+        frames.invalidate()
+        frame = scanner._next_frame()  # Nothing new arrives within the interval
+        assert frame.seq == 2
+        assert scanner.get_stats()["own_grabs"] == 1
+
+
+class TestTemplatePins:
+    """Test that start()/stop() release only the pins they took."""
+
+    @pytest.fixture
+    def store(self, setup, tmp_path):  # type: ignore
+        from core.templates import LazyTemplateStore
+
+        scanner = setup[0]
+        scanner._ctx.templates = LazyTemplateStore(tmp_path)
+        scanner._ctx.templates.pin(["popup"])  # Another holder, e.g. InterruptWatcher
+        return scanner._ctx.templates
+
+    def test_stop_twice_releases_once(self, setup, store) -> None:  # type: ignore
+        scanner = setup[0]
+        scanner.start()
+        assert store.get_cache_stats()["pinned"] == 3
+
+        scanner.stop()
+        scanner.stop()
+        assert store._pinned == {"popup": 1}
+
+    def test_stop_without_start_keeps_other_pins(self, setup, store) -> None:  # type: ignore
+        setup[0].stop()
+        assert store._pinned == {"popup": 1}
+
+    def test_rules_changed_while_running(self, setup, store) -> None:  # type: ignore
+        scanner = setup[0]
+        scanner.start()
+        scanner._ctx.script.interrupts = []
+        scanner.stop()
+        assert store._pinned == {"popup": 1}
+
+    def test_watcher_stop_twice_and_without_start(self, setup, store) -> None:  # type: ignore
+        from core.engine.interrupts import InterruptWatcher
+
+        ctx = setup[0]._ctx
+        ctx.matcher = setup[1]
+        InterruptWatcher(ctx, runner=None).stop()  # type: ignore
+        assert store._pinned == {"popup": 1}
+
+        watcher = InterruptWatcher(ctx, runner=None, poll_ms=10)  # type: ignore
+        watcher.start()
+        watcher.stop()
+        watcher.stop()
+        assert store._pinned == {"popup": 1}
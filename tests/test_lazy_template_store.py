@@ -0,0 +1,134 @@
+"""
+Test the byte-bounded LRU in LazyTemplateStore.
+"""
+
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import AssetImage
+from core.templates import LazyTemplateStore
+
+# 40x50 grayscale = 2000 bytes per template
+TEMPLATE_BYTES = 2000
+
+
+@pytest.fixture
+def assets(tmp_path: Path) -> list[AssetImage]:
+    rng = np.random.default_rng(5)
+    result = []
+    for i in range(4):
+        cv2.imwrite(str(tmp_path / f"t{i}.png"), rng.integers(0, 255, (40, 50), dtype=np.uint8))
+        result.append(AssetImage(id=f"t{i}", path=f"t{i}.png"))
+    return result
+
+
+def make_store(tmp_path: Path, assets: list[AssetImage], **kwargs) -> LazyTemplateStore:  # type: ignore
+    store = LazyTemplateStore(tmp_path, **kwargs)
+    store.register_assets(assets)
+    return store
+
+
+class TestLazyTemplateStore:
+    """Test eviction, pinning and statistics."""
+
+    def test_hits_and_misses_are_counted(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets)
+
+        first = store.get("t0")
+        assert store.get("t0") is first
+        assert store.get("unknown") is None
+
+        stats = store.get_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["bytes"] == TEMPLATE_BYTES
+
+    def test_byte_bound_evicts_lru(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets, max_bytes=2 * TEMPLATE_BYTES)
+
+        store.get("t0")
+        store.get("t1")
+        store.get("t0")  # t1 is now least recently used
+        store.get("t2")
+
+        stats = store.get_cache_stats()
+        assert stats["cache_size"] == 2
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= 2 * TEMPLATE_BYTES
+
+        misses = stats["misses"]
+        store.get("t0")
+        assert store.get_cache_stats()["misses"] == misses  # Still cached
+        store.get("t1")
+        assert store.get_cache_stats()["misses"] == misses + 1  # Was evicted
+
+    def test_max_cached_is_honoured(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets, max_cached=1)
+        store.get("t0")
+        store.get("t1")
+        assert store.get_cache_stats()["cache_size"] == 1
+
+    def test_pinned_assets_are_not_evicted(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets, max_bytes=TEMPLATE_BYTES)
+        store.pin(["t0"])
+
+        store.get("t0")
+        store.get("t1")
+        store.get("t2")
+        misses = store.get_cache_stats()["misses"]
+        store.get("t0")
+        assert store.get_cache_stats()["misses"] == misses
+
+        store.unpin(["t0"])
+        assert store.get_cache_stats()["bytes"] <= TEMPLATE_BYTES
+
+    def test_pins_are_counted(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets, max_bytes=TEMPLATE_BYTES)
+        store.pin(["t0"])  # Interrupt watcher
+        store.pin(["t0"])  # Interrupt scanner
+        store.get("t0")
+
+        store.unpin(["t0"])  # One holder left: still resident
+        store.get("t1")
+        misses = store.get_cache_stats()["misses"]
+        store.get("t0")
+        assert store.get_cache_stats()["misses"] == misses
+        assert store.get_cache_stats()["pinned"] == 1
+
+        store.unpin(["t0"])
+        assert store.get_cache_stats()["pinned"] == 0
+        store.get("t1")
+        misses = store.get_cache_stats()["misses"]
+        store.get("t0")
+        assert store.get_cache_stats()["misses"] == misses + 1  # Evicted once unpinned
+
+    def test_instances_do_not_share_cache(self, tmp_path: Path, assets) -> None:  # type: ignore
+        a = make_store(tmp_path, assets)
+        b = make_store(tmp_path, assets)
+        a.get("t0")
+        assert b.get_cache_stats()["cache_size"] == 0
+
+    def test_concurrent_access(self, tmp_path: Path, assets) -> None:  # type: ignore
+        store = make_store(tmp_path, assets, max_bytes=2 * TEMPLATE_BYTES)
+        errors: list[Exception] = []
+
+        def worker(offset: int) -> None:
+            try:
+                for i in range(200):
+                    assert store.get(f"t{(i + offset) % 4}") is not None
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = store.get_cache_stats()
+        assert not errors
+        assert stats["hits"] + stats["misses"] == 800
+        assert stats["bytes"] <= 2 * TEMPLATE_BYTES
@@ -2,6 +2,9 @@
 Tests for DSL Lexer.
 """
 
+import random
+from pathlib import Path
+
 from core.dsl.lexer import Lexer
 from core.dsl.tokens import TokenType
 
@@ -302,3 +305,47 @@ class TestLexerRealCode:
         lexer = Lexer(source)
         lexer.tokenize()
         assert len(lexer.errors) == 0
+
+
+class TestLexerFastPath:
+    """The regex fast path must match the character scanner exactly."""
+
+    SOURCES = [
+        'flow main {\n  click(100, 200) // go\n  wait(1.5s) /* a\nb */ $hp = -3\n}',
+        'let s = "a\\n\\"b\\"" + \'c\'\nif x >= 10 && !done { goto(@label) }',
+        "café = 1\nx٣ = 2\n² →",
+        '"unterminated\n let a = 1',
+        '"ends in backslash\\',
+        "/* never closed",
+        "1.2.3 4ms 5h 6.x .5 $ # ~",
+    ]
+
+    @staticmethod
+    def _tokens(source: str, fast: bool) -> tuple:
+        lexer = Lexer(source, fast=fast)
+        tokens = [
+            (t.type, t.value, t.line, t.column, t.end_line, t.end_column)
+            for t in lexer.tokenize()
+        ]
+        errors = [(e.message, e.line, e.column) for e in lexer.errors]
+        return tokens, errors, (lexer.pos, lexer.line, lexer.column)
+
+    def test_matches_character_scanner(self) -> None:
+        for source in self.SOURCES:
+            assert self._tokens(source, fast=True) == self._tokens(source, fast=False), source
+
+    def test_matches_on_example_scripts(self) -> None:
+        root = Path(__file__).parent.parent
+        paths = [*(root / "scripts").rglob("*.dsl"), *(root / "scripts").rglob("*.retro")]
+        assert paths
+        for path in paths:
+            source = path.read_text(encoding="utf-8")
+            assert self._tokens(source, fast=True) == self._tokens(source, fast=False), path
+
+    def test_matches_on_random_input(self) -> None:
+        rng = random.Random(1)
+        alphabet = list("azAZ_09$@#/*\"'\\\n\t .,;:(){}[]+-%<>=!&|é٣msh")
+        alphabet += ["flow ", "/*", "*/", "1.5", "2s"]
+        for _ in range(2000):
+            source = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            assert self._tokens(source, fast=True) == self._tokens(source, fast=False), source
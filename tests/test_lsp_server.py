@@ -0,0 +1,190 @@
+"""
+Test the language server: incremental sync, symbol index, background diagnostics.
+"""
+
+import threading
+from typing import Any
+
+import pytest
+
+from core.lsp import server as lsp_server
+from core.lsp.index import AnalysisCancelled, index_document
+from core.lsp.server import RetroScriptLanguageServer, TextDocument
+
+SOURCE = """const SPEED = 3
+flow main {
+  let n = 1
+  run_flow("farm")
+  farm()
+}
+flow farm {
+  label top:
+  $hp = n + SPEED
+  goto top
+}
+"""
+
+
+def change(line: int, start: int, end_line: int, end: int, text: str) -> dict[str, Any]:
+    return {
+        "range": {
+            "start": {"line": line, "character": start},
+            "end": {"line": end_line, "character": end},
+        },
+        "text": text,
+    }
+
+
+def at(uri: str, line: int, character: int) -> dict[str, Any]:
+    return {"textDocument": {"uri": uri}, "position": {"line": line, "character": character}}
+
+
+@pytest.fixture
+def server():  # type: ignore
+    server = RetroScriptLanguageServer()
+    server.published = []
+    server._write_message = server.published.append
+    yield server
+    server._worker.stop()
+
+
+def open_doc(server, uri: str, text: str, version: int = 1) -> None:  # type: ignore
+    server._handle_did_open({"textDocument": {"uri": uri, "text": text, "version": version}})
+    assert server.wait_for_analysis(5)
+
+
+def edit(server, uri: str, version: int, *changes: dict[str, Any]) -> None:  # type: ignore
+    server._handle_did_change(
+        {"textDocument": {"uri": uri, "version": version}, "contentChanges": list(changes)}
+    )
+
+
+class TestTextDocument:
+    """Test range edits on the line array."""
+
+    def test_single_line_edit(self) -> None:
+        doc = TextDocument("a", "flow farm {\n}")
+        doc.apply_change(change(0, 5, 0, 9, "grind"))
+        assert doc.text == "flow grind {\n}"
+
+    def test_multi_line_insert_and_delete(self) -> None:
+        doc = TextDocument("a", "a\nb\nc")
+        doc.apply_change(change(1, 1, 1, 1, "\nx\ny"))
+        assert doc.lines == ["a", "b", "x", "y", "c"]
+        doc.apply_change(change(0, 1, 3, 1, ""))
+        assert doc.text == "a\nc"
+
+    def test_full_replace_and_clamping(self) -> None:
+        doc = TextDocument("a", "old")
+        doc.apply_change({"text": "new\ntext"})
+        doc.apply_change(change(1, 2, 99, 99, "!"))
+        assert doc.text == "new\nte!"
+
+
+class TestSymbolIndex:
+    """Test definitions and references from the parser."""
+
+    def test_definitions(self) -> None:
+        index = index_document("a", SOURCE)
+        kinds = {name: symbol.kind for name, symbol in index.symbols.items()}
+        assert kinds == {
+            "SPEED": "const",
+            "main": "flow",
+            "n": "variable",
+            "farm": "flow",
+            "top": "label",
+        }
+        farm = index.symbols["farm"].range
+        assert (farm.start.line, farm.start.character, farm.end.character) == (6, 5, 9)
+
+    def test_references_include_flow_name_strings(self) -> None:
+        index = index_document("a", SOURCE)
+        refs = index.references["farm"]
+        ranges = [(r.start.line, r.start.character, r.end.character) for r in refs]
+        assert ranges == [(3, 12, 16), (4, 2, 6), (6, 5, 9)]
+        assert len(index.references["$hp"]) == 1
+
+    def test_cancellation(self) -> None:
+        with pytest.raises(AnalysisCancelled):
+            index_document("a", SOURCE, is_cancelled=lambda: True)
+
+
+class TestLanguageServer:
+    """Test requests answered from the workspace index."""
+
+    def test_references_and_definition_across_documents(self, server) -> None:  # type: ignore
+        open_doc(server, "a", SOURCE)
+        open_doc(server, "b", 'flow other {\n  run_flow("farm")\n}\n')
+
+        refs = server._handle_references(at("a", 4, 3))
+        assert sorted((r["uri"], r["range"]["start"]["line"]) for r in refs) == [
+            ("a", 3),
+            ("a", 4),
+            ("a", 6),
+        ]  # "farm" is not defined in b, so its string there is not a reference
+        assert server._handle_definition(at("b", 0, 6))[0]["uri"] == "b"
+
+        server._handle_did_close({"textDocument": {"uri": "a"}})
+        refs = server._handle_references(at("b", 0, 6))
+        assert [(r["uri"], r["range"]["start"]) for r in refs] == [
+            ("b", {"line": 0, "character": 5})
+        ]
+
+    def test_incremental_change_updates_index_and_diagnostics(self, server) -> None:  # type: ignore
+        open_doc(server, "a", SOURCE)
+        assert server.published[-1]["params"]["diagnostics"] == []
+
+        edit(server, "a", 2, change(6, 5, 6, 9, "grind"))
+        assert server.wait_for_analysis(5)
+        messages = [d["message"] for d in server.published[-1]["params"]["diagnostics"]]
+        assert messages == ["Unknown flow 'farm'"]
+        assert server.index.get("a").version == 2
+        assert "grind" in {c["label"] for c in server._handle_completion(at("a", 4, 2))}
+
+    def test_close_while_storing_analysis_is_not_reindexed(self, server, monkeypatch) -> None:  # type: ignore
+        open_doc(server, "a", SOURCE)
+        update = server.index.update
+        closers: list[threading.Thread] = []
+
+        def close_then_update(index):  # type: ignore
+            # didClose arrives from the main thread right as the result is stored
+            closer = threading.Thread(
+                target=server._handle_did_close, args=({"textDocument": {"uri": "a"}},)
+            )
+            closers.append(closer)
+            closer.start()
+            closer.join(0.2)  # Waits on the document lock until the update is done
+            update(index)
+
+        monkeypatch.setattr(server.index, "update", close_then_update)
+        edit(server, "a", 2, change(0, 14, 0, 15, "4"))
+        assert server.wait_for_analysis(5)
+        closers[0].join(5)
+
+        assert server.index.get("a") is None
+        assert server.index.symbol("farm") is None
+
+    def test_stale_versions_are_not_published(self, server, monkeypatch) -> None:  # type: ignore
+        gate = threading.Event()
+        analysed: list[int] = []
+
+        def slow_index(uri, text, version, is_cancelled=None):  # type: ignore
+            gate.wait(5)
+            analysed.append(version)
+            return index_document(uri, text, version, is_cancelled)
+
+        monkeypatch.setattr(lsp_server, "index_document", slow_index)
+        server._handle_did_open({"textDocument": {"uri": "a", "text": SOURCE, "version": 1}})
+        for version in range(2, 6):
+            edit(server, "a", version, change(0, 14, 0, 15, str(version)))
+
+        # Requests are answered while the analysis is blocked
+        assert server._handle_hover(at("a", 4, 3)) is None
+        assert "click" in {c["label"] for c in server._handle_completion(at("a", 4, 2))}
+
+        gate.set()
+        assert server.wait_for_analysis(5)
+        assert analysed[-1] == 5 and len(analysed) <= 2
+        assert len(server.published) == 1
+        assert server.index.get("a").version == 5
+        assert server._get_hover_info("SPEED") == "**const SPEED**"
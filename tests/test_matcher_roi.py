@@ -2,6 +2,7 @@
 Test matcher with ROI optimization.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
@@ -155,3 +156,83 @@ class TestScreenCapture:
         with ScreenCapture() as cap:
             img = cap.capture_roi(roi)
             assert img.shape == (100, 100, 3)
+
+
+class TestFindMany:
+    """Test batched multi-template matching."""
+
+    @pytest.fixture
+    def setup_batch(self, tmp_path: Path):  # type: ignore
+        """Create matcher with several assets sharing one screen."""
+        screen = np.ones((600, 800, 3), dtype=np.uint8) * 200
+        cv2.rectangle(screen, (100, 100), (180, 140), (0, 0, 255), -1)
+        cv2.putText(screen, "OK", (120, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        cv2.circle(screen, (500, 400), 30, (255, 0, 0), -1)
+
+        cv2.imwrite(str(tmp_path / "btn_ok.png"), screen[100:140, 100:180])
+        cv2.imwrite(str(tmp_path / "circle.png"), screen[365:435, 465:535])
+
+        store = TemplateStore(tmp_path)
+        errors = store.preload(
+            [
+                AssetImage(id="btn_ok", path="btn_ok.png"),
+                AssetImage(id="btn_color", path="btn_ok.png", grayscale=False),
+                AssetImage(id="circle", path="circle.png", roi=ROI(x=400, y=300, w=200, h=200)),
+                AssetImage(id="far_away", path="circle.png", roi=ROI(x=5000, y=0, w=100, h=100)),
+                AssetImage(id="tiny_roi", path="circle.png", roi=ROI(x=0, y=0, w=10, h=10)),
+            ]
+        )
+        assert len(errors) == 0
+        return Matcher(store, MockCapture(screen))
+
+    def test_batch_matches_individual_finds(self, setup_batch) -> None:  # type: ignore
+        """Batch results equal one-by-one find() results."""
+        matcher = setup_batch
+        ids = ["btn_ok", "btn_color", "circle"]
+
+        results = matcher.find_many(ids)
+        assert list(results) == ids
+        for asset_id in ids:
+            single = matcher.find(asset_id)
+            assert results[asset_id].found
+            assert (results[asset_id].match.x, results[asset_id].match.y) == (single.x, single.y)
+            assert results[asset_id].elapsed_ms >= 0
+
+    def test_batch_parallel(self, setup_batch) -> None:  # type: ignore
+        """Thread pool execution gives the same results."""
+        matcher = setup_batch
+        results = matcher.find_many(["btn_ok", "btn_color", "circle"], max_workers=3)
+        assert all(r.found for r in results.values())
+
+    def test_batch_concurrent_callers_share_pool(self, setup_batch) -> None:  # type: ignore
+        """Threads asking for different widths share one fixed pool."""
+        matcher = setup_batch
+        ids = ["btn_ok", "btn_color", "circle"]
+
+        def scan(workers: int) -> bool:
+            return all(
+                all(r.found for r in matcher.find_many(ids, max_workers=workers).values())
+                for _ in range(20)
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as callers:
+            assert all(callers.map(scan, [2, 3, 2, 3]))
+        assert matcher._get_pool() is matcher._get_pool()
+
+    def test_batch_skips(self, setup_batch) -> None:  # type: ignore
+        """Unmatchable templates are skipped with a reason."""
+        matcher = setup_batch
+        results = matcher.find_many(["far_away", "tiny_roi", "missing"])
+
+        assert results["far_away"].skipped == "roi_outside_frame"
+        assert results["tiny_roi"].skipped == "template_larger_than_roi"
+        assert results["missing"].skipped == "asset_not_loaded"
+        assert not any(r.found for r in results.values())
+
+    def test_batch_roi_overrides(self, setup_batch) -> None:  # type: ignore
+        """Per-asset ROI overrides restrict the search region."""
+        matcher = setup_batch
+        results = matcher.find_many(
+            ["btn_ok"], roi_overrides={"btn_ok": ROI(x=400, y=400, w=100, h=100)}
+        )
+        assert not results["btn_ok"].found
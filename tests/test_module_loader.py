@@ -0,0 +1,166 @@
+"""
+Test the module loader: persistent parsed-module cache, import graph, targeted reload.
+"""
+
+from core.dsl.ast import Program
+from core.dsl.module_cache import ModuleCache, content_digest, decode_ast, encode_ast
+from core.dsl.module_loader import ModuleLoader
+from core.dsl.parser import Parser
+from core.runtime.hot_reload import HotReloader, ReloadEvent
+
+SOURCE = """import "lib/util" as u
+const SPEED = 3
+flow main {
+    let n = 1
+    if n > 0 {
+        click(10, 20)
+    }
+    run_flow("farm")
+}
+"""
+
+
+def make_project(tmp_path):  # type: ignore
+    """main -> (lib/util, lib/combat); lib/combat -> lib/util; lib/util -> lib/base."""
+    (tmp_path / "lib").mkdir(parents=True)
+    (tmp_path / "main.retro").write_text(
+        'import "lib/util" as u\nimport "lib/combat"\nflow main {\n    u()\n}\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "lib" / "combat.retro").write_text(
+        'import "lib/util"\nflow attack {\n    click(1, 2)\n}\n', encoding="utf-8"
+    )
+    (tmp_path / "lib" / "util.retro").write_text(
+        'import "lib/base"\nflow helper {\n    wait(1)\n}\n', encoding="utf-8"
+    )
+    (tmp_path / "lib" / "base.retro").write_text("const X = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+def loader_for(tmp_path, **kwargs) -> ModuleLoader:  # type: ignore
+    return ModuleLoader(tmp_path / "p", cache_dir=tmp_path / "cache", **kwargs)
+
+
+class TestModuleCache:
+    """Test AST encoding and the on-disk store."""
+
+    def test_round_trip(self) -> None:
+        program = Parser(SOURCE).parse()
+        assert decode_ast(encode_ast(program)) == program
+
+    def test_get_checks_content_digest(self, tmp_path) -> None:  # type: ignore
+        cache = ModuleCache(tmp_path)
+        program = Parser(SOURCE).parse()
+        digest = content_digest(SOURCE.encode())
+        cache.put("/m.retro", digest, program)
+
+        assert cache.get("/m.retro", digest) == program
+        assert cache.get("/m.retro", content_digest(b"other")) is None
+        assert cache.get("/other.retro", digest) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path) -> None:  # type: ignore
+        cache = ModuleCache(tmp_path)
+        cache.put("/m.retro", "d", Parser(SOURCE).parse())
+        for entry in tmp_path.glob("*.ast"):
+            entry.write_bytes(b"garbage")
+        assert cache.get("/m.retro", "d") is None
+
+
+class TestModuleLoader:
+    """Test loading, linking and the import graph."""
+
+    def test_nested_imports_and_aliases(self, tmp_path) -> None:  # type: ignore
+        make_project(tmp_path / "p")
+        module = loader_for(tmp_path).load("main")
+        assert module is not None and isinstance(module.ast, Program)
+        assert list(module.exports) == ["u", "combat"]
+        util = module.exports["u"]
+        # Shared modules are loaded once, keeping the alias they were first imported as
+        assert module.exports["combat"].exports == {"u": util}
+        assert list(util.exports) == ["base"]
+
+    def test_parallel_matches_sequential(self, tmp_path) -> None:  # type: ignore
+        make_project(tmp_path / "p")
+        parallel = loader_for(tmp_path, persistent=False, max_workers=4).load("main")
+        sequential = loader_for(tmp_path, persistent=False, max_workers=1).load("main")
+        assert parallel is not None and sequential is not None
+        assert list(parallel.exports) == list(sequential.exports)
+        for name, nested in parallel.exports.items():
+            flows = [flow.name for flow in nested.ast.flows]
+            assert flows == [flow.name for flow in sequential.exports[name].ast.flows]
+
+    def test_circular_imports(self, tmp_path) -> None:  # type: ignore
+        root = tmp_path / "p"
+        root.mkdir()
+        (root / "a.retro").write_text('import "b"\nflow a {\n}\n', encoding="utf-8")
+        (root / "b.retro").write_text('import "a"\nflow b {\n}\n', encoding="utf-8")
+        a = loader_for(tmp_path).load("a")
+        assert a is not None
+        assert a.exports["b"].exports["a"] is a
+
+    def test_missing_module(self, tmp_path) -> None:  # type: ignore
+        (tmp_path / "p").mkdir()
+        assert loader_for(tmp_path).load("nope") is None
+
+    def test_persistent_cache_across_loaders(self, tmp_path) -> None:  # type: ignore
+        make_project(tmp_path / "p")
+        first = loader_for(tmp_path)
+        first.load("main")
+        assert first.disk_cache is not None and first.disk_cache.hits == 0
+
+        second = loader_for(tmp_path)
+        module = second.load("main")
+        assert second.disk_cache is not None
+        assert (second.disk_cache.hits, second.disk_cache.misses) == (4, 0)
+        assert module is not None and module.ast == first.get_cached(module.path).ast
+
+        (tmp_path / "p" / "lib" / "base.retro").write_text("const X = 2\n", encoding="utf-8")
+        third = loader_for(tmp_path)
+        third.load("main")
+        assert third.disk_cache is not None
+        assert (third.disk_cache.hits, third.disk_cache.misses) == (3, 1)
+
+    def test_graph_and_targeted_reload(self, tmp_path) -> None:  # type: ignore
+        root = make_project(tmp_path / "p")
+        loader = loader_for(tmp_path)
+        main = loader.load("main")
+        assert main is not None
+        names = ("util", "combat", "base")
+        paths = {name: str((root / "lib" / f"{name}.retro").resolve()) for name in names}
+        assert sorted(loader.loaded_paths()) == sorted([main.path, *paths.values()])
+
+        assert loader.graph.imports_of(main.path) == [paths["util"], paths["combat"]]
+        assert loader.graph.importers_of(paths["util"]) == {main.path, paths["combat"]}
+        assert loader.graph.dependents(paths["combat"]) == [paths["combat"], main.path]
+
+        base = loader.get_cached(paths["base"])
+        (root / "lib" / "combat.retro").write_text("flow attack {\n}\n", encoding="utf-8")
+        reloaded = loader.reload(root / "lib" / "combat.retro")
+
+        assert [m.path for m in reloaded] == [main.path]
+        assert loader.get_cached(paths["base"]) is base  # Untouched
+        assert loader.get_cached(main.path) is not main
+        assert loader.get_cached(paths["combat"]).exports == {}
+        assert loader.graph.importers_of(paths["util"]) == {main.path}
+
+
+class TestHotReloadWithLoader:
+    """Test that file changes go through the loader."""
+
+    def test_change_reloads_dependents(self, tmp_path) -> None:  # type: ignore
+        root = make_project(tmp_path / "p")
+        loader = loader_for(tmp_path)
+        main = loader.load("main")
+        assert main is not None
+        reloader = HotReloader(loader)
+        reloader.watch_imports()
+
+        base = root / "lib" / "base.retro"
+        base.write_text("const X = 3\n", encoding="utf-8")
+        reloader._handle_change(ReloadEvent(base, "modified", 0.0))
+
+        assert reloader.get_reload_count() == 1
+        assert len(reloader.last_affected) == 4  # base, util, then combat and main
+        assert reloader.last_affected[0] == str(base.resolve())
+        assert loader.get_cached(main.path) is not main
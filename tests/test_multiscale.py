@@ -0,0 +1,121 @@
+"""
+Test multi-scale matching (scale memory, early exit, coarse-to-fine).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.vision.matcher import ImageMatcher
+
+
+def make_icon() -> np.ndarray:
+    icon = np.full((40, 40, 3), 20, dtype=np.uint8)
+    cv2.rectangle(icon, (4, 4), (35, 35), (0, 180, 255), -1)
+    cv2.line(icon, (4, 4), (35, 35), (255, 255, 255), 3)
+    cv2.circle(icon, (28, 12), 5, (255, 0, 0), -1)
+    return icon
+
+
+def make_screen(scale: float) -> np.ndarray:
+    rng = np.random.default_rng(9)
+    screen = cv2.GaussianBlur(rng.integers(0, 120, (360, 480, 3), dtype=np.uint8), (7, 7), 0)
+    icon = cv2.resize(make_icon(), None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    h, w = icon.shape[:2]
+    screen[200 : 200 + h, 300 : 300 + w] = icon
+    return screen
+
+
+@pytest.fixture
+def matcher(tmp_path: Path) -> ImageMatcher:
+    cv2.imwrite(str(tmp_path / "icon.png"), make_icon())
+    return ImageMatcher(assets_dir=tmp_path, confidence=0.85)
+
+
+def use_screen(matcher: ImageMatcher, monkeypatch: pytest.MonkeyPatch, scale: float) -> None:
+    screen = make_screen(scale)
+    monkeypatch.setattr(matcher, "_capture_screen", lambda roi=None: screen)
+
+
+def count_scales(matcher: ImageMatcher, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    evaluated: list[float] = []
+    original = matcher._score_scale
+
+    def spy(key, template_img, screen, scale, report_scale=None):  # type: ignore
+        evaluated.append(scale)
+        return original(key, template_img, screen, scale, report_scale)
+
+    monkeypatch.setattr(matcher, "_score_scale", spy)
+    return evaluated
+
+
+class TestFindMultiscale:
+    """Test the multi-scale engine."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_finds_scaled_template(self, matcher, monkeypatch, workers: int) -> None:  # type: ignore
+        use_screen(matcher, monkeypatch, 1.5)
+
+        result = matcher.find_multiscale("icon.png", early_exit=False, max_workers=workers)
+        assert result.found
+        assert result.scale == 1.5
+        assert (result.x, result.y) == (300, 200)
+
+    def test_remembered_scale_is_tried_first(self, matcher, monkeypatch) -> None:  # type: ignore
+        use_screen(matcher, monkeypatch, 1.25)
+        assert matcher.find_multiscale("icon.png", early_exit=False).scale == 1.25
+
+        evaluated = count_scales(matcher, monkeypatch)
+        result = matcher.find_multiscale("icon.png")
+        assert result.found and result.scale == 1.25
+        assert evaluated == [1.25]
+
+    def test_resized_templates_are_cached(self, matcher, monkeypatch) -> None:  # type: ignore
+        use_screen(matcher, monkeypatch, 0.75)
+        matcher.find_multiscale("icon.png", early_exit=False, max_workers=1)
+        cached = dict(matcher._scaled_cache)
+
+        matcher.find_multiscale("icon.png", early_exit=False, max_workers=1)
+        for key, (_, scaled) in matcher._scaled_cache.items():
+            assert cached[key][1] is scaled
+
+    def test_resized_cache_is_bounded(self, tmp_path: Path, monkeypatch) -> None:  # type: ignore
+        cv2.imwrite(str(tmp_path / "icon.png"), make_icon())
+        budget = 3 * make_icon().nbytes
+        matcher = ImageMatcher(assets_dir=tmp_path, scaled_cache_bytes=budget)
+        use_screen(matcher, monkeypatch, 1.0)
+
+        scales = [0.75, 0.875, 1.0, 1.125, 1.25, 1.5]
+        matcher.find_multiscale("icon.png", scales=scales, early_exit=False, max_workers=1)
+        assert matcher._scaled_bytes <= budget
+        assert matcher._scaled_bytes == sum(s.nbytes for _, s in matcher._scaled_cache.values())
+        assert list(matcher._scaled_cache)[-1] == ("icon.png", 1.5)  # Newest kept
+
+    def test_concurrent_callers_share_scale_pool(self, matcher, monkeypatch) -> None:  # type: ignore
+        use_screen(matcher, monkeypatch, 1.5)
+
+        def search(workers: int) -> bool:
+            return all(
+                matcher.find_multiscale("icon.png", early_exit=False, max_workers=workers).found
+                for _ in range(5)
+            )
+
+        with ThreadPoolExecutor(max_workers=4) as callers:
+            assert all(callers.map(search, [2, 4, 3, 2]))
+        assert matcher._get_scale_pool() is matcher._get_scale_pool()
+
+    def test_coarse_to_fine_finds_in_between_scale(self, matcher, monkeypatch) -> None:  # type: ignore
+        use_screen(matcher, monkeypatch, 1.125)
+
+        result = matcher.find_multiscale("icon.png", scales=[1.0, 1.25, 1.5], coarse_to_fine=True)
+        assert result.found
+        assert result.scale == 1.125
+        assert (result.x, result.y) == (300, 200)
+
+    def test_not_found(self, matcher, monkeypatch) -> None:  # type: ignore
+        screen = np.zeros((200, 200, 3), dtype=np.uint8)
+        monkeypatch.setattr(matcher, "_capture_screen", lambda roi=None: screen)
+        assert not matcher.find_multiscale("icon.png").found
@@ -0,0 +1,99 @@
+"""
+Test multi-object detection (local maxima + NMS) for find_all.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import AssetImage
+from core.templates import TemplateStore
+from core.vision.matcher import ImageMatcher, MatchMethod
+from core.vision.nms import detect, non_max_suppression
+from vision.frame_bus import FrameBus
+from vision.matcher import Matcher
+
+# Top-left corners of the coins drawn on the test screen
+COINS = [(40, 30), (140, 30), (240, 30), (100, 150), (200, 150)]
+
+
+class StaticCapture:
+    """Capture returning a fixed screen."""
+
+    def __init__(self, image: np.ndarray) -> None:
+        self._image = image
+
+    def capture_full(self, monitor: int = 1) -> np.ndarray:
+        return self._image
+
+
+def make_coin() -> np.ndarray:
+    coin = np.full((24, 24, 3), 30, dtype=np.uint8)
+    cv2.circle(coin, (12, 12), 9, (0, 200, 255), -1)
+    cv2.circle(coin, (12, 12), 4, (0, 120, 180), -1)
+    return coin
+
+
+def make_screen() -> np.ndarray:
+    screen = np.full((240, 320, 3), 30, dtype=np.uint8)
+    coin = make_coin()
+    for x, y in COINS:
+        screen[y : y + 24, x : x + 24] = coin
+    return screen
+
+
+class TestDetect:
+    """Test the response-map detector."""
+
+    def test_one_detection_per_object(self) -> None:
+        screen = cv2.cvtColor(make_screen(), cv2.COLOR_BGR2GRAY)
+        coin = cv2.cvtColor(make_coin(), cv2.COLOR_BGR2GRAY)
+        result = cv2.matchTemplate(screen, coin, cv2.TM_CCOEFF_NORMED)
+
+        found = detect(result, 0.8, 24, 24, max_results=10)
+        assert sorted((d.x, d.y) for d in found) == sorted(COINS)
+        assert [d.score for d in found] == sorted((d.score for d in found), reverse=True)
+
+    def test_top_k(self) -> None:
+        screen = cv2.cvtColor(make_screen(), cv2.COLOR_BGR2GRAY)
+        coin = cv2.cvtColor(make_coin(), cv2.COLOR_BGR2GRAY)
+        result = cv2.matchTemplate(screen, coin, cv2.TM_SQDIFF_NORMED)
+
+        found = detect(result, 0.9, 24, 24, sqdiff=True, max_results=3)
+        assert len(found) == 3
+        assert all((d.x, d.y) in COINS for d in found)
+
+    def test_nms_and_min_distance(self) -> None:
+        boxes = np.array([[0, 0, 10, 10], [2, 0, 10, 10], [30, 0, 10, 10]])
+        scores = np.array([0.9, 0.95, 0.8])
+
+        assert non_max_suppression(boxes, scores, iou_threshold=0.3) == [1, 2]
+        assert non_max_suppression(boxes, scores, iou_threshold=0.9) == [1, 0, 2]
+        assert non_max_suppression(boxes, scores, iou_threshold=0.9, min_distance=5) == [1, 2]
+
+
+class TestFindAll:
+    """Test find_all in both matchers."""
+
+    def test_image_matcher(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cv2.imwrite(str(tmp_path / "coin.png"), make_coin())
+        matcher = ImageMatcher(assets_dir=tmp_path, method=MatchMethod.CCOEFF)
+        monkeypatch.setattr(matcher, "_capture_screen", lambda roi=None: make_screen())
+
+        results = matcher.find_all("coin.png", confidence=0.8, max_results=10)
+        assert sorted((r.x, r.y) for r in results) == sorted(COINS)
+
+        spaced = matcher.find_all("coin.png", confidence=0.8, min_distance=150)
+        assert len(spaced) < len(COINS)
+
+    def test_template_matcher(self, tmp_path: Path) -> None:
+        cv2.imwrite(str(tmp_path / "coin.png"), make_coin())
+        store = TemplateStore(tmp_path)
+        assert store.preload([AssetImage(id="coin", path="coin.png")]) == []
+        matcher = Matcher(store, frames=FrameBus(StaticCapture(make_screen())))
+
+        matches = matcher.find_all("coin", max_matches=10)
+        assert sorted((m.x, m.y) for m in matches) == sorted(COINS)
+        assert len(matcher.find_all("coin", max_matches=2)) == 2
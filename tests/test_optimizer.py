@@ -0,0 +1,105 @@
+"""
+Tests for the DSL optimizer (constant folding and dead-branch elimination).
+"""
+
+import pytest
+
+from core.dsl.ast import IfStmt, Literal, ReturnStmt, WhileStmt
+from core.dsl.formatter import Formatter
+from core.dsl.optimizer import Optimizer
+from core.dsl.parser import Parser
+
+
+def optimized(source: str) -> tuple:  # type: ignore
+    """Parse and optimize source; return (original, optimized, stats)."""
+    program = Parser(source).parse()
+    optimizer = Optimizer()
+    return program, optimizer.optimize(program), optimizer.stats
+
+
+def main_statements(source: str) -> list:  # type: ignore
+    _, program, _ = optimized(source)
+    return program.main_flow.body.statements
+
+
+class TestFolding:
+    """Test constant folding."""
+
+    def test_arithmetic_strings_and_durations(self) -> None:
+        (ret,) = main_statements('flow main { return [500 * 2, "hp:" + 10, 2s, 1 < 2, -(3)] }')
+        assert [e.value for e in ret.value.elements] == [1000, "hp:10", 2000, True, -3]
+        assert all(isinstance(e, Literal) for e in ret.value.elements)
+
+    def test_logic_returns_an_operand(self) -> None:
+        (a, b, c) = main_statements("flow main { let a = 0 and f(); let b = 1 and x; let c = not \"\" }")
+        assert a.initializer.value == 0
+        assert b.initializer.name == "x"
+        assert c.initializer.value is True
+
+    def test_runtime_errors_are_not_folded(self) -> None:
+        (a, b) = main_statements('flow main { let a = 1 / 0; let b = "a" - 1 }')
+        assert a.initializer.operator == "/"
+        assert b.initializer.operator == "-"
+
+    def test_spans_are_kept(self) -> None:
+        program, result, _ = optimized("flow main {\n  return 2 * 3\n}")
+        before = program.main_flow.body.statements[0].value
+        after = result.main_flow.body.statements[0].value
+        assert isinstance(after, Literal)
+        assert after.span == before.span and after.id == before.id
+
+    def test_input_is_not_modified(self) -> None:
+        program, _, _ = optimized("flow main { if false { log(1) } return 2 * 3 }")
+        assert isinstance(program.main_flow.body.statements[0], IfStmt)
+        assert not isinstance(program.main_flow.body.statements[1].value, Literal)
+
+
+class TestConstants:
+    """Test const inlining."""
+
+    def test_inlined_into_flows_and_later_constants(self) -> None:
+        _, program, stats = optimized("const A = 2\nconst B = A * 3\nflow main { return B + A }")
+        assert program.constants[1].initializer.value == 6
+        assert program.main_flow.body.statements[0].value.value == 8
+        assert stats.inlined == 3
+
+    def test_reassigned_constant_is_not_inlined(self) -> None:
+        _, program, _ = optimized("const A = 2\nflow f { A = 5 }\nflow main { f(); return A }")
+        assert program.main_flow.body.statements[1].value.name == "A"
+
+
+class TestDeadBranches:
+    """Test if/while elimination."""
+
+    def test_constant_if_is_spliced(self) -> None:
+        stmts = main_statements("flow main { if false { a() } elif 1 > 2 { b() } else { c() } }")
+        assert [s.expr.callee for s in stmts] == ["c"]
+
+    def test_true_elif_becomes_else(self) -> None:
+        (stmt,) = main_statements("flow main { if x { a() } elif false { b() } elif true { c() } elif y { d() } }")
+        assert stmt.elif_branches == []
+        assert stmt.else_branch.statements[0].expr.callee == "c"
+
+    def test_while_false_removed(self) -> None:
+        stmts = main_statements("flow main { while false { a() } while 0 > 1 { b() } return 1 }")
+        assert len(stmts) == 1 and isinstance(stmts[0], ReturnStmt)
+        assert not any(isinstance(s, WhileStmt) for s in stmts)
+
+    def test_formats_back_to_source(self) -> None:
+        _, program, stats = optimized("const N = 2\nflow main { if N > 10 { log(1) } wait(1s + N) }")
+        assert "wait(1002);" in Formatter().format(program)
+        assert str(stats) == "3 folded, 2 inlined, 1 removed"
+
+
+PROGRAMS = [
+    "const N = 3\nflow main { let t = 0; for i in range(N * 2) { if N > 1 { t = t + i * 100ms } } return t }",
+    'const P = "x"\nflow main { let s = P + 1 + true; if false { s = 0 } elif s { s = s + "!" } return s }',
+    "const A = 1\nflow f { A = A + 1 }\nflow main { f(); f(); return [A, 0 or A, not A] }",
+]
+
+
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_same_result_as_unoptimized(source: str) -> None:
+    from core.engine.interpreter import interpret
+
+    assert interpret(source, optimize=True) == interpret(source, optimize=False)
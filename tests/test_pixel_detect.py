@@ -0,0 +1,103 @@
+"""
+Test vectorised pixel color search.
+"""
+
+import numpy as np
+import pytest
+
+from core.game import pixel_detect
+from core.game.pixel_detect import Color, PixelChecker
+from core.models import ROI
+
+
+class ArrayFrames:
+    """Frame source serving a fixed BGR array."""
+
+    def __init__(self, image: np.ndarray) -> None:
+        self._image = image
+
+    def get(self, roi: ROI | None = None) -> np.ndarray:
+        if roi is None:
+            return self._image
+        return self._image[roi.y : roi.y + roi.h, roi.x : roi.x + roi.w]
+
+
+def scan_reference(
+    image: np.ndarray, target: Color, step: int = 1, offset: tuple[int, int] = (0, 0)
+) -> list[tuple[int, int]]:
+    """Per-pixel loop the vectorised search must agree with."""
+    hits = []
+    for y in range(0, image.shape[0], step):
+        for x in range(0, image.shape[1], step):
+            b, g, r = image[y, x, :3]
+            if target.matches(Color(int(r), int(g), int(b))):
+                hits.append((x + offset[0], y + offset[1]))
+    return hits
+
+
+@pytest.fixture
+def screen() -> np.ndarray:
+    rng = np.random.default_rng(3)
+    image = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    image[10:12, 30:40] = (0, 0, 250)  # Red health bar (BGR)
+    image[40, 5] = (0, 200, 0)
+    image[50, 70] = (5, 195, 3)
+    return image
+
+
+class TestFindPixel:
+    """Test first-hit and all-hits search."""
+
+    @pytest.mark.parametrize("step", [1, 2, 3])
+    def test_find_all_matches_reference(self, screen: np.ndarray, step: int) -> None:
+        checker = PixelChecker(frames=ArrayFrames(screen))
+        target = Color(250, 0, 0, tolerance=40)
+
+        results = checker.find_all_pixels(target, max_results=10_000, step=step)
+        assert [(p.x, p.y) for p in results] == scan_reference(screen, target, step)
+
+    def test_find_pixel_is_first_in_scan_order(self, screen: np.ndarray) -> None:
+        checker = PixelChecker(frames=ArrayFrames(screen))
+        target = Color(250, 0, 0, tolerance=5)
+
+        result = checker.find_pixel(target)
+        assert result is not None
+        assert (result.x, result.y) == scan_reference(screen, target)[0]
+        assert result.color.to_tuple() == (250, 0, 0)
+
+    def test_region_offset_and_cap(self, screen: np.ndarray) -> None:
+        checker = PixelChecker(frames=ArrayFrames(screen))
+        region = (32, 5, 20, 20)
+
+        results = checker.find_all_pixels("#fa0000", region=region, max_results=3)
+        assert [(p.x, p.y) for p in results] == [(32, 10), (33, 10), (34, 10)]
+
+    def test_not_found(self, screen: np.ndarray) -> None:
+        checker = PixelChecker(frames=ArrayFrames(np.zeros((10, 10, 3), dtype=np.uint8)))
+        assert checker.find_pixel(Color(255, 255, 255, tolerance=0)) is None
+        assert checker.find_all_pixels(Color(255, 255, 255)) == []
+
+    def test_multi_color_single_capture(self, screen: np.ndarray) -> None:
+        checker = PixelChecker(frames=ArrayFrames(screen))
+        red = Color(250, 0, 0, tolerance=0)
+        green = Color(0, 200, 0, tolerance=6)
+
+        red_hits, green_hits = checker.find_pixels_multi([red, green], max_results=100)
+        assert len(red_hits) == 20
+        assert [(p.x, p.y) for p in green_hits] == scan_reference(screen, green)
+
+
+class TestDefaultChecker:
+    """Test that the module-level checker reads the runtime frame bus."""
+
+    def test_execution_context_binds_its_frame_bus(self, screen, monkeypatch) -> None:  # type: ignore
+        from core.engine.context import ExecutionContext
+        from core.models import Script
+        from core.templates import TemplateStore
+
+        monkeypatch.setattr(pixel_detect, "_checker", None)
+        frames = ArrayFrames(screen)
+        ExecutionContext(script=Script(), templates=TemplateStore(), frames=frames)  # type: ignore
+
+        assert pixel_detect.get_checker()._frames is frames
+        assert pixel_detect.check_pixel(5, 40, Color(0, 200, 0, tolerance=0))
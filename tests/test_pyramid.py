@@ -0,0 +1,118 @@
+"""
+Test coarse-to-fine pyramid template search.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import ROI, AssetImage
+from core.templates import TemplateStore
+from core.vision.pyramid import build_pyramid, exhaustive_search, pyramid_search
+from vision.frame_bus import FrameBus
+from vision.matcher import Matcher
+
+
+class StaticCapture:
+    """Capture returning a fixed screen."""
+
+    def __init__(self, image: np.ndarray) -> None:
+        self._image = image
+
+    def capture_full(self, monitor: int = 1) -> np.ndarray:
+        return self._image
+
+    def capture_roi(self, roi: ROI, grayscale: bool = False) -> np.ndarray:
+        return self._image[roi.y : roi.y + roi.h, roi.x : roi.x + roi.w]
+
+
+def make_screen() -> np.ndarray:
+    """Noisy screen with a textured button at (613, 377)."""
+    rng = np.random.default_rng(7)
+    screen = cv2.GaussianBlur(rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8), (9, 9), 0)
+    cv2.rectangle(screen, (613, 377), (713, 427), (30, 30, 220), -1)
+    cv2.putText(screen, "PLAY", (625, 412), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    return screen
+
+
+class TestPyramidSearch:
+    """Test the standalone pyramid search functions."""
+
+    @pytest.mark.parametrize("levels", [1, 2])
+    def test_matches_exhaustive(self, levels: int) -> None:
+        """Pyramid search finds the same location and score as exhaustive."""
+        screen = cv2.cvtColor(make_screen(), cv2.COLOR_BGR2GRAY)
+        template = screen[377:428, 613:714]
+
+        e_score, e_loc = exhaustive_search(screen, template, cv2.TM_CCOEFF_NORMED)
+        p_score, p_loc = pyramid_search(screen, template, cv2.TM_CCOEFF_NORMED, levels)
+
+        assert p_loc == e_loc == (613, 377)
+        assert p_score == pytest.approx(e_score, abs=1e-4)
+
+    def test_small_template_falls_back(self) -> None:
+        """Templates too small for the coarse level use exhaustive search."""
+        screen = cv2.cvtColor(make_screen(), cv2.COLOR_BGR2GRAY)
+        template = screen[100:108, 200:208]
+
+        assert len(build_pyramid(template, 2)) == 2
+        _, loc = pyramid_search(screen, template, cv2.TM_SQDIFF_NORMED, levels=2)
+        assert loc == (200, 100)
+
+
+class TestMatcherPyramid:
+    """Test pyramid mode in the vision Matcher."""
+
+    @pytest.fixture
+    def setup_matcher(self, tmp_path: Path):  # type: ignore
+        screen = make_screen()
+        cv2.imwrite(str(tmp_path / "play.png"), screen[377:428, 613:714])
+
+        store = TemplateStore(tmp_path)
+        errors = store.preload(
+            [
+                AssetImage(id="play", path="play.png"),
+                AssetImage(id="play_fast", path="play.png", pyramid_levels=2),
+                AssetImage(id="play_color", path="play.png", grayscale=False, pyramid_levels=1),
+            ]
+        )
+        assert len(errors) == 0
+        return Matcher(store, frames=FrameBus(StaticCapture(screen)))
+
+    def test_store_keeps_pyramid(self, setup_matcher) -> None:  # type: ignore
+        """Downscaled templates are stored only for pyramid assets."""
+        store = setup_matcher._templates
+        assert store.get_pyramid("play") == []
+        assert [p.shape for p in store.get_pyramid("play_fast")] == [(26, 51), (13, 26)]
+
+    @pytest.mark.parametrize("asset_id", ["play_fast", "play_color"])
+    def test_find_same_as_exhaustive(self, setup_matcher, asset_id: str) -> None:  # type: ignore
+        """Pyramid find returns the exhaustive match."""
+        matcher = setup_matcher
+        exact = matcher.find("play")
+        fast = matcher.find(asset_id)
+
+        assert fast is not None
+        assert (fast.x, fast.y) == (exact.x, exact.y) == (613, 377)
+
+    def test_find_with_roi(self, setup_matcher) -> None:  # type: ignore
+        """Coarse ROI views line up with the full-resolution ROI."""
+        matcher = setup_matcher
+        match = matcher.find("play_fast", roi_override=ROI(x=501, y=301, w=400, h=250))
+        assert match is not None
+        assert (match.x, match.y) == (613, 377)
+
+    def test_find_many_uses_pyramid(self, setup_matcher) -> None:  # type: ignore
+        """Batched finds give the same result for pyramid assets."""
+        results = setup_matcher.find_many(["play", "play_fast", "play_color"])
+        assert {(r.match.x, r.match.y) for r in results.values()} == {(613, 377)}
+
+    def test_drift_report(self, setup_matcher) -> None:  # type: ignore
+        """Drift against an exhaustive search is reported."""
+        drift = setup_matcher.pyramid_drift("play_fast")
+        assert drift is not None
+        assert drift.same_location
+        assert drift.drift == pytest.approx(0.0, abs=1e-4)
+        assert setup_matcher.pyramid_drift("missing") is None
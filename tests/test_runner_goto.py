@@ -242,6 +242,47 @@ class TestRunner:
         assert success
         assert ctx.keyboard.hotkeys == [["CTRL", "S"]]
 
+    def test_compiled_conditionals_are_measured(self, setup_runner, tmp_path) -> None:  # type: ignore
+        """If* steps get a metrics span and a frame-bus tick like other actions."""
+        from core.analytics.metrics import ActionMetrics, MetricsRegistry
+        from core.engine.runner import Runner
+
+        _, ctx = setup_runner
+        ctx.script = Script(
+            name="Test",
+            assets=[AssetImage(id="btn", path="btn.png")],
+            flows=[
+                Flow(
+                    name="main",
+                    actions=[
+                        IfImage(asset_id="btn", then_actions=[]),
+                        Hotkey(keys=["CTRL", "S"]),
+                    ],
+                )
+            ],
+        )
+        ctx.matcher.find_results["btn"] = True
+        ticks = []
+        new_tick = ctx.frames.new_tick
+        ctx.frames.new_tick = lambda: ticks.append(1) or new_tick()
+        metrics = ActionMetrics(MetricsRegistry())
+        stats_path = tmp_path / "action_stats.json"
+        runner = Runner(ctx, metrics=metrics, stats_path=stats_path)
+
+        assert runner.run_flow("main")
+        rows = [(r["action"], r["asset"], r["count"]) for r in metrics.summary() if not r["phase"]]
+        assert rows == [("Hotkey", "", 1), ("IfImage", "btn", 1)]
+        assert len(ticks) == 2
+
+        saved = MetricsRegistry()
+        saved.load_histograms(stats_path)
+        assert len(saved.get_all()) == len(metrics.registry.get_all())
+
+    def test_stats_are_not_saved_by_default(self, setup_runner) -> None:  # type: ignore
+        """Only the app and CLI entry points persist action stats."""
+        runner, _ = setup_runner
+        assert runner._stats_path is None
+
     def test_type_text(self, setup_runner) -> None:  # type: ignore
         """Test TypeText action."""
         runner, ctx = setup_runner
@@ -0,0 +1,146 @@
+"""
+Test the on-disk template plane cache.
+"""
+
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import AssetImage
+from core.templates import LazyTemplateStore, TemplateStore
+from core.vision.template_cache import TemplateDiskCache
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    rng = np.random.default_rng(11)
+    for name in ("btn.png", "icon.png"):
+        cv2.imwrite(str(tmp_path / name), rng.integers(0, 255, (40, 60, 3), dtype=np.uint8))
+    return tmp_path
+
+
+ASSETS = [
+    AssetImage(id="btn", path="btn.png", pyramid_levels=1),
+    AssetImage(id="icon", path="icon.png", grayscale=False),
+]
+
+
+def preload(project: Path) -> tuple[TemplateStore, TemplateDiskCache]:
+    cache = TemplateDiskCache.for_project(project)
+    store = TemplateStore(project, disk_cache=cache)
+    assert store.preload(ASSETS) == []
+    return store, cache
+
+
+class TestTemplateDiskCache:
+    """Test persistence, zero-copy loads and invalidation."""
+
+    def test_second_start_served_from_cache(self, project: Path) -> None:
+        cold, cold_cache = preload(project)
+        assert cold_cache.misses == 2
+        assert cold_cache.path.exists()
+
+        warm, warm_cache = preload(project)
+        assert warm_cache.hits == 2 and warm_cache.misses == 0
+
+        for asset_id in ("btn", "icon"):
+            for plane in ("gray", "color"):
+                expected = cold.get(asset_id)[plane]
+                actual = warm.get(asset_id)[plane]
+                if expected is None:
+                    assert actual is None
+                else:
+                    assert np.array_equal(actual, expected)
+        assert np.array_equal(warm.get_pyramid("btn")[0], cold.get_pyramid("btn")[0])
+        assert np.allclose(warm.get("icon")["norms"], cold.get("icon")["norms"])
+
+    def test_planes_are_readonly_memmap_views(self, project: Path) -> None:
+        preload(project)
+        warm, _ = preload(project)
+
+        gray = warm.get("btn")["gray"]
+        assert not gray.flags.writeable
+        assert isinstance(gray.base, np.memmap) or isinstance(gray.base.base, np.memmap)
+
+    def test_touched_but_unchanged_file_is_reused(self, project: Path) -> None:
+        preload(project)
+        stat = (project / "btn.png").stat()
+        os.utime(project / "btn.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        _, cache = preload(project)
+        assert cache.hits == 2 and cache.invalidated == 0
+
+    def test_changed_file_is_invalidated(self, project: Path) -> None:
+        preload(project)
+        changed = np.full((40, 60, 3), 7, dtype=np.uint8)
+        cv2.imwrite(str(project / "btn.png"), changed)
+
+        store, cache = preload(project)
+        assert cache.invalidated == 1
+        assert int(store.get("btn")["gray"][0, 0]) == 7
+
+        _, cache = preload(project)
+        assert cache.hits == 2
+
+    def test_corrupt_file_is_ignored(self, project: Path) -> None:
+        path = TemplateDiskCache.for_project(project).path
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"garbage")
+
+        _, cache = preload(project)
+        assert cache.misses == 2
+        assert TemplateDiskCache(path).get_stats()["entries"] == 2
+
+    def test_lazy_store_uses_cache(self, project: Path) -> None:
+        preload(project)
+        cache = TemplateDiskCache.for_project(project)
+        store = LazyTemplateStore(project, disk_cache=cache)
+        store.register_assets(ASSETS)
+
+        data = store.get("btn")
+        assert data is not None
+        assert cache.hits == 1
+        assert len(data.pyramid) == 1
+
+    def test_repeated_saves_never_replace_a_mapped_file(
+        self, project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store, cache = preload(project)
+        held = store.get("btn")["gray"]  # Keeps the first data file mapped
+        first_file = cache._data_path
+
+        # Windows refuses to replace or rewrite a mapped file
+        real_replace = os.replace
+
+        def replace(src: object, dst: object) -> None:
+            if Path(str(dst)) == cache._data_path:
+                raise PermissionError("file is mapped")
+            real_replace(src, dst)
+
+        monkeypatch.setattr("core.vision.template_cache.os.replace", replace)
+
+        cv2.imwrite(str(project / "new.png"), np.full((20, 30, 3), 9, dtype=np.uint8))
+        new_asset = AssetImage(id="new", path="new.png")
+        assert store.preload([*ASSETS, new_asset]) == []
+        assert cache._data_path != first_file
+        assert int(held[0, 0]) == int(store.get("btn")["gray"][0, 0])
+
+        warm, warm_cache = preload(project)
+        assert warm.get("new") is None  # Not in ASSETS; check the cache directly
+        key = f"{(project / 'new.png').resolve()}|gray=True|pyramid=0"
+        planes = warm_cache.get(key, project / "new.png")
+        assert planes is not None and int(planes["gray"][0, 0]) == 9
+        assert warm_cache.get_stats()["entries"] == 3
+
+    def test_truncated_data_file_entries_are_misses(self, project: Path) -> None:
+        _, cache = preload(project)
+        data_file = cache._data_path
+        del cache
+        data_file.write_bytes(data_file.read_bytes()[:-200])
+
+        _, cache = preload(project)
+        assert cache.misses >= 1
+        assert cache.hits + cache.misses == 2
@@ -0,0 +1,78 @@
+"""
+Test the precision timer (drift-free, stop/pause-aware sleeps).
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.models import Script
+from core.templates import TemplateStore
+
+
+@pytest.fixture
+def timing():  # type: ignore
+    """The timing module (core.engine imports platform input backends)."""
+    from core.engine import timing
+
+    return timing
+
+
+@pytest.fixture
+def ctx():  # type: ignore
+    from core.engine.context import ExecutionContext
+
+    return ExecutionContext(script=Script(name="Test"), templates=TemplateStore())
+
+
+def later(seconds: float, func) -> threading.Timer:  # type: ignore
+    timer = threading.Timer(seconds, func)
+    timer.start()
+    return timer
+
+
+class TestPrecisionTimer:
+    """Test deadlines, stop and pause."""
+
+    def test_sleep_reaches_deadline(self, timing, ctx) -> None:  # type: ignore
+        timer = timing.PrecisionTimer(ctx)
+        for seconds in (0.0005, 0.005, 0.02):
+            start = time.perf_counter()
+            assert timer.sleep(seconds)
+            assert time.perf_counter() - start >= seconds
+
+    def test_stop_wakes_immediately(self, timing, ctx) -> None:  # type: ignore
+        later(0.05, ctx.request_stop)
+        start = time.perf_counter()
+        assert not timing.PrecisionTimer(ctx).sleep(5.0)
+        assert time.perf_counter() - start < 1.0
+
+    def test_pause_shifts_deadline(self, timing, ctx) -> None:  # type: ignore
+        later(0.02, ctx.request_pause)
+        later(0.12, ctx.request_resume)
+        start = time.perf_counter()
+        assert timing.PrecisionTimer(ctx).sleep(0.05)
+        # 50ms of sleep plus the ~100ms spent paused
+        assert time.perf_counter() - start >= 0.14
+
+    def test_stop_while_paused(self, timing, ctx) -> None:  # type: ignore
+        ctx.request_pause()
+        later(0.05, ctx.request_stop)
+        assert not timing.PrecisionTimer(ctx).sleep(5.0)
+
+
+class TestTicks:
+    """Test the fixed-rate schedule."""
+
+    def test_deadlines_do_not_drift(self, timing) -> None:  # type: ignore
+        schedule = timing.ticks(0.01)
+        first = next(schedule)
+        time.sleep(0.003)  # Work shorter than an interval
+        assert next(schedule) == pytest.approx(first + 0.01)
+
+    def test_restarts_when_behind(self, timing) -> None:  # type: ignore
+        schedule = timing.ticks(0.01)
+        first = next(schedule)
+        time.sleep(0.05)
+        assert next(schedule) > first + 0.04
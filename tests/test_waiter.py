@@ -0,0 +1,89 @@
+"""
+Test change-gated image waiting.
+"""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from core.models import ROI, AssetImage
+from core.templates import TemplateStore
+from vision.frame_bus import FrameBus
+from vision.matcher import Matcher
+from vision.waiter import ImageWaiter, WaitResult
+
+
+class SwitchingCapture:
+    """Capture that shows `before` until `switch_after` grabs, then `after`."""
+
+    def __init__(self, before: np.ndarray, after: np.ndarray, switch_after: int) -> None:
+        self._before = before
+        self._after = after
+        self._switch_after = switch_after
+        self.grabs = 0
+
+    def capture_full(self, monitor: int = 1) -> np.ndarray:
+        self.grabs += 1
+        return self._after if self.grabs > self._switch_after else self._before
+
+    def capture_roi(self, roi: ROI, grayscale: bool = False) -> np.ndarray:
+        raise AssertionError("ROI is inside the frame")
+
+
+@pytest.fixture
+def screens(tmp_path: Path) -> tuple[np.ndarray, np.ndarray, TemplateStore]:
+    empty = np.full((300, 400, 3), 40, dtype=np.uint8)
+    with_button = empty.copy()
+    cv2.rectangle(with_button, (150, 120), (230, 160), (0, 0, 255), -1)
+    cv2.putText(with_button, "GO", (168, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    cv2.imwrite(str(tmp_path / "go.png"), with_button[120:161, 150:231])
+
+    store = TemplateStore(tmp_path)
+    assert store.preload([AssetImage(id="go", path="go.png")]) == []
+    return empty, with_button, store
+
+
+def make_waiter(store: TemplateStore, capture: SwitchingCapture) -> ImageWaiter:
+    matcher = Matcher(store, frames=FrameBus(capture, max_age_ms=0))
+    return ImageWaiter(matcher)
+
+
+class TestChangeGatedWait:
+    """Test that matching only runs when the region changed."""
+
+    def test_unchanged_screen_skips_matching(self, screens) -> None:  # type: ignore
+        empty, _, store = screens
+        waiter = make_waiter(store, SwitchingCapture(empty, empty, switch_after=10**6))
+
+        outcome = waiter.wait_appear("go", timeout_ms=200, poll_ms=10)
+        assert outcome.result == WaitResult.TIMEOUT
+        assert outcome.matches_run == 1
+        assert outcome.matches_avoided > 0
+
+    def test_change_triggers_match(self, screens) -> None:  # type: ignore
+        empty, with_button, store = screens
+        waiter = make_waiter(store, SwitchingCapture(empty, with_button, switch_after=5))
+
+        outcome = waiter.wait_appear("go", timeout_ms=2000, poll_ms=10)
+        assert outcome.found
+        assert (outcome.match.x, outcome.match.y) == (150, 120)
+        assert outcome.matches_run == 2
+        assert outcome.matches_avoided >= 1
+
+    def test_vanish(self, screens) -> None:  # type: ignore
+        empty, with_button, store = screens
+        waiter = make_waiter(store, SwitchingCapture(with_button, empty, switch_after=5))
+
+        outcome = waiter.wait_vanish("go", timeout_ms=2000, poll_ms=10)
+        assert outcome.found
+        assert outcome.matches_run == 2
+
+    def test_ungated_matches_every_tick(self, screens) -> None:  # type: ignore
+        empty, _, store = screens
+        waiter = make_waiter(store, SwitchingCapture(empty, empty, switch_after=10**6))
+
+        outcome = waiter.wait_appear("go", timeout_ms=100, poll_ms=10, change_gated=False)
+        assert outcome.matches_avoided == 0
+        assert outcome.matches_run > 1
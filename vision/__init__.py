@@ -1,13 +1,18 @@
 """RetroAuto v2 - Vision package."""
 
 from vision.capture import ScreenCapture, get_capture
-from vision.matcher import Matcher
+from vision.frame_bus import Frame, FrameBus, FrameBusStats
+from vision.matcher import BatchMatch, Matcher
 from vision.waiter import ImageWaiter, WaitOutcome, WaitResult
 
 __all__ = [
     "ScreenCapture",
     "get_capture",
+    "Frame",
+    "FrameBus",
+    "FrameBusStats",
     "Matcher",
+    "BatchMatch",
     "ImageWaiter",
     "WaitResult",
     "WaitOutcome",
@@ -66,6 +66,29 @@ class ScreenCapture:
             return self._to_grayscale(img)
         return img[:, :, :3]  # Remove alpha channel
 
+    def capture_full_into(
+        self, out: np.ndarray | None = None, monitor: int = 1
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """
+        Capture full screen as BGR into a reusable buffer.
+
+        Args:
+            out: Buffer to write into (reallocated if None or wrong shape)
+            monitor: Monitor index (0=all, 1=primary, 2+=secondary)
+
+        Returns:
+            (BGR frame, (left, top) screen origin of the monitor)
+        """
+        sct = self._get_sct()
+        mon = sct.monitors[monitor]
+        shot = sct.grab(mon)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+        if out is None or out.shape != (shot.height, shot.width, 3):
+            out = np.empty((shot.height, shot.width, 3), dtype=np.uint8)
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+        return out, (mon["left"], mon["top"])
+
     def capture_roi(self, roi: ROI, grayscale: bool = False) -> np.ndarray:
         """
         Capture specific region (faster than full + crop).
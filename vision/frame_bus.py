@@ -0,0 +1,292 @@
+"""
+RetroAuto v2 - Frame Bus
+
+One screen grab per tick, shared by every vision consumer.
+
+The matcher, pixel checks, OCR and the Flight Recorder all read from the
+same captured frame instead of grabbing the screen themselves. ROI reads
+are zero-copy numpy views into the frame; the grayscale plane is converted
+lazily, at most once per frame.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Condition, Lock
+from typing import Any
+
+import cv2
+import numpy as np
+
+from core.analytics.metrics import phase
+from core.models import ROI
+from infra import get_logger
+
+logger = get_logger("FrameBus")
+
+
+@dataclass
+class FrameBusStats:
+    """Capture counters for the frame bus."""
+
+    grabs: int = 0  # Full-frame grabs
+    fallback_grabs: int = 0  # Direct ROI grabs for regions outside the frame
+    reads: int = 0  # Reads served by the bus
+    grabs_avoided: int = 0  # Reads served from an already captured frame
+    ticks: int = 0
+    tick_grabs_avoided: int = 0  # Grabs avoided in the current tick
+    last_tick_grabs_avoided: int = 0  # Grabs avoided in the previous tick
+
+    def to_dict(self) -> dict[str, int]:
+        """Convert to dictionary."""
+        return {
+            "grabs": self.grabs,
+            "fallback_grabs": self.fallback_grabs,
+            "reads": self.reads,
+            "grabs_avoided": self.grabs_avoided,
+            "ticks": self.ticks,
+            "tick_grabs_avoided": self.tick_grabs_avoided,
+            "last_tick_grabs_avoided": self.last_tick_grabs_avoided,
+        }
+
+
+class Frame:
+    """
+    A single captured screen frame.
+
+    Views returned by `view()` share memory with the frame buffer. They stay
+    valid until the bus reuses the buffer, so callers that keep pixels
+    across ticks must `.copy()` them.
+    """
+
+    __slots__ = ("seq", "timestamp", "bgr", "left", "top", "_gray", "_levels", "_lock")
+
+    def __init__(self, seq: int, bgr: np.ndarray, origin: tuple[int, int]) -> None:
+        self.seq = seq
+        self.timestamp = time.perf_counter()
+        self.bgr = bgr
+        self.left, self.top = origin
+        self._gray: np.ndarray | None = None
+        self._levels: dict[tuple[int, bool], np.ndarray] = {}
+        self._lock = Lock()
+
+    @property
+    def width(self) -> int:
+        return int(self.bgr.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.bgr.shape[0])
+
+    @property
+    def age_ms(self) -> float:
+        """Milliseconds since the frame was captured."""
+        return (time.perf_counter() - self.timestamp) * 1000
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale plane, converted on first access."""
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def pyramid(self, level: int, grayscale: bool = False) -> np.ndarray:
+        """Plane downscaled by 2**level, built on first access."""
+        if level <= 0:
+            return self.gray if grayscale else self.bgr
+
+        key = (level, grayscale)
+        plane = self._levels.get(key)
+        if plane is None:
+            finer = self.pyramid(level - 1, grayscale)
+            with self._lock:
+                plane = self._levels.get(key)
+                if plane is None:
+                    plane = cv2.pyrDown(finer)
+                    self._levels[key] = plane
+        return plane
+
+    def contains_origin(self, roi: ROI) -> bool:
+        """Check if the ROI's top-left corner lies inside this frame."""
+        return (
+            self.left <= roi.x < self.left + self.width
+            and self.top <= roi.y < self.top + self.height
+        )
+
+    def view(
+        self, roi: ROI | None = None, grayscale: bool = False, level: int = 0
+    ) -> np.ndarray:
+        """
+        Get a zero-copy view of the frame.
+
+        ROIs are in absolute screen coordinates and are clipped at the
+        right/bottom edges of the frame. With `level` > 0 the view comes from
+        the plane downscaled by 2**level (coordinates scaled accordingly).
+        """
+        plane = self.pyramid(level, grayscale)
+        if roi is None:
+            return plane
+
+        x = (roi.x - self.left) >> level
+        y = (roi.y - self.top) >> level
+        x1 = (roi.x - self.left + roi.w) >> level
+        y1 = (roi.y - self.top + roi.h) >> level
+        return plane[y:y1, x:x1]
+
+
+class FrameBus:
+    """
+    Shared screen frame source.
+
+    Features:
+    - One full-frame grab per tick into reusable buffers
+    - Zero-copy ROI views
+    - Lazy grayscale plane (once per frame)
+    - Frame sequence number for change tracking
+    - Grab-avoidance counters
+    - `wait_frame` for background consumers that follow the flow's captures
+
+    A frame is reused until the tick ends (`new_tick`/`invalidate`) or it is
+    older than `max_age_ms`, so polling loops still see fresh pixels.
+
+    Usage:
+        bus = FrameBus(capture)
+        bus.new_tick()
+        btn = bus.get(roi, grayscale=True)
+        hp_bar = bus.get(other_roi)  # Same capture, no new grab
+    """
+
+    def __init__(
+        self,
+        capture: Any,
+        max_age_ms: float = 50,
+        monitor: int = 1,
+        ring_size: int = 2,
+    ) -> None:
+        """
+        Initialize frame bus.
+
+        Args:
+            capture: ScreenCapture (or compatible) used for grabs
+            max_age_ms: Maximum age before a frame is considered stale
+            monitor: Monitor index to capture
+            ring_size: Number of reusable buffers, so views of the previous
+                frame stay valid while the next one is captured
+        """
+        self._capture = capture
+        self._max_age_ms = max_age_ms
+        self._monitor = monitor
+        self._buffers: list[np.ndarray | None] = [None] * max(1, ring_size)
+        self._next_buffer = 0
+        self._frame: Frame | None = None
+        self._seq = 0
+        self._stale = True
+        self._lock = Lock()
+        self._new_frame = Condition(self._lock)
+        self._stats = FrameBusStats()
+
+    @property
+    def capture(self) -> Any:
+        """Underlying screen capture."""
+        return self._capture
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest captured frame (0 = none yet)."""
+        return self._seq
+
+    @property
+    def latest(self) -> Frame | None:
+        """Most recently captured frame, without grabbing (None before the first grab)."""
+        return self._frame
+
+    @property
+    def stats(self) -> FrameBusStats:
+        """Capture counters."""
+        return self._stats
+
+    def new_tick(self) -> int:
+        """
+        Start a new tick: the next read grabs a fresh frame.
+
+        Returns:
+            Number of grabs avoided during the tick that just ended
+        """
+        with self._lock:
+            avoided = self._stats.tick_grabs_avoided
+            self._stats.last_tick_grabs_avoided = avoided
+            self._stats.tick_grabs_avoided = 0
+            self._stats.ticks += 1
+            self._stale = True
+        return avoided
+
+    def invalidate(self) -> None:
+        """Force the next read to grab a fresh frame (e.g. after input)."""
+        self._stale = True
+
+    def frame(self) -> Frame:
+        """Get the current frame, grabbing a new one if stale."""
+        with self._lock:
+            self._stats.reads += 1
+            frame = self._frame
+            if frame is not None and not self._stale and frame.age_ms < self._max_age_ms:
+                self._stats.grabs_avoided += 1
+                self._stats.tick_grabs_avoided += 1
+                return frame
+            with phase("capture"):
+                return self._grab()
+
+    def wait_frame(self, after_seq: int, timeout: float) -> Frame | None:
+        """
+        Wait for a frame newer than `after_seq` without grabbing one.
+
+        Lets background consumers (e.g. the interrupt scanner) reuse the
+        captures the flow makes anyway.
+
+        Returns:
+            Latest frame, or None if nothing newer was captured within timeout
+        """
+        with self._new_frame:
+            self._new_frame.wait_for(lambda: self._seq > after_seq, timeout)
+            return self._frame if self._seq > after_seq else None
+
+    def get(
+        self, roi: ROI | None = None, grayscale: bool = False, level: int = 0
+    ) -> np.ndarray:
+        """
+        Get screen pixels for an ROI (or the full frame).
+
+        Regions whose origin lies outside the captured monitor are grabbed
+        directly from the capture instead. `level` > 0 returns the region
+        from the 2**level downscaled plane.
+        """
+        frame = self.frame()
+        if roi is None or frame.contains_origin(roi):
+            return frame.view(roi, grayscale, level)
+
+        self._stats.fallback_grabs += 1
+        with phase("capture"):
+            region = self._capture.capture_roi(roi, grayscale=grayscale)
+        for _ in range(level):
+            region = cv2.pyrDown(region)
+        return region
+
+    def _grab(self) -> Frame:
+        """Grab a new frame into the next ring buffer (lock held)."""
+        capture_into = getattr(self._capture, "capture_full_into", None)
+        if capture_into is not None:
+            bgr, origin = capture_into(self._buffers[self._next_buffer], self._monitor)
+            self._buffers[self._next_buffer] = bgr
+            self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+        else:
+            bgr, origin = self._capture.capture_full(self._monitor), (0, 0)
+
+        self._seq += 1
+        self._stale = False
+        self._stats.grabs += 1
+        self._frame = Frame(self._seq, bgr, origin)
+        self._new_frame.notify_all()
+        return self._frame
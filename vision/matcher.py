@@ -4,15 +4,23 @@ RetroAuto v2 - Template Matcher
 OpenCV template matching with ROI optimization.
 """
 
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import cv2
 import numpy as np
 
+from core.analytics.metrics import in_phase
 from core.models import ROI, AssetImage, Match, MatchMethod
 from core.templates import TemplateStore
+from core.vision.nms import detect
+from core.vision.pyramid import PyramidDrift, exhaustive_search, measure_drift, pyramid_search
 from infra import get_logger
 from vision.capture import ScreenCapture, get_capture
+from vision.frame_bus import Frame, FrameBus
 
 logger = get_logger("Matcher")
 
@@ -24,6 +32,25 @@ CV_METHODS = {
 }
 
 
+@dataclass
+class BatchMatch:
+    """Per-asset result of a batched find_many() call."""
+
+    asset_id: str
+    match: Match | None = None
+    elapsed_ms: float = 0.0
+    skipped: str | None = None  # Reason the template was not matched at all
+
+    @property
+    def found(self) -> bool:
+        """Check if the asset was found."""
+        return self.match is not None
+
+
+# (asset_id, asset, template) entries sharing one ROI + colour mode
+_PlanGroup = tuple[ROI | None, bool, list[tuple[str, AssetImage, np.ndarray]]]
+
+
 class Matcher:
     """
     Template matcher using OpenCV.
@@ -33,54 +60,42 @@ class Matcher:
     - Grayscale optimization
     - Multiple match methods
     - Confidence thresholding
+    - Opt-in coarse-to-fine pyramid search (AssetImage.pyramid_levels)
     """
 
     def __init__(
         self,
         templates: TemplateStore,
         capture: ScreenCapture | None = None,
+        frames: FrameBus | None = None,
+        pool_workers: int = 4,
     ) -> None:
         self._templates = templates
         self._capture = capture or get_capture()
-        # O1: Screen cache for rapid multi-asset matching (50ms TTL)
-        self._screen_cache: dict[str, tuple[float, np.ndarray]] = {}
-        self._cache_ttl_ms = 50  # Cache valid for 50ms
+        # O1: Shared frame bus - one capture serves every asset in a tick
+        self._frames = frames or FrameBus(self._capture)
+        # Worker pool for find_many: fixed size, created on first parallel
+        # batch and shared by every caller thread (runner, interrupt scanner)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_workers = max(1, pool_workers)
+        self._pool_lock = threading.Lock()
+
+    @property
+    def frames(self) -> FrameBus:
+        """Frame bus this matcher reads from."""
+        return self._frames
 
     def _get_cached_screen(
         self, roi: ROI | None, grayscale: bool
     ) -> np.ndarray:
-        """Get screen with caching (50ms TTL) for rapid multi-asset checks."""
-        # Create cache key based on ROI and grayscale
-        if roi:
-            cache_key = f"{roi.x},{roi.y},{roi.w},{roi.h},{grayscale}"
-        else:
-            cache_key = f"full,{grayscale}"
-
-        now = time.time() * 1000  # Current time in ms
-
-        # Check if cached version is still valid
-        if cache_key in self._screen_cache:
-            cached_time, cached_screen = self._screen_cache[cache_key]
-            if (now - cached_time) < self._cache_ttl_ms:
-                return cached_screen
-
-        # Capture new screen
-        if roi:
-            screen = self._capture.capture_roi(roi, grayscale=grayscale)
-        else:
-            screen = self._capture.capture_full(grayscale=grayscale)
-
-        # Cache it (limit cache size to prevent memory leak)
-        if len(self._screen_cache) > 10:
-            self._screen_cache.clear()
-        self._screen_cache[cache_key] = (now, screen)
-
-        return screen
+        """Get screen pixels from the shared frame bus (50ms max frame age)."""
+        return self._frames.get(roi, grayscale)
 
     def clear_cache(self) -> None:
-        """Clear screen cache (call after each action for fresh captures)."""
-        self._screen_cache.clear()
+        """Drop the current frame (call after each action for fresh captures)."""
+        self._frames.invalidate()
 
+    @in_phase("match")
     def find(
         self,
         asset_id: str,
@@ -98,14 +113,37 @@ class Matcher:
         Returns:
             Match if found with confidence >= threshold (or adaptive floor), else None
         """
-        # Get template
+        resolved = self._resolve_template(asset_id)
+        if resolved is None:
+            return None
+        asset, tmpl_img = resolved
+
+        # Determine ROI
+        roi = roi_override or asset.roi
+
+        # O1: Screen comes from the shared frame bus (one capture per tick)
+        screen = self._get_cached_screen(roi, asset.grayscale)
+        coarse_screen = self._get_coarse_screen(asset, tmpl_img, roi)
+        return self._match_screen(
+            asset_id, asset, tmpl_img, screen, roi, adaptive, coarse_screen
+        )
+
+    def _get_coarse_screen(
+        self, asset: AssetImage, tmpl_img: np.ndarray, roi: ROI | None
+    ) -> np.ndarray | None:
+        """Downscaled search region for pyramid assets (None = exhaustive search)."""
+        if asset.pyramid_levels <= 0:
+            return None
+        return self._frames.get(roi, tmpl_img.ndim == 2, level=asset.pyramid_levels)
+
+    def _resolve_template(self, asset_id: str) -> tuple[AssetImage, np.ndarray] | None:
+        """Look up asset metadata and the template plane to match with."""
         tmpl_data = self._templates.get(asset_id)
         if tmpl_data is None:
             logger.warning("Asset not found in store: %s", asset_id)
             return None
 
         asset: AssetImage = tmpl_data["asset"]
-        tmpl_h, tmpl_w = tmpl_data["shape"]
 
         # A1 FIX: Null-safe template image access
         # After O4 optimization, grayscale assets have color=None
@@ -120,29 +158,54 @@ class Matcher:
             else:
                 tmpl_img = color_img
 
-        # Determine ROI
-        roi = roi_override or asset.roi
+        return asset, tmpl_img
 
-        # O1: Use cached screen capture if available and fresh (50ms TTL)
-        screen = self._get_cached_screen(roi, asset.grayscale)
+    def _match_screen(
+        self,
+        asset_id: str,
+        asset: AssetImage,
+        tmpl_img: np.ndarray,
+        screen: np.ndarray,
+        roi: ROI | None,
+        adaptive: bool,
+        coarse_screen: np.ndarray | None = None,
+    ) -> Match | None:
+        """
+        Match one template against an already captured screen region.
+
+        When `coarse_screen` is given and the asset has a template pyramid,
+        the downscaled planes are searched first and only the best candidate
+        windows are re-verified at full resolution.
+        """
+        tmpl_h, tmpl_w = tmpl_img.shape[:2]
         if roi:
             offset_x, offset_y = roi.x, roi.y
         else:
             offset_x, offset_y = 0, 0
 
-        # Match
-        result = cv2.matchTemplate(screen, tmpl_img, CV_METHODS[asset.method])
+        # ROI clipped at the screen edge can end up smaller than the template
+        if screen.shape[0] < tmpl_h or screen.shape[1] < tmpl_w:
+            logger.debug("Search region smaller than template: %s", asset_id)
+            return None
 
-        # Get best match
-        if asset.method == MatchMethod.TM_SQDIFF_NORMED:
-            # For SQDIFF, lower is better
-            min_val, _, min_loc, _ = cv2.minMaxLoc(result)
-            confidence = 1.0 - min_val
-            loc = min_loc
+        # Grayscale fallback template against a colour screen
+        if screen.ndim != tmpl_img.ndim:
+            screen = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+
+        # Match (SQDIFF scores are converted so higher is always better)
+        method = CV_METHODS[asset.method]
+        pyramid = self._templates.get_pyramid(asset_id) if coarse_screen is not None else []
+        if pyramid and pyramid[-1].ndim == tmpl_img.ndim == coarse_screen.ndim:
+            confidence, loc = pyramid_search(
+                screen,
+                tmpl_img,
+                method,
+                levels=len(pyramid),
+                coarse_screen=coarse_screen,
+                coarse_template=pyramid[-1],
+            )
         else:
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
-            confidence = max_val
-            loc = max_loc
+            confidence, loc = exhaustive_search(screen, tmpl_img, method)
 
         # Check threshold
         if confidence < asset.threshold:
@@ -168,17 +231,70 @@ class Matcher:
             y=loc[1] + offset_y,
             w=tmpl_w,
             h=tmpl_h,
-            confidence=confidence,
+            confidence=min(max(confidence, 0.0), 1.0),
         )
 
         logger.debug("Found %s at (%d, %d) conf=%.2f", asset_id, match.x, match.y, confidence)
         return match
 
+    def pyramid_drift(self, asset_id: str, roi_override: ROI | None = None) -> PyramidDrift | None:
+        """
+        Compare pyramid search against an exhaustive search on the current frame.
+
+        Use this to check that an asset's pyramid_levels setting does not cost
+        accuracy: `drift` is the score lost, `speedup` the time saved.
+
+        Returns:
+            PyramidDrift, or None if the asset is not loaded or does not fit
+        """
+        resolved = self._resolve_template(asset_id)
+        if resolved is None:
+            return None
+        asset, tmpl_img = resolved
+
+        screen = self._get_cached_screen(roi_override or asset.roi, tmpl_img.ndim == 2)
+        if screen.shape[0] < tmpl_img.shape[0] or screen.shape[1] < tmpl_img.shape[1]:
+            return None
+
+        drift = measure_drift(
+            screen, tmpl_img, CV_METHODS[asset.method], levels=max(1, asset.pyramid_levels)
+        )
+        logger.debug(
+            "Pyramid drift %s: %.4f (%.1fx faster, same_loc=%s)",
+            asset_id,
+            drift.drift,
+            drift.speedup,
+            drift.same_location,
+        )
+        return drift
+
+    def region_checksum(self, asset_id: str, roi_override: ROI | None = None) -> int | None:
+        """
+        Cheap checksum of the region an asset would be searched in.
+
+        Used to skip template matching while the pixels have not changed.
+        Every second row/column is hashed, which is plenty to notice a
+        template-sized change.
+
+        Returns:
+            CRC32 of the current frame's region, or None if the asset is unknown
+        """
+        resolved = self._resolve_template(asset_id)
+        if resolved is None:
+            return None
+        asset, _ = resolved
+
+        region = self._get_cached_screen(roi_override or asset.roi, grayscale=True)
+        return zlib.crc32(np.ascontiguousarray(region[::2, ::2]))
+
+    @in_phase("match")
     def find_all(
         self,
         asset_id: str,
         roi_override: ROI | None = None,
         max_matches: int = 10,
+        iou_threshold: float = 0.3,
+        min_distance: float = 0.0,
     ) -> list[Match]:
         """
         Find all occurrences of asset on screen.
@@ -187,6 +303,8 @@ class Matcher:
             asset_id: Asset ID
             roi_override: Override default ROI
             max_matches: Maximum matches to return
+            iou_threshold: Overlap above which weaker hits are suppressed
+            min_distance: Optional minimum spacing between matches (pixels)
 
         Returns:
             List of matches sorted by confidence
@@ -201,40 +319,39 @@ class Matcher:
 
         roi = roi_override or asset.roi
 
+        screen = self._get_cached_screen(roi, asset.grayscale)
         if roi:
-            screen = self._capture.capture_roi(roi, grayscale=asset.grayscale)
             offset_x, offset_y = roi.x, roi.y
         else:
-            screen = self._capture.capture_full(grayscale=asset.grayscale)
             offset_x, offset_y = 0, 0
 
+        if screen.shape[0] < tmpl_h or screen.shape[1] < tmpl_w:
+            return []
+
         result = cv2.matchTemplate(screen, tmpl_img, CV_METHODS[asset.method])
 
-        # Find all locations above threshold
-        if asset.method == MatchMethod.TM_SQDIFF_NORMED:
-            locations = np.where(result <= (1.0 - asset.threshold))
-            confidences = 1.0 - result[locations]
-        else:
-            locations = np.where(result >= asset.threshold)
-            confidences = result[locations]
-
-        matches = []
-        for i, (y, x) in enumerate(zip(locations[0], locations[1], strict=False)):
-            if len(matches) >= max_matches:
-                break
-            matches.append(
-                Match(
-                    x=int(x) + offset_x,
-                    y=int(y) + offset_y,
-                    w=tmpl_w,
-                    h=tmpl_h,
-                    confidence=float(confidences[i]),
-                )
-            )
+        # One match per object: local maxima + non-maximum suppression
+        detections = detect(
+            result,
+            asset.threshold,
+            tmpl_w,
+            tmpl_h,
+            sqdiff=asset.method == MatchMethod.TM_SQDIFF_NORMED,
+            max_results=max_matches,
+            iou_threshold=iou_threshold,
+            min_distance=min_distance,
+        )
 
-        # Sort by confidence descending
-        matches.sort(key=lambda m: m.confidence, reverse=True)
-        return matches
+        return [
+            Match(
+                x=det.x + offset_x,
+                y=det.y + offset_y,
+                w=tmpl_w,
+                h=tmpl_h,
+                confidence=min(max(det.score, 0.0), 1.0),
+            )
+            for det in detections
+        ]
 
     def exists(
         self,
@@ -244,6 +361,124 @@ class Matcher:
         """Quick check if asset exists on screen."""
         return self.find(asset_id, roi_override) is not None
 
+    # ─────────────────────────────────────────────────────────────
+    # Batched Multi-Template Matching
+    # ─────────────────────────────────────────────────────────────
+
+    @in_phase("match")
+    def find_many(
+        self,
+        asset_ids: list[str],
+        roi_override: ROI | None = None,
+        adaptive: bool = False,
+        max_workers: int = 1,
+        roi_overrides: dict[str, ROI] | None = None,
+        frame: Frame | None = None,
+    ) -> dict[str, BatchMatch]:
+        """
+        Find several assets against one frame with a shared match plan.
+
+        Templates are grouped by (ROI, colour mode) so each region is cropped
+        and converted once. Templates whose ROI lies outside the captured
+        frame, or that are larger than their search region, are skipped.
+
+        Args:
+            asset_ids: Asset IDs to search for
+            roi_override: Override ROI for all assets
+            adaptive: Allow adaptive thresholding (lower confidence)
+            max_workers: Spread groups across up to this many threads of the
+                shared pool (OpenCV releases the GIL inside matchTemplate);
+                1 = run inline
+            roi_overrides: Per-asset ROI overrides (win over roi_override)
+            frame: Match against this frame instead of the bus's current one
+
+        Returns:
+            Dict of {asset_id: BatchMatch} in the order of asset_ids
+        """
+        results: dict[str, BatchMatch] = {aid: BatchMatch(aid) for aid in asset_ids}
+        if not asset_ids:
+            return results
+
+        groups = self._plan_batch(asset_ids, roi_override, roi_overrides or {}, results)
+        if not groups:
+            return results
+
+        if frame is None:
+            frame = self._frames.frame()
+
+        def run_group(group: _PlanGroup) -> None:
+            roi, grayscale, entries = group
+            if roi is not None and not frame.contains_origin(roi):
+                for aid, _, _ in entries:
+                    results[aid].skipped = "roi_outside_frame"
+                return
+
+            screen = frame.view(roi, grayscale)
+            for aid, asset, tmpl_img in entries:
+                if screen.shape[0] < tmpl_img.shape[0] or screen.shape[1] < tmpl_img.shape[1]:
+                    results[aid].skipped = "template_larger_than_roi"
+                    continue
+                start = time.perf_counter()
+                coarse = None
+                if asset.pyramid_levels > 0:
+                    coarse = frame.view(roi, grayscale, level=asset.pyramid_levels)
+                results[aid].match = self._match_screen(
+                    aid, asset, tmpl_img, screen, roi, adaptive, coarse
+                )
+                results[aid].elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if max_workers > 1 and len(groups) > 1:
+            # One task per slice so a call never holds more than max_workers
+            # of the shared pool's threads
+            slices = [groups[i::max_workers] for i in range(min(max_workers, len(groups)))]
+            pool = self._get_pool()
+            list(pool.map(lambda part: [run_group(group) for group in part], slices))
+        else:
+            for group in groups:
+                run_group(group)
+
+        return results
+
+    def _plan_batch(
+        self,
+        asset_ids: list[str],
+        roi_override: ROI | None,
+        roi_overrides: dict[str, ROI],
+        results: dict[str, BatchMatch],
+    ) -> list[_PlanGroup]:
+        """Group templates by (ROI, colour mode) for find_many()."""
+        groups: dict[tuple[tuple[int, int, int, int] | None, bool], _PlanGroup] = {}
+
+        planned: set[str] = set()
+
+        for aid in asset_ids:
+            if aid in planned:
+                continue  # Duplicate id in the batch
+            planned.add(aid)
+            resolved = self._resolve_template(aid)
+            if resolved is None:
+                results[aid].skipped = "asset_not_loaded"
+                continue
+            asset, tmpl_img = resolved
+
+            roi = roi_overrides.get(aid) or roi_override or asset.roi
+            grayscale = tmpl_img.ndim == 2
+            key = ((roi.x, roi.y, roi.w, roi.h) if roi else None, grayscale)
+            if key not in groups:
+                groups[key] = (roi, grayscale, [])
+            groups[key][2].append((aid, asset, tmpl_img))
+
+        return list(groups.values())
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Get the worker pool used by find_many(), creating it once."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._pool_workers, thread_name_prefix="matcher"
+                )
+            return self._pool
+
     # ─────────────────────────────────────────────────────────────
     # Phase 3.2.2: Parallel Multi-Asset Matching
     # ─────────────────────────────────────────────────────────────
@@ -5,6 +5,7 @@ Wraps pytesseract/Tesseract-OCR.
 
 import logging
 import os
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
@@ -20,6 +21,9 @@ except ImportError:
 
 from core.models import ROI
 
+if TYPE_CHECKING:
+    from vision.frame_bus import FrameBus
+
 logger = logging.getLogger(__name__)
 
 
@@ -217,6 +221,29 @@ class TextReader:
                 logger.critical("Tesseract binary not found! Please install Tesseract-OCR.")
             return ""
 
+    def read_from_frame(
+        self,
+        frames: "FrameBus",
+        roi: ROI | None = None,
+        allowlist: str = "",
+        scale: float = 1.0,
+        invert: bool = False,
+        binarize: bool = False,
+    ) -> str:
+        """
+        Read text from the shared frame bus.
+
+        Uses the current frame instead of grabbing the screen again.
+        """
+        if not self.available:
+            return ""
+
+        region = frames.get(roi)
+        img = Image.fromarray(cv2.cvtColor(region, cv2.COLOR_BGR2RGB))
+        return self.read_from_image(
+            img, allowlist=allowlist, scale=scale, invert=invert, binarize=binarize
+        )
+
     def _compute_image_hash(self, img: Image.Image, allowlist: str) -> int:
         """Compute hash of image for caching."""
         try:
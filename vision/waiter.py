@@ -5,7 +5,7 @@ Wait for image to appear or disappear with polling and timeout.
 """
 
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from dataclasses import dataclass
 from enum import Enum
 
@@ -31,6 +31,8 @@ class WaitOutcome:
     result: WaitResult
     match: Match | None = None
     elapsed_ms: int = 0
+    matches_run: int = 0  # Template matches performed
+    matches_avoided: int = 0  # Ticks skipped because the region was unchanged
 
     @property
     def found(self) -> bool:
@@ -48,6 +50,8 @@ class ImageWaiter:
     - Timeout handling
     - Cancel support
     - Exponential backoff during idle
+    - Change-gated mode: match only when the search region changed
+    - Sleep-agnostic polling (`poll`) for cooperative/async drivers
     """
 
     def __init__(
@@ -79,6 +83,7 @@ class ImageWaiter:
         roi_override: ROI | None = None,
         on_poll: Callable[[int], None] | None = None,
         smart_wait: bool = True,
+        change_gated: bool = True,
     ) -> WaitOutcome:
         """
         Wait for image to appear on screen.
@@ -89,6 +94,7 @@ class ImageWaiter:
             poll_ms: Polling interval (None = use default)
             roi_override: Override default ROI
             on_poll: Callback on each poll (elapsed_ms)
+            change_gated: Skip matching while the search region is unchanged
 
         Returns:
             WaitOutcome with result and match if found
@@ -101,6 +107,7 @@ class ImageWaiter:
             roi_override=roi_override,
             on_poll=on_poll,
             smart_wait=smart_wait,
+            change_gated=change_gated,
         )
 
     def wait_vanish(
@@ -111,6 +118,7 @@ class ImageWaiter:
         roi_override: ROI | None = None,
         on_poll: Callable[[int], None] | None = None,
         smart_wait: bool = True,
+        change_gated: bool = True,
     ) -> WaitOutcome:
         """
         Wait for image to disappear from screen.
@@ -121,6 +129,7 @@ class ImageWaiter:
             poll_ms: Polling interval
             roi_override: Override default ROI
             on_poll: Callback on each poll
+            change_gated: Skip matching while the search region is unchanged
 
         Returns:
             WaitOutcome (match is None on success since image vanished)
@@ -133,6 +142,7 @@ class ImageWaiter:
             roi_override=roi_override,
             on_poll=on_poll,
             smart_wait=smart_wait,
+            change_gated=change_gated,
         )
 
     def _wait(
@@ -144,12 +154,81 @@ class ImageWaiter:
         roi_override: ROI | None,
         on_poll: Callable[[int], None] | None,
         smart_wait: bool,
+        change_gated: bool = True,
     ) -> WaitOutcome:
-        """Internal wait implementation with exponential backoff."""
+        """Internal wait implementation: drive `_poll` with time.sleep."""
+        steps = self._poll(
+            asset_id, appear, timeout_ms, poll_ms, roi_override, on_poll, smart_wait, change_gated
+        )
+        try:
+            while True:
+                time.sleep(next(steps))
+        except StopIteration as done:
+            return done.value
+
+    def poll(
+        self,
+        asset_id: str,
+        appear: bool = True,
+        timeout_ms: int | None = None,
+        poll_ms: int | None = None,
+        roi_override: ROI | None = None,
+        on_poll: Callable[[int], None] | None = None,
+        smart_wait: bool = True,
+        change_gated: bool = True,
+    ) -> Generator[float, None, WaitOutcome]:
+        """
+        Wait as a generator, for callers that own the sleeping.
+
+        Yields the number of seconds to sleep before the next poll and
+        returns the WaitOutcome, so the same wait can be driven by
+        time.sleep, asyncio.sleep or `yield from` another generator.
+
+        Usage:
+            steps = waiter.poll("btn", timeout_ms=5000)
+            try:
+                while True:
+                    await asyncio.sleep(next(steps))
+            except StopIteration as done:
+                outcome = done.value
+        """
+        return self._poll(
+            asset_id,
+            appear,
+            timeout_ms or self._default_timeout_ms,
+            poll_ms or self._default_poll_ms,
+            roi_override,
+            on_poll,
+            smart_wait,
+            change_gated,
+        )
+
+    def _poll(
+        self,
+        asset_id: str,
+        appear: bool,
+        timeout_ms: int,
+        poll_ms: int,
+        roi_override: ROI | None,
+        on_poll: Callable[[int], None] | None,
+        smart_wait: bool,
+        change_gated: bool,
+    ) -> Generator[float, None, WaitOutcome]:
+        """
+        Polling loop; yields sleep durations in seconds.
+
+        In change-gated mode the search region is checksummed every tick and
+        the template is only matched when the checksum changed, so polling
+        stays at poll_ms (no backoff latency) for the cost of a hash. Without
+        gating, idle polling backs off exponentially up to backoff_max_ms.
+        """
         self._cancelled = False
         start_time = time.perf_counter()
         current_poll_ms = poll_ms
         consecutive_misses = 0
+        last_checksum: int | None = None
+        matches_run = 0
+        matches_avoided = 0
 
         action = "appear" if appear else "vanish"
         logger.info("Waiting for %s to %s (timeout=%dms)", asset_id, action, timeout_ms)
@@ -159,38 +238,74 @@ class ImageWaiter:
             if self._cancelled:
                 elapsed = int((time.perf_counter() - start_time) * 1000)
                 logger.info("Wait cancelled after %dms", elapsed)
-                return WaitOutcome(result=WaitResult.CANCELLED, elapsed_ms=elapsed)
+                return WaitOutcome(
+                    result=WaitResult.CANCELLED,
+                    elapsed_ms=elapsed,
+                    matches_run=matches_run,
+                    matches_avoided=matches_avoided,
+                )
 
             # Check timeout
             elapsed = int((time.perf_counter() - start_time) * 1000)
             if elapsed >= timeout_ms:
-                logger.warning("Wait timeout after %dms", elapsed)
-                return WaitOutcome(result=WaitResult.TIMEOUT, elapsed_ms=elapsed)
+                logger.warning(
+                    "Wait timeout after %dms (%d matches, %d avoided)",
+                    elapsed,
+                    matches_run,
+                    matches_avoided,
+                )
+                return WaitOutcome(
+                    result=WaitResult.TIMEOUT,
+                    elapsed_ms=elapsed,
+                    matches_run=matches_run,
+                    matches_avoided=matches_avoided,
+                )
 
             # Callback
             if on_poll:
                 on_poll(elapsed)
 
-            # Check image
-            match = self._matcher.find(asset_id, roi_override, adaptive=smart_wait)
-
-            if appear:
-                # Waiting for image to appear
-                if match is not None:
-                    logger.info(
-                        "Found %s after %dms (conf=%.2f)", asset_id, elapsed, match.confidence
-                    )
-                    return WaitOutcome(result=WaitResult.SUCCESS, match=match, elapsed_ms=elapsed)
-                consecutive_misses += 1
+            # Unchanged region: the previous match result still holds
+            checksum = None
+            if change_gated:
+                checksum = self._matcher.region_checksum(asset_id, roi_override)
+            if checksum is not None and checksum == last_checksum:
+                matches_avoided += 1
             else:
-                # Waiting for image to vanish
-                if match is None:
-                    logger.info("%s vanished after %dms", asset_id, elapsed)
-                    return WaitOutcome(result=WaitResult.SUCCESS, elapsed_ms=elapsed)
-                consecutive_misses = 0  # Reset - still visible
-
-            # Exponential backoff during idle
-            if consecutive_misses > 5:
+                last_checksum = checksum
+
+                # Check image
+                match = self._matcher.find(asset_id, roi_override, adaptive=smart_wait)
+                matches_run += 1
+
+                if appear:
+                    # Waiting for image to appear
+                    if match is not None:
+                        logger.info(
+                            "Found %s after %dms (conf=%.2f)", asset_id, elapsed, match.confidence
+                        )
+                        return WaitOutcome(
+                            result=WaitResult.SUCCESS,
+                            match=match,
+                            elapsed_ms=elapsed,
+                            matches_run=matches_run,
+                            matches_avoided=matches_avoided,
+                        )
+                    consecutive_misses += 1
+                else:
+                    # Waiting for image to vanish
+                    if match is None:
+                        logger.info("%s vanished after %dms", asset_id, elapsed)
+                        return WaitOutcome(
+                            result=WaitResult.SUCCESS,
+                            elapsed_ms=elapsed,
+                            matches_run=matches_run,
+                            matches_avoided=matches_avoided,
+                        )
+                    consecutive_misses = 0  # Reset - still visible
+
+            # Exponential backoff during idle (gated waits poll at full rate)
+            if consecutive_misses > 5 and checksum is None:
                 current_poll_ms = min(current_poll_ms * 1.5, self._backoff_max_ms)
             else:
                 current_poll_ms = poll_ms
@@ -198,4 +313,4 @@ class ImageWaiter:
             # Sleep
             sleep_ms = min(current_poll_ms, timeout_ms - elapsed)
             if sleep_ms > 0:
-                time.sleep(sleep_ms / 1000.0)
+                yield sleep_ms / 1000.0